@@ -3,7 +3,7 @@ Unified RAG Web Application
 Combines GDD RAG and Code Q&A into a single Flask app
 """
 
-from flask import Flask, render_template, request, session, jsonify
+from flask import Flask, Response, render_template, request, session, jsonify, stream_with_context
 import os
 import sys
 from pathlib import Path
@@ -31,7 +31,7 @@ def new_job():
     return job_id
 
 
-def update_job(job_id, step=None, status=None, message=None, doc_id=None, chunks_count=None):
+def update_job(job_id, step=None, status=None, message=None, doc_id=None, chunks_count=None, report=None):
     with JOBS_LOCK:
         job = UPLOAD_JOBS.get(job_id)
         if not job:
@@ -46,6 +46,8 @@ def update_job(job_id, step=None, status=None, message=None, doc_id=None, chunks
             job["doc_id"] = doc_id
         if chunks_count is not None:
             job["chunks_count"] = chunks_count
+        if report is not None:
+            job["report"] = report
 
 
 def get_job(job_id):
@@ -99,11 +101,14 @@ def run_code_upload_pipeline_async(job_id, file_bytes, filename):
     try:
         update_job(job_id, step="Reading file")
 
+        from backend.csharp_symbols import extract_csharp_symbols
+        from backend.services.code_ingest_service import (
+            build_code_chunks, decode_source, file_content_hash, symbol_index_entry)
+        from backend.storage.code_blob_store import get_blob_store
+        from backend.storage.code_symbol_index import get_symbol_index, symbol_to_row
+
         # Decode file content
-        try:
-            code_text = file_bytes.decode('utf-8')
-        except UnicodeDecodeError:
-            code_text = file_bytes.decode('utf-8', errors='ignore')
+        code_text = decode_source(file_bytes)
 
         # Only process .cs files
         if not filename.lower().endswith('.cs'):
@@ -114,155 +119,40 @@ def run_code_upload_pipeline_async(job_id, file_bytes, filename):
         update_job(job_id, step="Extracting methods and classes")
 
         # Import required functions
-        from backend.code_service import _analyze_csharp_file_symbols
         from backend.storage.code_supabase_storage import index_code_chunks_to_supabase
         from backend.services.llm_provider import SimpleLLMProvider
-        import re
 
         # Use file name as file_path (relative path)
         file_path = filename
         file_name = filename.split(
             '/')[-1] if '/' in filename else filename.split('\\')[-1]
 
-        # Extract methods
-        methods, fields, properties = _analyze_csharp_file_symbols(code_text)
-
-        # Helper function to extract method code
-        def extract_method_code(code_text, method):
-            signature = method.get('signature', '')
-            if not signature:
-                return ''
-            sig_start = code_text.find(signature)
-            if sig_start == -1:
-                return signature
-            brace_start = code_text.find('{', sig_start + len(signature))
-            if brace_start == -1:
-                arrow_pos = code_text.find('=>', sig_start + len(signature))
-                if arrow_pos != -1:
-                    end_pos = code_text.find(';', arrow_pos)
-                    if end_pos != -1:
-                        return code_text[sig_start:end_pos + 1]
-                return signature
-            brace_count = 1
-            pos = brace_start + 1
-            while pos < len(code_text) and brace_count > 0:
-                char = code_text[pos]
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                elif char in ('"', "'"):
-                    quote_char = char
-                    pos += 1
-                    while pos < len(code_text) and code_text[pos] != quote_char:
-                        if code_text[pos] == '\\':
-                            pos += 1
-                        pos += 1
-                pos += 1
-            if brace_count == 0:
-                return code_text[sig_start:pos]
-            return signature
-
-        # Build method chunks
-        method_chunks = []
-        for method in methods:
-            method_code = extract_method_code(code_text, method)
-            if not method_code:
-                continue
-
-            # Find class name
-            class_name = None
-            sig_start = code_text.find(method.get('signature', ''))
-            if sig_start != -1:
-                before_code = code_text[:sig_start]
-                class_match = re.search(r'class\s+(\w+)', before_code)
-                if class_match:
-                    class_name = class_match.group(1)
-
-            method_chunks.append({
-                'chunk_type': 'method',
-                'name': method.get('name'),
-                'class_name': class_name,
-                'code': method_code,
-                'source_code': method_code,
-                'signature': method.get('signature', ''),
-                'doc_comment': method.get('doc_comment', ''),
-                'metadata': {'line': method.get('line', 1)}
-            })
-
-        # Extract class-like types
-        class_chunks = []
-        TYPE_PATTERN = re.compile(
-            r'^[ \t]*(?:\[[^\]]+\]\s*)*'
-            r'(?:public|private|protected|internal|abstract|sealed|static|partial)?\s*'
-            r'(?P<kind>class|struct|interface|enum)\s+'
-            r'(?P<name>\w+)',
-            re.MULTILINE | re.IGNORECASE
-        )
-
-        for match in TYPE_PATTERN.finditer(code_text):
-            kind = match.group("kind").lower()
-            name = match.group("name")
-            start_pos = match.start()
-            brace_pos = code_text.find("{", match.end())
-            if brace_pos == -1:
-                continue
-            brace_count = 1
-            pos = brace_pos + 1
-            while pos < len(code_text) and brace_count > 0:
-                char = code_text[pos]
-                if char == '{':
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                elif char in ('"', "'"):
-                    quote_char = char
-                    pos += 1
-                    while pos < len(code_text) and code_text[pos] != quote_char:
-                        if code_text[pos] == '\\':
-                            pos += 1
-                        pos += 1
-                pos += 1
-            if brace_count == 0:
-                type_code = code_text[start_pos:pos]
-                formatted_code = f"File: {file_path}\n\n{type_code}"
-                class_chunks.append({
-                    'chunk_type': kind,
-                    'class_name': name,
-                    'source_code': formatted_code,
-                    'code': None,
-                    'method_declarations': '',
-                    'metadata': {'kind': kind}
-                })
+        # One parse yields every type and member with its exact source range;
+        # it feeds both the chunks and the symbol index
+        content_hash = file_content_hash(file_bytes)
+        symbols = extract_csharp_symbols(code_text)
+        chunks = build_code_chunks(file_path, code_text, symbols)
 
         update_job(job_id, step="Indexing to Supabase")
 
         # Initialize provider
         provider = SimpleLLMProvider()
 
-        total_chunks = 0
+        # Method and type chunks share one chunk -> embed -> write pipeline
+        total_chunks = index_code_chunks_to_supabase(
+            file_path=file_path,
+            file_name=file_name,
+            chunks=chunks,
+            provider=provider,
+            progress_cb=progress_cb,
+            content_hash=content_hash
+        )
 
-        # Index method chunks
-        if method_chunks:
-            success = index_code_chunks_to_supabase(
-                file_path=file_path,
-                file_name=file_name,
-                chunks=method_chunks,
-                provider=provider
-            )
-            if success:
-                total_chunks += len(method_chunks)
-
-        # Index class chunks
-        if class_chunks:
-            success = index_code_chunks_to_supabase(
-                file_path=file_path,
-                file_name=file_name,
-                chunks=class_chunks,
-                provider=provider
-            )
-            if success:
-                total_chunks += len(class_chunks)
+        # Recorded only once code_files has the file, so a failed upload never
+        # leaves a source or symbol table that code_files does not back
+        get_blob_store().put(file_bytes, content_hash)
+        get_symbol_index().record_files([symbol_index_entry(
+            file_path, content_hash, [symbol_to_row(s) for s in symbols])])
 
         update_job(job_id, status="success", step="Completed",
                    message=f"Successfully indexed {filename} ({total_chunks} chunks)",
@@ -275,6 +165,33 @@ def run_code_upload_pipeline_async(job_id, file_bytes, filename):
         update_job(job_id, status="error", step="Failed", message=error_msg)
 
 
+def run_code_bulk_upload_pipeline_async(job_id, archive_bytes, path_prefix, force):
+    """Index every code file of a zip archive asynchronously."""
+    def progress_cb(step_text):
+        update_job(job_id, step=step_text)
+
+    try:
+        update_job(job_id, step="Parsing code files")
+        from backend.services.code_ingest_service import ingest_codebase
+
+        report = ingest_codebase(
+            archive_bytes,
+            path_prefix=path_prefix,
+            force=force,
+            progress_cb=progress_cb
+        )
+        chunks_count = sum(f.chunks for f in report.files)
+        update_job(job_id, status="success", step="Completed",
+                   message=f"Bulk ingest: {report.summary()} ({chunks_count} chunks)",
+                   chunks_count=chunks_count, report=report.to_dict())
+
+    except Exception as e:
+        import traceback
+        error_msg = str(e) + "\n" + traceback.format_exc()
+        app.logger.error(f"Error in code bulk upload pipeline: {error_msg}")
+        update_job(job_id, status="error", step="Failed", message=error_msg)
+
+
 # Load environment variables
 load_dotenv()
 
@@ -520,8 +437,10 @@ def gdd_query():
         query = data.get('query', '')
         selected_doc = data.get('selected_doc', None)
         language = data.get('language', None)
+        # Per-request opt-out of the semantic answer cache
+        use_cache = data.get('use_cache', True) is not False
 
-        result = query_gdd_documents(query, selected_doc, language=language)
+        result = query_gdd_documents(query, selected_doc, language=language, use_cache=use_cache)
         return jsonify(result)
     except Exception as e:
         app.logger.error(f"Error in GDD query: {e}")
@@ -951,6 +870,33 @@ def explainer_explain():
         }), 500
 
 
+@app.route('/api/gdd/explainer/explain/stream', methods=['POST'])
+def explainer_explain_stream():
+    """Stream section explanations as they complete using Server-Sent Events (SSE)"""
+    from backend.gdd_explainer import generate_explanation_stream
+
+    data = request.get_json() or {}
+    keyword = data.get('keyword', '')
+    app.logger.info(
+        f"[EXPLAINER EXPLAIN STREAM] keyword='{keyword}', choices={len(data.get('selected_choices', []))}")
+
+    # When the client disconnects the server closes the generator, which
+    # cancels the section explanations that have not started yet
+    return Response(
+        stream_with_context(generate_explanation_stream(
+            keyword,
+            data.get('selected_choices', []),
+            data.get('stored_results', []),
+            selected_keywords=data.get('selected_keywords', []),
+            language=data.get('language', 'en'))),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # IMPORTANT (nginx)
+        }
+    )
+
+
 @app.route('/api/gdd/explainer/select-all', methods=['POST'])
 def explainer_select_all():
     """Select all items"""
@@ -1190,6 +1136,53 @@ def code_files():
         return jsonify({'error': str(e), 'files': []}), 500
 
 
+@app.route('/api/code/file', methods=['GET'])
+def code_file_content():
+    """
+    Original source of an indexed code file, read from the code blob store.
+    Supports HTTP Range requests (e.g. "Range: bytes=0-4095" for a preview).
+    Query params: file_path (full path or file name).
+    """
+    try:
+        from backend.storage.code_blob_store import code_file_hash, get_blob_store
+        from backend.storage.code_path_index import get_path_index
+
+        file_filter = request.args.get('file_path', '').strip()
+        if not file_filter:
+            return jsonify({'error': 'file_path is required'}), 400
+
+        paths = get_path_index().resolve(file_filter)
+        if not paths:
+            return jsonify({'error': f'File not indexed: {file_filter}'}), 404
+        if len(paths) > 1:
+            return jsonify({'error': f'Ambiguous file: {file_filter}', 'candidates': paths}), 409
+
+        store = get_blob_store()
+        content_hash = code_file_hash(paths[0])
+        size = store.size(content_hash) if content_hash else None
+        if size is None:
+            return jsonify({'error': f'No stored source for {paths[0]} (re-upload the file)'}), 404
+
+        headers = {'Accept-Ranges': 'bytes', 'ETag': f'"{content_hash}"', 'X-File-Path': paths[0]}
+        if request.if_none_match.contains(content_hash):
+            return Response(status=304, headers=headers)
+
+        byte_range = request.range.range_for_length(size) if request.range else None
+        if request.range and byte_range is None:
+            headers['Content-Range'] = f'bytes */{size}'
+            return Response(status=416, headers=headers)
+        start, stop = byte_range or (0, size)
+        status = 200
+        if byte_range:
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+        return Response(store.read_range(content_hash, start, stop), status=status,
+                        headers=headers, mimetype='text/plain; charset=utf-8')
+    except Exception as e:
+        app.logger.error(f"Error reading code file: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/code/upload', methods=['POST'])
 def code_upload():
     """Start an async code file upload + index job and return a job_id immediately."""
@@ -1225,6 +1218,47 @@ def code_upload():
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@app.route('/api/code/upload/bulk', methods=['POST'])
+def code_upload_bulk():
+    """
+    Start an async bulk ingest of a zipped codebase and return a job_id immediately.
+
+    Form fields: file (.zip), path_prefix (optional, prepended to archive
+    paths), force (optional, re-index files whose hash is unchanged).
+    Poll /api/code/upload/status for progress and the per-file report.
+    """
+    try:
+        if not code_service_available:
+            return jsonify({'status': 'error', 'message': 'Code service not available'}), 500
+
+        if 'file' not in request.files:
+            return jsonify({'status': 'error', 'message': 'No file provided'}), 400
+
+        file = request.files['file']
+        if not file or file.filename == '':
+            return jsonify({'status': 'error', 'message': 'No file selected'}), 400
+
+        if not file.filename.lower().endswith('.zip'):
+            return jsonify({'status': 'error', 'message': 'Only .zip archives are supported'}), 400
+
+        archive_bytes = file.read()
+        path_prefix = request.form.get('path_prefix', '')
+        force = request.form.get('force', '').lower() in ('1', 'true', 'yes')
+        job_id = new_job()
+        # Start background thread
+        t = threading.Thread(target=run_code_bulk_upload_pipeline_async, args=(
+            job_id, archive_bytes, path_prefix, force), daemon=True)
+        t.start()
+
+        return jsonify({'status': 'accepted', 'job_id': job_id, 'step': 'Uploading file'}), 202
+
+    except Exception as e:
+        app.logger.error(f"Error in code bulk upload: {e}")
+        import traceback
+        app.logger.error(traceback.format_exc())
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
 @app.route('/api/code/upload/status', methods=['GET'])
 def code_upload_status():
     """Poll the current status of a code upload job."""
@@ -1254,10 +1288,28 @@ def code_upload_status():
             response['chunks_count'] = int(chunks_match.group(1))
         else:
             response['chunks_count'] = 0
+        # Bulk ingest: files/sec and per-file status
+        if job.get('report'):
+            response['report'] = job['report']
 
     return jsonify(response), 200
 
 
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Process-wide performance counters of the query hot paths (caches, batching, rate limits)"""
+    from backend.storage.answer_cache import get_answer_cache
+    from gdd_rag_backbone.llm_providers.rate_limiter import get_rate_limiter
+    from gdd_rag_backbone.rag_backend.embedding_batcher import batcher_stats
+    from gdd_rag_backbone.rag_backend.single_flight import single_flight_stats
+    return jsonify({
+        'single_flight': single_flight_stats(),
+        'rate_limits': get_rate_limiter().stats(),
+        'embedding_batches': batcher_stats(),
+        'answer_cache': get_answer_cache().stats(),
+    })
+
+
 @app.route('/api/debug/code-supabase', methods=['GET'])
 def debug_code_supabase():
     """Debug endpoint to check Code Q&A Supabase connection and data"""
@@ -1442,6 +1494,13 @@ def delete_code_file_route():
             return jsonify({'error': 'file_path is required'}), 400
 
         success = delete_code_file(file_path)
+        try:
+            from backend.storage.code_path_index import get_path_index
+            from backend.storage.code_symbol_index import get_symbol_index
+            get_path_index().remove_path(file_path)
+            get_symbol_index().delete_file(file_path)
+        except Exception as e:
+            app.logger.warning(f"Could not remove {file_path} from local code indexes: {e}")
         return jsonify({'success': success})
     except Exception as e:
         import traceback
@@ -1478,6 +1537,7 @@ def add_alias():
     """Add a new alias for a keyword (Supabase)"""
     try:
         from backend.storage.keyword_storage import insert_alias
+        from backend.storage.alias_graph import get_alias_graph
 
         data = request.get_json()
         keyword = data.get('keyword', '').strip()
@@ -1488,6 +1548,7 @@ def add_alias():
             return jsonify({'error': 'Keyword and alias are required'}), 400
 
         result = insert_alias(keyword, alias, language)
+        get_alias_graph().mark_changed()
         return jsonify(result)
     except Exception as e:
         import traceback
@@ -1500,6 +1561,7 @@ def remove_alias():
     """Delete an alias (Supabase)"""
     try:
         from backend.storage.keyword_storage import delete_alias
+        from backend.storage.alias_graph import get_alias_graph
 
         data = request.get_json()
         keyword = data.get('keyword', '').strip()
@@ -1509,6 +1571,8 @@ def remove_alias():
             return jsonify({'error': 'Keyword and alias are required'}), 400
 
         success = delete_alias(keyword, alias)
+        if success:
+            get_alias_graph().mark_changed()
         return jsonify({'success': success})
     except Exception as e:
         import traceback
@@ -1522,6 +1586,7 @@ def save_aliases():
     """Save aliases (Supabase) - handles bulk updates from frontend"""
     try:
         from backend.storage.keyword_storage import insert_alias, delete_alias
+        from backend.storage.alias_graph import get_alias_graph
         from datetime import datetime
 
         data = request.get_json()
@@ -1558,6 +1623,7 @@ def save_aliases():
                             app.logger.warning(
                                 f"Could not insert alias {alias_name} for {keyword_name}: {e}")
 
+        get_alias_graph().mark_changed()
         return jsonify({
             'status': 'success',
             'lastUpdated': datetime.now().isoformat()
@@ -1631,6 +1697,26 @@ except Exception as e:
     app.logger.warning(
         f"WordNet preload failed (synonym generation may be slower): {e}")
 
+# Prewarm the term cache (translations and synonyms of alias terms and
+# section headings) in the background, so startup is not delayed. Only one
+# worker process prewarms; it reads the headings from the keyword search
+# mirror once the rebuild below has loaded it
+try:
+    from backend.services.translation_synonym_service import prewarm_term_cache
+    threading.Thread(target=prewarm_term_cache, name='term-cache-prewarm', daemon=True).start()
+except Exception as e:
+    app.logger.warning(f"Term cache prewarm could not start: {e}")
+
+# Rebuild the local keyword search mirror from Supabase in the background;
+# keyword_search uses the RPC until it is ready
+try:
+    from backend.shared.config import KEYWORD_FTS_ENABLED
+    if KEYWORD_FTS_ENABLED:
+        from backend.storage.keyword_fts_index import get_keyword_fts_index
+        get_keyword_fts_index().rebuild_async()
+except Exception as e:
+    app.logger.warning(f"Keyword search mirror rebuild could not start: {e}")
+
 # Final validation - ensure app can start
 try:
     app.logger.info("=" * 60)
@@ -3,15 +3,19 @@ Code Q&A Service
 Extracted from code_qa/app.py - handles codebase queries with Supabase integration
 """
 
-from gdd_rag_backbone.llm_providers import make_embedding_func
+from gdd_rag_backbone.llm_providers import get_openai_client
+from gdd_rag_backbone.rag_backend.embedding_batcher import get_embedding_batcher
 import os
 import sys
 import time
 import re
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import List, Dict, Optional, Any, Tuple
-from openai import OpenAI
+
+from backend.csharp_symbols import extract_csharp_symbols
 
 # Add project root to path for imports
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -36,107 +40,102 @@ def _resolve_local_code_path(supabase_path: str) -> Optional[Path]:
 def _analyze_csharp_file_symbols(code_text: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Analyze a C# file and extract methods, fields, and properties.
-    Lightweight regex-based parser; good enough for listing names and locations.
+    Uses the single-parse symbol extractor (tree-sitter when installed).
+    Constructors are listed with methods.
     """
     methods: List[Dict[str, Any]] = []
     fields: List[Dict[str, Any]] = []
     properties: List[Dict[str, Any]] = []
 
-    # Precompute line offsets for line numbers
-    line_starts = [0]
-    for m in re.finditer(r"\n", code_text):
-        line_starts.append(m.end())
-
-    def _line_number_for_pos(pos: int) -> int:
-        # Binary search for line number
-        import bisect
-        return bisect.bisect_right(line_starts, pos)
-
-    # Improved C# method pattern (attributes + optional modifiers + return type + name + params).
-    # We no longer require the '{' on the same line so that styles like:
-    #   protected override void Awake()
-    #   {
-    #   }
-    # are still detected. Control-flow constructs (if/for/while/catch) don't match this
-    # because they don't have a return type before the name.
-    method_pattern = re.compile(
-        r'^[ \t]*(?:\[[^\]]+\]\s*)*'                         # attributes
-        r'(?:public|private|protected|internal)?\s*'
-        r'(?:(?:static|async|override|virtual|abstract|sealed|partial|extern|unsafe|new)\s+)*'
-        r'(?:void|[\w<>\[\],]+)\s+'                          # return type
-        r'(?P<name>\w+)\s*'                                  # method name
-        r'\([^)]*\)\s*'                                      # parameters
-        # generic constraints
-        r'(?:where\s+\w+\s*:\s*[^{=>]+)?\s*'
-        # block or expression-bodied
-        r'(?:\{|=>)',
-        re.MULTILINE
-    )
+    for symbol in extract_csharp_symbols(code_text):
+        if symbol.kind in ('method', 'constructor'):
+            methods.append({
+                "name": symbol.name,
+                "line": symbol.start_line,
+                "signature": symbol.signature,
+                "class_name": symbol.parent,
+                "start_byte": symbol.start_byte,
+                "end_byte": symbol.end_byte,
+                "doc_comment": symbol.doc_comment,
+            })
+        elif symbol.kind == 'field':
+            fields.append({
+                "name": symbol.name,
+                "line": symbol.start_line,
+                "declaration": symbol.signature,
+            })
+        elif symbol.kind == 'property':
+            properties.append({
+                "name": symbol.name,
+                "line": symbol.start_line,
+                "declaration": symbol.signature,
+            })
 
-    # Field pattern: attributes + optional access + type + name;
-    # Made more flexible to handle various field declarations
-    # Must have at least one modifier (access or static/const/readonly) to avoid false positives
-    field_pattern = re.compile(
-        r'^[ \t]*(?:\[[^\]]*\]\s*)*'                          # attributes
-        # optional access modifier
-        r'(?:(?:public|private|protected|internal)\s+)?'
-        # optional modifiers
-        r'(?:(?:static|const|readonly)\s+)?'
-        # type (must be present)
-        r'[\w<>\[\],\s]+\s+'
-        r'(?P<name>\w+)\s*'                                    # field name
-        # optional initializer
-        r'(?:=[^;]*)?;',
-        re.MULTILINE
-    )
+    return methods, fields, properties
+
+
+def _indexed_file_path(file_filter: str) -> Optional[str]:
+    """
+    Resolve a file filter in the local symbol index, restoring the file's
+    symbol table from the Supabase mirror when it is not on this disk yet.
+    """
+    from backend.storage.code_symbol_index import get_symbol_index
+
+    index = get_symbol_index()
+    file_path = index.resolve(file_filter)
+    if file_path is None and SUPABASE_AVAILABLE:
+        from backend.storage.supabase_client import get_code_symbols_by_name
+        file_name = file_filter.replace('\\', '/').split('/')[-1]
+        rows = get_code_symbols_by_name(file_name)
+        if rows:
+            index.load_mirror_rows(rows)
+            file_path = index.resolve(file_filter)
+    return file_path
 
-    # Property pattern: attributes + access + type + name { get; ... } or => expression
-    # Handles both traditional properties and expression-bodied properties
-    property_pattern = re.compile(
-        r'^[ \t]*(?:\[[^\]]*\]\s*)*'                          # attributes
-        # optional access modifier
-        r'(?:public|private|protected|internal)?\s*'
-        r'(?:static|virtual|override|sealed|abstract)?\s*'   # optional modifiers
-        r'[\w<>\[\],\s]+\s+'                                   # return type
-        r'(?P<name>\w+)\s*'                                    # property name
-        # { get; set; } or => expression
-        r'(?:\{[^\}]*\}|=>[^;]+)',
-        re.MULTILINE
-    )
 
-    for match in method_pattern.finditer(code_text):
-        name = match.group("name")
-        start = match.start()
-        line_no = _line_number_for_pos(start)
-        signature = match.group(0).strip()
-        methods.append({
-            "name": name,
-            "line": line_no,
-            "signature": signature,
-        })
-
-    for match in field_pattern.finditer(code_text):
-        name = match.group("name")
-        start = match.start()
-        line_no = _line_number_for_pos(start)
-        decl = match.group(0).strip()
-        fields.append({
-            "name": name,
-            "line": line_no,
-            "declaration": decl,
-        })
-
-    for match in property_pattern.finditer(code_text):
-        name = match.group("name")
-        start = match.start()
-        line_no = _line_number_for_pos(start)
-        decl = match.group(0).strip()
-        properties.append({
-            "name": name,
-            "line": line_no,
-            "declaration": decl,
-        })
+def lookup_file_symbols(file_filter: str) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Methods, fields and properties of a file from the symbol index, in the
+    shape of _analyze_csharp_file_symbols.
+
+    Returns:
+        (methods, fields, properties), or None when the file is not in the
+        index (e.g. indexed before the symbol index existed)
+    """
+    import logging
+    logger = logging.getLogger(__name__)
+    try:
+        from backend.storage.code_symbol_index import get_symbol_index
+        file_path = _indexed_file_path(file_filter)
+        if file_path is None:
+            return None
+        symbols = get_symbol_index().get_symbols(
+            file_path, kinds=['method', 'constructor', 'field', 'property'])
+    except Exception as e:
+        logger.warning(f"[Symbol Index] Lookup failed for {file_filter}: {e}")
+        return None
 
+    methods: List[Dict[str, Any]] = []
+    fields: List[Dict[str, Any]] = []
+    properties: List[Dict[str, Any]] = []
+    for symbol in symbols:
+        if symbol['kind'] in ('method', 'constructor'):
+            methods.append({
+                "name": symbol['name'],
+                "line": symbol['start_line'],
+                "signature": symbol['signature'],
+                "class_name": symbol['parent'],
+                "start_byte": symbol['start_byte'],
+                "end_byte": symbol['end_byte'],
+                "doc_comment": symbol['doc_comment'] or "",
+            })
+        else:
+            target = fields if symbol['kind'] == 'field' else properties
+            target.append({
+                "name": symbol['name'],
+                "line": symbol['start_line'],
+                "declaration": symbol['signature'],
+            })
     return methods, fields, properties
 
 
@@ -146,7 +145,9 @@ def _extract_variables_from_methods(code_text: str, methods: List[Dict[str, Any]
 
     Args:
         code_text: Full source code text
-        methods: List of method dicts with 'name', 'line', 'signature'
+        methods: List of method dicts from _analyze_csharp_file_symbols
+            (with 'name', 'line', 'start_byte', 'end_byte'); re-parsed from
+            code_text when the ranges are missing
         selected_method_names: List of method names to extract variables from
 
     Returns:
@@ -154,27 +155,8 @@ def _extract_variables_from_methods(code_text: str, methods: List[Dict[str, Any]
     """
     variables = []
 
-    # Precompute line offsets
-    line_starts = [0]
-    for m in re.finditer(r"\n", code_text):
-        line_starts.append(m.end())
-
-    def _line_number_for_pos(pos: int) -> int:
-        import bisect
-        return bisect.bisect_right(line_starts, pos)
-
-    # Find method bodies for selected methods
-    method_pattern = re.compile(
-        r'^[ \t]*(?:\[[^\]]+\]\s*)*'
-        r'(?:public|private|protected|internal)?\s*'
-        r'(?:(?:static|async|override|virtual|abstract|sealed|partial|extern|unsafe|new)\s+)*'
-        r'(?:void|[\w<>\[\],]+)\s+'
-        r'(?P<name>\w+)\s*'
-        r'\([^)]*\)\s*'
-        r'(?:where\s+\w+\s*:\s*[^{=>]+)?\s*'
-        r'(?:\{|=>)',
-        re.MULTILINE
-    )
+    if not methods or any('start_byte' not in m for m in methods):
+        methods = _analyze_csharp_file_symbols(code_text)[0]
 
     # Pattern for local variable declarations within method bodies
     # Matches: type name; or type name = value;
@@ -186,57 +168,34 @@ def _extract_variables_from_methods(code_text: str, methods: List[Dict[str, Any]
         re.MULTILINE
     )
 
-    # Find all methods and their positions
-    method_matches = []
-    for match in method_pattern.finditer(code_text):
-        method_name = match.group("name")
-        if method_name in selected_method_names:
-            method_start = match.start()
-            method_end = match.end()
-
-            # Find the method body (from opening brace to matching closing brace)
-            brace_count = 0
-            body_start = None
-            body_end = None
-
-            # Find opening brace
-            for i in range(method_end, len(code_text)):
-                if code_text[i] == '{':
-                    if body_start is None:
-                        body_start = i + 1
-                    brace_count += 1
-                    break
-                elif code_text[i] == '}':
-                    # Method might be expression-bodied (=>)
-                    break
-
-            if body_start is not None:
-                # Find matching closing brace
-                for i in range(body_start, len(code_text)):
-                    if code_text[i] == '{':
-                        brace_count += 1
-                    elif code_text[i] == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            body_end = i
-                            break
-
-                if body_end is not None:
-                    method_body = code_text[body_start:body_end]
-
-                    # Extract local variables from method body
-                    for var_match in local_var_pattern.finditer(method_body):
-                        var_name = var_match.group("name")
-                        var_start = body_start + var_match.start()
-                        var_line = _line_number_for_pos(var_start)
-                        var_decl = var_match.group(0).strip()
-
-                        variables.append({
-                            "name": var_name,
-                            "line": var_line,
-                            "method": method_name,
-                            "declaration": var_decl,
-                        })
+    source = code_text.encode('utf-8')
+    for method in methods:
+        method_name = method['name']
+        if method_name not in selected_method_names:
+            continue
+
+        # Symbol ranges are UTF-8 byte offsets; slice bytes, then scan the text
+        method_text = source[method['start_byte']:method['end_byte']].decode('utf-8', errors='replace')
+        body_start = method_text.find('{')
+        if body_start == -1:
+            # Expression-bodied or abstract method: no locals
+            continue
+        method_body = method_text[body_start + 1:method_text.rfind('}')]
+        body_line = method['line'] + method_text.count('\n', 0, body_start + 1)
+
+        # Extract local variables from method body
+        for var_match in local_var_pattern.finditer(method_body):
+            var_name = var_match.group("name")
+            leading = len(var_match.group(0)) - len(var_match.group(0).lstrip())
+            var_line = body_line + method_body.count('\n', 0, var_match.start() + leading)
+            var_decl = var_match.group(0).strip()
+
+            variables.append({
+                "name": var_name,
+                "line": var_line,
+                "method": method_name,
+                "declaration": var_decl,
+            })
 
     return variables
 
@@ -272,7 +231,7 @@ Use ONLY information explicitly present in the context above.'''
 # Try to import Supabase storage (optional)
 try:
     from backend.storage.code_supabase_storage import (
-        search_code_chunks_supabase,
+        search_code_chunks_multi,
         get_code_chunks_for_files,
         list_code_files_supabase,
         normalize_path_consistent as normalize_path_storage,
@@ -322,12 +281,33 @@ if not api_key:
     raise ValueError("OPENAI_API_KEY environment variable must be set")
 
 base_url = None
-client = OpenAI(api_key=api_key, base_url=base_url)
+client = get_openai_client(api_key, base_url)
 
 # Get LLM models from environment or use defaults
 _hyde_model = os.environ.get("HYDE_MODEL", "gpt-4o-mini")
 _answer_model = os.environ.get("ANSWER_MODEL", "gpt-4o-mini")
 
+# HYDE v2 in generate_context_supabase:
+#   "always"   - rewrite every query (original sequential behaviour)
+#   "adaptive" - skip the rewrite when the first-pass top similarity reaches
+#                CODE_HYDE_SKIP_SCORE, otherwise run it concurrently with the
+#                rest of the first pass and discard it after CODE_HYDE_TIMEOUT
+CODE_HYDE_MODE = os.environ.get("CODE_HYDE_MODE", "adaptive")
+CODE_HYDE_SKIP_SCORE = float(os.environ.get("CODE_HYDE_SKIP_SCORE", 0.55))
+CODE_HYDE_TIMEOUT = float(os.environ.get("CODE_HYDE_TIMEOUT", 8.0))
+
+# Moving average of what the HYDE v2 pass (rewrite + embed + search) costs,
+# used to report the latency saved when it is skipped or cancelled
+_hyde_pass_lock = threading.Lock()
+_hyde_pass_seconds: Optional[float] = None
+
+
+def _record_hyde_pass(seconds: float) -> None:
+    global _hyde_pass_seconds
+    with _hyde_pass_lock:
+        _hyde_pass_seconds = seconds if _hyde_pass_seconds is None else (
+            0.8 * _hyde_pass_seconds + 0.2 * seconds)
+
 
 def parse_cs_file_filter(raw_query: str):
     """
@@ -356,9 +336,15 @@ def parse_cs_file_filter(raw_query: str):
     return cleaned, file_paths if file_paths else None
 
 
-def openai_hyde_v2(query: str, temp_context: str, hyde_query: str):
-    """Generate HYDE v2 refined query using context"""
+def openai_hyde_v2(query: str, temp_context: str, hyde_query: str,
+                   cancel_event: Optional[threading.Event] = None):
+    """
+    Generate HYDE v2 refined query using context.
+    Setting cancel_event stops reading the stream and closes it; the partial
+    response is returned with timing "cancelled": True.
+    """
     start_time = time.time()
+    cancelled = False
 
     stream = client.chat.completions.create(
         model=_hyde_model,
@@ -380,6 +366,10 @@ def openai_hyde_v2(query: str, temp_context: str, hyde_query: str):
     full_response = ""
 
     for chunk in stream:
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            stream.close()
+            break
         if chunk.choices[0].delta.content:
             if first_token_time is None:
                 first_token_time = time.time() - start_time
@@ -398,6 +388,8 @@ def openai_hyde_v2(query: str, temp_context: str, hyde_query: str):
         "token_rate": round(token_rate, 1) if token_rate > 0 else None,
         "response_length": len(full_response)
     }
+    if cancelled:
+        timing_data["cancelled"] = True
 
     return full_response, timing_data
 
@@ -497,7 +489,8 @@ def generate_context_supabase(
     query: str,
     file_filters: Optional[List[str]] = None,
     provider=None,
-    prioritize_class_chunks: bool = False
+    prioritize_class_chunks: bool = False,
+    hyde_mode: Optional[str] = None
 ) -> tuple[str, Dict]:
     """
     Generate context from Supabase using vector search and HYDE v2.
@@ -506,6 +499,9 @@ def generate_context_supabase(
         query: User query
         file_filters: Optional list of file paths to filter by
         provider: LLM provider for embeddings
+        prioritize_class_chunks: Include all class chunks of the filtered files
+        hyde_mode: "always", "adaptive" or "off" (default: CODE_HYDE_MODE);
+            the decision is reported in timing_info["hyde_v2_decision"]
 
     Returns:
         (context_string, timing_info_dict)
@@ -520,19 +516,20 @@ def generate_context_supabase(
 
     # Initialize provider if not provided
     if provider is None:
-        from backend.services.llm_provider import SimpleLLMProvider
+        from backend.services.llm_provider import get_llm_provider
         try:
-            provider = SimpleLLMProvider()
+            provider = get_llm_provider()
         except:
             # Fallback to Qwen if OpenAI not available (for embeddings)
             from gdd_rag_backbone.llm_providers import QwenProvider
             provider = QwenProvider()
 
-    embedding_func = make_embedding_func(provider)
+    # Query embeddings share batched requests with concurrent queries
+    embedding_batcher = get_embedding_batcher()
 
     # Step 1: Initial search with original query
     search_start = time.time()
-    query_embedding = embedding_func([query])[0]
+    query_embedding = embedding_batcher.embed(provider, [query])[0]
 
     # Get initial chunks
     import logging
@@ -540,80 +537,133 @@ def generate_context_supabase(
     logger.info(f"[Code Q&A] Starting search for query: {query[:100]}")
     logger.info(f"[Code Q&A] File filters: {file_filters}")
 
-    initial_methods = search_code_chunks_supabase(
-        query=query,
-        query_embedding=query_embedding,
-        limit=20,
-        threshold=0.2,
-        file_paths=file_filters,
-        chunk_type='method'
-    )
-    logger.info(f"[Code Q&A] Initial methods found: {len(initial_methods)}")
-
-    initial_classes = search_code_chunks_supabase(
-        query=query,
-        query_embedding=query_embedding,
-        limit=20,
-        threshold=0.2,
-        file_paths=file_filters,
-        chunk_type='class'
-    )
-    logger.info(f"[Code Q&A] Initial classes found: {len(initial_classes)}")
-
-    # Also do direct file lookup if filters are specified
-    if file_filters:
-        direct_methods = get_code_chunks_for_files(
-            file_filters, chunk_type='method')
-        direct_classes = get_code_chunks_for_files(
-            file_filters, chunk_type='class')
-
-        # Combine and deduplicate
-        all_methods = {
-            chunk.get('id'): chunk for chunk in initial_methods + direct_methods}
-        all_classes = {
-            chunk.get('id'): chunk for chunk in initial_classes + direct_classes}
-
-        initial_methods = list(all_methods.values())
-        initial_classes = list(all_classes.values())
-
-    # Limit to top 5 for HYDE context
-    method_docs = initial_methods[:5]
-    class_docs = initial_classes[:5]
-
-    # Step 2: Build temporary context for HYDE v2
-    methods_text = "\n".join([doc.get('code', '') or doc.get(
-        'source_code', '') for doc in method_docs])
-    classes_text = "\n".join([doc.get('source_code', '')
-                             for doc in class_docs])
-    temp_context = methods_text + "\n" + classes_text
-    temp_context = temp_context[:6000]  # Truncate for faster processing
-
-    # Step 3: HYDE v2 query generation
-    hyde_query_v2, hyde_v2_timing = openai_hyde_v2(query, temp_context, query)
-    timing_info["hyde_v2_generation"] = hyde_v2_timing
-
-    # Step 4: Final search with HYDE v2 refined query
+    hyde_mode = hyde_mode or CODE_HYDE_MODE
+
+    def build_temp_context(methods, classes):
+        # Temporary context for HYDE v2 (top 5 of each)
+        methods_text = "\n".join([doc.get('code', '') or doc.get(
+            'source_code', '') for doc in methods[:5]])
+        classes_text = "\n".join([doc.get('source_code', '')
+                                  for doc in classes[:5]])
+        temp_context = methods_text + "\n" + classes_text
+        return temp_context[:6000]  # Truncate for faster processing
+
+    # One multi-type vector search; direct file lookups (independent of the
+    # query) run concurrently and are reused after HYDE v2
+    executor = ThreadPoolExecutor(max_workers=3)
+    cancel_hyde = threading.Event()
+    hyde_future = None
+    hyde_started = None
+    hyde_query_v2 = None
+    try:
+        initial_future = executor.submit(
+            search_code_chunks_multi,
+            query=query,
+            query_embedding=query_embedding,
+            limit=20,
+            threshold=0.2,
+            file_paths=file_filters,
+            chunk_types=['method', 'class']
+        )
+        direct_methods_future = direct_classes_future = None
+        if file_filters:
+            direct_methods_future = executor.submit(
+                get_code_chunks_for_files, file_filters, chunk_type='method')
+            direct_classes_future = executor.submit(
+                get_code_chunks_for_files, file_filters, chunk_type='class')
+
+        initial = initial_future.result()
+        search_methods = initial['method']
+        search_classes = initial['class']
+        logger.info(f"[Code Q&A] Initial methods found: {len(search_methods)}")
+        logger.info(f"[Code Q&A] Initial classes found: {len(search_classes)}")
+
+        # Step 2: Decide on HYDE v2 from the first-pass scores
+        top_score = max((doc.get('similarity') or 0.0
+                         for doc in search_methods + search_classes), default=0.0)
+        hyde_decision = {
+            "mode": hyde_mode,
+            "top_score": round(top_score, 3),
+            "threshold": CODE_HYDE_SKIP_SCORE,
+        }
+        run_hyde = hyde_mode == "always" or (
+            hyde_mode == "adaptive" and top_score < CODE_HYDE_SKIP_SCORE)
+        if not run_hyde:
+            hyde_decision["decision"] = "skipped" if hyde_mode == "adaptive" else "off"
+
+        if run_hyde and len(search_methods) >= 5 and len(search_classes) >= 5:
+            # The direct lookups cannot change the top 5: start HYDE v2 now,
+            # overlapping the rest of the first pass
+            hyde_started = time.time()
+            hyde_future = executor.submit(
+                openai_hyde_v2, query, build_temp_context(search_methods, search_classes),
+                query, cancel_hyde)
+
+        initial_methods = search_methods
+        initial_classes = search_classes
+        direct_classes = []
+        if file_filters:
+            direct_methods = direct_methods_future.result()
+            direct_classes = direct_classes_future.result()
+
+            # Combine and deduplicate
+            all_methods = {
+                chunk.get('id'): chunk for chunk in initial_methods + direct_methods}
+            all_classes = {
+                chunk.get('id'): chunk for chunk in initial_classes + direct_classes}
+
+            initial_methods = list(all_methods.values())
+            initial_classes = list(all_classes.values())
+
+        # Step 3: HYDE v2 query generation
+        if run_hyde and hyde_future is None:
+            hyde_started = time.time()
+            hyde_future = executor.submit(
+                openai_hyde_v2, query, build_temp_context(initial_methods, initial_classes),
+                query, cancel_hyde)
+        if hyde_future is not None:
+            try:
+                hyde_query_v2, hyde_v2_timing = hyde_future.result(
+                    timeout=CODE_HYDE_TIMEOUT if hyde_mode == "adaptive" else None)
+                timing_info["hyde_v2_generation"] = hyde_v2_timing
+            except FutureTimeoutError:
+                # Too slow to pay for itself: stop the stream, keep the first pass
+                cancel_hyde.set()
+                hyde_decision["decision"] = "cancelled"
+                hyde_decision["cancelled_after"] = round(time.time() - hyde_started, 2)
+    finally:
+        executor.shutdown(wait=False)
+
     search_start = time.time()
-    hyde_embedding = embedding_func([hyde_query_v2])[0]
-
-    final_methods = search_code_chunks_supabase(
-        query=hyde_query_v2,
-        query_embedding=hyde_embedding,
-        limit=10,
-        threshold=0.2,
-        file_paths=file_filters,
-        chunk_type='method'
-    )
+    if hyde_query_v2 and hyde_query_v2.strip():
+        # Step 4: Final search with HYDE v2 refined query
+        hyde_embedding = embedding_batcher.embed(provider, [hyde_query_v2])[0]
+
+        final = search_code_chunks_multi(
+            query=hyde_query_v2,
+            query_embedding=hyde_embedding,
+            limit=10,
+            threshold=0.2,
+            file_paths=file_filters,
+            chunk_types=['method', 'class']
+        )
+        final_methods = final['method']
+        final_classes = final['class']
+        hyde_pass_time = time.time() - hyde_started
+        _record_hyde_pass(hyde_pass_time)
+        hyde_decision["decision"] = "used"
+        hyde_decision["pass_time"] = round(hyde_pass_time, 2)
+    else:
+        # First-pass hits stand in for the final search (same per-type limit)
+        final_methods = search_methods[:10]
+        final_classes = search_classes[:10]
+        hyde_decision.setdefault("decision", "discarded")
+        if _hyde_pass_seconds is not None:
+            hyde_decision["saved_time_estimate"] = round(
+                _hyde_pass_seconds - hyde_decision.get("cancelled_after", 0.0), 2)
+    timing_info["hyde_v2_decision"] = hyde_decision
+    logger.info(f"[Code Q&A] HYDE v2: {hyde_decision}")
     logger.info(f"[Code Q&A] Final methods found: {len(final_methods)}")
-
-    final_classes = search_code_chunks_supabase(
-        query=hyde_query_v2,
-        query_embedding=hyde_embedding,
-        limit=10,
-        threshold=0.2,
-        file_paths=file_filters,
-        chunk_type='class'
-    )
     logger.info(f"[Code Q&A] Final classes found: {len(final_classes)}")
 
     # Filter by files if specified
@@ -625,9 +675,9 @@ def generate_context_supabase(
     # If prioritizing class chunks (e.g., for global variables), get ALL class chunks directly
     if prioritize_class_chunks and file_filters:
         logger.info(
-            "[Code Q&A] Prioritizing class chunks - retrieving all class chunks for file(s)")
-        direct_class_chunks = get_code_chunks_for_files(
-            file_filters, chunk_type='class')
+            "[Code Q&A] Prioritizing class chunks - using all class chunks for file(s)")
+        # Already fetched alongside the initial search
+        direct_class_chunks = direct_classes
         logger.info(
             f"[Code Q&A] Direct lookup found {len(direct_class_chunks)} class chunks")
 
@@ -792,6 +842,25 @@ def query_codebase(query: str, file_filters: list = None, selected_methods: list
                 else:
                     import logging
                     logger = logging.getLogger(__name__)
+                    # Files with a stored blob are served verbatim in one read
+                    try:
+                        from backend.storage.code_blob_store import read_code_file
+                        from backend.storage.code_path_index import get_path_index
+                        resolved_paths = get_path_index().resolve(file_filters[0])
+                        stored_bytes = read_code_file(resolved_paths[0]) if len(resolved_paths) == 1 else None
+                    except Exception as e:
+                        logger.warning(f"[Code Q&A Extract Full Code] Blob store lookup failed: {e}")
+                        stored_bytes = None
+                    if stored_bytes is not None:
+                        from backend.services.code_ingest_service import decode_source
+                        logger.info(
+                            f"[Code Q&A Extract Full Code] Serving {resolved_paths[0]} from the blob store ({len(stored_bytes)} bytes)")
+                        return {
+                            "response": f"```csharp\nFile: {resolved_paths[0]}\n\n{decode_source(stored_bytes).strip()}\n```",
+                            "status": "success",
+                            "source_file": file_filters[0],
+                        }
+
                     logger.info(
                         f"[Code Q&A Extract Full Code] Getting all chunks for file: {file_filters[0]}")
 
@@ -1011,21 +1080,31 @@ If no global variables are found in the provided class definitions, respond with
                     logger.info(
                         f"[Code Q&A Regex Override] Query type: list_methods={is_list_methods}, list_vars={is_list_vars}")
 
-                    class_chunks = get_code_chunks_for_files(
-                        file_filters, chunk_type='class')
-                    method_chunks = get_code_chunks_for_files(
-                        file_filters, chunk_type='method')
+                    # Symbol index first; chunks are only fetched and reparsed
+                    # for files indexed before the symbol index existed
+                    indexed_symbols = lookup_file_symbols(file_filters[0])
+                    if indexed_symbols is not None:
+                        class_chunks, method_chunks = [], []
+                        logger.info(
+                            f"[Code Q&A Regex Override] Using symbol index for {file_filters[0]}")
+                    else:
+                        class_chunks = get_code_chunks_for_files(
+                            file_filters, chunk_type='class')
+                        method_chunks = get_code_chunks_for_files(
+                            file_filters, chunk_type='method')
 
-                    logger.info(
-                        f"[Code Q&A Regex Override] Found {len(class_chunks)} class chunks and {len(method_chunks)} method chunks from Supabase")
+                        logger.info(
+                            f"[Code Q&A Regex Override] Found {len(class_chunks)} class chunks and {len(method_chunks)} method chunks from Supabase")
 
                     # Always try to extract methods and global variables, even if chunks are missing
                     # This allows us to show the method selection UI with whatever we can find
                     methods = []
                     fields = []
                     properties = []
+                    if indexed_symbols is not None:
+                        methods, fields, properties = indexed_symbols
 
-                    if not class_chunks and not method_chunks:
+                    if indexed_symbols is None and not class_chunks and not method_chunks:
                         # No chunks found in Supabase - try to diagnose why
                         import os
                         filename = os.path.basename(
@@ -1046,12 +1125,14 @@ If no global variables are found in the provided class definitions, respond with
                         for method_chunk in method_chunks:
                             method_name = method_chunk.get('method_name')
                             if method_name:
-                                # Try to extract line number from source_code if available
+                                # Line recorded by the symbol extractor at upload time
+                                metadata = method_chunk.get('metadata') or {}
+                                line_num = (metadata.get('original_metadata') or {}).get('line')
                                 source_code = method_chunk.get(
                                     'code', '') or method_chunk.get('source_code', '')
-                                line_num = 1  # Default if we can't determine
-                                if source_code:
-                                    # Try to find method name in source code to get approximate line
+                                if not line_num and source_code:
+                                    # Older chunks: find method name in source code to get approximate line
+                                    line_num = 1
                                     try:
                                         lines = source_code.split('\n')
                                         for idx, line in enumerate(lines, 1):
@@ -1060,6 +1141,7 @@ If no global variables are found in the provided class definitions, respond with
                                                 break
                                     except Exception:
                                         line_num = 1
+                                line_num = line_num or 1
 
                                 methods.append({
                                     "name": method_name,
@@ -1277,8 +1359,8 @@ If no global variables are found in the provided class definitions, respond with
         # Use Supabase if available
         if SUPABASE_AVAILABLE:
             try:
-                from backend.services.llm_provider import SimpleLLMProvider
-                provider = SimpleLLMProvider()
+                from backend.services.llm_provider import get_llm_provider
+                provider = get_llm_provider()
 
                 # Generate context
                 import logging
@@ -0,0 +1,444 @@
+"""
+C# symbol extraction for Code Q&A.
+
+One parse per file yields every class-like type, method, constructor, property
+and field with its byte range, line numbers and enclosing type. The code upload
+chunker, _analyze_csharp_file_symbols and the list-methods / list-variables
+intents in query_codebase all consume this instead of running their own regex
+and brace-matching passes.
+
+Uses tree-sitter (tree-sitter + tree-sitter-c-sharp) when installed. Without
+it, a linear-time fallback runs the declaration regexes once over the file and
+resolves bodies and nesting from a single brace-matching scan.
+"""
+
+import bisect
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tree_sitter_c_sharp
+    from tree_sitter import Language, Parser
+    try:
+        # tree-sitter >= 0.22
+        _CSHARP_LANGUAGE = Language(tree_sitter_c_sharp.language())
+    except TypeError:
+        # tree-sitter 0.21 needs the language name
+        _CSHARP_LANGUAGE = Language(tree_sitter_c_sharp.language(), "c_sharp")
+    TREE_SITTER_AVAILABLE = True
+except Exception:
+    _CSHARP_LANGUAGE = None
+    TREE_SITTER_AVAILABLE = False
+
+TYPE_KINDS = ('class', 'struct', 'interface', 'enum', 'record')
+
+
+@dataclass
+class CSharpSymbol:
+    """A declaration found in a C# file."""
+    kind: str  # class, struct, interface, enum, record, method, constructor, property, field
+    name: str
+    start_byte: int  # UTF-8 byte offsets into the file, end exclusive
+    end_byte: int
+    start_line: int  # 1-based
+    end_line: int
+    signature: str  # declaration up to (not including) its body
+    text: str  # full declaration source
+    parent: Optional[str] = None  # enclosing type name
+    path: str = ""  # dotted path of enclosing types + name, e.g. "Tank.Inner.Fire"
+    doc_comment: str = ""
+
+    @property
+    def is_type(self) -> bool:
+        return self.kind in TYPE_KINDS
+
+
+def extract_csharp_symbols(code_text: str) -> List[CSharpSymbol]:
+    """
+    Extract types and members from C# source in a single parse.
+
+    Args:
+        code_text: Full C# source
+
+    Returns:
+        Symbols in document order (types before their members)
+    """
+    if TREE_SITTER_AVAILABLE:
+        try:
+            return _extract_with_tree_sitter(code_text)
+        except Exception as e:
+            logger.warning(f"[C# Symbols] tree-sitter parse failed, using fallback: {e}")
+    return _extract_with_fallback(code_text)
+
+
+# ---------------------------------------------------------------------------
+# tree-sitter
+# ---------------------------------------------------------------------------
+
+_TS_TYPE_NODES = {
+    'class_declaration': 'class',
+    'struct_declaration': 'struct',
+    'interface_declaration': 'interface',
+    'enum_declaration': 'enum',
+    'record_declaration': 'record',
+    'record_struct_declaration': 'record',
+}
+_TS_MEMBER_NODES = {
+    'method_declaration': 'method',
+    'constructor_declaration': 'constructor',
+    'property_declaration': 'property',
+    'field_declaration': 'field',
+}
+# Containers that can hold type declarations (never descend into bodies of members)
+_TS_CONTAINER_NODES = {
+    'compilation_unit', 'namespace_declaration', 'file_scoped_namespace_declaration',
+    'declaration_list', 'ERROR',
+}
+_TS_BODY_NODES = {
+    'block', 'arrow_expression_clause', 'declaration_list', 'accessor_list',
+    'enum_member_declaration_list',
+}
+
+
+def _make_parser():
+    try:
+        return Parser(_CSHARP_LANGUAGE)
+    except TypeError:
+        parser = Parser()
+        parser.set_language(_CSHARP_LANGUAGE)
+        return parser
+
+
+def _extract_with_tree_sitter(code_text: str) -> List[CSharpSymbol]:
+    source = code_text.encode('utf-8')
+    tree = _make_parser().parse(source)
+    symbols: List[CSharpSymbol] = []
+
+    def text_of(start: int, end: int) -> str:
+        return source[start:end].decode('utf-8', errors='replace')
+
+    def doc_comment_for(node) -> str:
+        lines = []
+        sibling = node.prev_named_sibling
+        while sibling is not None and sibling.type == 'comment':
+            comment = text_of(sibling.start_byte, sibling.end_byte)
+            if not comment.startswith('///'):
+                break
+            lines.insert(0, comment)
+            sibling = sibling.prev_named_sibling
+        return '\n'.join(lines)
+
+    def signature_of(node) -> str:
+        end = node.end_byte
+        for child in node.children:
+            if child.type in _TS_BODY_NODES:
+                end = child.start_byte
+                break
+        return text_of(node.start_byte, end).strip().rstrip(';').strip()
+
+    def add(kind: str, name: str, node, parents: List[str]) -> CSharpSymbol:
+        symbol = CSharpSymbol(
+            kind=kind,
+            name=name,
+            start_byte=node.start_byte,
+            end_byte=node.end_byte,
+            start_line=node.start_point[0] + 1,
+            end_line=node.end_point[0] + 1,
+            signature=signature_of(node),
+            text=text_of(node.start_byte, node.end_byte),
+            parent=parents[-1] if parents else None,
+            path='.'.join(parents + [name]),
+            doc_comment=doc_comment_for(node),
+        )
+        symbols.append(symbol)
+        return symbol
+
+    def name_of(node) -> Optional[str]:
+        name_node = node.child_by_field_name('name')
+        if name_node is None:
+            name_node = next((c for c in node.named_children if c.type == 'identifier'), None)
+        return text_of(name_node.start_byte, name_node.end_byte) if name_node is not None else None
+
+    # Iterative walk: (node, enclosing type names)
+    stack: List[Tuple[object, List[str]]] = [(tree.root_node, [])]
+    while stack:
+        node, parents = stack.pop()
+        children = []
+
+        if node.type in _TS_TYPE_NODES:
+            name = name_of(node)
+            if name:
+                add(_TS_TYPE_NODES[node.type], name, node, parents)
+                parents = parents + [name]
+            children = [c for c in node.named_children if c.type == 'declaration_list']
+        elif node.type in _TS_MEMBER_NODES and parents:
+            kind = _TS_MEMBER_NODES[node.type]
+            if kind == 'field':
+                for declaration in node.named_children:
+                    if declaration.type != 'variable_declaration':
+                        continue
+                    for declarator in declaration.named_children:
+                        if declarator.type == 'variable_declarator':
+                            name = name_of(declarator)
+                            if name:
+                                add(kind, name, node, parents)
+            else:
+                name = name_of(node)
+                if name:
+                    add(kind, name, node, parents)
+        elif node.type in _TS_CONTAINER_NODES:
+            children = node.named_children
+
+        # Push in reverse so symbols come out in document order
+        for child in reversed(children):
+            stack.append((child, parents))
+
+    return symbols
+
+
+# ---------------------------------------------------------------------------
+# Regex fallback (linear time)
+# ---------------------------------------------------------------------------
+
+# A declaration starts a line or follows '{', '}' or ';' on the same line
+# ("class Inner { void Go() {} }")
+_DECLARATION_START = r'(?:^|(?<=[{};]))[ \t]*'
+
+_TYPE_PATTERN = re.compile(
+    _DECLARATION_START + r'(?:\[[^\]]+\]\s*)*'
+    r'(?:(?:public|private|protected|internal|abstract|sealed|static|partial|readonly|ref|unsafe|new)\s+)*'
+    r'(?P<kind>class|struct|interface|enum|record)\s+'
+    r'(?P<name>\w+)',
+    re.MULTILINE
+)
+
+_METHOD_PATTERN = re.compile(
+    _DECLARATION_START + r'(?:\[[^\]]+\]\s*)*'           # attributes
+    r'(?:public|private|protected|internal)?\s*'
+    r'(?:(?:static|async|override|virtual|abstract|sealed|partial|extern|unsafe|new)\s+)*'
+    r'(?:void|[\w<>\[\],]+)\s+'                          # return type
+    r'(?P<name>\w+)\s*'                                  # method name
+    r'(?:<[^>()]*>)?\s*'                                 # generic parameters
+    r'\([^)]*\)\s*'                                      # parameters
+    r'(?:where\s+\w+\s*:\s*[^{=>]+)?\s*'                 # generic constraints
+    r'(?P<body>\{|=>)',                                  # block or expression-bodied
+    re.MULTILINE
+)
+
+_CONSTRUCTOR_PATTERN = re.compile(
+    _DECLARATION_START + r'(?:\[[^\]]+\]\s*)*'
+    r'(?:(?:public|private|protected|internal|static)\s+)*'
+    r'(?P<name>\w+)\s*'
+    r'\([^)]*\)\s*'
+    r'(?::\s*(?:base|this)\s*\([^)]*\)\s*)?'
+    r'(?P<body>\{|=>)',
+    re.MULTILINE
+)
+
+_PROPERTY_PATTERN = re.compile(
+    _DECLARATION_START + r'(?:\[[^\]]*\]\s*)*'
+    r'(?:public|private|protected|internal)?\s*'
+    r'(?:(?:static|virtual|override|sealed|abstract|new)\s+)*'
+    r'[\w<>\[\],?]+\s+'                                  # type
+    r'(?P<name>\w+)\s*'
+    r'(?P<body>\{|=>)',
+    re.MULTILINE
+)
+
+_FIELD_PATTERN = re.compile(
+    _DECLARATION_START + r'(?:\[[^\]]*\]\s*)*'
+    r'(?P<type>[\w<>\[\],?.\s]+?)\s+'                   # modifiers + type
+    r'(?P<names>\w+(?:\s*=[^;]*)?)\s*;',                # declarators
+    re.MULTILINE
+)
+_DECLARATOR_PATTERN = re.compile(r'^\s*(\w+)\s*(?:=.*)?$', re.DOTALL)
+
+# Words that can look like a return type / name pair in statements
+_NON_DECLARATION_WORDS = {
+    'if', 'for', 'foreach', 'while', 'switch', 'catch', 'using', 'lock', 'fixed',
+    'return', 'else', 'new', 'throw', 'await', 'yield', 'namespace', 'class',
+    'struct', 'interface', 'enum', 'record', 'get', 'set', 'init', 'add', 'remove',
+    'case', 'goto', 'break', 'continue', 'delegate', 'event', 'operator',
+}
+
+
+def _match_braces(code_text: str) -> Dict[int, int]:
+    """Map each '{' position to its matching '}' (skips strings, chars and comments)."""
+    pairs: Dict[int, int] = {}
+    stack: List[int] = []
+    i = 0
+    n = len(code_text)
+    while i < n:
+        ch = code_text[i]
+        if ch == '/' and i + 1 < n and code_text[i + 1] == '/':
+            newline = code_text.find('\n', i)
+            i = n if newline == -1 else newline
+        elif ch == '/' and i + 1 < n and code_text[i + 1] == '*':
+            close = code_text.find('*/', i + 2)
+            i = n if close == -1 else close + 2
+            continue
+        elif ch == '@' and i + 1 < n and code_text[i + 1] == '"':
+            # Verbatim string: "" is an escaped quote
+            i += 2
+            while i < n:
+                if code_text[i] == '"':
+                    if i + 1 < n and code_text[i + 1] == '"':
+                        i += 2
+                        continue
+                    break
+                i += 1
+        elif ch in ('"', "'"):
+            i += 1
+            while i < n and code_text[i] != ch and code_text[i] != '\n':
+                if code_text[i] == '\\':
+                    i += 1
+                i += 1
+        elif ch == '{':
+            stack.append(i)
+        elif ch == '}' and stack:
+            pairs[stack.pop()] = i
+        i += 1
+    return pairs
+
+
+def _extract_with_fallback(code_text: str) -> List[CSharpSymbol]:
+    pairs = _match_braces(code_text)
+    n = len(code_text)
+
+    line_starts = [0]
+    for m in re.finditer(r"\n", code_text):
+        line_starts.append(m.end())
+    is_ascii = code_text.isascii()
+    # UTF-8 byte offset of each line start, accumulated once
+    line_byte_starts = line_starts
+    if not is_ascii:
+        line_byte_starts = [0]
+        for previous, current in zip(line_starts, line_starts[1:]):
+            line_byte_starts.append(line_byte_starts[-1] + len(code_text[previous:current].encode('utf-8')))
+
+    def line_of(pos: int) -> int:
+        return bisect.bisect_right(line_starts, pos)
+
+    def byte_of(pos: int) -> int:
+        if is_ascii:
+            return pos
+        line = line_of(pos) - 1
+        return line_byte_starts[line] + len(code_text[line_starts[line]:pos].encode('utf-8'))
+
+    def block_end(open_pos: int) -> Optional[int]:
+        close = pairs.get(open_pos)
+        return close + 1 if close is not None else None
+
+    def statement_end(pos: int) -> int:
+        end = code_text.find(';', pos)
+        return n if end == -1 else end + 1
+
+    def body_end(match) -> Optional[int]:
+        if match.group('body') == '{':
+            end = block_end(match.end('body') - 1)
+            # Properties/methods may end with "} = value;" or similar
+            return end
+        return statement_end(match.end('body'))
+
+    # (start, end, kind, name, signature_end)
+    candidates: List[Tuple[int, int, str, str, int]] = []
+
+    for match in _TYPE_PATTERN.finditer(code_text):
+        brace = code_text.find('{', match.end())
+        semicolon = code_text.find(';', match.end())
+        if brace == -1 or (semicolon != -1 and semicolon < brace):
+            # Bodiless record: "record Pt(int X);"
+            if match.group('kind') == 'record' and semicolon != -1:
+                candidates.append((match.start(), semicolon + 1, 'record', match.group('name'), semicolon))
+            continue
+        end = block_end(brace)
+        if end is not None:
+            candidates.append((match.start(), end, match.group('kind'), match.group('name'), brace))
+
+    for pattern, kind in ((_METHOD_PATTERN, 'method'), (_CONSTRUCTOR_PATTERN, 'constructor'),
+                          (_PROPERTY_PATTERN, 'property')):
+        for match in pattern.finditer(code_text):
+            name = match.group('name')
+            header = code_text[match.start():match.start('name')]
+            if name in _NON_DECLARATION_WORDS or any(
+                    word in _NON_DECLARATION_WORDS - {'new'} for word in re.findall(r'\w+', header)):
+                continue
+            end = body_end(match)
+            if end is not None:
+                candidates.append((match.start(), end, kind, name, match.start('body')))
+
+    for match in _FIELD_PATTERN.finditer(code_text):
+        names = match.group('names')
+        if '=>' in names or any(word in _NON_DECLARATION_WORDS
+                                for word in re.findall(r'\w+', match.group('type'))):
+            continue
+        for part in names.split(','):
+            declarator = _DECLARATOR_PATTERN.match(part)
+            if declarator:
+                candidates.append((match.start(), match.end(), 'field', declarator.group(1), match.end()))
+
+    # Resolve nesting with one sweep over candidates sorted by position
+    candidates.sort(key=lambda c: (c[0], -c[1]))
+    symbols: List[CSharpSymbol] = []
+    seen = set()
+    # Stack of (end, kind, name) for enclosing declarations
+    stack: List[Tuple[int, str, str]] = []
+    for start, end, kind, name, signature_end in candidates:
+        while stack and stack[-1][0] <= start:
+            stack.pop()
+        enclosing = stack[-1] if stack else None
+        is_type = kind in TYPE_KINDS
+
+        if enclosing is not None and enclosing[1] not in TYPE_KINDS:
+            # Inside a method/property body: locals, statements, local functions
+            continue
+        if not is_type and enclosing is None:
+            # Members must live inside a type
+            continue
+        if kind in ('method', 'constructor') and name == enclosing[2]:
+            # The method pattern also matches constructors ("public Tank(...)")
+            kind = 'constructor'
+        elif kind == 'constructor':
+            continue
+        key = (start, name)
+        if key in seen:
+            # The same declaration matched by more than one pattern
+            continue
+        seen.add(key)
+
+        parents = [entry[2] for entry in stack if entry[1] in TYPE_KINDS]
+        symbols.append(CSharpSymbol(
+            kind=kind,
+            name=name,
+            start_byte=byte_of(start),
+            end_byte=byte_of(end),
+            start_line=line_of(start),
+            end_line=line_of(max(start, end - 1)),
+            signature=code_text[start:signature_end].strip().rstrip(';').strip(),
+            text=code_text[start:end],
+            parent=parents[-1] if parents else None,
+            path='.'.join(parents + [name]),
+            doc_comment=_doc_comment_before(code_text, start),
+        ))
+        if kind != 'field':
+            stack.append((end, kind, name))
+
+    return symbols
+
+
+def _doc_comment_before(code_text: str, pos: int) -> str:
+    """Collect the /// lines directly above a declaration."""
+    lines = []
+    end = pos
+    while end > 0:
+        line_start = code_text.rfind('\n', 0, end - 1) + 1
+        line = code_text[line_start:end].strip()
+        if not line.startswith('///'):
+            break
+        lines.insert(0, line)
+        end = line_start
+    return '\n'.join(lines)
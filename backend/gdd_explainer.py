@@ -3,11 +3,16 @@ GDD Document Explainer backend functions for keyword-based document search and e
 """
 import json
 import logging
+import queue
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any, Generator
-from backend.services.search_service import keyword_search
-from backend.services.explainer_service import explain_keyword
-from backend.storage.keyword_storage import list_keyword_documents, find_keyword_by_alias, get_aliases_for_keyword
+from backend.shared.config import EXPLAINER_DEEP_SEARCH_TIMEOUT, EXPLAINER_SEARCH_STAGE_TIMEOUT
+from backend.services.search_service import keyword_search, keyword_search_multi
+from backend.services.explainer_service import explain_keyword, explain_keyword_stream
+from backend.storage.keyword_storage import list_keyword_documents
+from backend.storage.alias_graph import get_alias_graph
 from backend.storage.supabase_client import get_supabase_client
 
 logger = logging.getLogger(__name__)
@@ -28,17 +33,6 @@ def _create_search_response(keyword: str, choices: List[str] = None, store_data:
     }
 
 
-def _log_search_step(step_num: str, description: str, success: bool = None, count: int = None):
-    """Log search step with consistent formatting."""
-    if success is None:
-        logger.info(f"[MAIN SEARCH] STEP {step_num}: {description}")
-    elif success:
-        logger.info(
-            f"[MAIN SEARCH] ✓ STEP {step_num} succeeded with {count} results")
-    else:
-        logger.info(f"[MAIN SEARCH] ✗ STEP {step_num} found no results")
-
-
 def _extract_display_name(doc_name: str) -> str:
     """Extract clean display name from full document path."""
     display_name = doc_name
@@ -220,55 +214,31 @@ def search_for_explainer(keyword: str) -> Dict[str, Any]:
         logger.info(f"[MAIN SEARCH] Starting search for: '{keyword_stripped}'")
         logger.info("=" * 80)
 
-        # Define search strategies to try in order
-        translation_info = None
-
-        # First step: try translation search (returns tuple: results, translation_info)
-        _log_search_step("1", "Searching with translation")
-        results, translation_info = _search_with_translation(
-            keyword_stripped, progress_messages)
+        # Translation, aliases, synonyms and the database search run concurrently
+        for event in _run_search_pipeline(keyword_stripped, progress_messages):
+            if 'results' not in event:
+                continue
+            if event['results']:
+                logger.info(
+                    f"[MAIN SEARCH] ✓ Found {len(event['results'])} results; stages: {event['stage_timings']}")
+                response = _process_search_results(
+                    event['results'], keyword_stripped, progress_messages, event['translation_info'])
+                response['stage_timings'] = event['stage_timings']
+                return response
 
-        if results:
-            _log_search_step("1", "Searching with translation",
-                             success=True, count=len(results))
-            return _process_search_results(results, keyword_stripped, progress_messages, translation_info)
-
-        _log_search_step("1", "Searching with translation", success=False)
-
-        # Other search strategies
-        search_steps = [
-            ("2", "Searching aliases", lambda: _search_aliases(
-                keyword_stripped, progress_messages)),
-            ("2b", "Checking aliases for translation", lambda: _check_translated_aliases(
-                keyword_stripped, progress_messages)),
-            ("3", "Generating and searching with synonyms", lambda: _try_translation_and_synonyms(
-                keyword_stripped, progress_messages, add_progress=True)),
-            ("4", "LLM deep search (final fallback)", lambda: _try_llm_deep_search(
-                keyword_stripped, progress_messages)),
-        ]
-
-        # Execute remaining search steps
-        for step_num, description, search_func in search_steps:
-            _log_search_step(step_num, description)
-            results = search_func()
-
-            if results:
-                _log_search_step(step_num, description,
-                                 success=True, count=len(results))
-                return _process_search_results(results, keyword_stripped, progress_messages, translation_info)
-
-            _log_search_step(step_num, description, success=False)
-
-        # No results found after all attempts
-        logger.info(
-            "[MAIN SEARCH] ✗✗✗ NO RESULTS FOUND after all attempts ✗✗✗")
-        progress_messages.append("No results found after all search attempts")
-        return _create_search_response(
-            keyword_stripped,
-            status_msg="No results found even after trying translation, synonyms, and LLM search.",
-            success=True,
-            progress_messages=progress_messages
-        )
+            # No results found after all attempts
+            logger.info(
+                "[MAIN SEARCH] ✗✗✗ NO RESULTS FOUND after all attempts ✗✗✗")
+            progress_messages.append("No results found after all search attempts")
+            response = _create_search_response(
+                keyword_stripped,
+                status_msg="No results found even after trying translation, synonyms, and LLM search.",
+                success=True,
+                progress_messages=progress_messages,
+                translation_info=event['translation_info']
+            )
+            response['stage_timings'] = event['stage_timings']
+            return response
 
     except Exception as e:
         logger.error(f"Exception in search_for_explainer: {e}", exc_info=True)
@@ -279,220 +249,246 @@ def search_for_explainer(keyword: str) -> Dict[str, Any]:
         )
 
 
-def generate_explanation(keyword: str, selected_choices: List[str], stored_results: List[Dict], selected_keywords: List[str] = None, language: str = 'en') -> Dict[str, Any]:
+def _resolve_explanation_request(keyword: str, selected_choices: List[str], stored_results: List[Dict],
+                                 selected_keywords: List[str] = None, language: str = 'en') -> Dict[str, Any]:
     """
-    Generate explanation from selected items.
-    EXACT COPY from keyword_extractor - adapted to return dict instead of Gradio components.
-
-    Args:
-        keyword: Search keyword (primary keyword for display)
-        selected_choices: List of selected choice labels
-        stored_results: Stored search results data
-        selected_keywords: List of keywords to query (original + translation). If None, uses keyword only.
-        language: Language preference ('en' or 'vn') - only affects output language, not which keywords are queried
+    Validate an explanation request and map the selected choice labels to sections.
 
     Returns:
-        Dict with 'explanation', 'source_chunks', 'metadata', 'success'
+        Dict with 'selected_items', 'additional_keywords' and 'validation_time',
+        or with only 'error_result' (the response to return) when the request
+        cannot be explained
     """
-    import time
-
     if not keyword or not keyword.strip():
-        return {
+        return {'error_result': {
             'explanation': "Please enter a keyword first.",
             'source_chunks': '',
             'metadata': '',
             'success': False
-        }
+        }}
 
     if not stored_results or len(stored_results) == 0:
-        return {
+        return {'error_result': {
             'explanation': "Please search for a keyword first.",
             'source_chunks': '',
             'metadata': '',
             'success': False
-        }
+        }}
 
-    try:
-        # Time the validation step
-        validation_start_time = time.perf_counter()
+    # Time the validation step
+    validation_start_time = time.perf_counter()
 
-        # Get selected items based on checkbox selection
-        selected_items = []
+    # Get selected items based on checkbox selection
+    selected_items = []
 
-        # Handle None or empty selected_choices
-        if not selected_choices:
-            selected_choices = []
+    # Handle None or empty selected_choices
+    if not selected_choices:
+        selected_choices = []
 
-        # Build choice label to item mapping from stored_results
-        # This creates the valid choices set for validation
-        choice_to_item = {}
-        valid_choices = set()
+    # Build choice label to item mapping from stored_results
+    # This creates the valid choices set for validation
+    choice_to_item = {}
+    valid_choices = set()
 
-        docs = list_keyword_documents()
-        docs_dict = {doc.get('doc_id'): doc.get(
-            'name', 'Unknown') for doc in docs}
+    docs = list_keyword_documents()
+    docs_dict = {doc.get('doc_id'): doc.get(
+        'name', 'Unknown') for doc in docs}
 
-        for item in stored_results:
-            doc_id = item.get('doc_id')
-            section = item.get('section_heading')
+    for item in stored_results:
+        doc_id = item.get('doc_id')
+        section = item.get('section_heading')
 
-            # Get doc_name from database for display
-            doc_name = docs_dict.get(doc_id, 'Unknown')
+        # Get doc_name from database for display
+        doc_name = docs_dict.get(doc_id, 'Unknown')
 
-            # Extract filename (same logic as search_for_explainer)
-            display_name = doc_name
-            if '\\' in display_name:
-                display_name = display_name.split('\\')[-1]
-            elif '/' in display_name:
-                display_name = display_name.split('/')[-1]
+        # Extract filename (same logic as search_for_explainer)
+        display_name = doc_name
+        if '\\' in display_name:
+            display_name = display_name.split('\\')[-1]
+        elif '/' in display_name:
+            display_name = display_name.split('/')[-1]
 
-            # Remove .pdf extension for cleaner display (must match search_for_explainer)
-            if display_name.lower().endswith('.pdf'):
-                display_name = display_name[:-4]
+        # Remove .pdf extension for cleaner display (must match search_for_explainer)
+        if display_name.lower().endswith('.pdf'):
+            display_name = display_name[:-4]
 
-            section_display = section if section else "(No section)"
-            choice_label = f"{display_name} → {section_display}"
-            choice_to_item[choice_label] = {
-                'doc_id': doc_id,
-                'section_heading': section,
-                # Preserve matching keywords
-                '_matching_keywords': item.get('_matching_keywords', [])
-            }
-            valid_choices.add(choice_label)
-
-        # Filter selected_choices to only include valid ones
-        # This prevents errors when search results change between searches
-        valid_selected_choices = [
-            c for c in selected_choices if c in valid_choices]
-
-        if not valid_selected_choices:
-            return {
-                'explanation': "Please select at least one document/section to explain. (Note: Previous selections were cleared due to new search results.)",
-                'source_chunks': '',
-                'metadata': '',
-                'success': False
-            }
+        section_display = section if section else "(No section)"
+        choice_label = f"{display_name} → {section_display}"
+        choice_to_item[choice_label] = {
+            'doc_id': doc_id,
+            'section_heading': section,
+            # Preserve matching keywords
+            '_matching_keywords': item.get('_matching_keywords', [])
+        }
+        valid_choices.add(choice_label)
 
-        # Map valid selected choices to items
-        for choice in valid_selected_choices:
-            if choice in choice_to_item:
-                selected_items.append(choice_to_item[choice])
-
-        if not selected_items:
-            return {
-                'explanation': "Please select at least one document/section to explain.",
-                'source_chunks': '',
-                'metadata': '',
-                'success': False
-            }
+    # Filter selected_choices to only include valid ones
+    # This prevents errors when search results change between searches
+    valid_selected_choices = [
+        c for c in selected_choices if c in valid_choices]
+
+    if not valid_selected_choices:
+        return {'error_result': {
+            'explanation': "Please select at least one document/section to explain. (Note: Previous selections were cleared due to new search results.)",
+            'source_chunks': '',
+            'metadata': '',
+            'success': False
+        }}
+
+    # Map valid selected choices to items
+    for choice in valid_selected_choices:
+        if choice in choice_to_item:
+            selected_items.append(choice_to_item[choice])
 
-        validation_end_time = time.perf_counter()
-        validation_time = round(validation_end_time - validation_start_time, 2)
+    if not selected_items:
+        return {'error_result': {
+            'explanation': "Please select at least one document/section to explain.",
+            'source_chunks': '',
+            'metadata': '',
+            'success': False
+        }}
+
+    validation_end_time = time.perf_counter()
+    validation_time = round(validation_end_time - validation_start_time, 2)
+
+    # Determine which keywords to use for querying
+    # Priority: selected_keywords (from frontend) > original keyword
+    logger.info("=" * 100)
+    logger.info(
+        f"[GENERATE EXPLANATION] ===== KEYWORD SELECTION DEBUG =====")
+    logger.info(f"[GENERATE EXPLANATION] Primary keyword: '{keyword}'")
+    logger.info(
+        f"[GENERATE EXPLANATION] selected_keywords received from frontend: {selected_keywords}")
+    logger.info(
+        f"[GENERATE EXPLANATION] Language parameter: '{language}' (only affects output language, not keyword selection)")
 
-        # Determine which keywords to use for querying
-        # Priority: selected_keywords (from frontend) > original keyword
-        logger.info("=" * 100)
+    keywords_to_query = None
+    if selected_keywords and len(selected_keywords) > 0:
+        # Use provided keywords (always includes both original and translation if available)
+        keywords_to_query = [kw.strip()
+                             for kw in selected_keywords if kw and kw.strip()]
         logger.info(
-            f"[GENERATE EXPLANATION] ===== KEYWORD SELECTION DEBUG =====")
-        logger.info(f"[GENERATE EXPLANATION] Primary keyword: '{keyword}'")
+            f"[GENERATE EXPLANATION] ✓ Using selected_keywords from frontend: {keywords_to_query}")
         logger.info(
-            f"[GENERATE EXPLANATION] selected_keywords received from frontend: {selected_keywords}")
+            f"[GENERATE EXPLANATION] Number of keywords to query: {len(keywords_to_query)}")
+    else:
+        # Fallback: use original keyword only
+        keywords_to_query = [keyword.strip()]
+        logger.warning(
+            f"[GENERATE EXPLANATION] ⚠ No selected_keywords provided, using keyword only: {keywords_to_query}")
+    logger.info("=" * 100)
+
+    # Determine additional keywords (all except the primary keyword)
+    additional_keywords = None
+    if keywords_to_query and len(keywords_to_query) > 1:
+        # Get all keywords except the primary one
+        additional_keywords = [
+            kw for kw in keywords_to_query if kw.strip() != keyword.strip()]
+        logger.info(
+            f"[GENERATE EXPLANATION] Additional keywords to search: {additional_keywords}")
+    else:
         logger.info(
-            f"[GENERATE EXPLANATION] Language parameter: '{language}' (only affects output language, not keyword selection)")
+            f"[GENERATE EXPLANATION] Only one keyword, no additional keywords")
 
-        keywords_to_query = None
-        if selected_keywords and len(selected_keywords) > 0:
-            # Use provided keywords (always includes both original and translation if available)
-            keywords_to_query = [kw.strip()
-                                 for kw in selected_keywords if kw and kw.strip()]
-            logger.info(
-                f"[GENERATE EXPLANATION] ✓ Using selected_keywords from frontend: {keywords_to_query}")
-            logger.info(
-                f"[GENERATE EXPLANATION] Number of keywords to query: {len(keywords_to_query)}")
-        else:
-            # Fallback: use original keyword only
-            keywords_to_query = [keyword.strip()]
-            logger.warning(
-                f"[GENERATE EXPLANATION] ⚠ No selected_keywords provided, using keyword only: {keywords_to_query}")
-        logger.info("=" * 100)
-
-        # Determine additional keywords (all except the primary keyword)
-        additional_keywords = None
-        if keywords_to_query and len(keywords_to_query) > 1:
-            # Get all keywords except the primary one
-            additional_keywords = [
-                kw for kw in keywords_to_query if kw.strip() != keyword.strip()]
-            logger.info(
-                f"[GENERATE EXPLANATION] Additional keywords to search: {additional_keywords}")
-        else:
-            logger.info(
-                f"[GENERATE EXPLANATION] Only one keyword, no additional keywords")
+    return {
+        'selected_items': selected_items,
+        'additional_keywords': additional_keywords,
+        'validation_time': validation_time,
+    }
+
+
+def _format_explanation_result(result: Dict[str, Any], keyword: str, validation_time: float) -> Dict[str, Any]:
+    """Build the explainer response (markdown explanation, chunks, metadata, timings) from an explain_keyword result."""
+    if result.get('error'):
+        return {
+            'explanation': f"❌ Error: {result['error']}",
+            'source_chunks': '',
+            'metadata': '',
+            'success': False
+        }
+
+    # Build explanation output
+    explanation_text = f"## Explanation\n\n{result.get('explanation', 'No explanation generated.')}"
+
+    # Build source chunks output
+    source_chunks = result.get('source_chunks', [])
+    chunks_text = f"### Source Chunks ({len(source_chunks)} chunks used)\n\n"
+    for i, chunk in enumerate(source_chunks, 1):  # Show all chunks (no limit)
+        section = chunk.get('section_heading') or 'No section'
+        content = chunk.get('content') or ''
+        content_preview = content[:200] if content else '(Empty chunk)'
+        chunks_text += f"**Chunk {i}** (Section: {section})\n"
+        chunks_text += f"{content_preview}...\n\n"
+
+    # Build metadata output
+    metadata_text = "### Metadata\n\n"
+    metadata_text += f"- **HYDE Query:** {result.get('hyde_query', keyword)}\n"
+    metadata_text += f"- **Language Detected:** {result.get('language', 'english')}\n"
+    metadata_text += f"- **Chunks Used:** {result.get('chunks_used', 0)}\n"
+    if result.get('hyde_timing'):
+        timing = result['hyde_timing']
+        if 'total_time' in timing:
+            metadata_text += f"- **HYDE Timing:** {timing['total_time']}s\n"
+
+    # Collect timing metadata and calculate total
+    timing_metadata = result.get('timing_metadata', {})
+    if timing_metadata:
+        timing_metadata['validation_time'] = validation_time
+        total_time = (
+            validation_time +
+            timing_metadata.get('hyde_expansion_time', 0.0) +
+            sum(s.get('time', 0.0) for s in timing_metadata.get('section_timings', [])) +
+            timing_metadata.get('formatting_time', 0.0)
+        )
+        timing_metadata['total_time'] = round(total_time, 2)
+    else:
+        timing_metadata = {
+            'validation_time': validation_time,
+            'hyde_expansion_time': 0.0,
+            'section_timings': [],
+            'formatting_time': 0.0,
+            'total_time': validation_time
+        }
+
+    return {
+        'explanation': explanation_text,
+        'source_chunks': chunks_text,
+        'metadata': metadata_text,
+        'timing_metadata': timing_metadata,
+        'citations': result.get('citations', {}),
+        'success': True
+    }
+
+
+
+def generate_explanation(keyword: str, selected_choices: List[str], stored_results: List[Dict], selected_keywords: List[str] = None, language: str = 'en') -> Dict[str, Any]:
+    """
+    Generate explanation from selected items.
+    EXACT COPY from keyword_extractor - adapted to return dict instead of Gradio components.
+
+    Args:
+        keyword: Search keyword (primary keyword for display)
+        selected_choices: List of selected choice labels
+        stored_results: Stored search results data
+        selected_keywords: List of keywords to query (original + translation). If None, uses keyword only.
+        language: Language preference ('en' or 'vn') - only affects output language, not which keywords are queried
+
+    Returns:
+        Dict with 'explanation', 'source_chunks', 'metadata', 'success'
+    """
+    try:
+        request_info = _resolve_explanation_request(
+            keyword, selected_choices, stored_results, selected_keywords, language)
+        if 'error_result' in request_info:
+            return request_info['error_result']
 
         # Always use normal flow - explain_keyword will handle multiple keywords internally
         # Pass additional_keywords so it searches with all keywords
         result = explain_keyword(
-            keyword.strip(), selected_items, use_hyde=True, language=language,
-            additional_keywords=additional_keywords)
-
-        if result.get('error'):
-            return {
-                'explanation': f"❌ Error: {result['error']}",
-                'source_chunks': '',
-                'metadata': '',
-                'success': False
-            }
-
-        # Build explanation output
-        explanation_text = f"## Explanation\n\n{result.get('explanation', 'No explanation generated.')}"
-
-        # Build source chunks output
-        source_chunks = result.get('source_chunks', [])
-        chunks_text = f"### Source Chunks ({len(source_chunks)} chunks used)\n\n"
-        for i, chunk in enumerate(source_chunks, 1):  # Show all chunks (no limit)
-            section = chunk.get('section_heading') or 'No section'
-            content = chunk.get('content') or ''
-            content_preview = content[:200] if content else '(Empty chunk)'
-            chunks_text += f"**Chunk {i}** (Section: {section})\n"
-            chunks_text += f"{content_preview}...\n\n"
-
-        # Build metadata output
-        metadata_text = "### Metadata\n\n"
-        metadata_text += f"- **HYDE Query:** {result.get('hyde_query', keyword)}\n"
-        metadata_text += f"- **Language Detected:** {result.get('language', 'english')}\n"
-        metadata_text += f"- **Chunks Used:** {result.get('chunks_used', 0)}\n"
-        if result.get('hyde_timing'):
-            timing = result['hyde_timing']
-            if 'total_time' in timing:
-                metadata_text += f"- **HYDE Timing:** {timing['total_time']}s\n"
-
-        # Collect timing metadata and calculate total
-        timing_metadata = result.get('timing_metadata', {})
-        if timing_metadata:
-            timing_metadata['validation_time'] = validation_time
-            total_time = (
-                validation_time +
-                timing_metadata.get('hyde_expansion_time', 0.0) +
-                sum(s.get('time', 0.0) for s in timing_metadata.get('section_timings', [])) +
-                timing_metadata.get('formatting_time', 0.0)
-            )
-            timing_metadata['total_time'] = round(total_time, 2)
-        else:
-            timing_metadata = {
-                'validation_time': validation_time,
-                'hyde_expansion_time': 0.0,
-                'section_timings': [],
-                'formatting_time': 0.0,
-                'total_time': validation_time
-            }
+            keyword.strip(), request_info['selected_items'], use_hyde=True, language=language,
+            additional_keywords=request_info['additional_keywords'])
 
-        return {
-            'explanation': explanation_text,
-            'source_chunks': chunks_text,
-            'metadata': metadata_text,
-            'timing_metadata': timing_metadata,
-            'citations': result.get('citations', {}),
-            'success': True
-        }
+        return _format_explanation_result(result, keyword, request_info['validation_time'])
 
     except Exception as e:
         import traceback
@@ -504,6 +500,56 @@ def generate_explanation(keyword: str, selected_choices: List[str], stored_resul
         }
 
 
+def generate_explanation_stream(keyword: str, selected_choices: List[str], stored_results: List[Dict],
+                                selected_keywords: List[str] = None, language: str = 'en') -> Generator[str, None, None]:
+    """
+    Stream an explanation using Server-Sent Events (SSE).
+    Each section is sent as soon as its explanation is generated, followed by
+    the same response generate_explanation returns.
+
+    Args:
+        Same as generate_explanation
+
+    Yields:
+        SSE-formatted events: {'type': 'section', ...} per section (see
+        explain_keyword_stream), then {'type': 'summary', ...generate_explanation response}
+    """
+    def emit(event: Dict[str, Any]) -> str:
+        return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    try:
+        request_info = _resolve_explanation_request(
+            keyword, selected_choices, stored_results, selected_keywords, language)
+        if 'error_result' in request_info:
+            yield emit({'type': 'summary', **request_info['error_result']})
+            return
+
+        events = explain_keyword_stream(
+            keyword.strip(), request_info['selected_items'], use_hyde=True, language=language,
+            additional_keywords=request_info['additional_keywords'])
+        try:
+            for event in events:
+                if event['type'] == 'summary':
+                    response = _format_explanation_result(
+                        event['result'], keyword, request_info['validation_time'])
+                    yield emit({'type': 'summary', **response})
+                else:
+                    yield emit(event)
+        finally:
+            # Client disconnected (generator closed mid-stream): cancel the
+            # sections that have not started
+            events.close()
+    except Exception as e:
+        logger.error(f"[GENERATE EXPLANATION] Stream error: {e}\n{traceback.format_exc()}")
+        yield emit({
+            'type': 'summary',
+            'explanation': f"❌ Error generating explanation: {str(e)}",
+            'source_chunks': '',
+            'metadata': '',
+            'success': False
+        })
+
+
 def select_all_items(stored_results: List[Dict]) -> Dict[str, Any]:
     """
     Select all items - return all choice labels.
@@ -558,24 +604,6 @@ def select_none_items() -> Dict[str, Any]:
     return {'choices': []}
 
 
-def _check_translated_aliases(keyword: str, progress_messages: List[str] = None) -> List[Dict]:
-    """Check aliases for translated keyword. Returns results if found, empty list otherwise."""
-    try:
-        from backend.services.translation_synonym_service import translate_with_google
-        trans_result = translate_with_google(keyword)
-
-        if trans_result.get('success'):
-            translation = trans_result.get('translated_text', '')
-            if translation and translation.lower() != keyword.lower():
-                logger.info(
-                    f"[TRANSLATED ALIASES] Checking for: '{translation}'")
-                return _search_aliases(translation, progress_messages)
-    except Exception as e:
-        logger.warning(f"[TRANSLATED ALIASES] Error: {e}")
-
-    return []
-
-
 def _search_aliases(keyword: str, progress_messages: List[str] = None, emit: Optional[callable] = None) -> List[Dict]:
     """Search using alias dictionary. Returns results if found, empty list otherwise.
 
@@ -588,7 +616,9 @@ def _search_aliases(keyword: str, progress_messages: List[str] = None, emit: Opt
     if progress_messages is not None:
         progress_messages.append(msg)
 
-    alias_matches = find_keyword_by_alias(keyword.lower())
+    # Alias lookups are served from the in-memory alias graph
+    alias_graph = get_alias_graph()
+    alias_matches = alias_graph.find_keyword_by_alias(keyword)
 
     # Collect all main keywords from matches
     main_keywords = set()
@@ -600,19 +630,10 @@ def _search_aliases(keyword: str, progress_messages: List[str] = None, emit: Opt
 
     # Always check if the search term itself is a main keyword
     # (check if it exists as a keyword in the database and has aliases)
-    all_aliases_for_term = get_aliases_for_keyword(keyword)
-    if all_aliases_for_term:
+    all_aliases_for_term = alias_graph.get_aliases_for_keyword(keyword)
+    if all_aliases_for_term or alias_graph.is_keyword(keyword):
         # If the term has aliases, it means it's a main keyword itself
-        main_keywords.add(keyword.lower())
-
-    # Also check directly if the term exists as a keyword (even without aliases yet)
-    # This handles the case where someone searches for a main keyword that exists
-    client = get_supabase_client()
-    keyword_lower = keyword.strip().lower()
-    result = client.table('keyword_aliases').select(
-        'keyword').eq('keyword', keyword_lower).limit(1).execute()
-    if result.data and len(result.data) > 0:
-        main_keywords.add(keyword_lower)
+        main_keywords.add(keyword.strip().lower())
 
     if not main_keywords:
         return []
@@ -632,7 +653,7 @@ def _search_aliases(keyword: str, progress_messages: List[str] = None, emit: Opt
         main_search_terms.append(main_kw)
 
         # Get all aliases for this main keyword
-        aliases = get_aliases_for_keyword(main_kw)
+        aliases = alias_graph.get_aliases_for_keyword(main_kw)
         for alias in aliases:
             alias_lower = alias.lower()
             if alias_lower not in alias_search_terms and alias_lower != main_kw:
@@ -644,20 +665,21 @@ def _search_aliases(keyword: str, progress_messages: List[str] = None, emit: Opt
     if not all_search_terms:
         return []
 
-    # Search database for each term sequentially and combine results
+    # Search database for all terms in one round trip and combine results
     # Track which keywords matched each chunk for explanation generation
     all_results = []
     # Maps (doc_id, section) -> set of matching keywords
     result_keywords_map = {}
 
-    for search_term in all_search_terms:
-        msg = f"Searching database for {search_term}"
-        if emit:
-            emit(msg)
-        if progress_messages is not None:
-            progress_messages.append(msg)
+    msg = f"Searching database for {', '.join(all_search_terms)}"
+    if emit:
+        emit(msg)
+    if progress_messages is not None:
+        progress_messages.append(msg)
+    results_by_term = keyword_search_multi(all_search_terms, limit=100)
 
-        results = keyword_search(search_term, limit=100)
+    for search_term in all_search_terms:
+        results = results_by_term.get(search_term.strip(), [])
 
         if not results:
             continue
@@ -734,177 +756,85 @@ def _search_database(keyword: str, progress_messages: List[str] = None, emit: Op
     return []
 
 
-def _search_with_translation(keyword: str, progress_messages: List[str] = None, emit: Optional[callable] = None) -> tuple:
-    """Search for both original keyword and its translation. Returns combined, deduplicated results.
-
-    Always searches both the original term and its translation (if available) to ensure
-    comprehensive results regardless of language. Results are deduplicated by (doc_id, section_heading).
-
-    Returns:
-        tuple: (results: List[Dict], translation_info: Dict[str, str])
-        translation_info contains 'original' and 'translation' keys
-    """
-    results_map = {}  # Map (doc_id, section_heading) -> result object
-    translation = None
-    detected_lang = None
-
-    logger.info("=" * 80)
-    logger.info(f"[SEARCH] Starting search for keyword: '{keyword}'")
-
-    # Step 1: Try to detect language and translate
-    search_terms = [keyword]
+def _merge_results(results_map: Dict[tuple, Dict], results: List[Dict]) -> None:
+    """Add results to a (doc_id, section_heading) -> result map, merging matching keywords."""
+    for r in results or []:
+        doc_id = r.get('doc_id', '') or ''
+        section = r.get('section_heading')
+        key = (doc_id, section)
+
+        if key in results_map:
+            # Merge matching keywords
+            existing = results_map[key]
+            new_keywords = r.get('_matching_keywords', [])
+            if '_matching_keywords' not in existing:
+                existing['_matching_keywords'] = []
+            for kw in new_keywords:
+                if kw not in existing['_matching_keywords']:
+                    existing['_matching_keywords'].append(kw)
+        else:
+            results_map[key] = r
 
-    try:
-        from backend.services.translation_synonym_service import translate_with_google, detect_language_local
 
-        detected_lang = detect_language_local(keyword)
-        logger.info(f"[SEARCH] Detected language: {detected_lang}")
+def _search_synonyms(keyword: str, translation: Optional[str], synonym_result: Optional[Dict[str, Any]],
+                     progress_messages: List[str] = None, emit: Optional[callable] = None) -> List[Dict]:
+    """Search with generated synonyms (translation already searched). Returns results if found, empty list otherwise.
 
-        trans_result = translate_with_google(keyword)
-        if trans_result.get('success'):
-            translation = trans_result.get('translated_text', '')
-            if translation and translation.strip():
-                translation_clean = translation.strip()
-                if translation_clean.lower() != keyword.lower():
-                    search_terms.append(translation_clean)
+    All synonyms are searched at once (alias searches in parallel, one batched
+    database search); the result is that of the first synonym, in order, with
+    alias results, else database results, as if they were tried one by one.
+    """
+    if not synonym_result or not synonym_result.get('success'):
+        error_msg = (synonym_result or {}).get('error', 'Translation failed')
+        logger.warning(
+            f"[SYNONYM SEARCH] Translation/synonym service failed: {error_msg}")
+        return []
 
-        else:
-            logger.warning(
-                f"[SEARCH] Translation failed: {trans_result.get('error', 'Unknown error')}")
-    except Exception as e:
-        logger.warning(f"[SEARCH] Translation exception: {e}")
+    synonyms_original = synonym_result.get('synonyms_original', [])
+    synonyms_translated = synonym_result.get('synonyms_translated', [])
+    logger.info(
+        f"[SYNONYM SEARCH] Synonyms (original language): {synonyms_original}")
+    logger.info(
+        f"[SYNONYM SEARCH] Synonyms (translated language): {synonyms_translated}")
+
+    translation = translation or synonym_result.get('translation', '')
+    synonyms = list(dict.fromkeys(
+        s for s in synonyms_original + synonyms_translated
+        if s and s.strip() and s != keyword and s != translation))
+    if not synonyms:
+        logger.info(f"[SYNONYM SEARCH] No synonyms generated")
+        return []
 
-    # Build message
-    msg = f"Searching for '{search_terms[0]}'" + \
-        (f" and '{search_terms[1]}'" if len(search_terms) > 1 else "")
+    msg = f"Searching with synonyms: {', '.join(synonyms)}"
     if emit:
         emit(msg)
     if progress_messages is not None:
         progress_messages.append(msg)
 
-    # Step 2: Search for each term and combine results (with keyword merging)
-    for search_term in search_terms:
-        results = _search_database(search_term, progress_messages, emit)
-        if results:
-            for r in results:
-                doc_id = r.get('doc_id', '') or ''
-                section = r.get('section_heading')
-                key = (doc_id, section)
-
-                if key in results_map:
-                    # Merge matching keywords
-                    existing = results_map[key]
-                    new_keywords = r.get('_matching_keywords', [])
-                    if '_matching_keywords' not in existing:
-                        existing['_matching_keywords'] = []
-                    for kw in new_keywords:
-                        if kw not in existing['_matching_keywords']:
-                            existing['_matching_keywords'].append(kw)
-                else:
-                    results_map[key] = r
-
-    # Step 3: Check aliases
-    alias_results = _search_aliases(keyword, progress_messages, emit)
-    if alias_results:
-        for r in alias_results:
-            doc_id = r.get('doc_id', '') or ''
-            section = r.get('section_heading')
-            key = (doc_id, section)
-
-            if key in results_map:
-                existing = results_map[key]
-                new_keywords = r.get('_matching_keywords', [])
-                if '_matching_keywords' not in existing:
-                    existing['_matching_keywords'] = []
-                for kw in new_keywords:
-                    if kw not in existing['_matching_keywords']:
-                        existing['_matching_keywords'].append(kw)
-            else:
-                results_map[key] = r
-
-    all_results = list(results_map.values())
-    logger.info(
-        f"[SEARCH] Final combined result: {len(all_results)} unique combinations")
-
-    # Return results and translation info
-    translation_info = {
-        'original': keyword,
-        'translation': translation.strip() if translation and translation.strip() and translation.strip().lower() != keyword.lower() else None
-    }
-
-    return all_results, translation_info
-
+    with ThreadPoolExecutor(max_workers=min(4, len(synonyms))) as executor:
+        alias_results = list(executor.map(lambda s: _search_aliases(s, emit=emit), synonyms))
+    database_results = keyword_search_multi(synonyms, limit=100)
 
-def _try_translation_and_synonyms(keyword: str, progress_messages: List[str] = None, emit: Optional[callable] = None, add_progress: bool = False) -> List[Dict]:
-    """Try searching with synonyms (translation already done earlier). Returns results if found, empty list otherwise."""
-    try:
-        from backend.services.translation_synonym_service import auto_translate_and_find_synonyms
-
-        if add_progress and progress_messages is not None:
-            progress_messages.append(
-                "Generating synonyms, searching with synonyms now")
-
-        logger.info("=" * 80)
-        logger.info(f"[SYNONYM SEARCH] Generating synonyms for: '{keyword}'")
-
-        trans_result = auto_translate_and_find_synonyms(keyword)
-
-        if not trans_result.get('success'):
-            error_msg = trans_result.get('error', 'Translation failed')
-            logger.warning(
-                f"[SYNONYM SEARCH] Translation/synonym service failed: {error_msg}")
-            return []
-
-        translation = trans_result.get('translation', '')
-        synonyms_original = trans_result.get('synonyms_original', [])
-        synonyms_translated = trans_result.get('synonyms_translated', [])
-
-        logger.info(
-            f"[SYNONYM SEARCH] Translation: '{keyword}' -> '{translation}'")
-        logger.info(
-            f"[SYNONYM SEARCH] Synonyms (original language): {synonyms_original}")
-        logger.info(
-            f"[SYNONYM SEARCH] Synonyms (translated language): {synonyms_translated}")
-
-        # Try synonyms (translation already searched in _search_with_translation)
-        all_synonyms = synonyms_original + synonyms_translated
-        if all_synonyms:
+    for synonym, aliases_found in zip(synonyms, alias_results):
+        if aliases_found:
             logger.info(
-                f"[SYNONYM SEARCH] Total synonyms to try: {len(all_synonyms)}")
-            # Search with each synonym
-            for i, synonym in enumerate(all_synonyms, 1):
-                if not synonym or synonym == keyword or synonym == translation:
-                    logger.info(
-                        f"[SYNONYM SEARCH] Skipping synonym {i}: '{synonym}' (duplicate or empty)")
-                    continue
-
-                logger.info(
-                    f"[SYNONYM SEARCH] Trying synonym {i}/{len(all_synonyms)}: '{synonym}'")
-
-                results = _search_aliases(synonym, progress_messages, emit)
-                if results:
-                    logger.info(
-                        f"[SYNONYM SEARCH] ✓ Found results with synonym '{synonym}' in aliases!")
-                    return results
-
-                results = _search_database(synonym, progress_messages, emit)
-                if results:
-                    logger.info(
-                        f"[SYNONYM SEARCH] ✓ Found results with synonym '{synonym}' in database!")
-                    return results
-
-                logger.info(
-                    f"[SYNONYM SEARCH] ✗ No results with synonym '{synonym}'")
-        else:
-            logger.info(f"[SYNONYM SEARCH] No synonyms generated")
-
-        logger.info(f"[SYNONYM SEARCH] No results found with any synonyms")
-        return []
-
-    except Exception as e:
-        logger.error(
-            f"[SYNONYM SEARCH] Error in synonym step: {e}", exc_info=True)
-        return []
+                f"[SYNONYM SEARCH] ✓ Found results with synonym '{synonym}' in aliases!")
+            return aliases_found
+        results = database_results.get(synonym.strip(), [])
+        if results:
+            logger.info(
+                f"[SYNONYM SEARCH] ✓ Found results with synonym '{synonym}' in database!")
+            for r in results:
+                r['_matching_keywords'] = [synonym]
+            msg = f"Found for {synonym}"
+            if emit:
+                emit(msg)
+            if progress_messages is not None:
+                progress_messages.append(msg)
+            return results
+
+    logger.info(f"[SYNONYM SEARCH] No results found with any synonyms")
+    return []
 
 
 def _try_llm_deep_search(keyword: str, progress_messages: List[str] = None, emit: Optional[callable] = None) -> List[Dict]:
@@ -948,20 +878,173 @@ def _try_llm_deep_search(keyword: str, progress_messages: List[str] = None, emit
         return []
 
 
+class _Stage:
+    """One concurrently running step of the explainer search pipeline."""
+
+    def __init__(self, name: str, timeout: float):
+        self.name = name
+        self.future = None
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.deadline = self.started + timeout
+
+
+def _run_search_pipeline(keyword: str, progress_messages: List[str] = None) -> Generator[Dict[str, Any], None, None]:
+    """
+    Search for a keyword with every independent step running concurrently.
+
+    The database search, translation, alias search and synonym generation
+    start at once; the translated term is searched as soon as the
+    translation arrives. Results are then taken in the original priority
+    order: original + translation + aliases, aliases of the translation,
+    synonyms, and finally the LLM deep search (started only when everything
+    else found nothing). Each stage has a deadline; a stage that misses it
+    counts as finding nothing.
+
+    Yields:
+        {'message': ...} progress messages and {'stage', 'status', 'time',
+        'count'} stage events as they happen, then one final
+        {'results', 'translation_info', 'stage_timings'}
+    """
+    from backend.services.translation_synonym_service import translate_with_google, auto_translate_and_find_synonyms
+
+    events: queue.Queue = queue.Queue()
+
+    def emit(msg: str):
+        events.put({'message': msg})
+        if progress_messages is not None:
+            progress_messages.append(msg)
+
+    stages: Dict[str, _Stage] = {}
+    outcomes: Dict[str, Any] = {}
+    stage_timings: Dict[str, Dict[str, Any]] = {}
+    executor = ThreadPoolExecutor(max_workers=6)
+
+    def start(name: str, func, timeout: float = EXPLAINER_SEARCH_STAGE_TIMEOUT):
+        stage = stages[name] = _Stage(name, timeout)
+
+        def on_done(_):
+            stage.finished = time.perf_counter()
+            # Wake the collector
+            events.put({'_stage_done': name})
+        stage.future = executor.submit(func)
+        stage.future.add_done_callback(on_done)
+
+    def finish(stage: _Stage, status: str, value: Any = None) -> Dict[str, Any]:
+        outcomes[stage.name] = value
+        count = len(value) if isinstance(value, list) else None
+        elapsed = (stage.finished or time.perf_counter()) - stage.started
+        stage_timings[stage.name] = {'status': status, 'time': round(elapsed, 2), 'count': count}
+        logger.info(f"[SEARCH PIPELINE] {stage.name}: {status} in {stage_timings[stage.name]['time']}s"
+                    + (f" ({count} results)" if count is not None else ""))
+        return {'stage': stage.name, **stage_timings[stage.name]}
+
+    def collect(*names: str):
+        """Yield events until the named stages have finished or passed their deadline."""
+        pending = [stages[name] for name in names if name in stages and name not in outcomes]
+        while pending:
+            for stage in list(pending):
+                if stage.future.done():
+                    try:
+                        event = finish(stage, 'ok', stage.future.result())
+                    except Exception as e:
+                        logger.warning(f"[SEARCH PIPELINE] {stage.name} failed: {e}")
+                        event = finish(stage, 'error')
+                elif time.perf_counter() >= stage.deadline:
+                    event = finish(stage, 'timeout')
+                else:
+                    continue
+                pending.remove(stage)
+                yield event
+            if not pending:
+                break
+            timeout = max(0.0, min(stage.deadline for stage in pending) - time.perf_counter())
+            try:
+                event = events.get(timeout=timeout)
+                if 'message' in event:
+                    yield event
+            except queue.Empty:
+                pass
+        # Progress messages emitted just before the stages finished
+        while not events.empty():
+            event = events.get_nowait()
+            if 'message' in event:
+                yield event
+
+    try:
+        start('database', lambda: _search_database(keyword, emit=emit))
+        start('aliases', lambda: _search_aliases(keyword, emit=emit))
+        start('translation', lambda: translate_with_google(keyword))
+        start('synonyms', lambda: auto_translate_and_find_synonyms(keyword))
+
+        yield from collect('translation')
+        trans_result = outcomes.get('translation') or {}
+        translation = None
+        if trans_result.get('success'):
+            translated_text = (trans_result.get('translated_text') or '').strip()
+            if translated_text and translated_text.lower() != keyword.lower():
+                translation = translated_text
+        elif 'error' in trans_result:
+            logger.warning(f"[SEARCH] Translation failed: {trans_result.get('error', 'Unknown error')}")
+        translation_info = {'original': keyword, 'translation': translation}
+
+        emit(f"Searching for '{keyword}'" + (f" and '{translation}'" if translation else ""))
+        if translation:
+            start('translated_database', lambda: _search_database(translation, emit=emit))
+            start('translated_aliases', lambda: _search_aliases(translation, emit=emit))
+
+        # Original keyword and its translation, plus aliases of the keyword
+        yield from collect('database', 'translated_database', 'aliases')
+        results_map: Dict[tuple, Dict] = {}
+        for name in ('database', 'translated_database', 'aliases'):
+            _merge_results(results_map, outcomes.get(name))
+        results = list(results_map.values())
+
+        if not results:
+            # Aliases of the translation
+            yield from collect('translated_aliases')
+            results = outcomes.get('translated_aliases') or []
+
+        if not results:
+            emit("Generating synonyms, searching with synonyms now")
+            yield from collect('synonyms')
+            synonym_result = outcomes.get('synonyms')
+            start('synonym_search', lambda: _search_synonyms(keyword, translation, synonym_result, emit=emit))
+            yield from collect('synonym_search')
+            results = outcomes.get('synonym_search') or []
+
+        if not results:
+            # Final fallback: LLM deep search
+            start('deep_search', lambda: _try_llm_deep_search(keyword, emit=emit),
+                  timeout=EXPLAINER_DEEP_SEARCH_TIMEOUT)
+            yield from collect('deep_search')
+            results = outcomes.get('deep_search') or []
+
+        yield {'results': results, 'translation_info': translation_info, 'stage_timings': stage_timings}
+    finally:
+        # Stages still running (past their deadline, or results no longer
+        # needed) finish in the background; queued ones never start
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def search_for_explainer_stream(keyword: str) -> Generator[str, None, None]:
     """
     Stream search progress using Server-Sent Events (SSE).
-    Yields messages one at a time as the search progresses.
+    Yields progress messages and stage results as the concurrent search
+    stages complete.
 
     Args:
         keyword: Search keyword
 
     Yields:
-        SSE-formatted messages
+        SSE-formatted messages: {'message': ...} progress, {'message', 'stage',
+        'status', 'time', 'count'} per finished stage, and a final
+        {'message': '__DONE__', 'result': <search_for_explainer response>,
+        'stage_timings': ...}
     """
-    def emit(msg: str):
+    def emit(msg: str, **fields):
         """Emit a message in SSE format."""
-        yield f"data: {json.dumps({'message': msg})}\n\n"
+        yield f"data: {json.dumps({'message': msg, **fields}, ensure_ascii=False)}\n\n"
 
     keyword_stripped = keyword.strip() if keyword else ""
 
@@ -971,78 +1054,31 @@ def search_for_explainer_stream(keyword: str) -> Generator[str, None, None]:
         return
 
     try:
-        # Use a list to collect messages for emit callback
-        message_list = []
-
-        def emit_callback(msg: str):
-            """Callback that collects messages for immediate yielding."""
-            message_list.append(msg)
-
-        # Step 1: Search database for original keyword AND its translation immediately
-        translation_result = _search_with_translation(
-            keyword_stripped, emit=emit_callback)
-        while message_list:
-            yield from emit(message_list.pop(0))
-
-        # Handle tuple return from _search_with_translation
-        if isinstance(translation_result, tuple) and len(translation_result) == 2:
-            results, _ = translation_result
-        else:
-            results = translation_result if translation_result else []
-
-        if results:
-            yield from emit("__DONE__")
-            return
-
-        # Step 2: Search aliases for both original and translated keywords
-        results = _search_aliases(keyword_stripped, emit=emit_callback)
-        while message_list:
-            yield from emit(message_list.pop(0))
-
-        if results:
-            yield from emit("__DONE__")
-            return
-
-        # Also check aliases for translated keyword
-        try:
-            from backend.services.translation_synonym_service import translate_with_google, detect_language_local
-            trans_result = translate_with_google(keyword_stripped)
-            if trans_result.get('success'):
-                translation = trans_result.get('translated_text', '')
-                if translation and translation.lower() != keyword_stripped.lower():
-                    results = _search_aliases(translation, emit=emit_callback)
-                    while message_list:
-                        yield from emit(message_list.pop(0))
-                    if results:
-                        yield from emit("__DONE__")
-                        return
-        except Exception:
-            pass
-
-        # Step 3: Try automatic translation and synonyms
-        yield from emit("Generating synonyms, searching with synonyms now")
-
-        results = _try_translation_and_synonyms(
-            keyword_stripped, emit=emit_callback)
-        while message_list:
-            yield from emit(message_list.pop(0))
-
-        if results:
-            yield from emit("__DONE__")
-            return
-
-        # Step 4: Try LLM deep search as final fallback
-        results = _try_llm_deep_search(keyword_stripped, emit=emit_callback)
-        while message_list:
-            yield from emit(message_list.pop(0))
-
-        if results:
-            yield from emit("__DONE__")
-            return
-
-        # Step 5: No results found
-        yield from emit("No results found after all search attempts")
-        yield from emit("__DONE__")
+        pipeline_start = time.perf_counter()
+        progress_messages = []
+        for event in _run_search_pipeline(keyword_stripped, progress_messages):
+            if 'message' in event:
+                yield from emit(event['message'])
+            elif 'stage' in event:
+                status = {'ok': f"{event['count']} results" if event['count'] is not None else 'done',
+                          'timeout': 'timed out', 'error': 'failed'}[event['status']]
+                yield from emit(f"{event['stage']}: {status} ({event['time']}s)", **event)
+            else:
+                stage_timings = dict(event['stage_timings'],
+                                     total={'time': round(time.perf_counter() - pipeline_start, 2)})
+                if event['results']:
+                    result = _process_search_results(
+                        event['results'], keyword_stripped, progress_messages, event['translation_info'])
+                else:
+                    yield from emit("No results found after all search attempts")
+                    result = _create_search_response(
+                        keyword_stripped,
+                        status_msg="No results found even after trying translation, synonyms, and LLM search.",
+                        success=True,
+                        progress_messages=progress_messages,
+                        translation_info=event['translation_info']
+                    )
+                yield from emit("__DONE__", result=result, stage_timings=stage_timings)
 
     except Exception as e:
         logger.error(
@@ -9,18 +9,14 @@ import time
 import re
 from typing import Dict, Tuple, Optional
 
-# Try to import OpenAI client for HYDE
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from gdd_rag_backbone.llm_providers.client_registry import OPENAI_AVAILABLE, get_openai_client
+from gdd_rag_backbone.rag_backend.single_flight import coalesce, normalize_text_key
 
 # Get API key and base URL
 api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("QWEN_API_KEY") or os.environ.get("DASHSCOPE_API_KEY")
 if api_key:
     base_url = None
-    client = OpenAI(api_key=api_key, base_url=base_url) if OPENAI_AVAILABLE else None
+    client = get_openai_client(api_key, base_url) if OPENAI_AVAILABLE else None
 else:
     client = None
 
@@ -72,6 +68,7 @@ Output format:
 - Do not include explanations, comments, or code blocks.'''
 
 
+@coalesce('gdd_hyde_v1', lambda query: normalize_text_key(query))
 def gdd_hyde_v1(query: str) -> Tuple[str, Dict]:
     """
     Generate HYDE v1 refined query for GDD (simple expansion).
@@ -129,6 +126,7 @@ def gdd_hyde_v1(query: str) -> Tuple[str, Dict]:
         return query, {"total_time": 0, "error": str(e)}
 
 
+@coalesce('gdd_hyde_v2', lambda query, temp_context: (normalize_text_key(query), temp_context))
 def gdd_hyde_v2(query: str, temp_context: str) -> Tuple[str, Dict]:
     """
     Generate HYDE v2 refined query for GDD (context-aware expansion).
@@ -230,6 +228,8 @@ def detect_language(text: str) -> str:
     return "en"
 
 
+@coalesce('translate_to_vietnamese', lambda text, preserve_technical_terms=True: (
+    normalize_text_key(text), preserve_technical_terms))
 def translate_to_vietnamese(text: str, preserve_technical_terms: bool = True) -> Tuple[str, Dict]:
     """
     Translate English text to Vietnamese using LLM.
@@ -16,6 +16,8 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from backend.shared.config import ANSWER_CACHE_ENABLED
+
 # Try to import Supabase storage (optional)
 try:
     from backend.storage.gdd_supabase_storage import (
@@ -24,6 +26,7 @@ try:
         index_gdd_chunks_to_supabase,
         USE_SUPABASE
     )
+    from gdd_rag_backbone.rag_backend.chunk_qa import _embed_texts
     SUPABASE_AVAILABLE = USE_SUPABASE
 except ImportError:
     SUPABASE_AVAILABLE = False
@@ -145,6 +148,7 @@ def extract_full_document(doc_id: str) -> str:
 
     try:
         from backend.storage.supabase_client import get_gdd_document_markdown, get_gdd_document_pdf_url, get_supabase_client
+        from backend.storage.projections import KEYWORD_CHUNK_CONTENT
         import logging
         logger = logging.getLogger(__name__)
 
@@ -187,7 +191,7 @@ def extract_full_document(doc_id: str) -> str:
                 return f"Error: Document '{doc_id}' not found in Supabase."
 
             # Get all chunks for this document, ordered by chunk_index
-            result = client.table('keyword_chunks').select('content, chunk_id, section_heading, chunk_index').eq(
+            result = KEYWORD_CHUNK_CONTENT.query(client).eq(
                 'doc_id', doc_id).order('chunk_index').execute()
 
             if not result.data:
@@ -281,6 +285,44 @@ def _detect_question_language(text: str) -> str:
     return 'english'
 
 
+# Bump when the answer prompt changes, so cached answers are not reused
+ANSWER_PROMPT_VERSION = 'answer/v1'
+
+
+def _answer_cache_scope(doc_ids, language, query, provider):
+    """
+    Answer cache scope of a question: (scope key, index versions of its documents).
+
+    The scope language is the UI override or else the question's language,
+    so an English and a Vietnamese paraphrase never share an answer.
+    Returns None when the document versions cannot be read (nothing is cached then).
+    """
+    import logging
+    from backend.storage.answer_cache import AnswerCache
+    from backend.storage.keyword_fts_index import doc_version_name
+    from backend.storage.supabase_client import get_data_versions
+
+    scope_language = None
+    if language is not None and str(language).strip():
+        lang_lower = str(language).strip().lower()
+        if lang_lower in ("vn", "vi", "vietnamese"):
+            scope_language = "vi"
+        elif lang_lower in ("en", "english"):
+            scope_language = "en"
+    if scope_language is None:
+        scope_language = "vi" if _detect_question_language(query) == "vietnamese" else "en"
+
+    key = AnswerCache.scope_key(doc_ids, scope_language, ANSWER_PROMPT_VERSION,
+                                getattr(provider, 'embedding_model', None))
+    names = [doc_version_name(doc_id) for doc_id in key[0]]
+    try:
+        versions = get_data_versions(names)
+    except Exception as e:
+        logging.getLogger(__name__).debug(f"[GDD Query] Answer cache disabled, no document versions: {e}")
+        return None
+    return key, tuple(versions[name] for name in names)
+
+
 def _select_chunks_for_answer(chunks):
     """
     Heuristic to decide how many top chunks to feed into the answer prompt.
@@ -461,15 +503,14 @@ def get_document_sections(doc_id: str) -> List[Dict[str, str]]:
 
     try:
         from backend.storage.supabase_client import get_supabase_client
+        from backend.storage.projections import KEYWORD_CHUNK_LISTING
         client = get_supabase_client()
 
         logger.info(
             f"[get_document_sections] Querying chunks for doc_id: {doc_id}")
 
         # Get all unique sections for this document from keyword_chunks
-        result = client.table('keyword_chunks').select(
-            'section_heading, chunk_index'
-        ).eq('doc_id', doc_id).execute()
+        result = KEYWORD_CHUNK_LISTING.query(client).eq('doc_id', doc_id).execute()
 
         raw_chunks = result.data or []
         logger.info(
@@ -501,9 +542,7 @@ def get_document_sections(doc_id: str) -> List[Dict[str, str]]:
                 logger.info(
                     f"[get_document_sections] Found case-insensitive match: {actual_doc_id}")
                 # Retry with actual doc_id
-                result = client.table('keyword_chunks').select(
-                    'section_heading, chunk_index'
-                ).eq('doc_id', actual_doc_id).execute()
+                result = KEYWORD_CHUNK_LISTING.query(client).eq('doc_id', actual_doc_id).execute()
                 raw_chunks = result.data or []
                 logger.info(
                     f"[get_document_sections] Found {len(raw_chunks)} chunks with corrected doc_id")
@@ -532,9 +571,7 @@ def get_document_sections(doc_id: str) -> List[Dict[str, str]]:
                     actual_doc_id = similar_doc_ids[0]
                     logger.info(
                         f"[get_document_sections] Using similar doc_id: {actual_doc_id}")
-                    result = client.table('keyword_chunks').select(
-                        'section_heading, chunk_index'
-                    ).eq('doc_id', actual_doc_id).execute()
+                    result = KEYWORD_CHUNK_LISTING.query(client).eq('doc_id', actual_doc_id).execute()
                     raw_chunks = result.data or []
                     logger.info(
                         f"[get_document_sections] Found {len(raw_chunks)} chunks with similar doc_id")
@@ -589,7 +626,7 @@ def get_document_sections(doc_id: str) -> List[Dict[str, str]]:
         return []
 
 
-def query_gdd_documents(query: str, selected_doc: str = None, language: str = None):
+def query_gdd_documents(query: str, selected_doc: str = None, language: str = None, use_cache: bool = True):
     """
     Query GDD documents using RAG.
 
@@ -598,6 +635,8 @@ def query_gdd_documents(query: str, selected_doc: str = None, language: str = No
         selected_doc: Optional document selection (format: "filename (doc_id)" or "All Documents")
         language: Optional response language override: 'en' (English) or 'vn'/'vi' (Vietnamese).
                   When set, overrides auto-detection for answer language.
+        use_cache: Serve (and store) answers from the semantic answer cache; a cached
+                   answer of a similar question is returned with 'cached': True
 
     Returns:
         dict: Response with answer and metadata
@@ -881,8 +920,8 @@ def query_gdd_documents(query: str, selected_doc: str = None, language: str = No
 
         # Create provider and query
         try:
-            from backend.services.llm_provider import SimpleLLMProvider
-            provider = SimpleLLMProvider()
+            from backend.services.llm_provider import get_llm_provider
+            provider = get_llm_provider()
         except Exception as e:
             return {
                 'response': f'Error: Could not initialize LLM provider. Please check your API key in .env file.\n\nError: {str(e)}',
@@ -923,6 +962,30 @@ def query_gdd_documents(query: str, selected_doc: str = None, language: str = No
                 f"[GDD SERVICE] Final doc_ids_to_query: {doc_ids_to_query}")
             logger.info("="*80)
 
+            # Semantic answer cache: paraphrases of a recent question over the same documents
+            cache_scope = None
+            question_embedding = None
+            if use_cache and ANSWER_CACHE_ENABLED:
+                try:
+                    from backend.storage.answer_cache import get_answer_cache
+                    cache_scope = _answer_cache_scope(doc_ids_to_query, language, query, provider)
+                    if cache_scope:
+                        question_embedding = _embed_texts(provider, [query], use_cache=True)[0]
+                        hit = get_answer_cache().lookup(question_embedding, *cache_scope)
+                        if hit:
+                            cached, similarity = hit
+                            logger.info(f"[GDD Query] Answer cache hit (similarity {similarity:.3f})")
+                            return {
+                                'response': cached['response'],
+                                'citations': cached['citations'],
+                                'status': 'success',
+                                'cached': True,
+                                'cache_similarity': round(similarity, 4),
+                            }
+                except Exception as e:
+                    logger.warning(f"[GDD Query] Answer cache lookup failed: {e}")
+                    cache_scope = None
+
             # Enhanced retrieval with HYDE and section targeting
             markdown_chunks, retrieval_metrics = get_gdd_top_chunks_supabase(
                 doc_ids=doc_ids_to_query,
@@ -1014,6 +1077,18 @@ Chunks:
 
 Provide a clear, comprehensive answer based on the chunks above. If chunks reference specific sections (e.g., "4.1 DanhsáchTanks"), mention those section numbers in your answer."""
                 answer = provider.llm(prompt)
+                citations = [
+                    {
+                        'doc_id': chunk.get('doc_id'),
+                        'chunk_id': chunk.get('chunk_id'),
+                        'section': chunk.get('numbered_header') or chunk.get('section_path'),
+                    }
+                    for chunk in selected_chunks
+                ]
+                if cache_scope and question_embedding is not None:
+                    from backend.storage.answer_cache import get_answer_cache
+                    get_answer_cache().put(question_embedding, *cache_scope,
+                                           {'response': answer, 'citations': citations})
             else:
                 # Use explicit language override from UI if provided; empty string = no override
                 detected_language = None
@@ -1038,9 +1113,11 @@ Provide a clear, comprehensive answer based on the chunks above. If chunks refer
                     answer = "Không tìm thấy đoạn tài liệu liên quan trong các tài liệu markdown."
                 else:
                     answer = "No relevant chunks found in markdown documents."
+                citations = []
 
             return {
                 'response': answer,
+                'citations': citations,
                 'status': 'success'
             }
         except Exception as e:
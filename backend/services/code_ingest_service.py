@@ -0,0 +1,321 @@
+"""
+Code ingestion service for Code Q&A.
+Builds code chunks from C# symbols, and bulk-ingests a whole codebase (zip
+archive or directory): files are parsed in a process pool, files whose hash
+matches code_files are skipped, and the chunks of every changed file feed one
+shared batched embedding/upsert pipeline. The original bytes of each changed
+file go to the content-addressed code blob store.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from backend.csharp_symbols import CSharpSymbol, extract_csharp_symbols
+from backend.storage.code_blob_store import get_blob_store
+from backend.storage.code_symbol_index import get_symbol_index, symbol_to_row
+
+logger = logging.getLogger(__name__)
+
+CODE_EXTENSIONS = ('.cs',)
+# Unity / .NET build and cache folders that hold generated or third-party code
+EXCLUDED_DIRS = {'.git', '.vs', 'Library', 'Temp', 'Logs', 'obj', 'bin'}
+
+
+def decode_source(file_bytes: bytes) -> str:
+    """Decode a source file as UTF-8, dropping undecodable bytes."""
+    try:
+        return file_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        return file_bytes.decode('utf-8', errors='ignore')
+
+
+def file_content_hash(file_bytes: bytes) -> str:
+    """Hash of a whole file, recorded in code_files.content_hash."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+def build_code_chunks(file_path: str, code_text: str, symbols: Optional[List[CSharpSymbol]] = None) -> List[Dict[str, Any]]:
+    """
+    Build method and type chunks for a C# file from a single symbol parse.
+
+    Args:
+        file_path: Path the file is indexed under
+        code_text: File source
+        symbols: Symbols of code_text if already extracted
+
+    Returns:
+        Chunk dicts for index_code_chunks_to_supabase, in document order
+    """
+    if symbols is None:
+        symbols = extract_csharp_symbols(code_text)
+    chunks = []
+    for symbol in symbols:
+        if symbol.kind in ('method', 'constructor'):
+            chunks.append({
+                'chunk_type': 'method',
+                'name': symbol.name,
+                'class_name': symbol.parent,
+                'code': symbol.text,
+                'source_code': symbol.text,
+                'signature': symbol.signature,
+                'doc_comment': symbol.doc_comment,
+                'metadata': {'line': symbol.start_line, 'path': symbol.path}
+            })
+        elif symbol.is_type:
+            chunks.append({
+                'chunk_type': symbol.kind,
+                'class_name': symbol.name,
+                'source_code': f"File: {file_path}\n\n{symbol.text}",
+                'code': None,
+                'method_declarations': '',
+                'doc_comment': symbol.doc_comment,
+                'metadata': {'kind': symbol.kind, 'line': symbol.start_line, 'path': symbol.path}
+            })
+    return chunks
+
+
+def symbol_index_entry(file_path: str, content_hash: Optional[str],
+                       symbol_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Entry for CodeSymbolIndex.record_files."""
+    return {
+        'file_path': file_path,
+        'file_name': file_path.replace('\\', '/').split('/')[-1],
+        'content_hash': content_hash,
+        'symbols': symbol_rows,
+    }
+
+
+def _parse_file(item: Tuple[str, bytes]) -> Tuple[str, Optional[List[Dict[str, Any]]], Optional[List[Dict[str, Any]]], Optional[str]]:
+    """Process-pool worker: (file_path, bytes) -> (file_path, chunks, symbol rows, error)."""
+    file_path, file_bytes = item
+    try:
+        code_text = decode_source(file_bytes)
+        symbols = extract_csharp_symbols(code_text)
+        return (file_path, build_code_chunks(file_path, code_text, symbols),
+                [symbol_to_row(symbol) for symbol in symbols], None)
+    except Exception as e:
+        return file_path, None, None, str(e)
+
+
+def _parse_files(items: Iterable[Tuple[str, bytes]], max_workers: int) -> Iterator[tuple]:
+    """
+    Parse files in a process pool, yielding results in input order.
+    Only a few files per worker are in flight, so file bytes are not all
+    held in memory at once.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield _parse_file(item)
+        return
+
+    in_flight = max_workers * 4
+    # Spawn rather than fork: this runs on a background job thread of a
+    # threaded server, and a forked child could inherit locks held by
+    # other threads
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        pending = []
+        for item in items:
+            pending.append(executor.submit(_parse_file, item))
+            if len(pending) >= in_flight:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def iter_source_files(
+    source: Union[str, Path, bytes],
+    path_prefix: str = "",
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (file_path, bytes) for every code file in a zip archive or directory.
+
+    Args:
+        source: Directory path, zip file path, or zip archive bytes
+        path_prefix: Prepended to each relative path (e.g. "Assets/Scripts/")
+
+    Yields:
+        (file_path with forward slashes, file bytes), sorted by path
+    """
+    def is_code_file(relative_path: str) -> bool:
+        parts = relative_path.split('/')
+        return (relative_path.lower().endswith(CODE_EXTENSIONS)
+                and not any(part in EXCLUDED_DIRS for part in parts[:-1]))
+
+    if isinstance(source, (bytes, bytearray)) or zipfile.is_zipfile(str(source)):
+        archive = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else str(source)
+        with zipfile.ZipFile(archive) as zf:
+            names = sorted(
+                info.filename for info in zf.infolist()
+                if not info.is_dir() and is_code_file(info.filename.replace('\\', '/'))
+            )
+            for name in names:
+                yield path_prefix + name.replace('\\', '/'), zf.read(name)
+        return
+
+    root = Path(source)
+    if not root.is_dir():
+        raise ValueError(f"Not a directory or zip archive: {source}")
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+        for filename in sorted(filenames):
+            relative_path = (Path(dirpath) / filename).relative_to(root).as_posix()
+            if is_code_file(relative_path):
+                yield path_prefix + relative_path, (Path(dirpath) / filename).read_bytes()
+
+
+@dataclass
+class FileStatus:
+    """Outcome for one file of a bulk ingest."""
+    file_path: str
+    status: str  # indexed | unchanged | error
+    chunks: int = 0
+    written: int = 0
+    removed: int = 0
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'file_path': self.file_path,
+            'status': self.status,
+            'chunks': self.chunks,
+            'written': self.written,
+            'removed': self.removed,
+            'message': self.message,
+        }
+
+
+@dataclass
+class BulkIngestReport:
+    """Per-file statuses and throughput of a bulk ingest."""
+    files: List[FileStatus] = field(default_factory=list)
+    elapsed: float = 0.0
+    pipeline: Dict[str, Any] = field(default_factory=dict)
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for file_status in self.files:
+            counts[file_status.status] = counts.get(file_status.status, 0) + 1
+        return counts
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.files) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{n} {status}" for status, n in sorted(self.counts().items()))
+        return (f"{len(self.files)} files in {self.elapsed:.1f}s "
+                f"({self.files_per_second:.1f} files/s): {counts or 'nothing to do'}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'summary': self.summary(),
+            'counts': self.counts(),
+            'elapsed': round(self.elapsed, 2),
+            'files_per_second': round(self.files_per_second, 1),
+            'pipeline': self.pipeline,
+            'files': [file_status.to_dict() for file_status in self.files],
+        }
+
+
+def ingest_codebase(
+    source: Union[str, Path, bytes],
+    provider=None,
+    path_prefix: str = "",
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    progress_cb: Optional[Callable[[str], None]] = None,
+) -> BulkIngestReport:
+    """
+    Index every code file of a zip archive or directory.
+
+    Args:
+        source: Directory path, zip file path, or zip archive bytes
+        provider: LLM provider for embeddings (defaults to SimpleLLMProvider)
+        path_prefix: Prepended to each relative path to form its file_path
+        max_workers: Parser processes (default: min(4, CPU count))
+        force: Re-parse files even when their hash matches code_files
+        progress_cb: Optional callable(step_text) for job progress
+
+    Returns:
+        BulkIngestReport with one FileStatus per code file found
+    """
+    from backend.storage.code_supabase_storage import index_code_files_to_supabase
+    from backend.storage.supabase_client import get_code_file_hashes
+
+    if provider is None:
+        from backend.services.llm_provider import get_llm_provider
+        provider = get_llm_provider()
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+
+    started = time.perf_counter()
+    known_hashes = {} if force else get_code_file_hashes()
+    statuses: Dict[str, FileStatus] = {}
+    file_hashes: Dict[str, str] = {}
+    # Bytes of files handed to the parser, kept until their parse result is back
+    in_flight: Dict[str, bytes] = {}
+    symbol_index = get_symbol_index()
+    blob_store = get_blob_store()
+
+    def changed_files():
+        # Unchanged files are skipped before they reach the parser
+        for file_path, file_bytes in iter_source_files(source, path_prefix):
+            content_hash = file_content_hash(file_bytes)
+            if known_hashes.get(file_path) == content_hash:
+                statuses[file_path] = FileStatus(file_path, 'unchanged')
+                continue
+            file_hashes[file_path] = content_hash
+            in_flight[file_path] = file_bytes
+            yield file_path, file_bytes
+
+    # Symbol tables of parsed files, recorded once their chunks are indexed
+    symbol_entries: Dict[str, Dict[str, Any]] = {}
+
+    def parsed_files():
+        for file_path, chunks, symbol_rows, error in _parse_files(changed_files(), max_workers):
+            file_bytes = in_flight.pop(file_path)
+            if error is not None:
+                logger.warning(f"[Code Ingest] Failed to parse {file_path}: {error}")
+                statuses[file_path] = FileStatus(file_path, 'error', message=error)
+                continue
+            # Blobs are content-addressed and only reachable through a recorded
+            # hash, so storing one for a file that then fails is harmless
+            blob_store.put(file_bytes, file_hashes[file_path])
+            symbol_entries[file_path] = symbol_index_entry(
+                file_path, file_hashes[file_path], symbol_rows)
+            # Files without symbols still go through, so stale chunks are removed
+            yield file_path, file_path.split('/')[-1], chunks, file_hashes[file_path]
+
+    results, stats = index_code_files_to_supabase(
+        parsed_files(), provider, progress_cb=progress_cb, progress_label="Indexing codebase")
+
+    indexed_entries = []
+    for file_path, result in results.items():
+        if result.error:
+            logger.warning(f"[Code Ingest] Failed to index {file_path}: {result.error}")
+            statuses[file_path] = FileStatus(
+                file_path, 'error', written=result.written, message=result.error)
+            continue
+        statuses[file_path] = FileStatus(
+            file_path, 'indexed',
+            chunks=result.chunks, written=result.written, removed=result.removed)
+        if file_path in symbol_entries:
+            indexed_entries.append(symbol_entries[file_path])
+    symbol_index.record_files(indexed_entries)
+
+    report = BulkIngestReport(
+        files=[statuses[path] for path in sorted(statuses)],
+        elapsed=time.perf_counter() - started,
+        pipeline=stats.to_dict(),
+    )
+    logger.info(f"[Code Ingest] {report.summary()}")
+    return report
@@ -4,14 +4,15 @@ Uses LLM to generate translations and synonyms, then searches aliases and databa
 """
 import json
 import re
-from typing import List, Dict, Any, Set
-from backend.services.llm_provider import SimpleLLMProvider
-from backend.storage.keyword_storage import (
-    find_keyword_by_alias,
-    list_all_aliases,
-    get_all_keywords
-)
-from backend.services.search_service import keyword_search
+from typing import List, Dict, Any, Optional, Set
+from backend.services.llm_provider import get_llm_provider
+from backend.storage.alias_graph import get_alias_graph
+from backend.storage.term_cache import get_term_cache
+from backend.services.search_service import keyword_search_multi
+
+
+# Term cache prompt version of generate_translation_and_synonyms (bump when the prompt changes)
+_DEEP_SEARCH_PROMPT_VERSION = 'translation_synonyms/v1'
 
 
 def detect_language(word: str) -> str:
@@ -41,10 +42,18 @@ def generate_translation_and_synonyms(word: str, source_language: str, retry: bo
         Dict with 'translation', 'synonyms_en', 'synonyms_vi'
     """
     try:
-        provider = SimpleLLMProvider()
+        provider = get_llm_provider()
 
         target_language = 'vi' if source_language == 'en' else 'en'
 
+        # Same word, languages, model and prompt -> reuse the stored answer
+        cache = get_term_cache()
+        cache_key = (word, source_language, target_language, f"llm:{provider.model}",
+                     _DEEP_SEARCH_PROMPT_VERSION + ('/retry' if retry else ''))
+        cached = cache.get(*cache_key)
+        if cached is not None:
+            return cached
+
         retry_instruction = ""
         if retry:
             retry_instruction = "\n\nIMPORTANT: Generate DIFFERENT synonyms than before. Avoid common/obvious synonyms and provide alternative terms, related concepts, or variations that might be used in documents."
@@ -81,11 +90,13 @@ Be concise and return only relevant words. Return ONLY the JSON, no other text."
 
         result = json.loads(response)
 
-        return {
+        output = {
             'translation': result.get('translation', ''),
             'synonyms_en': result.get('synonyms_en', []) if source_language == 'en' else result.get('synonyms_en', []),
             'synonyms_vi': result.get('synonyms_vi', []) if source_language == 'vi' else result.get('synonyms_vi', [])
         }
+        cache.put(*cache_key, output)
+        return output
 
     except Exception as e:
         # Fallback: return empty results
@@ -96,6 +107,14 @@ Be concise and return only relevant words. Return ONLY the JSON, no other text."
         }
 
 
+def _appears_in_results(keyword_lower: str, results: Optional[List[Dict]]) -> bool:
+    """Whether a keyword appears as a whole word in the content of any search result."""
+    # Use word boundary to match whole words only (not just a fuzzy match)
+    pattern = r'\b' + re.escape(keyword_lower) + r'\b'
+    return any(re.search(pattern, result.get('content', '').lower())
+               for result in results or [])
+
+
 def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]:
     """
     Check a list of words against aliases table and database.
@@ -108,8 +127,12 @@ def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]
         - 'matched_keywords': List of base keywords that matched
         - 'matches_by_word': Dict mapping word -> list of matched keywords
     """
+    import logging
+    logger = logging.getLogger(__name__)
     matched_keywords_set: Set[str] = set()
     matches_by_word: Dict[str, List[str]] = {}
+    # Alias lookups are served from the in-memory alias graph
+    alias_graph = get_alias_graph()
 
     # Step 1: Check against aliases table
     for word in words:
@@ -117,25 +140,27 @@ def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]
             continue
 
         word_lower = word.strip().lower()
-        matches = find_keyword_by_alias(word_lower)
+        matches = alias_graph.find_keyword_by_alias(word_lower)
 
         if matches:
             keyword_list = [m['keyword'] for m in matches]
             matched_keywords_set.update(keyword_list)
             matches_by_word[word] = keyword_list
 
-    # Step 2: Check against database using keyword_search
+    # Step 2: Check against database using keyword_search (one batched call)
     # If a word returns search results, it means it exists in the database
+    results_by_word = keyword_search_multi(
+        [word for word in words if word and word.strip()], limit=5)
     for word in words:
         if not word or not word.strip():
             continue
 
         word_clean = word.strip()
-        results = keyword_search(word_clean, limit=5)
+        results = results_by_word.get(word_clean)
 
         if results:
             # Word found in database - check if it has an alias mapping
-            alias_matches = find_keyword_by_alias(word_clean.lower())
+            alias_matches = alias_graph.find_keyword_by_alias(word_clean.lower())
 
             if alias_matches:
                 # Word is an alias - get the base keyword
@@ -155,36 +180,19 @@ def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]
                 if word_clean.lower() not in matches_by_word[word]:
                     matches_by_word[word].append(word_clean.lower())
 
-    # Step 3: Also check all existing keywords/aliases for partial matches
-    all_aliases = list_all_aliases()
-    all_keywords = get_all_keywords()
-
+    # Step 3: Also check all existing keywords/aliases for partial matches:
+    # the word is a keyword or alias (case-insensitive), or contains one as
+    # whole words ("xe tăng hạng nặng" -> keyword of alias "xe tăng")
     for word in words:
         if not word or not word.strip():
             continue
 
-        word_lower = word.strip().lower()
-
-        # Check if word matches any keyword or alias (case-insensitive)
-        for alias_row in all_aliases:
-            keyword = alias_row.get('keyword', '').lower()
-            alias = alias_row.get('alias', '').lower()
-
-            if word_lower == keyword or word_lower == alias:
-                matched_keywords_set.add(alias_row['keyword'])
-                if word not in matches_by_word:
-                    matches_by_word[word] = []
-                if alias_row['keyword'] not in matches_by_word[word]:
-                    matches_by_word[word].append(alias_row['keyword'])
-
-        # Check against all keywords list
-        for kw in all_keywords:
-            if word_lower == kw.lower():
-                matched_keywords_set.add(kw)
-                if word not in matches_by_word:
-                    matches_by_word[word] = []
-                if kw not in matches_by_word[word]:
-                    matches_by_word[word].append(kw)
+        for kw in alias_graph.keywords_for_term(word) + alias_graph.keywords_in_text(word):
+            matched_keywords_set.add(kw)
+            if word not in matches_by_word:
+                matches_by_word[word] = []
+            if kw not in matches_by_word[word]:
+                matches_by_word[word].append(kw)
 
     # Step 4: Verify that all matched keywords actually exist in the database
     # Only return keywords that have actual search results in the database
@@ -192,70 +200,52 @@ def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]
     verified_keywords = []
     verified_matches_by_word = {}
 
+    # Check if each keyword itself exists in database (one batched call)
+    # Get more results to verify the keyword actually appears
+    keywords_to_verify = [kw.strip() for kw in matched_keywords_set if kw.strip()]
+    try:
+        results_by_keyword = keyword_search_multi(keywords_to_verify, limit=10)
+    except Exception as e:
+        logger.error(
+            f"[Deep Search Verification] Error searching for {keywords_to_verify}: {e}")
+        results_by_keyword = {}
+
+    # Keywords not found directly, with their alias base keywords
+    unverified_aliases: Dict[str, List[str]] = {}
     for keyword in matched_keywords_set:
         keyword_lower = keyword.lower().strip()
         keyword_original = keyword.strip()
 
-        # Check if keyword itself exists in database
-        # Get more results to verify the keyword actually appears
-        try:
-            results = keyword_search(keyword_original, limit=10)
-        except Exception as e:
-            logger.error(
-                f"[Deep Search Verification] Error searching for '{keyword_original}': {e}")
-            results = None
-
-        if results and len(results) > 0:
-            # Verify keyword actually appears in the content (not just fuzzy match)
-            # Check if keyword appears in at least one result's content
-            keyword_found = False
-            for result in results:
-                content = result.get('content', '').lower()
-                # Check for exact word match (whole word, case-insensitive)
-                # Use word boundary to match whole words only
-                pattern = r'\b' + re.escape(keyword_lower) + r'\b'
-                if re.search(pattern, content):
-                    keyword_found = True
-                    break
-
-            if keyword_found:
-                # Keyword exists in database - include it
-                verified_keywords.append(keyword_original)
-                continue
+        # Verify keyword actually appears in the content (not just fuzzy match)
+        if _appears_in_results(keyword_lower, results_by_keyword.get(keyword_original)):
+            # Keyword exists in database - include it
+            verified_keywords.append(keyword_original)
+            continue
 
         # If keyword not found directly, check if it's an alias
-        # If it's an alias, check if the base keyword exists in database
-        alias_matches = find_keyword_by_alias(keyword_lower)
+        alias_matches = alias_graph.find_keyword_by_alias(keyword_lower)
         if alias_matches:
-            # This is an alias - check if base keyword exists
-            for match in alias_matches:
-                base_keyword = match.get('keyword', '').strip()
-                if base_keyword:
-                    # Verify base keyword exists in database
-                    try:
-                        base_results = keyword_search(base_keyword, limit=10)
-                    except Exception as e:
-                        logger.error(
-                            f"[Deep Search Verification] Error searching for base keyword '{base_keyword}': {e}")
-                        base_results = None
-
-                    if base_results and len(base_results) > 0:
-                        # Check if base keyword appears in results
-                        base_keyword_lower = base_keyword.lower()
-                        base_found = False
-                        for result in base_results:
-                            content = result.get('content', '').lower()
-                            pattern = r'\b' + \
-                                re.escape(base_keyword_lower) + r'\b'
-                            if re.search(pattern, content):
-                                base_found = True
-                                break
-
-                        if base_found:
-                            # Base keyword exists - include the base keyword (not the alias)
-                            if base_keyword not in verified_keywords:
-                                verified_keywords.append(base_keyword)
-                            break
+            unverified_aliases[keyword_original] = [
+                match.get('keyword', '').strip() for match in alias_matches
+                if match.get('keyword', '').strip()]
+
+    # If it's an alias, check if the base keyword exists in database
+    base_keywords = list(dict.fromkeys(
+        base for bases in unverified_aliases.values() for base in bases))
+    try:
+        base_results_by_keyword = keyword_search_multi(base_keywords, limit=10) if base_keywords else {}
+    except Exception as e:
+        logger.error(
+            f"[Deep Search Verification] Error searching for base keywords {base_keywords}: {e}")
+        base_results_by_keyword = {}
+
+    for bases in unverified_aliases.values():
+        for base_keyword in bases:
+            if _appears_in_results(base_keyword.lower(), base_results_by_keyword.get(base_keyword)):
+                # Base keyword exists - include the base keyword (not the alias)
+                if base_keyword not in verified_keywords:
+                    verified_keywords.append(base_keyword)
+                break
 
     # Remove duplicates while preserving order
     verified_keywords = list(dict.fromkeys(verified_keywords))
@@ -270,7 +260,7 @@ def check_words_against_aliases_and_database(words: List[str]) -> Dict[str, Any]
                 verified_list.append(kw)
             else:
                 # Check if keyword is an alias for a verified base keyword
-                alias_matches = find_keyword_by_alias(kw.lower())
+                alias_matches = alias_graph.find_keyword_by_alias(kw.lower())
                 if alias_matches:
                     for match in alias_matches:
                         base_keyword = match.get('keyword', '')
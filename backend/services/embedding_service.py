@@ -6,22 +6,21 @@ EXACT COPY from keyword_extractor - adapted for unified_rag_app.
 from typing import List, Dict, Optional
 import os
 
+from backend.storage.embedding_index import GDD_INDEX, check_embedding_index
 from backend.storage.supabase_client import get_supabase_client
 
-try:
-    from openai import OpenAI
-except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
+from gdd_rag_backbone.llm_providers.client_registry import OPENAI_AVAILABLE, get_openai_client
+from gdd_rag_backbone.llm_providers.rate_limiter import BACKGROUND, llm_priority
 
 
-def _get_openai_client() -> Optional["OpenAI"]:
+def _get_openai_client():
     """
-    Build OpenAI client (or compatible) from environment.
+    Shared OpenAI client (or compatible) for the environment's credentials.
     Supports:
     - OPENAI_API_KEY (direct OpenAI)
     - OPENAI_COMPATIBLE_BASE_URL_EMBEDDING + OPENAI_COMPATIBLE_API_KEY_EMBEDDING
     """
-    if OpenAI is None:
+    if not OPENAI_AVAILABLE:
         return None
 
     api_key = os.getenv("OPENAI_API_KEY")
@@ -29,9 +28,9 @@ def _get_openai_client() -> Optional["OpenAI"]:
     alt_key = os.getenv("OPENAI_COMPATIBLE_API_KEY_EMBEDDING")
 
     if base_url and alt_key:
-        return OpenAI(api_key=alt_key, base_url=base_url)
+        return get_openai_client(alt_key, base_url)
     if api_key:
-        return OpenAI(api_key=api_key)
+        return get_openai_client(api_key)
     return None
 
 
@@ -78,6 +77,9 @@ def embed_document_chunks(doc_id: str, model: Optional[str] = None, batch_size:
     if not chunks:
         return 0
 
+    # Re-embedding must stay on the model keyword_chunks was built with
+    check_embedding_index(GDD_INDEX, embedding_model)
+
     total_embedded = 0
 
     # Batch process
@@ -85,10 +87,13 @@ def embed_document_chunks(doc_id: str, model: Optional[str] = None, batch_size:
         batch = chunks[i: i + batch_size]
         texts = [c["content"] for c in batch]
 
-        # Call embedding API
-        emb = openai_client.embeddings.create(
-            model=embedding_model, input=texts)
+        # Call embedding API (bulk re-embedding yields to interactive calls)
+        with llm_priority(BACKGROUND):
+            emb = openai_client.embeddings.create(
+                model=embedding_model, input=texts)
         vectors = [e.embedding for e in emb.data]
+        if vectors:
+            check_embedding_index(GDD_INDEX, embedding_model, len(vectors[0]))
 
         # Upsert embeddings back per row
         update_rows = []
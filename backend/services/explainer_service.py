@@ -1,15 +1,26 @@
 """
 Document Explainer service - generates detailed explanations from keyword queries.
-Uses section-based chunk retrieval with sequential LLM processing for comprehensive results.
+Uses section-based chunk retrieval with parallel per-section LLM processing for comprehensive results.
 """
-from typing import List, Dict, Optional, Any, Tuple
+from typing import Generator, List, Dict, Optional, Any, Tuple
+import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from backend.shared.config import EXPLAINER_SECTION_CONCURRENCY
 from backend.storage.supabase_client import get_supabase_client
+from backend.storage.projections import KEYWORD_CHUNK_CONTENT
 from backend.storage.keyword_storage import list_keyword_documents
-from backend.services.search_service import keyword_search
-from backend.services.llm_provider import SimpleLLMProvider
-from backend.services.hyde_service import hyde_expand_query
+from backend.storage.explanation_cache import get_explanation_cache, section_cache_key
+from backend.services.search_service import keyword_search_multi
+from backend.services.llm_provider import get_llm_provider
+from backend.services.hyde_service import hyde_expand_query_cached
+
+logger = logging.getLogger(__name__)
+
+# Bump when the section prompt or its post-processing changes, so cached
+# section explanations are not reused
+SECTION_PROMPT_VERSION = 'section/v1'
 
 
 def detect_query_language(text: str) -> str:
@@ -69,8 +80,8 @@ def get_all_chunks_from_section(doc_id: str, section_heading: str) -> List[Dict[
     """
     client = get_supabase_client()
 
-    query = client.table('keyword_chunks').select(
-        '*').eq('doc_id', doc_id).order('chunk_index')
+    query = KEYWORD_CHUNK_CONTENT.query(client).eq(
+        'doc_id', doc_id).order('chunk_index')
 
     if section_heading:
         query = query.eq('section_heading', section_heading)
@@ -279,6 +290,7 @@ def _explain_single_section(
     detected_language: str,
     all_keywords: List[str] = None,
     hyde_queries: Dict[str, str] = None,
+    section_chunks: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Generate explanation for a single section.
@@ -292,13 +304,15 @@ def _explain_single_section(
         detected_language: Detected language ('english' or 'vietnamese')
         all_keywords: List of all keywords to search with (primary + additional). If None, uses keyword only.
         hyde_queries: Dict mapping original keyword -> HYDE-expanded query. If None, uses hyde_query for all.
+        section_chunks: Chunks of the section if already fetched (fetched here otherwise)
 
     Returns:
         Dict with 'explanation', 'source_chunks', 'citations', 'error', etc.
     """
     try:
         # Get all chunks from this section
-        section_chunks = get_all_chunks_from_section(doc_id, section_heading)
+        if section_chunks is None:
+            section_chunks = get_all_chunks_from_section(doc_id, section_heading)
 
         if not section_chunks:
             return {
@@ -325,22 +339,29 @@ def _explain_single_section(
         
         keyword_results_summary = {}  # Track results per keyword for debugging
         
+        # Use HYDE-expanded query if available, otherwise use original keyword
+        search_queries = {}
         for search_keyword in keywords_to_search:
-            logger.info("-" * 100)
-            logger.info(f"[EXPLAIN SINGLE SECTION] Processing keyword: '{search_keyword}'")
-            
-            # Use HYDE-expanded query if available, otherwise use original keyword
             if hyde_queries and search_keyword in hyde_queries:
-                search_query = hyde_queries[search_keyword]
-                logger.info(f"[EXPLAIN SINGLE SECTION] Using HYDE-expanded query for '{search_keyword}': '{search_query}'")
+                search_queries[search_keyword] = hyde_queries[search_keyword]
+                logger.info(f"[EXPLAIN SINGLE SECTION] Using HYDE-expanded query for '{search_keyword}': '{search_queries[search_keyword]}'")
             else:
                 # Fallback: use primary HYDE query for primary keyword, direct search for others
-                search_query = hyde_query if search_keyword.strip() == keyword.strip() else search_keyword.strip()
-                logger.info(f"[EXPLAIN SINGLE SECTION] Using query for '{search_keyword}': '{search_query}' (no HYDE expansion available)")
-            
-            logger.info(f"[EXPLAIN SINGLE SECTION] Calling keyword_search with query='{search_query}', doc_id_filter='{doc_id}', limit=20")
-            matched_chunks = keyword_search(
-                search_query, limit=20, doc_id_filter=doc_id)
+                search_queries[search_keyword] = hyde_query if search_keyword.strip() == keyword.strip() else search_keyword.strip()
+                logger.info(f"[EXPLAIN SINGLE SECTION] Using query for '{search_keyword}': '{search_queries[search_keyword]}' (no HYDE expansion available)")
+        
+        # All keywords in one round trip; HYDE rewrites are long, so chunks are
+        # scored on any of their tokens rather than the whole query as a phrase
+        logger.info(f"[EXPLAIN SINGLE SECTION] Calling keyword_search_multi with {len(search_queries)} queries, doc_id_filter='{doc_id}', limit=20")
+        matches_by_query = keyword_search_multi(
+            list(search_queries.values()), limit=20, doc_id_filter=doc_id,
+            section_filter=section_heading, match_any=True)
+        
+        for search_keyword in keywords_to_search:
+            logger.info("-" * 100)
+            logger.info(f"[EXPLAIN SINGLE SECTION] Processing keyword: '{search_keyword}'")
+            search_query = search_queries[search_keyword]
+            matched_chunks = matches_by_query.get((search_query or '').strip(), [])
             
             logger.info(f"[EXPLAIN SINGLE SECTION] keyword_search returned {len(matched_chunks)} total chunks for query '{search_query}'")
             
@@ -611,7 +632,7 @@ Chunks:
 
         # Generate explanation using LLM with max_tokens to ensure complete responses
         try:
-            provider = SimpleLLMProvider()
+            provider = get_llm_provider()
             llm_start_time = time.perf_counter()
             explanation = provider.llm(
                 prompt, temperature=0.3, max_tokens=3000)
@@ -662,6 +683,370 @@ Chunks:
         }
 
 
+def _prepare_explanation(
+    keyword: str,
+    selected_items: List[Dict[str, str]],
+    use_hyde: bool,
+    language: Optional[str],
+    additional_keywords: Optional[List[str]],
+) -> Dict[str, Any]:
+    """
+    Everything before the per-section LLM calls: HYDE expansion, citation
+    names, language, and the selected sections' chunks in sidebar order.
+
+    Returns:
+        Dict of shared inputs for the section explanations, or a dict with only
+        'result' when there is nothing to explain
+    """
+    # Step 1: HYDE query expansion for ALL keywords (optional)
+    # Collect all keywords to expand (primary + additional)
+    all_keywords_to_expand = [keyword]
+    if additional_keywords:
+        all_keywords_to_expand.extend(additional_keywords)
+
+    # Expand all keywords with HYDE
+    hyde_queries = {}  # Map original keyword -> expanded query
+    hyde_timing = {}
+    hyde_expansion_time = 0.0
+
+    if use_hyde:
+        hyde_start_time = time.perf_counter()
+        # Expansions are independent LLM calls: run them in parallel
+        with ThreadPoolExecutor(max_workers=min(EXPLAINER_SECTION_CONCURRENCY, len(all_keywords_to_expand))) as executor:
+            for kw, (expanded, _timing) in zip(all_keywords_to_expand,
+                                               executor.map(hyde_expand_query_cached, all_keywords_to_expand)):
+                hyde_queries[kw] = expanded
+        hyde_end_time = time.perf_counter()
+        hyde_expansion_time = round(hyde_end_time - hyde_start_time, 2)
+        hyde_timing = {'total_time': hyde_expansion_time}
+
+    # Primary HYDE query (for backward compatibility and display)
+    hyde_query = hyde_queries.get(keyword, keyword)
+
+    # Step 2: Group selected items by unique (doc_id, section_heading) combinations
+    unique_sections = []
+    seen_sections = set()
+
+    for item in selected_items:
+        doc_id = item['doc_id']
+        section_heading = item.get('section_heading')
+        section_key = (doc_id, section_heading)
+
+        if section_key not in seen_sections:
+            unique_sections.append({
+                'doc_id': doc_id,
+                'section_heading': section_heading
+            })
+            seen_sections.add(section_key)
+
+    if not unique_sections:
+        return {'result': {
+            'explanation': 'No sections selected.',
+            'source_chunks': [],
+            'hyde_query': hyde_query,
+            'language': 'english',
+            'error': None
+        }}
+
+    # Step 3: Get document name mapping for citations
+    docs = list_keyword_documents()
+    doc_name_map = {}
+    for doc in docs:
+        doc_id = doc.get('doc_id')
+        if not doc_id:
+            continue
+        name = doc.get('name', doc_id)
+        filename = name
+        if '\\' in filename or '/' in filename:
+            filename = filename.split('\\')[-1].split('/')[-1]
+        if filename.lower().endswith('.pdf'):
+            filename = filename[:-4]
+        doc_name_map[doc_id] = filename
+
+    # Step 4: Detect or use provided language
+    if language and language in ['en', 'vn']:
+        # Use provided language from toggle
+        detected_language = 'vietnamese' if language == 'vn' else 'english'
+    else:
+        # Auto-detect from keyword
+        detected_language = detect_query_language(keyword)
+
+    # Collect all keywords to query (primary + additional)
+    all_keywords = [keyword]
+    if additional_keywords:
+        all_keywords.extend([kw for kw in additional_keywords if kw and kw.strip() and kw.strip() != keyword.strip()])
+
+    # Step 5: Look up cached explanations of the sections
+    section_cache_keys = _section_cache_keys(keyword, all_keywords, detected_language, use_hyde, unique_sections)
+    cached_sections = {}
+    if section_cache_keys:
+        try:
+            cached = get_explanation_cache().get_many(section_cache_keys.values())
+            cached_sections = {section_key: cached[cache_key] for section_key, cache_key in section_cache_keys.items()
+                               if cache_key in cached}
+        except Exception as e:
+            logger.warning(f"[EXPLANATION CACHE] Lookup failed: {e}")
+
+    # Step 6: Fetch the chunks of every uncached section (in parallel) and order
+    # the sections by their first chunk_id, to match the sidebar order
+    # (cached sections keep the first chunk_id they were explained with)
+    missing_sections = [section for section in unique_sections
+                        if (section['doc_id'], section.get('section_heading')) not in cached_sections]
+    fetched = []
+    if missing_sections:
+        with ThreadPoolExecutor(max_workers=min(EXPLAINER_SECTION_CONCURRENCY, len(missing_sections))) as executor:
+            fetched = list(executor.map(
+                lambda section: get_all_chunks_from_section(section['doc_id'], section.get('section_heading')),
+                missing_sections))
+    section_entries = [
+        (((section['doc_id'], section.get('section_heading')), section_chunks),
+         min(chunk.get('chunk_id', '') or '' for chunk in section_chunks))
+        for section, section_chunks in zip(missing_sections, fetched) if section_chunks]
+    section_entries.extend(((section_key, None), entry['sort_key'])
+                           for section_key, entry in cached_sections.items())
+    sorted_sections = [section for section, _ in sorted(section_entries, key=lambda x: x[1])]
+    if cached_sections:
+        logger.info(f"[EXPLANATION CACHE] '{keyword}': {len(cached_sections)} of "
+                    f"{len(unique_sections)} sections cached")
+
+    return {
+        'hyde_query': hyde_query,
+        'hyde_queries': hyde_queries,
+        'hyde_timing': hyde_timing,
+        'hyde_expansion_time': hyde_expansion_time,
+        'doc_name_map': doc_name_map,
+        'detected_language': detected_language,
+        'sorted_sections': sorted_sections,
+        'all_keywords': all_keywords,
+        'section_cache_keys': section_cache_keys,
+        'cached_sections': cached_sections,
+    }
+
+
+def _section_cache_keys(
+    keyword: str,
+    all_keywords: List[str],
+    detected_language: str,
+    use_hyde: bool,
+    sections: List[Dict[str, Any]],
+) -> Dict[Tuple[str, Optional[str]], str]:
+    """
+    Explanation cache key of each (doc_id, section_heading), built with the
+    current index version of its document.
+
+    Returns:
+        Dict of section key -> cache key; empty when the index versions cannot
+        be read (the request then bypasses the cache)
+    """
+    from backend.storage.keyword_fts_index import doc_version_name
+    from backend.storage.supabase_client import get_data_versions
+    doc_ids = list(dict.fromkeys(section['doc_id'] for section in sections))
+    try:
+        versions = get_data_versions([doc_version_name(doc_id) for doc_id in doc_ids])
+    except Exception as e:
+        logger.warning(f"[EXPLANATION CACHE] Index versions unavailable, not caching: {e}")
+        return {}
+    return {
+        (section['doc_id'], section.get('section_heading')): section_cache_key(
+            keyword, all_keywords[1:], detected_language, use_hyde,
+            section['doc_id'], section.get('section_heading'),
+            versions[doc_version_name(section['doc_id'])], SECTION_PROMPT_VERSION)
+        for section in sections
+    }
+
+
+def _section_explainer(keyword: str, plan: Dict[str, Any]):
+    """Function explaining one (section key, chunks) entry of plan['sorted_sections']; returns (result, latency)."""
+    def explain_section(section):
+        (doc_id, section_heading), section_chunks = section
+        cached = plan['cached_sections'].get((doc_id, section_heading))
+        if cached is not None:
+            return dict(cached['result'], section_timing=0.0, cached=True), 0.0
+        section_start = time.perf_counter()
+        result = _explain_single_section(
+            keyword=keyword,
+            doc_id=doc_id,
+            section_heading=section_heading,
+            hyde_query=plan['hyde_query'],
+            doc_name_map=plan['doc_name_map'],
+            detected_language=plan['detected_language'],
+            all_keywords=plan['all_keywords'],
+            hyde_queries=plan['hyde_queries'],  # Pass all HYDE-expanded queries
+            section_chunks=section_chunks,
+        )
+        cache_key = plan['section_cache_keys'].get((doc_id, section_heading))
+        if cache_key and not result.get('error'):
+            try:
+                get_explanation_cache().put(cache_key, doc_id, {
+                    'result': result,
+                    'sort_key': min(chunk.get('chunk_id', '') or '' for chunk in section_chunks),
+                })
+            except Exception as e:
+                logger.warning(f"[EXPLANATION CACHE] Could not store {doc_id} / {section_heading}: {e}")
+        return result, round(time.perf_counter() - section_start, 2)
+    return explain_section
+
+
+def _combine_section_outputs(
+    keyword: str,
+    plan: Dict[str, Any],
+    section_outputs: List[Tuple[Dict[str, Any], float]],
+    sections_wall_time: float,
+) -> Dict[str, Any]:
+    """Add citations in section order and combine the section explanations into the final result."""
+    sorted_sections = plan['sorted_sections']
+    doc_name_map = plan['doc_name_map']
+    hyde_query = plan['hyde_query']
+    detected_language = plan['detected_language']
+
+    # Step 6: Add citations in section order
+    section_results = []
+    all_source_chunks = []
+    all_citations = {}
+    errors = []
+    section_timings = []
+    citation_counter = 1  # Global counter for citations
+
+    for ((doc_id, section_heading), _), (result, section_latency) in zip(sorted_sections, section_outputs):
+
+        if result.get('error'):
+            errors.append(
+                f"{doc_name_map.get(doc_id, doc_id)} - {section_heading or 'No section'}: {result['error']}")
+
+        # Check if explanation exists and is not empty/whitespace
+        explanation_text = result.get('explanation')
+        if explanation_text and explanation_text.strip():
+            # Add citation to this section's explanation
+            explanation_with_citation = _add_citation_to_text(
+                explanation_text, citation_counter)
+
+            # Build citation map for this section (use first chunk for citation info)
+            source_chunks = result.get('source_chunks', [])
+            if source_chunks:
+                first_chunk = source_chunks[0]
+                all_citations[citation_counter] = {
+                    'doc_id': doc_id,
+                    'doc_name': doc_name_map.get(doc_id, doc_id),
+                    'section_heading': first_chunk.get('section_heading'),
+                    'chunk_id': first_chunk.get('chunk_id', '')
+                }
+
+            section_results.append({
+                'doc_id': doc_id,
+                'section_heading': section_heading,
+                'explanation': explanation_with_citation,
+                'source_chunks': source_chunks
+            })
+
+            # Increment citation counter for next LLM call
+            citation_counter += 1
+
+        # Collect section timing if available
+        if result.get('section_timing') is not None and result.get('section_label'):
+            section_timings.append({
+                'label': result['section_label'],
+                'time': result['section_timing'],
+                'total_time': section_latency,
+                'cached': result.get('cached', False)
+            })
+
+        # Collect source chunks
+        all_source_chunks.extend(result.get('source_chunks', []))
+
+    # Step 7: Combine all section explanations
+    if not section_results:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(
+            f"No explanations generated for keyword '{keyword}'. "
+            f"Processed {len(sorted_sections)} sections, "
+            f"found {len(all_source_chunks)} source chunks. "
+            f"Errors: {errors if errors else 'None'}"
+        )
+
+        error_msg = 'No explanations generated. '
+        if errors:
+            error_msg += 'Errors: ' + '; '.join(errors)
+        else:
+            error_msg += 'All generated explanations were filtered out or empty. This may indicate that the content does not match the keyword query.'
+
+        return {
+            'explanation': error_msg,
+            'source_chunks': all_source_chunks,
+            'hyde_query': hyde_query,
+            'language': detected_language,
+            'error': error_msg if errors else None
+        }
+
+    # Combine explanations: renumber sections sequentially
+    # Use regex to find and renumber all section headers (format: "1. Section Title")
+    formatting_start_time = time.perf_counter()
+    section_number = 1
+    combined_parts = []
+
+    for section_result in section_results:
+        explanation_text = section_result['explanation']
+
+        # Pattern to match section headers: number followed by period and space
+        # Example: "1. Section Title" or "2. Another Section"
+        pattern = r'^(\d+)\.\s+(.+)$'
+
+        lines = explanation_text.split('\n')
+        processed_lines = []
+
+        for line in lines:
+            match = re.match(pattern, line.strip())
+            if match:
+                # This is a section header - renumber it
+                section_title = match.group(2)
+                processed_lines.append(
+                    f"{section_number}. {section_title}")
+                section_number += 1
+            else:
+                # Regular content line - keep as is
+                processed_lines.append(line)
+
+        # Add this section's explanation to combined parts
+        if processed_lines:
+            combined_parts.append('\n'.join(processed_lines))
+
+    # Join all sections with double newlines
+    final_explanation = '\n\n'.join(combined_parts)
+
+    # Post-process: Remove statements about missing information from combined explanation
+    final_explanation = _filter_missing_info_statements(final_explanation)
+    formatting_end_time = time.perf_counter()
+    formatting_time = round(formatting_end_time - formatting_start_time, 2)
+
+    return {
+        'explanation': final_explanation,
+        'source_chunks': all_source_chunks,
+        'hyde_query': hyde_query,
+        'language': detected_language,
+        'hyde_timing': plan['hyde_timing'],
+        'chunks_used': len(all_source_chunks),
+        'citations': all_citations,
+        'error': '; '.join(errors) if errors else None,
+        'timing_metadata': {
+            'hyde_expansion_time': plan['hyde_expansion_time'],
+            'section_timings': section_timings,
+            'sections_wall_time': sections_wall_time,
+            'formatting_time': formatting_time,
+            'cached_sections': len(plan['cached_sections'])
+        }
+    }
+
+
+def _explanation_error(keyword: str, e: Exception) -> Dict[str, Any]:
+    return {
+        'explanation': None,
+        'source_chunks': [],
+        'hyde_query': keyword,
+        'language': 'english',
+        'error': f'Error generating explanation: {str(e)}'
+    }
+
+
 def explain_keyword(
     keyword: str,
     selected_items: List[Dict[str, str]],
@@ -684,264 +1069,93 @@ def explain_keyword(
         Dict with 'explanation', 'source_chunks', 'hyde_query', 'language', etc.
     """
     try:
-        # Step 1: HYDE query expansion for ALL keywords (optional)
-        # Collect all keywords to expand (primary + additional)
-        all_keywords_to_expand = [keyword]
-        if additional_keywords:
-            all_keywords_to_expand.extend(additional_keywords)
-        
-        # Expand all keywords with HYDE
-        hyde_queries = {}  # Map original keyword -> expanded query
-        hyde_timing = {}
-        hyde_expansion_time = 0.0
-        
-        if use_hyde:
-            hyde_start_time = time.perf_counter()
-            for kw in all_keywords_to_expand:
-                expanded, timing = hyde_expand_query(kw)
-                hyde_queries[kw] = expanded
-                # Accumulate timing (use max or sum, here using sum for total time)
-                if timing:
-                    hyde_expansion_time += timing.get('total_time', 0.0)
-            hyde_end_time = time.perf_counter()
-            hyde_expansion_time = round(hyde_end_time - hyde_start_time, 2)
-            hyde_timing = {'total_time': hyde_expansion_time}
-        
-        # Primary HYDE query (for backward compatibility and display)
-        hyde_query = hyde_queries.get(keyword, keyword)
-
-        # Step 2: Group selected items by unique (doc_id, section_heading) combinations
-        unique_sections = []
-        seen_sections = set()
-
-        for item in selected_items:
-            doc_id = item['doc_id']
-            section_heading = item.get('section_heading')
-            section_key = (doc_id, section_heading)
-
-            if section_key not in seen_sections:
-                unique_sections.append({
-                    'doc_id': doc_id,
-                    'section_heading': section_heading
-                })
-                seen_sections.add(section_key)
-
-        if not unique_sections:
-            return {
-                'explanation': 'No sections selected.',
-                'source_chunks': [],
-                'hyde_query': hyde_query,
-                'language': 'english',
-                'error': None
-            }
-
-        # Step 3: Get document name mapping for citations
-        docs = list_keyword_documents()
-        doc_name_map = {}
-        for doc in docs:
-            doc_id = doc.get('doc_id')
-            if not doc_id:
-                continue
-            name = doc.get('name', doc_id)
-            filename = name
-            if '\\' in filename or '/' in filename:
-                filename = filename.split('\\')[-1].split('/')[-1]
-            if filename.lower().endswith('.pdf'):
-                filename = filename[:-4]
-            doc_name_map[doc_id] = filename
-
-        # Step 4: Detect or use provided language
-        if language and language in ['en', 'vn']:
-            # Use provided language from toggle
-            detected_language = 'vietnamese' if language == 'vn' else 'english'
-        else:
-            # Auto-detect from keyword
-            detected_language = detect_query_language(keyword)
-
-        # Step 5: Collect all chunks from all sections and sort by chunk_id
-        # This ensures we process sections in sidebar order
-        all_chunks_global = []
-        for section in unique_sections:
-            doc_id = section['doc_id']
-            section_heading = section.get('section_heading')
-            section_chunks = get_all_chunks_from_section(
-                doc_id, section_heading)
-            for chunk in section_chunks:
-                chunk['_doc_id'] = doc_id
-                chunk['_section_heading'] = section_heading
-                all_chunks_global.append(chunk)
-
-        # Sort all chunks globally by chunk_id to match sidebar order
-        all_chunks_global.sort(key=lambda x: x.get('chunk_id', '') or '')
-
-        # Step 6: Process each section sequentially, adding citations as we go
-        section_results = []
-        all_source_chunks = []
-        all_citations = {}
-        errors = []
-        section_timings = []
-        citation_counter = 1  # Global counter for citations
-
-        # Group chunks by (doc_id, section_heading) to process sections
-        chunks_by_section = {}
-        for chunk in all_chunks_global:
-            doc_id = chunk.get('_doc_id')
-            section_heading = chunk.get('_section_heading')
-            section_key = (doc_id, section_heading)
-            if section_key not in chunks_by_section:
-                chunks_by_section[section_key] = []
-            chunks_by_section[section_key].append(chunk)
-
-        # Process sections in order (sorted by first chunk's chunk_id in each section)
-        sorted_sections = sorted(chunks_by_section.items(),
-                                 key=lambda x: x[1][0].get('chunk_id', '') or '' if x[1] else '')
-
-        # Collect all keywords to query (primary + additional)
-        all_keywords = [keyword]
-        if additional_keywords:
-            all_keywords.extend([kw for kw in additional_keywords if kw and kw.strip() and kw.strip() != keyword.strip()])
-        
-        for (doc_id, section_heading), section_chunks in sorted_sections:
-            # Process this section with all keywords
-            result = _explain_single_section(
-                keyword=keyword,
-                doc_id=doc_id,
-                section_heading=section_heading,
-                hyde_query=hyde_query,
-                doc_name_map=doc_name_map,
-                detected_language=detected_language,
-                all_keywords=all_keywords,
-                hyde_queries=hyde_queries  # Pass all HYDE-expanded queries
-            )
-
-            if result.get('error'):
-                errors.append(
-                    f"{doc_name_map.get(doc_id, doc_id)} - {section_heading or 'No section'}: {result['error']}")
-
-            # Check if explanation exists and is not empty/whitespace
-            explanation_text = result.get('explanation')
-            if explanation_text and explanation_text.strip():
-                # Add citation to this section's explanation
-                explanation_with_citation = _add_citation_to_text(
-                    explanation_text, citation_counter)
-
-                # Build citation map for this section (use first chunk for citation info)
-                source_chunks = result.get('source_chunks', [])
-                if source_chunks:
-                    first_chunk = source_chunks[0]
-                    all_citations[citation_counter] = {
-                        'doc_id': doc_id,
-                        'doc_name': doc_name_map.get(doc_id, doc_id),
-                        'section_heading': first_chunk.get('section_heading'),
-                        'chunk_id': first_chunk.get('chunk_id', '')
-                    }
-
-                section_results.append({
-                    'doc_id': doc_id,
-                    'section_heading': section_heading,
-                    'explanation': explanation_with_citation,
-                    'source_chunks': source_chunks
-                })
-
-                # Increment citation counter for next LLM call
-                citation_counter += 1
-
-            # Collect section timing if available
-            if result.get('section_timing') is not None and result.get('section_label'):
-                section_timings.append({
-                    'label': result['section_label'],
-                    'time': result['section_timing']
-                })
-
-            # Collect source chunks
-            all_source_chunks.extend(result.get('source_chunks', []))
-
-        # Step 6: Combine all section explanations
-        if not section_results:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(
-                f"No explanations generated for keyword '{keyword}'. "
-                f"Processed {len(sorted_sections)} sections, "
-                f"found {len(all_source_chunks)} source chunks. "
-                f"Errors: {errors if errors else 'None'}"
-            )
+        plan = _prepare_explanation(keyword, selected_items, use_hyde, language, additional_keywords)
+        if 'result' in plan:
+            return plan['result']
+        sorted_sections = plan['sorted_sections']
 
-            error_msg = 'No explanations generated. '
-            if errors:
-                error_msg += 'Errors: ' + '; '.join(errors)
-            else:
-                error_msg += 'All generated explanations were filtered out or empty. This may indicate that the content does not match the keyword query.'
-
-            return {
-                'explanation': error_msg,
-                'source_chunks': all_source_chunks,
-                'hyde_query': hyde_query,
-                'language': detected_language,
-                'error': error_msg if errors else None
-            }
+        # Each section runs its keyword searches and one LLM completion; at most
+        # EXPLAINER_SECTION_CONCURRENCY run at once for this request, and every
+        # completion also takes a slot of the process-wide LLM limit
+        sections_start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(EXPLAINER_SECTION_CONCURRENCY, max(1, len(sorted_sections)))) as executor:
+            section_outputs = list(executor.map(_section_explainer(keyword, plan), sorted_sections))
+        sections_wall_time = round(time.perf_counter() - sections_start_time, 2)
 
-        # Combine explanations: renumber sections sequentially
-        # Use regex to find and renumber all section headers (format: "1. Section Title")
-        formatting_start_time = time.perf_counter()
-        section_number = 1
-        combined_parts = []
-
-        for section_result in section_results:
-            explanation_text = section_result['explanation']
-
-            # Pattern to match section headers: number followed by period and space
-            # Example: "1. Section Title" or "2. Another Section"
-            pattern = r'^(\d+)\.\s+(.+)$'
-
-            lines = explanation_text.split('\n')
-            processed_lines = []
-
-            for line in lines:
-                match = re.match(pattern, line.strip())
-                if match:
-                    # This is a section header - renumber it
-                    section_title = match.group(2)
-                    processed_lines.append(
-                        f"{section_number}. {section_title}")
-                    section_number += 1
-                else:
-                    # Regular content line - keep as is
-                    processed_lines.append(line)
-
-            # Add this section's explanation to combined parts
-            if processed_lines:
-                combined_parts.append('\n'.join(processed_lines))
+        return _combine_section_outputs(keyword, plan, section_outputs, sections_wall_time)
 
-        # Join all sections with double newlines
-        final_explanation = '\n\n'.join(combined_parts)
+    except Exception as e:
+        return _explanation_error(keyword, e)
 
-        # Post-process: Remove statements about missing information from combined explanation
-        final_explanation = _filter_missing_info_statements(final_explanation)
-        formatting_end_time = time.perf_counter()
-        formatting_time = round(formatting_end_time - formatting_start_time, 2)
 
-        return {
-            'explanation': final_explanation,
-            'source_chunks': all_source_chunks,
-            'hyde_query': hyde_query,
-            'language': detected_language,
-            'hyde_timing': hyde_timing,
-            'chunks_used': len(all_source_chunks),
-            'citations': all_citations,
-            'error': '; '.join(errors) if errors else None,
-            'timing_metadata': {
-                'hyde_expansion_time': hyde_expansion_time,
-                'section_timings': section_timings,
-                'formatting_time': formatting_time
+def explain_keyword_stream(
+    keyword: str,
+    selected_items: List[Dict[str, str]],
+    use_hyde: bool = True,
+    language: str = None,
+    additional_keywords: List[str] = None,
+) -> Generator[Dict[str, Any], None, None]:
+    """
+    Same as explain_keyword, but yields each section's explanation as soon as
+    its LLM call completes (in completion order), then the combined result.
+
+    Closing the generator early (e.g. the client disconnected) cancels the
+    sections that have not started yet; sections already running finish and
+    their results are dropped.
+
+    Yields:
+        {'type': 'section', 'position', 'total', 'doc_id', 'doc_name',
+         'section_heading', 'explanation', 'chunk_ids', 'time', 'error'}
+        per section ('position' is the section's place in the final,
+        sidebar-ordered explanation), then one {'type': 'summary', 'result'}
+        where 'result' is what explain_keyword returns
+    """
+    try:
+        plan = _prepare_explanation(keyword, selected_items, use_hyde, language, additional_keywords)
+    except Exception as e:
+        yield {'type': 'summary', 'result': _explanation_error(keyword, e)}
+        return
+    if 'result' in plan:
+        yield {'type': 'summary', 'result': plan['result']}
+        return
+    sorted_sections = plan['sorted_sections']
+    doc_name_map = plan['doc_name_map']
+
+    sections_start_time = time.perf_counter()
+    section_outputs = [None] * len(sorted_sections)
+    executor = ThreadPoolExecutor(max_workers=min(EXPLAINER_SECTION_CONCURRENCY, max(1, len(sorted_sections))))
+    try:
+        explain_section = _section_explainer(keyword, plan)
+        futures = {executor.submit(explain_section, section): position
+                   for position, section in enumerate(sorted_sections)}
+        for future in as_completed(futures):
+            position = futures[future]
+            result, section_latency = future.result()
+            section_outputs[position] = (result, section_latency)
+            (doc_id, section_heading), _ = sorted_sections[position]
+            explanation_text = result.get('explanation') or ''
+            yield {
+                'type': 'section',
+                'position': position,
+                'total': len(sorted_sections),
+                'doc_id': doc_id,
+                'doc_name': doc_name_map.get(doc_id, doc_id),
+                'section_heading': section_heading,
+                'explanation': _filter_missing_info_statements(explanation_text) if explanation_text.strip() else '',
+                'chunk_ids': [chunk.get('chunk_id') for chunk in result.get('source_chunks', [])],
+                'time': section_latency,
+                'error': result.get('error'),
             }
-        }
+    except Exception as e:
+        yield {'type': 'summary', 'result': _explanation_error(keyword, e)}
+        return
+    finally:
+        # Also runs when the consumer closes the generator mid-stream
+        executor.shutdown(wait=False, cancel_futures=True)
+    sections_wall_time = round(time.perf_counter() - sections_start_time, 2)
 
+    try:
+        result = _combine_section_outputs(keyword, plan, section_outputs, sections_wall_time)
     except Exception as e:
-        return {
-            'explanation': None,
-            'source_chunks': [],
-            'hyde_query': keyword,
-            'language': 'english',
-            'error': f'Error generating explanation: {str(e)}'
-        }
+        result = _explanation_error(keyword, e)
+    yield {'type': 'summary', 'result': result}
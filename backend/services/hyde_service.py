@@ -6,25 +6,25 @@ import os
 import time
 from typing import Tuple, Dict, Optional
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    OpenAI = None
+from backend.services.llm_provider import LLM_SLOTS
+from gdd_rag_backbone.llm_providers.client_registry import OPENAI_AVAILABLE, get_openai_client
+from gdd_rag_backbone.rag_backend.single_flight import coalesce, normalize_text_key
 
 # Get API key and base URL
 api_key = os.getenv('OPENAI_API_KEY') or os.getenv(
     'QWEN_API_KEY') or os.getenv('DASHSCOPE_API_KEY')
 if api_key and OPENAI_AVAILABLE:
     base_url = None
-    client = OpenAI(api_key=api_key, base_url=base_url)
+    client = get_openai_client(api_key, base_url)
 else:
     client = None
 
 # HYDE model
 _hyde_model = os.getenv('HYDE_MODEL', 'gpt-4o-mini')
 
+# Bump when the prompt below changes, so cached expansions are not reused
+HYDE_PROMPT_VERSION = 'hyde/v1'
+
 # HYDE System Prompt (adapted for general document search)
 HYDE_SYSTEM_PROMPT = '''You are a document search query rewriter for a RAG system.
 
@@ -49,6 +49,7 @@ Output format:
 - Do not include explanations, comments, or code blocks.'''
 
 
+@coalesce('hyde_expand_query', lambda query: normalize_text_key(query))
 def hyde_expand_query(query: str) -> Tuple[str, Dict]:
     """
     Generate HYDE expanded query for better retrieval.
@@ -65,32 +66,34 @@ def hyde_expand_query(query: str) -> Tuple[str, Dict]:
     start_time = time.time()
 
     try:
-        stream = client.chat.completions.create(
-            model=_hyde_model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": HYDE_SYSTEM_PROMPT
-                },
-                {
-                    "role": "user",
-                    "content": f"Rewrite this query for searching documents: {query}"
-                }
-            ],
-            stream=True,
-            temperature=0.3
-        )
-
-        first_token_time = None
-        token_count = 0
-        full_response = ""
-
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                if first_token_time is None:
-                    first_token_time = time.time() - start_time
-                token_count += 1
-                full_response += chunk.choices[0].delta.content
+        # Holds a slot of the process-wide LLM limit until the stream is consumed
+        with LLM_SLOTS:
+            stream = client.chat.completions.create(
+                model=_hyde_model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": HYDE_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Rewrite this query for searching documents: {query}"
+                    }
+                ],
+                stream=True,
+                temperature=0.3
+            )
+
+            first_token_time = None
+            token_count = 0
+            full_response = ""
+
+            for chunk in stream:
+                if chunk.choices[0].delta.content:
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                    token_count += 1
+                    full_response += chunk.choices[0].delta.content
 
         total_time = time.time() - start_time
 
@@ -105,3 +108,23 @@ def hyde_expand_query(query: str) -> Tuple[str, Dict]:
     except Exception as e:
         # Fallback to original query on error
         return query, {"total_time": 0, "error": str(e)}
+
+
+def hyde_expand_query_cached(query: str) -> Tuple[str, Dict]:
+    """
+    hyde_expand_query through the term cache, so the expansion of a keyword
+    is generated once and reused (failed expansions are not cached).
+
+    Returns:
+        (expanded_query, timing_info); timing_info has 'cached': True on a hit
+    """
+    from backend.storage.term_cache import get_term_cache
+    cache = get_term_cache()
+    provider = f"hyde:{_hyde_model}"
+    cached = cache.get(query, '', '', provider, HYDE_PROMPT_VERSION)
+    if cached is not None:
+        return cached, {"total_time": 0, "cached": True}
+    expanded, timing = hyde_expand_query(query)
+    if not timing.get("error") and expanded:
+        cache.put(query, '', '', provider, HYDE_PROMPT_VERSION, expanded)
+    return expanded, timing
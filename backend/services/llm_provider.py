@@ -4,16 +4,18 @@ Uses OpenAI-compatible APIs for both LLM and embeddings.
 """
 import os
 import logging
+import threading
 from typing import Optional, List
 
+from backend.shared.config import LLM_MAX_CONCURRENCY
+from backend.storage.embedding_index import CODE_INDEX, GDD_INDEX, check_query_embedding_model
+from gdd_rag_backbone.config import EMBEDDING_BACKEND
+from gdd_rag_backbone.llm_providers.client_registry import OPENAI_AVAILABLE, get_openai_client
+
 logger = logging.getLogger(__name__)
 
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    OpenAI = None
+# Process-wide cap on concurrent chat completions, shared by every provider instance
+LLM_SLOTS = threading.BoundedSemaphore(max(1, LLM_MAX_CONCURRENCY))
 
 
 class SimpleLLMProvider:
@@ -32,6 +34,10 @@ class SimpleLLMProvider:
             api_key: Optional API key (read from env if not provided)
             base_url: OpenAI-compatible API base URL
             model: Model name (OpenAI-compatible model)
+
+        Raises:
+            EmbeddingModelMismatch: If keyword_chunks or code_chunks was built
+                with another embedding model than this provider's
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -59,9 +65,19 @@ class SimpleLLMProvider:
         # Embedding model: prefer OpenAI embedding (e.g. text-embedding-3-small) when using OpenAI
         self.embedding_model = os.getenv("EMBEDDING_MODEL") or os.getenv(
             "OPENAI_EMBEDDING_MODEL") or "text-embedding-3-small"
+        # EMBEDDING_BACKEND=local: embed in-process on the CPU instead of via the API
+        self._local_embedder = None
+        if EMBEDDING_BACKEND == "local":
+            from gdd_rag_backbone.llm_providers.local_embedding_provider import get_local_embedding_provider
+            self._local_embedder = get_local_embedding_provider()
+            self.embedding_model = self._local_embedder.embedding_model
+        # Queries must be embedded like the indexes they are scored against
+        for index_name in (GDD_INDEX, CODE_INDEX):
+            check_query_embedding_model(index_name, self.embedding_model)
         logger.info(
             f"[LLM Provider] Using OpenAI-compatible endpoint: {self.base_url} model={self.model} embedding={self.embedding_model}")
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        # Shared client: reuses the process-wide keep-alive connection pool
+        self.client = get_openai_client(self.api_key, self.base_url)
 
     def embed(self, texts: List[str]) -> List[List[float]]:
         """
@@ -75,6 +91,8 @@ class SimpleLLMProvider:
         """
         if not texts:
             return []
+        if self._local_embedder is not None:
+            return self._local_embedder.embed(texts)
         try:
             response = self.client.embeddings.create(
                 model=self.embedding_model,
@@ -110,12 +128,26 @@ class SimpleLLMProvider:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+            with LLM_SLOTS:
+                response = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
             return response.choices[0].message.content.strip()
         except Exception as e:
             raise RuntimeError(f"LLM API error: {str(e)}") from e
+
+
+_default_provider: Optional[SimpleLLMProvider] = None
+_default_provider_lock = threading.Lock()
+
+
+def get_llm_provider() -> SimpleLLMProvider:
+    """Process-wide SimpleLLMProvider with the environment's key, endpoint and models."""
+    global _default_provider
+    with _default_provider_lock:
+        if _default_provider is None:
+            _default_provider = SimpleLLMProvider()
+        return _default_provider
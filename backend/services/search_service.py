@@ -1,10 +1,52 @@
 """
 Search service for keyword extractor - shared by Tab 1 and Tab 2.
-Uses keyword_search_documents RPC function.
+Searches the local FTS5 mirror of keyword_chunks while it is fresh (see
+backend/storage/keyword_fts_index.py); otherwise uses the
+keyword_search_documents RPC function (and keyword_search_documents_multi
+to search several terms in one round trip).
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
+from backend.shared.config import KEYWORD_FTS_ENABLED
 from backend.storage.supabase_client import get_supabase_client
 
+# Cleared when the database has no keyword_search_documents_multi RPC (pre-migration)
+_MULTI_RPC_AVAILABLE = True
+
+
+def _local_keyword_search(
+    keyword: str,
+    limit: int,
+    doc_id_filter: Optional[str],
+    match_any: bool = False
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Search the local FTS5 mirror (phrase matching, or any token with match_any).
+    
+    Returns:
+        The results, or None when the mirror is disabled, stale or cannot
+        answer the query (the caller then uses the RPC)
+    """
+    if not KEYWORD_FTS_ENABLED:
+        return None
+    import logging
+    import time
+    logger = logging.getLogger(__name__)
+    try:
+        from backend.storage.keyword_fts_index import get_keyword_fts_index
+        index = get_keyword_fts_index()
+        if not index.is_fresh():
+            return None
+        start_time = time.perf_counter()
+        results = index.search(keyword, limit, doc_id_filter, match_any)
+        if results is not None:
+            logger.info(f"[KEYWORD SEARCH] Local FTS: {len(results)} results for '{keyword}' in "
+                        f"{(time.perf_counter() - start_time) * 1000:.1f}ms")
+        return results
+    except Exception as e:
+        logger.warning(f"[KEYWORD SEARCH] Local FTS search failed, using RPC: {e}")
+        return None
+
 
 def keyword_search(
     keyword: str,
@@ -39,6 +81,10 @@ def keyword_search(
     keyword_stripped = keyword.strip()
     logger.info(f"[KEYWORD SEARCH] Stripped keyword: '{keyword_stripped}'")
     
+    local_results = _local_keyword_search(keyword_stripped, limit, doc_id_filter)
+    if local_results is not None:
+        return local_results
+    
     try:
         logger.info("[KEYWORD SEARCH] Getting Supabase client")
         client = get_supabase_client()
@@ -118,7 +164,79 @@ def keyword_search(
         return []
 
 
-
-
-
-
+def keyword_search_multi(
+    keywords: List[str],
+    limit: int = 100,
+    doc_id_filter: Optional[str] = None,
+    section_filter: Optional[str] = None,
+    match_any: bool = False,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search several keywords in one round trip.
+    Each keyword is matched and ranked exactly as keyword_search would.
+    
+    Args:
+        keywords: Search keywords (stripped; blanks and duplicates are skipped)
+        limit: Maximum number of results per keyword
+        doc_id_filter: Optional document ID to filter by
+        section_filter: Optional section heading; only hits in that section are kept
+        match_any: Rank chunks containing any token of a keyword (for scoring
+            long queries, not for existence checks); only the local mirror
+            supports it, the RPC fallback keeps its own matching
+    
+    Returns:
+        Dict of stripped keyword -> its results (same fields as keyword_search,
+        plus 'matched_term'); every searched keyword has an entry
+    """
+    global _MULTI_RPC_AVAILABLE
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    terms = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    results: Dict[str, List[Dict[str, Any]]] = {term: [] for term in terms}
+    if not terms:
+        return results
+    
+    # Fresh local mirror: every term is a local query, no round trip at all
+    local_results = {term: _local_keyword_search(term, limit, doc_id_filter, match_any)
+                     for term in terms}
+    if all(hits is not None for hits in local_results.values()):
+        for term, hits in local_results.items():
+            results[term] = [
+                dict(hit, matched_term=term) for hit in hits
+                if section_filter is None or hit.get('section_heading') == section_filter
+            ]
+        return results
+    
+    if _MULTI_RPC_AVAILABLE:
+        try:
+            import time
+            start_time = time.time()
+            client = get_supabase_client()
+            response = client.rpc('keyword_search_documents_multi', {
+                'search_terms': terms,
+                'match_count': limit,
+                'doc_id_filter': doc_id_filter,
+                'section_filter': section_filter,
+            }).execute()
+            for row in response.data or []:
+                results.setdefault(row.get('matched_term'), []).append(row)
+            logger.info(f"[KEYWORD SEARCH MULTI] {len(terms)} terms in {time.time() - start_time:.2f}s: " +
+                        ", ".join(f"'{term}'={len(hits)}" for term, hits in results.items()))
+            return results
+        except Exception as e:
+            if 'keyword_search_documents_multi' not in str(e) and 'PGRST202' not in str(e):
+                logger.error(f"[KEYWORD SEARCH MULTI] RPC call failed: {e}")
+                return results
+            _MULTI_RPC_AVAILABLE = False
+            logger.warning(f"[KEYWORD SEARCH MULTI] keyword_search_documents_multi RPC not available, using per-term searches: {e}")
+    
+    # Pre-migration fallback: one keyword_search per term, run concurrently
+    with ThreadPoolExecutor(max_workers=min(8, len(terms))) as executor:
+        per_term = list(executor.map(lambda term: keyword_search(term, limit, doc_id_filter), terms))
+    for term, hits in zip(terms, per_term):
+        results[term] = [
+            dict(hit, matched_term=term) for hit in hits
+            if section_filter is None or hit.get('section_heading') == section_filter
+        ]
+    return results
@@ -6,15 +6,26 @@ Based on test_google_translate.py and test_synonym_english.py
 """
 import logging
 import re
+import time
 from typing import Dict, List, Optional, Any, Tuple
 from itertools import product
 
+from gdd_rag_backbone.rag_backend.single_flight import coalesce
+
 logger = logging.getLogger(__name__)
 
 # Global cached WordNet instance (loaded once at startup)
 _WORDNET_CACHE = None
 _WORDNET_LOAD_ATTEMPTED = False
 
+# Term cache keys (bump a version when the call or its output format changes)
+_TRANSLATE_PROVIDER = 'google'
+_TRANSLATE_VERSION = 'translate/v1'
+_WORDNET_PROVIDER = 'wordnet'
+_WORDNET_VERSION = 'synonyms/v1'
+# Seconds the prewarm waits for the keyword search mirror before scanning Supabase
+_PREWARM_MIRROR_WAIT = 300
+
 _VIETNAMESE_CHARS_PATTERN = re.compile(
     r'[àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđĐ]',
     re.IGNORECASE
@@ -53,6 +64,7 @@ def detect_language_local(text: str) -> str:
         return 'vi' if _VIETNAMESE_CHARS_PATTERN.search(text) else 'en'
 
 
+@coalesce('translate_with_google', lambda text, target_language=None: (text, target_language))
 def translate_with_google(text: str, target_language: Optional[str] = None) -> Dict[str, Any]:
     """
     Translate text using free Google Translate API (no API key needed).
@@ -67,8 +79,6 @@ def translate_with_google(text: str, target_language: Optional[str] = None) -> D
         dict with translation results
     """
     try:
-        from deep_translator import GoogleTranslator
-
         # Detect source language locally first
         detected_lang = detect_language_local(text)
 
@@ -79,6 +89,16 @@ def translate_with_google(text: str, target_language: Optional[str] = None) -> D
             else:
                 target_language = 'vi'
 
+        # Cache key uses the local detection (the translator may refine detected_lang)
+        source_language = detected_lang
+        from backend.storage.term_cache import get_term_cache
+        cached = get_term_cache().get(text, source_language, target_language,
+                                      _TRANSLATE_PROVIDER, _TRANSLATE_VERSION)
+        if cached is not None:
+            return dict(cached, original_text=text)
+
+        from deep_translator import GoogleTranslator
+
         translator = GoogleTranslator(source='auto', target=target_language)
         translated_text = translator.translate(text)
 
@@ -91,13 +111,16 @@ def translate_with_google(text: str, target_language: Optional[str] = None) -> D
             # Detection failure is non-critical, use local detection
             pass
 
-        return {
+        result = {
             'original_text': text,
             'translated_text': translated_text,
             'detected_language': detected_lang,
             'target_language': target_language,
             'success': True
         }
+        get_term_cache().put(text, source_language, target_language,
+                             _TRANSLATE_PROVIDER, _TRANSLATE_VERSION, result)
+        return result
 
     except ImportError:
         return {
@@ -248,11 +271,20 @@ def get_synonyms_for_word(word: str, max_synonyms: int = 3) -> List[str]:
     Returns:
         List of synonyms
     """
+    from backend.storage.term_cache import get_term_cache
+    cache = get_term_cache()
+    version = f"{_WORDNET_VERSION}/max{max_synonyms}"
+    cached = cache.get(word, 'en', 'en', _WORDNET_PROVIDER, version)
+    if cached is not None:
+        return cached
+
     wordnet = setup_nltk()
     if not wordnet:
         return []
 
-    return get_english_synonyms_wordnet(word, wordnet, max_synonyms)
+    synonyms = get_english_synonyms_wordnet(word, wordnet, max_synonyms)
+    cache.put(word, 'en', 'en', _WORDNET_PROVIDER, version, synonyms)
+    return synonyms
 
 
 def parse_phrase(phrase: str) -> List[str]:
@@ -424,3 +456,81 @@ def auto_translate_and_find_synonyms(keyword: str) -> Dict[str, Any]:
         'all_search_terms': all_search_terms,
         'success': True
     }
+
+
+def _prewarm_section_headings() -> List[str]:
+    """Section headings of keyword documents, from the search mirror when it loads."""
+    from backend.shared.config import KEYWORD_FTS_ENABLED
+    if KEYWORD_FTS_ENABLED:
+        from backend.storage.keyword_fts_index import get_keyword_fts_index
+        index = get_keyword_fts_index()
+        if index.wait_until_ready(timeout=_PREWARM_MIRROR_WAIT):
+            return index.section_headings()
+        logger.info("[TERM CACHE] Keyword search mirror not loaded; reading headings from Supabase")
+    from backend.storage.supabase_client import get_keyword_section_headings
+    return get_keyword_section_headings()
+
+
+def prewarm_term_cache(limit: Optional[int] = None) -> int:
+    """
+    Translate and find synonyms for the terms explainer searches are made of
+    (alias keywords and aliases, then document section headings), so their
+    searches are served from the term cache without external calls.
+    Terms already cached cost only a local lookup. Only the process holding
+    the prewarm lock runs it; the others return 0 at once. Headings come from
+    the keyword search mirror once it is loaded, so keyword_chunks is not
+    scanned a second time.
+
+    Args:
+        limit: Maximum number of terms (default TERM_CACHE_PREWARM_LIMIT)
+
+    Returns:
+        Number of terms processed
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.shared.config import TERM_CACHE_PREWARM_LIMIT
+    from backend.storage.term_cache import acquire_prewarm_lock, get_term_cache
+
+    limit = TERM_CACHE_PREWARM_LIMIT if limit is None else limit
+    if limit <= 0:
+        return 0
+    if not acquire_prewarm_lock():
+        logger.info("[TERM CACHE] Another process is prewarming the term cache; skipping")
+        return 0
+
+    removed = get_term_cache().purge_expired()
+    if removed:
+        logger.info(f"[TERM CACHE] Purged {removed} expired entries")
+
+    terms = []
+    try:
+        from backend.storage.keyword_storage import list_all_aliases
+        for row in list_all_aliases():
+            terms.extend([row.get('keyword'), row.get('alias')])
+    except Exception as e:
+        logger.warning(f"[TERM CACHE] Could not load aliases for prewarming: {e}")
+    try:
+        for heading in _prewarm_section_headings():
+            # "4.2. Thành phần" -> "Thành phần"; long headings are not search terms
+            heading = re.sub(r'^[\d.\s]+', '', heading).strip()
+            if len(heading) <= 60:
+                terms.append(heading)
+    except Exception as e:
+        logger.warning(f"[TERM CACHE] Could not load section headings for prewarming: {e}")
+
+    terms = _deduplicate_search_terms(terms)[:limit]
+    if not terms:
+        return 0
+
+    def warm(term: str) -> None:
+        try:
+            auto_translate_and_find_synonyms(term)
+        except Exception as e:
+            logger.debug(f"[TERM CACHE] Prewarm failed for '{term}': {e}")
+
+    started = time.perf_counter()
+    # Few workers: the free translation endpoint rate-limits bursts
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(warm, terms))
+    logger.info(f"[TERM CACHE] Prewarmed {len(terms)} terms in {time.perf_counter() - started:.1f}s")
+    return len(terms)
@@ -33,6 +33,23 @@ DEFAULT_EMBEDDING_MODEL = os.getenv(
 CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', 500))
 CHUNK_OVERLAP = float(os.getenv('CHUNK_OVERLAP', 0.15))
 
+# Ingest pipeline (chunk -> embed -> write)
+INGEST_EMBED_BATCH_SIZE = int(os.getenv('INGEST_EMBED_BATCH_SIZE', 16))
+INGEST_WRITE_BATCH_SIZE = int(os.getenv('INGEST_WRITE_BATCH_SIZE', 100))
+INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', 4))
+# Max estimated tokens per embedding request (a batch closes at whichever limit comes first)
+INGEST_EMBED_TOKEN_BUDGET = int(os.getenv('INGEST_EMBED_TOKEN_BUDGET', 8000))
+
+# LLM concurrency: completions in flight across the whole process, and
+# sections explained in parallel within one explainer request
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+EXPLAINER_SECTION_CONCURRENCY = int(os.getenv('EXPLAINER_SECTION_CONCURRENCY', 4))
+
+# Explainer keyword search pipeline: deadline (seconds) of each concurrent
+# stage (DB search, translation, aliases, synonyms) and of the LLM deep search
+EXPLAINER_SEARCH_STAGE_TIMEOUT = float(os.getenv('EXPLAINER_SEARCH_STAGE_TIMEOUT', 15))
+EXPLAINER_DEEP_SEARCH_TIMEOUT = float(os.getenv('EXPLAINER_DEEP_SEARCH_TIMEOUT', 60))
+
 # Redis configuration (optional)
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
@@ -43,6 +60,48 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 DATA_DIR = PROJECT_ROOT / 'data'
 DATA_DIR.mkdir(exist_ok=True)
 
+# Local code symbol index (SQLite; mirrored to the Supabase code_symbols table)
+CODE_SYMBOL_INDEX_PATH = os.getenv(
+    'CODE_SYMBOL_INDEX_PATH', str(DATA_DIR / 'code_symbols.sqlite'))
+
+# Content-addressed store of original code file bytes (mirrored to Supabase storage)
+CODE_BLOB_DIR = os.getenv('CODE_BLOB_DIR', str(DATA_DIR / 'code_blobs'))
+CODE_BLOB_BUCKET = os.getenv('CODE_BLOB_BUCKET', 'code_blobs')
+
+# In-memory index of code_files paths; reloaded after this many seconds
+CODE_PATH_INDEX_TTL = float(os.getenv('CODE_PATH_INDEX_TTL', 300))
+
+# In-memory keyword alias graph: how often to check the keyword_aliases data
+# version, and the reload interval when the data_versions table is missing
+ALIAS_GRAPH_VERSION_CHECK_INTERVAL = float(os.getenv('ALIAS_GRAPH_VERSION_CHECK_INTERVAL', 5))
+ALIAS_GRAPH_TTL = float(os.getenv('ALIAS_GRAPH_TTL', 300))
+
+# Persistent cache of translations, synonyms and deep-search LLM outputs per term
+TERM_CACHE_PATH = os.getenv('TERM_CACHE_PATH', str(DATA_DIR / 'term_cache.sqlite'))
+TERM_CACHE_TTL = float(os.getenv('TERM_CACHE_TTL', 30 * 24 * 3600))
+# Terms (aliases, then section headings) translated at startup; 0 disables prewarming
+TERM_CACHE_PREWARM_LIMIT = int(os.getenv('TERM_CACHE_PREWARM_LIMIT', 2000))
+
+# Local SQLite FTS5 mirror of keyword_chunks used by keyword_search. Its
+# keyword_chunks data version is checked at most every CHECK_INTERVAL
+# seconds; without the data_versions table the mirror is trusted for
+# MAX_AGE seconds after a rebuild
+KEYWORD_FTS_ENABLED = os.getenv('KEYWORD_FTS_ENABLED', 'true').lower() == 'true'
+KEYWORD_FTS_INDEX_PATH = os.getenv('KEYWORD_FTS_INDEX_PATH', str(DATA_DIR / 'keyword_fts.sqlite'))
+KEYWORD_FTS_VERSION_CHECK_INTERVAL = float(os.getenv('KEYWORD_FTS_VERSION_CHECK_INTERVAL', 5))
+KEYWORD_FTS_MAX_AGE = float(os.getenv('KEYWORD_FTS_MAX_AGE', 600))
+
+# Persistent cache of per-section keyword explanations (Document Explainer)
+EXPLANATION_CACHE_PATH = os.getenv('EXPLANATION_CACHE_PATH', str(DATA_DIR / 'explanation_cache.sqlite'))
+EXPLANATION_CACHE_TTL = float(os.getenv('EXPLANATION_CACHE_TTL', 7 * 24 * 3600))
+
+# In-memory semantic cache of GDD Q&A answers: a question is answered from a
+# cached one when their embeddings' cosine similarity is at least THRESHOLD
+ANSWER_CACHE_ENABLED = os.getenv('ANSWER_CACHE_ENABLED', 'true').lower() == 'true'
+ANSWER_CACHE_THRESHOLD = float(os.getenv('ANSWER_CACHE_THRESHOLD', 0.93))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', 2000))
+ANSWER_CACHE_TTL = float(os.getenv('ANSWER_CACHE_TTL', 24 * 3600))
+
 
 def validate_config():
     """Validate that required configuration is present"""
@@ -0,0 +1,219 @@
+"""
+In-memory keyword alias graph for keyword search and deep search.
+
+keyword_aliases rows are loaded once per process into dicts keyed by the
+normalized form of each term (NFC, lowercase, collapsed whitespace), so
+keyword -> aliases and alias -> keyword lookups are dict hits instead of
+table queries, and a token index answers "which keywords or aliases occur
+in this phrase" without scanning every alias.
+
+The graph is reloaded only when the keyword_aliases data version changes.
+The /api/manage/aliases endpoints bump it after every mutation (see
+migration 006_data_versions.sql); other processes notice within
+ALIAS_GRAPH_VERSION_CHECK_INTERVAL seconds. Without the data_versions
+table the graph is reloaded every ALIAS_GRAPH_TTL seconds instead.
+"""
+
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional, Set
+
+from backend.shared.config import ALIAS_GRAPH_TTL, ALIAS_GRAPH_VERSION_CHECK_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+ALIAS_VERSION_NAME = 'keyword_aliases'
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def normalize_term(term: str) -> str:
+    """NFC, lowercase and single spaces ("Xe  Tăng " -> "xe tăng")."""
+    return ' '.join(unicodedata.normalize('NFC', term or '').lower().split())
+
+
+def _tokens(normalized: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(normalized)
+
+
+class _Graph:
+    """One loaded copy of keyword_aliases; never mutated after build."""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        # normalized keyword -> normalized alias -> row (and the reverse)
+        self.aliases_of: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.keywords_of: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # token -> normalized keywords/aliases containing it
+        self.token_index: Dict[str, Set[str]] = {}
+        for row in rows:
+            keyword = normalize_term(row.get('keyword', ''))
+            alias = normalize_term(row.get('alias', ''))
+            if not keyword or not alias:
+                continue
+            self.aliases_of.setdefault(keyword, {})[alias] = row
+            self.keywords_of.setdefault(alias, {})[keyword] = row
+            for term in (keyword, alias):
+                for token in _tokens(term):
+                    self.token_index.setdefault(token, set()).add(term)
+
+
+class AliasGraph:
+    """Bidirectional keyword <-> alias lookups; safe to share between threads."""
+
+    def __init__(self, check_interval: float = ALIAS_GRAPH_VERSION_CHECK_INTERVAL,
+                 ttl: float = ALIAS_GRAPH_TTL):
+        self.check_interval = check_interval
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._graph: Optional[_Graph] = None
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._stale = False
+
+    def load(self, rows: List[Dict[str, Any]], version: Optional[int] = None) -> None:
+        """Replace the graph with the given keyword_aliases rows."""
+        graph = _Graph(rows)
+        now = time.monotonic()
+        self._graph, self._version, self._stale = graph, version, False
+        self._loaded_at = self._checked_at = now
+
+    def refresh(self, version: Optional[int] = None) -> None:
+        """Reload all rows from keyword_aliases."""
+        from backend.storage.keyword_storage import list_all_aliases
+        started = time.perf_counter()
+        rows = list_all_aliases()
+        self.load(rows, version)
+        logger.info(f"[Alias Graph] Loaded {len(rows)} aliases (version {version}) in "
+                    f"{(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def invalidate(self) -> None:
+        """Reload on the next lookup (after a mutation in this process)."""
+        self._stale = True
+
+    def mark_changed(self) -> None:
+        """Record an alias mutation: bump the shared version so every process reloads."""
+        try:
+            from backend.storage.supabase_client import bump_data_version
+            bump_data_version(ALIAS_VERSION_NAME)
+        except Exception as e:
+            logger.warning(f"[Alias Graph] Could not bump the alias version: {e}")
+        self.invalidate()
+
+    def _ensure_fresh(self) -> _Graph:
+        if self._graph is not None and not self._stale and time.monotonic() - self._checked_at < self.check_interval:
+            return self._graph
+        with self._lock:
+            if self._graph is not None and not self._stale and time.monotonic() - self._checked_at < self.check_interval:
+                return self._graph
+            try:
+                from backend.storage.supabase_client import get_data_version
+                try:
+                    version = get_data_version(ALIAS_VERSION_NAME)
+                except Exception as e:
+                    logger.debug(f"[Alias Graph] Data version unavailable, reloading on TTL: {e}")
+                    version = None
+                if self._graph is None or self._stale:
+                    stale = True
+                elif version is None:
+                    stale = time.monotonic() - self._loaded_at > self.ttl
+                else:
+                    stale = version != self._version
+                if stale:
+                    self.refresh(version)
+                else:
+                    self._checked_at = time.monotonic()
+            except Exception as e:
+                if self._graph is None:
+                    raise
+                # Keep serving the loaded graph; try again after the check interval
+                logger.warning(f"[Alias Graph] Could not reload aliases: {e}")
+                self._checked_at = time.monotonic()
+        return self._graph
+
+    def find_keyword_by_alias(self, alias: str) -> List[Dict[str, Any]]:
+        """
+        Keywords this term is an alias of, plus the aliases of the term when it
+        is itself a keyword (same result shape as keyword_storage.find_keyword_by_alias).
+
+        Returns:
+            List of dicts with keyword, alias, and language info (unique by keyword)
+        """
+        graph = self._ensure_fresh()
+        term = normalize_term(alias)
+        matches = []
+        for row in graph.keywords_of.get(term, {}).values():
+            matches.append({'keyword': row['keyword'], 'alias': row['alias'], 'language': row.get('language')})
+        for row in graph.aliases_of.get(term, {}).values():
+            # Reverse: alias becomes keyword
+            matches.append({'keyword': row['alias'], 'alias': row['keyword'], 'language': row.get('language')})
+        unique_matches = {}
+        for match in matches:
+            unique_matches.setdefault(match['keyword'], match)
+        return list(unique_matches.values())
+
+    def get_aliases_for_keyword(self, keyword: str) -> List[str]:
+        """Aliases of a keyword, and keywords the term is an alias of (bidirectional)."""
+        graph = self._ensure_fresh()
+        term = normalize_term(keyword)
+        aliases = [row['alias'] for row in graph.aliases_of.get(term, {}).values()]
+        aliases.extend(row['keyword'] for row in graph.keywords_of.get(term, {}).values())
+        return list(dict.fromkeys(aliases))
+
+    def is_keyword(self, term: str) -> bool:
+        """Whether the term is a main keyword (has at least one alias row)."""
+        return normalize_term(term) in self._ensure_fresh().aliases_of
+
+    def keywords_for_term(self, term: str) -> List[str]:
+        """Main keywords the term is (the keyword itself, or one of its aliases)."""
+        graph = self._ensure_fresh()
+        return list(dict.fromkeys(self._keywords_of_term(graph, normalize_term(term))))
+
+    def keywords_in_text(self, text: str) -> List[str]:
+        """
+        Main keywords whose keyword or alias occurs in the text as whole words
+        ("xe tăng hạng nặng" -> the keyword of alias "xe tăng").
+        """
+        graph = self._ensure_fresh()
+        normalized = normalize_term(text)
+        text_tokens = _tokens(normalized)
+        if not text_tokens:
+            return []
+        padded = f" {' '.join(text_tokens)} "
+        candidates: Set[str] = set()
+        for token in set(text_tokens):
+            candidates.update(graph.token_index.get(token, ()))
+        keywords = []
+        for term in sorted(candidates):
+            if f" {' '.join(_tokens(term))} " in padded:
+                keywords.extend(self._keywords_of_term(graph, term))
+        return list(dict.fromkeys(keywords))
+
+    @staticmethod
+    def _keywords_of_term(graph: _Graph, term: str) -> List[str]:
+        keywords = []
+        if term in graph.aliases_of:
+            keywords.append(next(iter(graph.aliases_of[term].values()))['keyword'])
+        keywords.extend(row['keyword'] for row in graph.keywords_of.get(term, {}).values())
+        return keywords
+
+    def keywords(self) -> List[str]:
+        """All main keywords, sorted."""
+        graph = self._ensure_fresh()
+        return sorted({next(iter(aliases.values()))['keyword'] for aliases in graph.aliases_of.values()})
+
+
+_graph: Optional[AliasGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_alias_graph() -> AliasGraph:
+    """Process-wide alias graph (loaded from keyword_aliases on first lookup)."""
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            _graph = AliasGraph()
+        return _graph
@@ -0,0 +1,198 @@
+"""
+In-memory semantic cache of GDD Q&A answers.
+
+Many questions are paraphrases of each other ("how does the tank upgrade
+work" / "tank upgrade mechanics"), yet each one pays for HYDE, retrieval
+and an answer LLM call. Answers are therefore cached with the embedding of
+their question, and a new question is answered from the most similar
+cached one when their cosine similarity is at least ANSWER_CACHE_THRESHOLD.
+
+Entries are grouped in scopes: the documents queried, the answer language,
+the answer prompt version and the embedding model. Each scope keeps its
+question vectors (unit-normalized) in one matrix, so a lookup is a single
+matrix-vector product.
+
+A scope also records the index versions of its documents (their
+'keyword_doc:<doc_id>' data versions, bumped by every keyword_chunks write
+of the document). When a lookup or write comes in with other versions,
+that is a re-index, and the scope is dropped. Entries expire after
+ANSWER_CACHE_TTL; past ANSWER_CACHE_MAX_ENTRIES the oldest ones are evicted.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from backend.shared.config import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_TTL,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class _Scope:
+    """Entries of one scope at one set of index versions."""
+
+    def __init__(self, versions: Tuple[int, ...]):
+        self.versions = versions
+        self.vectors: List[List[float]] = []
+        self.matrix = None  # numpy copy of vectors, rebuilt lazily
+        self.entries: List[Dict[str, Any]] = []
+
+    def add(self, vector: List[float], entry: Dict[str, Any]) -> None:
+        self.vectors.append(vector)
+        self.entries.append(entry)
+        self.matrix = None
+
+    def drop(self, indexes: Sequence[int]) -> None:
+        drop = set(indexes)
+        self.vectors = [v for i, v in enumerate(self.vectors) if i not in drop]
+        self.entries = [e for i, e in enumerate(self.entries) if i not in drop]
+        self.matrix = None
+
+    def similarities(self, vector: List[float]) -> List[float]:
+        if np is not None:
+            if self.matrix is None:
+                self.matrix = np.asarray(self.vectors, dtype=np.float32)
+            return (self.matrix @ np.asarray(vector, dtype=np.float32)).tolist()
+        return [sum(a * b for a, b in zip(row, vector)) for row in self.vectors]
+
+
+class AnswerCache:
+    """Question-embedding keyed answer cache; safe to share between threads."""
+
+    def __init__(
+        self,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl: float = ANSWER_CACHE_TTL,
+    ):
+        self.threshold = threshold
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._scopes: Dict[Hashable, _Scope] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def scope_key(doc_ids: Sequence[str], language: Optional[str], prompt_version: str,
+                  embedding_model: Optional[str]) -> Tuple:
+        return tuple(sorted(set(doc_ids))), language, prompt_version, embedding_model
+
+    def _current_scope(self, key: Tuple, versions: Tuple[int, ...]) -> Optional[_Scope]:
+        scope = self._scopes.get(key)
+        if scope is not None and scope.versions != versions:
+            # A document of the scope was re-indexed
+            self._size -= len(scope.entries)
+            del self._scopes[key]
+            scope = None
+        return scope
+
+    def lookup(
+        self,
+        embedding: Sequence[float],
+        key: Tuple,
+        versions: Tuple[int, ...],
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Most similar cached answer of the scope, if similar enough.
+
+        Args:
+            embedding: Question embedding
+            key: scope_key(doc_ids, language, prompt_version, embedding_model)
+            versions: Current index versions of the scope's documents (in the key's order)
+
+        Returns:
+            (cached value, cosine similarity), or None
+        """
+        vector = _unit(embedding)
+        now = time.time()
+        with self._lock:
+            scope = self._current_scope(key, versions)
+            best, best_index = -1.0, None
+            if scope is not None and scope.entries:
+                expired = [i for i, e in enumerate(scope.entries) if now - e['created_at'] > self.ttl]
+                if expired:
+                    scope.drop(expired)
+                    self._size -= len(expired)
+                if scope.entries:
+                    similarities = scope.similarities(vector)
+                    best_index = max(range(len(similarities)), key=similarities.__getitem__)
+                    best = similarities[best_index]
+            if best_index is None or best < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = scope.entries[best_index]
+            return entry['value'], best
+
+    def put(self, embedding: Sequence[float], key: Tuple, versions: Tuple[int, ...], value: Dict[str, Any]) -> None:
+        """Cache a value (treated as immutable) for a question embedding."""
+        vector = _unit(embedding)
+        with self._lock:
+            scope = self._current_scope(key, versions)
+            if scope is None:
+                scope = self._scopes[key] = _Scope(versions)
+            scope.add(vector, {'value': value, 'created_at': time.time()})
+            self._size += 1
+            while self._size > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        oldest_key = min(
+            (k for k, s in self._scopes.items() if s.entries),
+            key=lambda k: self._scopes[k].entries[0]['created_at'],
+        )
+        scope = self._scopes[oldest_key]
+        scope.drop([0])
+        self._size -= 1
+        if not scope.entries:
+            del self._scopes[oldest_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': ANSWER_CACHE_ENABLED,
+                'threshold': self.threshold,
+                'entries': self._size,
+                'scopes': len(self._scopes),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnswerCache()
+        return _cache
@@ -0,0 +1,191 @@
+"""
+Content-addressed store for original code file bytes.
+
+Each uploaded file is stored once per content hash (the sha256 recorded in
+code_files.content_hash), zlib-compressed, under CODE_BLOB_DIR, and mirrored
+to the Supabase storage bucket CODE_BLOB_BUCKET. "Extract full code" and file
+previews read the original bytes back with a single blob read instead of
+stitching class/method chunks together; a local miss is filled from the
+mirror (e.g. after a redeploy with an empty disk).
+
+Blob format: 8-byte big-endian uncompressed size, then a zlib stream. The
+size header lets byte ranges be served without decompressing the whole file,
+and decompression stops as soon as the requested range is complete.
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from backend.shared.config import CODE_BLOB_DIR
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>Q')
+_READ_SIZE = 64 * 1024
+
+
+def blob_hash(data: bytes) -> str:
+    """Content hash of a file (same as code_files.content_hash)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def encode_blob(data: bytes) -> bytes:
+    return _HEADER.pack(len(data)) + zlib.compress(data, 6)
+
+
+class CodeBlobStore:
+    """Local compressed blob directory with a Supabase storage mirror."""
+
+    def __init__(self, root: str = CODE_BLOB_DIR, mirror: bool = True):
+        self.root = Path(root)
+        self.mirror = mirror
+        self._lock = threading.Lock()
+
+    def _path(self, content_hash: str) -> Path:
+        return self.root / content_hash[:2] / f"{content_hash}.z"
+
+    def has(self, content_hash: str) -> bool:
+        return self._path(content_hash).exists()
+
+    def put(self, data: bytes, content_hash: Optional[str] = None) -> str:
+        """
+        Store file bytes (no-op when a blob with the same hash exists).
+
+        Returns:
+            The content hash
+        """
+        content_hash = content_hash or blob_hash(data)
+        if self.has(content_hash):
+            return content_hash
+        blob = encode_blob(data)
+        self._write_local(content_hash, blob)
+        if self.mirror:
+            try:
+                from backend.storage.supabase_client import upload_code_blob
+                upload_code_blob(content_hash, blob)
+            except Exception as e:
+                logger.warning(f"[Code Blobs] Mirror upload failed for {content_hash[:12]}: {e}")
+        return content_hash
+
+    def _write_local(self, content_hash: str, blob: bytes) -> None:
+        path = self._path(content_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename, so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _ensure_local(self, content_hash: str) -> Optional[Path]:
+        path = self._path(content_hash)
+        if path.exists():
+            return path
+        if not self.mirror:
+            return None
+        with self._lock:
+            if path.exists():
+                return path
+            try:
+                from backend.storage.supabase_client import download_code_blob
+                blob = download_code_blob(content_hash)
+            except Exception as e:
+                logger.warning(f"[Code Blobs] Mirror download failed for {content_hash[:12]}: {e}")
+                return None
+            if blob is None:
+                return None
+            self._write_local(content_hash, blob)
+        return path
+
+    def size(self, content_hash: str) -> Optional[int]:
+        """Uncompressed size of a blob, or None if it is not stored."""
+        path = self._ensure_local(content_hash)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            return _HEADER.unpack(f.read(_HEADER.size))[0]
+
+    def get(self, content_hash: str) -> Optional[bytes]:
+        """Full file bytes, or None if the blob is not stored."""
+        return self.read_range(content_hash, 0, None)
+
+    def read_range(self, content_hash: str, start: int, end: Optional[int]) -> Optional[bytes]:
+        """
+        Bytes [start, end) of a file (end=None reads to the end of the file).
+
+        Returns:
+            The bytes, or None if the blob is not stored
+        """
+        path = self._ensure_local(content_hash)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            total = _HEADER.unpack(f.read(_HEADER.size))[0]
+            end = total if end is None else min(end, total)
+            if start >= end:
+                return b''
+            decompressor = zlib.decompressobj()
+            parts = []
+            offset = 0
+            while offset < end:
+                compressed = f.read(_READ_SIZE)
+                if not compressed:
+                    chunk = decompressor.flush()
+                    if not chunk:
+                        break
+                else:
+                    chunk = decompressor.decompress(compressed)
+                chunk_end = offset + len(chunk)
+                if chunk_end > start:
+                    parts.append(chunk[max(start - offset, 0):end - offset])
+                offset = chunk_end
+        return b''.join(parts)
+
+
+_store: Optional[CodeBlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> CodeBlobStore:
+    """Process-wide blob store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CodeBlobStore()
+        return _store
+
+
+def read_code_file(file_path: str) -> Optional[bytes]:
+    """
+    Original bytes of an indexed code file, via its code_files.content_hash.
+
+    Returns:
+        The file bytes, or None when the file has no stored blob (e.g. it was
+        indexed before the blob store existed)
+    """
+    content_hash = code_file_hash(file_path)
+    return get_blob_store().get(content_hash) if content_hash else None
+
+
+def code_file_hash(file_path: str) -> Optional[str]:
+    """Content hash of an indexed file (local symbol index first, then code_files)."""
+    try:
+        from backend.storage.code_symbol_index import get_symbol_index
+        content_hash = get_symbol_index().get_content_hash(file_path)
+        if content_hash:
+            return content_hash
+    except Exception as e:
+        logger.debug(f"[Code Blobs] Symbol index lookup failed for {file_path}: {e}")
+    from backend.storage.supabase_client import get_code_file_hash
+    return get_code_file_hash(file_path)
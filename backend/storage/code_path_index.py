@@ -0,0 +1,200 @@
+"""
+In-memory index of indexed code file paths for Code Q&A.
+
+User-supplied file filters ("Tank.cs", "Scripts/Tank.cs", "scripts\\tank")
+are resolved to canonical code_files paths in memory, so direct file lookups
+need a single `in_('file_path', ...)` query instead of a cascade of ILIKE
+round trips.
+
+Paths are indexed by their normalized form (forward slashes, lowercase) and
+by a trie over their reversed path segments, which answers both basename and
+partial-path (suffix) lookups. The index is loaded from code_files on first
+use, updated in place by uploads and deletes in this process, and reloaded
+after CODE_PATH_INDEX_TTL seconds to pick up changes made by other workers.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from backend.shared.config import CODE_PATH_INDEX_TTL
+
+logger = logging.getLogger(__name__)
+
+# A miss reloads the index at most this often (a file may have just been
+# uploaded through another worker)
+_MISS_RELOAD_INTERVAL = 30.0
+
+
+def normalize_file_filter(path: str) -> str:
+    """Lowercase, forward slashes, no leading "./" or "/" and no empty segments."""
+    return '/'.join(part for part in path.replace('\\', '/').lower().split('/')
+                    if part and part != '.')
+
+
+class _SuffixNode:
+    __slots__ = ('children', 'paths')
+
+    def __init__(self):
+        self.children: Dict[str, '_SuffixNode'] = {}
+        # Canonical paths ending with the segments leading to this node
+        self.paths: Set[str] = set()
+
+
+class CodePathIndex:
+    """Resolves file filters to canonical code_files paths; safe to share between threads."""
+
+    def __init__(self, ttl: float = CODE_PATH_INDEX_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Serializes reloads, so concurrent lookups after the TTL share one
+        self._reload_lock = threading.Lock()
+        self._exact: Dict[str, Set[str]] = {}
+        self._suffixes = _SuffixNode()
+        self._stems: Dict[str, Set[str]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return sum(len(paths) for paths in self._exact.values())
+
+    def load(self, paths: Iterable[str]) -> None:
+        """Replace the index with the given canonical paths."""
+        exact: Dict[str, Set[str]] = {}
+        suffixes = _SuffixNode()
+        stems: Dict[str, Set[str]] = {}
+        for path in paths:
+            self._insert(path, exact, suffixes, stems)
+        with self._lock:
+            self._exact, self._suffixes, self._stems = exact, suffixes, stems
+            self._loaded_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """Reload all paths from code_files."""
+        from backend.storage.supabase_client import get_code_file_paths
+        started = time.perf_counter()
+        paths = get_code_file_paths()
+        self.load(paths)
+        logger.info(f"[Path Index] Loaded {len(paths)} code file paths in "
+                    f"{(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def add_paths(self, paths: Iterable[str]) -> None:
+        """Register uploaded paths (no-op for paths already indexed)."""
+        with self._lock:
+            for path in paths:
+                self._insert(path, self._exact, self._suffixes, self._stems)
+
+    def remove_path(self, path: str) -> None:
+        with self._lock:
+            normalized = normalize_file_filter(path)
+            self._discard(self._exact, normalized, path)
+            segments = normalized.split('/')
+            node = self._suffixes
+            for segment in reversed(segments):
+                node = node.children.get(segment)
+                if node is None:
+                    break
+                node.paths.discard(path)
+            self._discard(self._stems, segments[-1].rsplit('.', 1)[0], path)
+
+    @staticmethod
+    def _discard(mapping: Dict[str, Set[str]], key: str, path: str) -> None:
+        paths = mapping.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del mapping[key]
+
+    @staticmethod
+    def _insert(path: str, exact: Dict[str, Set[str]], suffixes: _SuffixNode,
+                stems: Dict[str, Set[str]]) -> None:
+        normalized = normalize_file_filter(path)
+        if not normalized:
+            return
+        exact.setdefault(normalized, set()).add(path)
+        segments = normalized.split('/')
+        node = suffixes
+        for segment in reversed(segments):
+            node = node.children.setdefault(segment, _SuffixNode())
+            node.paths.add(path)
+        stems.setdefault(segments[-1].rsplit('.', 1)[0], set()).add(path)
+
+    def _needs_reload(self, force: bool) -> bool:
+        loaded_at = self._loaded_at
+        age = None if loaded_at is None else time.monotonic() - loaded_at
+        return age is None or age > self.ttl or (force and age > _MISS_RELOAD_INTERVAL)
+
+    def _ensure_fresh(self, force: bool = False) -> None:
+        if not self._needs_reload(force):
+            return
+        with self._reload_lock:
+            # Another lookup may have reloaded while this one waited
+            if not self._needs_reload(force):
+                return
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"[Path Index] Could not load code file paths: {e}")
+                # Keep serving what is loaded; do not retry on every lookup
+                # while the database is unreachable
+                self._loaded_at = time.monotonic() - self.ttl + _MISS_RELOAD_INTERVAL
+
+    def _lookup(self, file_filter: str) -> List[str]:
+        normalized = normalize_file_filter(file_filter)
+        if not normalized:
+            return []
+        with self._lock:
+            # 1) Exact path
+            if normalized in self._exact:
+                return sorted(self._exact[normalized])
+            # 2) Basename or partial path: every path ending with these segments
+            node = self._suffixes
+            for segment in reversed(normalized.split('/')):
+                node = node.children.get(segment)
+                if node is None:
+                    break
+            else:
+                if node.paths:
+                    return sorted(node.paths)
+            # 3) Filename without extension ("Tank" -> ".../Tank.cs")
+            name = normalized.split('/')[-1]
+            if name in self._stems:
+                return sorted(self._stems[name])
+            # 4) Filename contained in a basename (the old ILIKE '%name%' match)
+            name = name.rsplit('.', 1)[0] if '.' in name else name
+            return sorted(path
+                          for basename, node in self._suffixes.children.items()
+                          if name in basename
+                          for path in node.paths)
+
+    def resolve(self, file_filter: str) -> List[str]:
+        """
+        Resolve one file filter to canonical paths.
+
+        Tries, in order: exact path, path suffix (which covers the basename),
+        filename without extension, and filename substring. The first tier
+        that matches wins; it may match several files.
+        """
+        self._ensure_fresh()
+        paths = self._lookup(file_filter)
+        if not paths:
+            self._ensure_fresh(force=True)
+            paths = self._lookup(file_filter)
+        return paths
+
+    def resolve_many(self, file_filters: Iterable[str]) -> Dict[str, List[str]]:
+        """Resolve several file filters; returns filter -> canonical paths."""
+        return {file_filter: self.resolve(file_filter) for file_filter in file_filters if file_filter}
+
+
+_index: Optional[CodePathIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_path_index() -> CodePathIndex:
+    """Process-wide path index (loaded from code_files on first lookup)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CodePathIndex()
+        return _index
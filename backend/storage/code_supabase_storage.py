@@ -3,10 +3,15 @@ Supabase storage adapter for Code Q&A
 Replaces LanceDB with Supabase for code chunk storage and retrieval
 """
 
+import hashlib
+import itertools
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Callable, Tuple
 
 # Add project root to path for imports
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
@@ -15,12 +20,31 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from backend.storage.supabase_client import (
     vector_search_code_chunks,
+    vector_search_code_chunks_multi,
     get_code_files,
-    insert_code_file,
-    insert_code_chunks,
+    upsert_code_files,
+    upsert_code_chunks,
+    get_code_chunk_keys,
+    update_code_chunk_metadata,
+    delete_code_chunks,
+    apply_code_chunk_changes,
 )
+from backend.storage.ingest_pipeline import run_ingest_pipeline, PipelineStats
+from backend.storage.code_path_index import get_path_index
+from backend.storage.embedding_index import CODE_INDEX, EmbeddingModelMismatch, guard_embed_batch
+from backend.storage.projections import CODE_CHUNK_CONTENT
 # Import from local gdd_rag_backbone (now included in unified_rag_app)
 from gdd_rag_backbone.llm_providers import QwenProvider, make_embedding_func
+from gdd_rag_backbone.llm_providers.rate_limiter import BACKGROUND, llm_priority
+
+# Cleared when the database has no match_code_chunks_multi RPC (pre-migration)
+_MULTI_RPC_AVAILABLE = True
+
+# Cleared when the database has no apply_code_chunk_changes RPC (pre-migration)
+_APPLY_CHANGES_RPC_AVAILABLE = True
+
+# Files registered / key-looked-up per round trip during code indexing
+CODE_FILE_GROUP_SIZE = 50
 
 # Check if Supabase is configured
 USE_SUPABASE = bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_KEY'))
@@ -86,6 +110,91 @@ def normalize_path_consistent(path: str) -> Optional[str]:
         return None
 
 
+def _filename_filters(file_paths: Optional[List[str]]) -> List[str]:
+    # Filter by filename only: the database stores full Windows-style paths
+    # that differ between local and server environments
+    filenames = []
+    for p in file_paths or []:
+        base = os.path.basename((p or '').replace('\\', '/'))
+        if base and base not in filenames:
+            filenames.append(base)
+    return filenames
+
+
+def search_code_chunks_multi(
+    query: str,
+    query_embedding: List[float],
+    limit: int = 20,
+    threshold: float = 0.2,
+    file_paths: Optional[List[str]] = None,
+    chunk_types: Optional[List[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Search code chunks of several types (and files) in a single round trip.
+    
+    Uses the match_code_chunks_multi RPC; if it is not installed, falls back
+    to one search per chunk type, issued concurrently.
+    
+    Args:
+        query: Original query text (for logging)
+        query_embedding: Query vector embedding
+        limit: Maximum number of results per chunk type
+        threshold: Similarity threshold
+        file_paths: Optional list of file paths to filter by (matched by filename)
+        chunk_types: Chunk types to search, e.g. ['method', 'class']
+    
+    Returns:
+        Dict of chunk_type -> matching chunks ranked by similarity; every
+        requested chunk type has an entry
+    """
+    global _MULTI_RPC_AVAILABLE
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    if not USE_SUPABASE:
+        raise ValueError("Supabase is not configured. Set SUPABASE_URL and SUPABASE_KEY in .env")
+    
+    chunk_types = list(chunk_types or [])
+    filenames = _filename_filters(file_paths)
+    if file_paths and not filenames:
+        logger.warning("[Code Search] WARNING: No valid filenames derived from file_paths. Falling back to search without file filter.")
+    
+    if _MULTI_RPC_AVAILABLE:
+        try:
+            grouped = vector_search_code_chunks_multi(
+                query_embedding=query_embedding,
+                limit=limit,
+                threshold=threshold,
+                file_paths=filenames or None,
+                chunk_types=chunk_types or None,
+            )
+            for chunk_type in chunk_types:
+                grouped.setdefault(chunk_type, [])
+            logger.info(f"[Code Search] Multi search (files={filenames or 'all'}): " +
+                        ", ".join(f"{t}={len(hits)}" for t, hits in grouped.items()))
+            return grouped
+        except Exception as e:
+            if 'match_code_chunks_multi' not in str(e) and 'PGRST202' not in str(e):
+                raise
+            _MULTI_RPC_AVAILABLE = False
+            logger.warning(f"[Code Search] match_code_chunks_multi RPC not available, using per-type searches: {e}")
+    
+    if not chunk_types:
+        results = _search_code_chunks_per_filter(query, query_embedding, limit, threshold, file_paths, None)
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for result in results:
+            grouped.setdefault(result.get('chunk_type'), []).append(result)
+        return grouped
+    
+    with ThreadPoolExecutor(max_workers=len(chunk_types)) as executor:
+        futures = {
+            chunk_type: executor.submit(
+                _search_code_chunks_per_filter, query, query_embedding, limit, threshold, file_paths, chunk_type)
+            for chunk_type in chunk_types
+        }
+        return {chunk_type: future.result() for chunk_type, future in futures.items()}
+
+
 def search_code_chunks_supabase(
     query: str,
     query_embedding: List[float],
@@ -108,8 +217,44 @@ def search_code_chunks_supabase(
     Returns:
         List of matching chunks with similarity scores
     """
-    if not USE_SUPABASE:
-        raise ValueError("Supabase is not configured. Set SUPABASE_URL and SUPABASE_KEY in .env")
+    grouped = search_code_chunks_multi(
+        query=query,
+        query_embedding=query_embedding,
+        limit=limit,
+        threshold=threshold,
+        file_paths=file_paths,
+        chunk_types=[chunk_type] if chunk_type else None,
+    )
+    results = [hit for hits in grouped.values() for hit in hits]
+    results.sort(key=lambda x: x.get('similarity', 0.0), reverse=True)
+    return results[:limit]
+
+
+def _search_code_chunks_per_filter(
+    query: str,
+    query_embedding: List[float],
+    limit: int = 20,
+    threshold: float = 0.2,
+    file_paths: Optional[List[str]] = None,
+    chunk_type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Search code chunks with one match_code_chunks RPC per filename filter.
+    Fallback for databases without match_code_chunks_multi.
+    
+    Args:
+        query: Original query text (for logging)
+        query_embedding: Query vector embedding (1024 dimensions)
+        limit: Maximum number of results
+        threshold: Similarity threshold
+        file_paths: Optional list of file paths to filter by
+        chunk_type: Optional chunk type ('method', 'class', 'struct', 'interface', 'enum')
+    
+    Returns:
+        List of matching chunks with similarity scores
+    """
+    import logging
+    logger = logging.getLogger(__name__)
     
     # Search for each file path if filters are provided
     all_results = []
@@ -198,8 +343,12 @@ def get_code_chunks_for_files(
     Get all chunks for specific files (direct lookup, not vector search).
     Useful for ensuring we get chunks from target files even if semantic search doesn't return them.
     
+    File filters are resolved to canonical code_files paths by the in-memory
+    path index (exact path, path suffix / basename, name without extension,
+    name substring), so the chunks come from a single query.
+    
     Args:
-        file_paths: List of file paths
+        file_paths: List of file paths or file names
         chunk_type: Optional chunk type filter
     
     Returns:
@@ -212,114 +361,26 @@ def get_code_chunks_for_files(
         import logging
         logger = logging.getLogger(__name__)
         from backend.storage.supabase_client import get_supabase_client
+        from backend.storage.code_path_index import get_path_index
         
-        client = get_supabase_client()
-        all_chunks = []
+        resolved = get_path_index().resolve_many(file_paths)
+        canonical_paths = []
+        for file_filter, paths in resolved.items():
+            if not paths:
+                logger.warning(f"[Direct File Lookup] File '{file_filter}' not found in code_files - it may not be indexed")
+            for path in paths:
+                if path not in canonical_paths:
+                    canonical_paths.append(path)
+        if not canonical_paths:
+            return []
+        logger.info(f"[Direct File Lookup] Resolved {list(resolved)} to {canonical_paths} (chunk_type={chunk_type})")
         
-        # Extract filenames from paths (same as vector search)
-        filenames = []
-        for p in file_paths:
-            if not p:
-                continue
-            base = os.path.basename(p)
-            if base:
-                filenames.append(base)
-        
-        filename_set = set(filenames)
-        logger.info(f"[Direct File Lookup] Looking up chunks for filenames: {list(filename_set)} (chunk_type={chunk_type})")
-        
-        # First, try to find the file in code_files table to get the exact file_path
-        # This helps when the path format in the database differs from the input
-        file_paths_from_db = {}
-        for filename in filename_set:
-            try:
-                # Query code_files table to find matching files
-                files_query = client.table('code_files').select('file_path, file_name').ilike('file_name', f'%{filename}%').execute()
-                matching_files = files_query.data if files_query.data else []
-                if matching_files:
-                    logger.info(f"[Direct File Lookup] Found {len(matching_files)} file(s) in code_files table for '{filename}': {[f.get('file_path') for f in matching_files]}")
-                    # Store the first matching file_path (or use exact match if available)
-                    for file_info in matching_files:
-                        if file_info.get('file_name', '').lower() == filename.lower():
-                            file_paths_from_db[filename] = file_info.get('file_path')
-                            logger.info(f"[Direct File Lookup] Using exact match file_path: {file_paths_from_db[filename]}")
-                            break
-                    if filename not in file_paths_from_db and matching_files:
-                        file_paths_from_db[filename] = matching_files[0].get('file_path')
-                else:
-                    logger.warning(f"[Direct File Lookup] File '{filename}' not found in code_files table - it may not be indexed")
-            except Exception as e:
-                logger.warning(f"[Direct File Lookup] Error querying code_files table for '{filename}': {e}")
-        
-        for filename in filename_set:
-            # Try multiple matching strategies
-            chunks_found = []
-            
-            # Strategy 0: If we found the file_path from code_files table, use it directly
-            if filename in file_paths_from_db:
-                db_file_path = file_paths_from_db[filename]
-                logger.info(f"[Direct File Lookup] Strategy 0 (exact file_path from code_files): '{db_file_path}'")
-                query = client.table('code_chunks').select('*')
-                query = query.eq('file_path', db_file_path)  # Use exact match, not ILIKE
-                if chunk_type:
-                    query = query.eq('chunk_type', chunk_type)
-                result = query.execute()
-                chunks_found = result.data if result.data else []
-                logger.info(f"[Direct File Lookup] Strategy 0: Found {len(chunks_found)} chunks using exact file_path")
-            
-            # Strategy 1: Exact filename match (case-insensitive) - only if Strategy 0 didn't find anything
-            if not chunks_found:
-                query = client.table('code_chunks').select('*')
-                query = query.ilike('file_path', f'%{filename}%')
-                if chunk_type:
-                    query = query.eq('chunk_type', chunk_type)
-                result = query.execute()
-                chunks_found = result.data if result.data else []
-                logger.info(f"[Direct File Lookup] Strategy 1 (filename '{filename}'): Found {len(chunks_found)} chunks")
-            
-            # Strategy 2: Try without extension (in case extension is different)
-            if not chunks_found and '.' in filename:
-                filename_no_ext = filename.rsplit('.', 1)[0]
-                query = client.table('code_chunks').select('*')
-                query = query.ilike('file_path', f'%{filename_no_ext}%')
-                if chunk_type:
-                    query = query.eq('chunk_type', chunk_type)
-                result = query.execute()
-                chunks_found = result.data if result.data else []
-                logger.info(f"[Direct File Lookup] Strategy 2 (filename without ext '{filename_no_ext}'): Found {len(chunks_found)} chunks")
-            
-            # Strategy 3: Try case variations (uppercase, lowercase, title case)
-            if not chunks_found:
-                variations = [filename.lower(), filename.upper(), filename.capitalize()]
-                for variant in variations:
-                    if variant == filename:  # Skip if same as original
-                        continue
-                    query = client.table('code_chunks').select('*')
-                    query = query.ilike('file_path', f'%{variant}%')
-                    if chunk_type:
-                        query = query.eq('chunk_type', chunk_type)
-                    result = query.execute()
-                    variant_chunks = result.data if result.data else []
-                    if variant_chunks:
-                        chunks_found = variant_chunks
-                        logger.info(f"[Direct File Lookup] Strategy 3 (variant '{variant}'): Found {len(chunks_found)} chunks")
-                        break
-            
-            # Strategy 4: If still no chunks found and chunk_type was specified, try without chunk_type filter
-            # This helps identify if the file exists but chunks are of a different type
-            if not chunks_found and chunk_type:
-                logger.info(f"[Direct File Lookup] Strategy 4: Trying without chunk_type filter for '{filename}'")
-                query = client.table('code_chunks').select('*')
-                query = query.ilike('file_path', f'%{filename}%')
-                result = query.execute()
-                all_chunks_for_file = result.data if result.data else []
-                if all_chunks_for_file:
-                    logger.warning(f"[Direct File Lookup] Found {len(all_chunks_for_file)} chunks for '{filename}' but NONE are of type '{chunk_type}'. Available types: {set(c.get('chunk_type') for c in all_chunks_for_file)}")
-                else:
-                    logger.warning(f"[Direct File Lookup] No chunks found for filename '{filename}' after trying all strategies (including without chunk_type filter)")
-            
-            if chunks_found:
-                all_chunks.extend(chunks_found)
+        client = get_supabase_client()
+        query = CODE_CHUNK_CONTENT.query(client).in_('file_path', canonical_paths)
+        if chunk_type:
+            query = query.eq('chunk_type', chunk_type)
+        result = query.execute()
+        all_chunks = result.data if result.data else []
         
         logger.info(f"[Direct File Lookup] TOTAL: Found {len(all_chunks)} chunks via direct lookup (chunk_type={chunk_type})")
         return all_chunks
@@ -348,94 +409,310 @@ def list_code_files_supabase() -> List[Dict[str, Any]]:
         return []
 
 
-def index_code_chunks_to_supabase(
-    file_path: str,
-    file_name: str,
-    chunks: List[Dict],
-    provider
-) -> bool:
+def _code_chunk_text(chunk: Dict) -> str:
+    """Text embedded for a code chunk."""
+    if chunk.get('chunk_type', 'method') == 'method':
+        return chunk.get('code', '') or chunk.get('source_code', '')
+    # class, struct, interface, enum - all use source_code
+    return chunk.get('source_code', '')
+
+
+def code_chunk_key(chunk: Dict) -> tuple:
     """
-    Index code chunks to Supabase with embeddings.
-    
+    Stable identity of a code chunk within its file.
+
+    Returns:
+        (symbol_path, content_hash). symbol_path is the chunk type plus the
+        dotted symbol path (e.g. "method:Tank.Inner.Fire"); content_hash
+        covers everything that is stored or embedded, except position
+        metadata such as the line number.
+    """
+    chunk_type = chunk.get('chunk_type', 'method')
+    path = (chunk.get('metadata') or {}).get('path') or '.'.join(
+        part for part in (chunk.get('class_name'), chunk.get('name')) if part)
+    symbol_path = f"{chunk_type}:{path}"
+    content = json.dumps([
+        symbol_path,
+        _code_chunk_text(chunk),
+        chunk.get('source_code', ''),
+        chunk.get('doc_comment', ''),
+        chunk.get('constructor_declaration', ''),
+        chunk.get('method_declarations', ''),
+        chunk.get('references', ''),
+    ], ensure_ascii=False)
+    return symbol_path, hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class EmbeddingFailure:
+    """Stands in for the vectors of an embedding batch that failed."""
+    message: str
+
+
+@dataclass
+class CodeFileIndexResult:
+    """What indexing did to one file's chunks."""
+    file_path: str
+    file_name: str
+    content_hash: Optional[str] = None
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    error: Optional[str] = None  # set when some of the file's chunks could not be embedded
+
+    @property
+    def chunks(self) -> int:
+        """Chunks the file has after indexing."""
+        return self.written + self.unchanged
+
+
+def _apply_code_chunk_changes(metadata_updates: List[Tuple[Any, Dict[str, Any]]],
+                              orphan_ids: List[Any]) -> None:
+    """
+    Refresh moved chunks' metadata and delete orphans in one RPC; without the
+    apply_code_chunk_changes RPC, falls back to an update per chunk and
+    batched deletes.
+    """
+    global _APPLY_CHANGES_RPC_AVAILABLE
+    if not metadata_updates and not orphan_ids:
+        return
+    if _APPLY_CHANGES_RPC_AVAILABLE:
+        try:
+            apply_code_chunk_changes(metadata_updates, orphan_ids)
+            return
+        except Exception as e:
+            if 'apply_code_chunk_changes' not in str(e) and 'PGRST202' not in str(e):
+                raise
+            _APPLY_CHANGES_RPC_AVAILABLE = False
+            import logging
+            logging.getLogger(__name__).warning(
+                f"[Code Index] apply_code_chunk_changes RPC not available, updating chunks one by one: {e}")
+    for chunk_id, metadata in metadata_updates:
+        update_code_chunk_metadata(chunk_id, metadata)
+    if orphan_ids:
+        delete_code_chunks(orphan_ids)
+
+
+def index_code_files_to_supabase(
+    files: Iterable[Tuple[str, str, Iterable[Dict], Optional[str]]],
+    provider,
+    progress_cb: Optional[Callable[[str], None]] = None,
+    progress_label: str = "Indexing code",
+) -> Tuple[Dict[str, CodeFileIndexResult], PipelineStats]:
+    """
+    Index the chunks of many code files through one shared pipeline, idempotently.
+
+    Chunks are keyed on (file_path, symbol_path, content_hash). Chunks that
+    are already stored with the same key are not re-embedded; new or changed
+    chunks of every file are streamed through one bounded chunk -> embed ->
+    write pipeline (see backend.storage.ingest_pipeline) in token-budgeted
+    embedding batches and upserted. Stored chunks that a file no longer
+    produces (removed or changed symbols, rows from older uploads) are
+    deleted once all upserts have succeeded, together with the metadata
+    refresh of unchanged chunks that moved, in one transaction
+    (apply_code_chunk_changes RPC); only then is each file's content hash
+    recorded in code_files. Re-indexing unchanged files makes no embedding
+    calls.
+
+    Upserts are committed batch by batch while the run streams, so until the
+    final delete readers can see a changed symbol's new chunk next to its
+    old one.
+
+    An embedding failure only fails the files whose chunks cannot be
+    embedded (a failed batch is retried text by text): their
+    CodeFileIndexResult.error is set, their stale chunks
+    are kept and their content hash is not recorded, so the next run
+    retries them. The other files are indexed normally.
+
+    Files are registered and their stored keys fetched CODE_FILE_GROUP_SIZE
+    files at a time, so a large codebase costs a few queries per group
+    rather than several per file.
+
     Args:
-        file_path: Full file path
-        file_name: File name
-        chunks: List of chunk dictionaries (methods or classes)
+        files: Iterable of (file_path, file_name, chunks, content_hash);
+            content_hash is the hash of the whole file (None to not record it)
         provider: LLM provider for embeddings
-    
+        progress_cb: Optional callable(step_text) that receives per-stage throughput
+        progress_label: Prefix for progress text
+
     Returns:
-        True if successful
+        (results by file_path, pipeline stats)
     """
     if not USE_SUPABASE:
         raise ValueError("Supabase is not configured")
-    
+
+    results: Dict[str, CodeFileIndexResult] = {}
+    # id -> file_path of every stored chunk of the files seen so far
+    existing_ids: Dict[Any, str] = {}
+    kept_ids = set()
+    metadata_updates = []
+
+    def chunk_metadata(chunk):
+        return {
+            "indexed_from": "code_qa",
+            "original_metadata": chunk.get('metadata', {})
+        }
+
+    def changed_chunks():
+        # Drop chunks whose key is already stored; only the rest are embedded
+        iterator = iter(files)
+        while True:
+            group = list(itertools.islice(iterator, CODE_FILE_GROUP_SIZE))
+            if not group:
+                return
+            # For indexing: use the file_path as-is (don't normalize)
+            # This ensures new chunks match the format of existing chunks (typically Windows paths)
+            upsert_code_files([
+                {'file_path': file_path, 'file_name': file_name, 'normalized_path': file_path}
+                for file_path, file_name, _, _ in group
+            ])
+            get_path_index().add_paths(file_path for file_path, _, _, _ in group)
+            stored = {}
+            for row in get_code_chunk_keys([file_path for file_path, _, _, _ in group]):
+                existing_ids[row['id']] = row['file_path']
+                if row.get('symbol_path') and row.get('content_hash'):
+                    stored[(row['file_path'], row['symbol_path'], row['content_hash'])] = row
+
+            for file_path, file_name, chunks, content_hash in group:
+                result = results[file_path] = CodeFileIndexResult(
+                    file_path=file_path, file_name=file_name, content_hash=content_hash)
+                seen_keys = set()
+                for chunk in chunks:
+                    symbol_path, chunk_hash = code_chunk_key(chunk)
+                    if (symbol_path, chunk_hash) in seen_keys:
+                        continue
+                    seen_keys.add((symbol_path, chunk_hash))
+                    row = stored.get((file_path, symbol_path, chunk_hash))
+                    if row is None:
+                        result.written += 1
+                        yield {**chunk, 'file_path': file_path,
+                               'symbol_path': symbol_path, 'content_hash': chunk_hash}
+                        continue
+                    result.unchanged += 1
+                    kept_ids.add(row['id'])
+                    metadata = chunk_metadata(chunk)
+                    if row.get('metadata') != metadata:
+                        # Same content at a new position: refresh metadata only
+                        metadata_updates.append((row['id'], metadata))
+
+    # Create embedding function
+    embedding_func = make_embedding_func(provider)
+
+    def embed_batch(texts):
+        # Single attempt only (for large files, retries waste time)
+        with llm_priority(BACKGROUND):
+            return embedding_func(texts)
+
+    # Refuse to mix embedding models in code_chunks
+    guarded_embed_batch = guard_embed_batch(embed_batch, CODE_INDEX, provider)
+
+    def embed_or_fail(texts):
+        try:
+            return guarded_embed_batch(texts)
+        except EmbeddingModelMismatch:
+            raise
+        except Exception as e:
+            return [EmbeddingFailure(str(e))] * len(texts)
+
+    def embed_batch_or_fail_files(texts):
+        # A batch mixes chunks of several files: when it fails, each text is
+        # retried alone so only the files whose chunks still fail are failed
+        # (see build_record)
+        vectors = embed_or_fail(texts)
+        if len(texts) > 1 and isinstance(vectors[0], EmbeddingFailure):
+            print(f"Warning: Failed to embed {len(texts)} chunks, retrying one by one: {vectors[0].message}")
+            vectors = [embed_or_fail([text])[0] for text in texts]
+        return vectors
+
+    def build_record(i, chunk, embedding):
+        if isinstance(embedding, EmbeddingFailure):
+            result = results[chunk['file_path']]
+            result.written -= 1
+            result.error = result.error or f"Embedding failed: {embedding.message}"
+            return None
+        chunk_type = chunk.get('chunk_type', 'method')  # 'method', 'class', 'struct', 'interface', 'enum'
+        return {
+            "file_path": chunk['file_path'],
+            "chunk_type": chunk_type,
+            "class_name": chunk.get('class_name'),
+            "method_name": chunk.get('name') if chunk_type == 'method' else None,
+            "source_code": chunk.get('source_code', ''),
+            "code": chunk.get('code', '') if chunk_type == 'method' else None,
+            "embedding": embedding,
+            "doc_comment": chunk.get('doc_comment', ''),
+            "constructor_declaration": chunk.get('constructor_declaration', ''),
+            "method_declarations": chunk.get('method_declarations', ''),
+            "code_references": chunk.get('references', ''),
+            "metadata": chunk_metadata(chunk),
+            "symbol_path": chunk['symbol_path'],
+            "content_hash": chunk['content_hash'],
+        }
+
     try:
-        # For indexing: use the file_path as-is (don't normalize)
-        # This ensures new chunks match the format of existing chunks (typically Windows paths)
-        # Only normalize if we're doing a search/query, not when indexing
-        # The old indexed chunks use full Windows paths like c:\users\...\assets\...
-        normalized_path = file_path  # Use path as-is for indexing to match existing format
-        
-        # Insert file metadata
-        insert_code_file(
-            file_path=normalized_path or file_path,
-            file_name=file_name,
-            normalized_path=normalized_path or file_path
+        stats = run_ingest_pipeline(
+            chunks=changed_chunks(),
+            text_of=_code_chunk_text,
+            embed_batch=embed_batch_or_fail_files,
+            build_record=build_record,
+            write_batch=upsert_code_chunks,
+            progress_cb=progress_cb,
+            progress_label=progress_label,
         )
-        
-        # Create embedding function
-        embedding_func = make_embedding_func(provider)
-        
-        # Prepare chunks for Supabase
-        supabase_chunks = []
-        for chunk in chunks:
-            chunk_type = chunk.get('chunk_type', 'method')  # 'method', 'class', 'struct', 'interface', 'enum'
-            
-            # Determine what to embed
-            if chunk_type == 'method':
-                text_to_embed = chunk.get('code', '') or chunk.get('source_code', '')
-            else:  # class, struct, interface, enum - all use source_code
-                text_to_embed = chunk.get('source_code', '')
-            
-            if not text_to_embed:
-                continue
-            
-            # Generate embedding - single attempt only (for large files, retries waste time)
-            try:
-                embedding = embedding_func([text_to_embed])[0]
-            except Exception as e:
-                error_msg = str(e)
-                # For large files, don't retry - just fail immediately
-                print(f"Warning: Failed to embed chunk: {e}")
-                # Re-raise to stop processing this file
-                raise Exception(f"Embedding failed for large file: {error_msg}")
-            
-            supabase_chunk = {
-                "file_path": normalized_path or file_path,
-                "chunk_type": chunk_type,
-                "class_name": chunk.get('class_name'),
-                "method_name": chunk.get('name') if chunk_type == 'method' else None,
-                "source_code": chunk.get('source_code', ''),
-                "code": chunk.get('code', '') if chunk_type == 'method' else None,
-                "embedding": embedding,
-                "doc_comment": chunk.get('doc_comment', ''),
-                "constructor_declaration": chunk.get('constructor_declaration', ''),
-                "method_declarations": chunk.get('method_declarations', ''),
-                "code_references": chunk.get('references', ''),
-                "metadata": {
-                    "indexed_from": "code_qa",
-                    "original_metadata": chunk.get('metadata', {})
-                }
-            }
-            
-            supabase_chunks.append(supabase_chunk)
-        
-        # Insert chunks
-        inserted_count = insert_code_chunks(supabase_chunks)
-        
-        print(f"Indexed {inserted_count} code chunks for {file_name} to Supabase")
-        return True
-        
+
+        # Everything stored for these files that this run did not produce;
+        # failed files keep their old chunks until a run indexes them fully
+        failed_paths = {r.file_path for r in results.values() if r.error}
+        orphan_ids = [chunk_id for chunk_id, file_path in existing_ids.items()
+                      if chunk_id not in kept_ids and file_path not in failed_paths]
+        for chunk_id in orphan_ids:
+            results[existing_ids[chunk_id]].removed += 1
+        _apply_code_chunk_changes(metadata_updates, orphan_ids)
+
+        # Record file hashes last: a failed run leaves files looking changed
+        upsert_code_files([
+            {'file_path': r.file_path, 'file_name': r.file_name,
+             'normalized_path': r.file_path, 'content_hash': r.content_hash}
+            for r in results.values() if r.content_hash and not r.error
+        ])
     except Exception as e:
         raise Exception(f"Error indexing code chunks to Supabase: {e}")
 
+    return results, stats
+
+
+def index_code_chunks_to_supabase(
+    file_path: str,
+    file_name: str,
+    chunks: Iterable[Dict],
+    provider,
+    progress_cb: Optional[Callable[[str], None]] = None,
+    content_hash: Optional[str] = None,
+) -> int:
+    """
+    Index one code file's chunks to Supabase with embeddings, idempotently.
+    See index_code_files_to_supabase.
+    
+    Args:
+        file_path: Full file path
+        file_name: File name
+        chunks: Iterable of chunk dictionaries (methods or classes)
+        provider: LLM provider for embeddings
+        progress_cb: Optional callable(step_text) that receives per-stage throughput
+        content_hash: Optional hash of the whole file, recorded in code_files
+    
+    Returns:
+        Number of chunks the file has after indexing (written + unchanged)
+    """
+    results, stats = index_code_files_to_supabase(
+        [(file_path, file_name, chunks, content_hash)],
+        provider,
+        progress_cb=progress_cb,
+        progress_label=f"Indexing {file_name}",
+    )
+    result = results[file_path]
+    if result.error:
+        raise Exception(f"Error indexing code chunks to Supabase: {result.error}")
+    print(f"Indexed {file_name} to Supabase: {result.written} written, "
+          f"{result.unchanged} unchanged, {result.removed} removed, "
+          f"{stats.embed.calls} embedding calls ({stats.summary()})")
+    return result.chunks
@@ -0,0 +1,213 @@
+"""
+Local code symbol index for Code Q&A.
+
+A symbol table (file -> types -> members, with signatures, line numbers and
+byte spans) is built from the C# symbol parse at upload time and stored in a
+local SQLite database. The "list methods" and "list variables" intents are
+answered from it with indexed lookups instead of fetching and reparsing
+code_chunks rows. File sources live in the code blob store, keyed by the
+content_hash recorded here.
+
+Each file's symbols are also mirrored compactly (no source) to the Supabase
+code_symbols table, so a fresh instance (e.g. a redeploy with an empty disk)
+restores the symbol table for a file on first use.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.shared.config import CODE_SYMBOL_INDEX_PATH
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_path TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    file_name_lower TEXT NOT NULL,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (file_name_lower);
+
+CREATE TABLE IF NOT EXISTS symbols (
+    file_path TEXT NOT NULL REFERENCES files (file_path) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    parent TEXT,
+    path TEXT NOT NULL,
+    signature TEXT,
+    start_byte INTEGER,
+    end_byte INTEGER,
+    start_line INTEGER,
+    end_line INTEGER,
+    doc_comment TEXT,
+    PRIMARY KEY (file_path, seq)
+);
+CREATE INDEX IF NOT EXISTS symbols_kind ON symbols (file_path, kind);
+"""
+
+# Column order of the compact Supabase mirror rows
+_MIRROR_FIELDS = ('kind', 'name', 'parent', 'path', 'signature',
+                  'start_byte', 'end_byte', 'start_line', 'end_line')
+
+
+def symbol_to_row(symbol) -> Dict[str, Any]:
+    """CSharpSymbol -> stored symbol dict (the source text is not stored per symbol)."""
+    return {
+        'kind': symbol.kind,
+        'name': symbol.name,
+        'parent': symbol.parent,
+        'path': symbol.path,
+        'signature': symbol.signature,
+        'start_byte': symbol.start_byte,
+        'end_byte': symbol.end_byte,
+        'start_line': symbol.start_line,
+        'end_line': symbol.end_line,
+        'doc_comment': symbol.doc_comment,
+    }
+
+
+class CodeSymbolIndex:
+    """SQLite-backed symbol table; safe to share between threads."""
+
+    def __init__(self, db_path: str = CODE_SYMBOL_INDEX_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def record_files(self, entries: Iterable[Dict[str, Any]], mirror: bool = True) -> int:
+        """
+        Replace the symbol table of some files.
+
+        Args:
+            entries: Dicts with file_path, file_name, content_hash and
+                symbols (list of symbol_to_row dicts)
+            mirror: Also upsert the compact rows to Supabase code_symbols
+
+        Returns:
+            Number of files recorded
+        """
+        entries = list(entries)
+        if not entries:
+            return 0
+        with self._lock, self._conn:
+            for entry in entries:
+                self._write_file(entry)
+        if mirror:
+            self._mirror(entries)
+        return len(entries)
+
+    def _write_file(self, entry: Dict[str, Any]) -> None:
+        self._conn.execute("DELETE FROM files WHERE file_path = ?", (entry['file_path'],))
+        self._conn.execute(
+            "INSERT INTO files (file_path, file_name, file_name_lower, content_hash) "
+            "VALUES (?, ?, ?, ?)",
+            (entry['file_path'], entry['file_name'], entry['file_name'].lower(),
+             entry.get('content_hash')))
+        self._conn.executemany(
+            "INSERT INTO symbols (file_path, seq, kind, name, parent, path, signature, "
+            "start_byte, end_byte, start_line, end_line, doc_comment) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(entry['file_path'], seq, s['kind'], s['name'], s.get('parent'), s['path'],
+              s.get('signature'), s.get('start_byte'), s.get('end_byte'),
+              s.get('start_line'), s.get('end_line'), s.get('doc_comment', ''))
+             for seq, s in enumerate(entry['symbols'])])
+
+    def _mirror(self, entries: List[Dict[str, Any]]) -> None:
+        try:
+            from backend.storage.supabase_client import upsert_code_symbols
+            upsert_code_symbols([{
+                'file_path': entry['file_path'],
+                'file_name': entry['file_name'],
+                'content_hash': entry.get('content_hash'),
+                'symbols': [[s.get(field) for field in _MIRROR_FIELDS] for s in entry['symbols']],
+            } for entry in entries])
+        except Exception as e:
+            logger.warning(f"[Symbol Index] Supabase mirror update failed: {e}")
+
+    def load_mirror_rows(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Restore files from Supabase code_symbols rows.
+
+        Returns:
+            Number of files loaded
+        """
+        entries = [{
+            'file_path': row['file_path'],
+            'file_name': row.get('file_name') or row['file_path'].replace('\\', '/').split('/')[-1],
+            'content_hash': row.get('content_hash'),
+            'symbols': [dict(zip(_MIRROR_FIELDS, values)) for values in row.get('symbols') or []],
+        } for row in rows]
+        return self.record_files(entries, mirror=False)
+
+    def delete_file(self, file_path: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+
+    def resolve(self, file_filter: str) -> Optional[str]:
+        """
+        Resolve a user-supplied path or filename to an indexed file_path.
+
+        Tries the exact path, then the filename (only when unambiguous, or
+        when exactly one candidate ends with the given path).
+        """
+        if not file_filter:
+            return None
+        normalized = file_filter.replace('\\', '/')
+        file_name = normalized.split('/')[-1].lower()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_path FROM files WHERE file_path = ?", (file_filter,)).fetchone()
+            if row:
+                return row['file_path']
+            candidates = [r['file_path'] for r in self._conn.execute(
+                "SELECT file_path FROM files WHERE file_name_lower = ?", (file_name,))]
+        if len(candidates) == 1:
+            return candidates[0]
+        suffix = normalized.lower()
+        matches = [c for c in candidates
+                   if c.replace('\\', '/').lower().endswith('/' + suffix)
+                   or suffix.endswith('/' + c.replace('\\', '/').lower())]
+        return matches[0] if len(matches) == 1 else None
+
+    def get_symbols(self, file_path: str, kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Symbols of a file in document order, optionally only some kinds."""
+        query = "SELECT * FROM symbols WHERE file_path = ?"
+        params: List[Any] = [file_path]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY seq", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_content_hash(self, file_path: str) -> Optional[str]:
+        """Content hash recorded for a file (its key in the code blob store)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM files WHERE file_path = ?", (file_path,)).fetchone()
+        return row['content_hash'] if row else None
+
+
+_index: Optional[CodeSymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> CodeSymbolIndex:
+    """Process-wide symbol index (opened on first use)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = CodeSymbolIndex()
+        return _index
@@ -0,0 +1,135 @@
+"""
+Keeps each vector index on one embedding model.
+
+keyword_chunks and code_chunks vectors are only comparable when every row
+was embedded by the same model, but the embedding backend is chosen per
+process (remote API or the local CPU model, see EMBEDDING_BACKEND). The
+first indexing run of a table records its model and native dimension in
+embedding_indexes (migration 007_embedding_indexes.sql); every later run
+is checked against that record and rejected with EmbeddingModelMismatch
+before it writes vectors from another model. Query embeddings are checked
+the same way (check_query_embedding_model, called when a provider is
+created), so a process never scores queries from one model against an index
+built with another.
+
+Without the embedding_indexes table the check is skipped with a warning.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+GDD_INDEX = 'keyword_chunks'
+CODE_INDEX = 'code_chunks'
+
+# (index, model, dim) already registered or verified by this process
+_confirmed: Set[Tuple[str, str, int]] = set()
+# (index, model) verified for query embeddings by this process
+_confirmed_queries: Set[Tuple[str, str]] = set()
+_confirmed_lock = threading.Lock()
+
+
+class EmbeddingModelMismatch(ValueError):
+    """Vectors or queries from another embedding model than the one the index was built with."""
+
+
+def embedding_model_of(provider) -> str:
+    """Model name a provider embeds with (its class name when it has none)."""
+    return getattr(provider, 'embedding_model', None) or type(provider).__name__
+
+
+def check_embedding_index(index_name: str, embedding_model: str, embedding_dim: Optional[int] = None) -> None:
+    """
+    Reject an embedding model that differs from the index's recorded one.
+
+    With embedding_dim, an index without a record is registered to this
+    model and dimension; without it (before anything is embedded) only the
+    model name is compared.
+
+    Raises:
+        EmbeddingModelMismatch: If the index was built with another model or dimension
+    """
+    if embedding_dim is not None and (index_name, embedding_model, embedding_dim) in _confirmed:
+        return
+    from backend.storage.supabase_client import get_embedding_index, register_embedding_index
+    try:
+        if embedding_dim is None:
+            recorded = get_embedding_index(index_name)
+        else:
+            recorded = register_embedding_index(index_name, embedding_model, embedding_dim)
+    except Exception as e:
+        logger.warning(f"[Embedding Index] Could not check the embedding model of {index_name}: {e}")
+        return
+    if not recorded:
+        return
+    recorded_model = recorded.get('embedding_model')
+    recorded_dim = int(recorded.get('embedding_dim') or 0)
+    if recorded_model != embedding_model or (embedding_dim is not None and recorded_dim != embedding_dim):
+        raise EmbeddingModelMismatch(
+            f"{index_name} was embedded with {recorded_model} ({recorded_dim} dims); refusing to add "
+            f"vectors from {embedding_model}"
+            + (f" ({embedding_dim} dims)" if embedding_dim is not None else "")
+            + ". Use the same EMBEDDING_BACKEND / embedding model, or re-embed the whole index.")
+    if embedding_dim is not None:
+        with _confirmed_lock:
+            _confirmed.add((index_name, embedding_model, embedding_dim))
+
+
+def check_query_embedding_model(index_name: str, embedding_model: str) -> None:
+    """
+    Reject query embeddings from another model than the index was built with.
+
+    An index without a record (or an unreachable embedding_indexes table)
+    accepts any model.
+
+    Raises:
+        EmbeddingModelMismatch: If the index was built with another model
+    """
+    if (index_name, embedding_model) in _confirmed_queries:
+        return
+    from backend.storage.supabase_client import get_embedding_index
+    try:
+        recorded = get_embedding_index(index_name)
+    except Exception as e:
+        logger.warning(f"[Embedding Index] Could not check the embedding model of {index_name}: {e}")
+        return
+    if recorded:
+        recorded_model = recorded.get('embedding_model')
+        if recorded_model != embedding_model:
+            raise EmbeddingModelMismatch(
+                f"{index_name} was embedded with {recorded_model}; queries embedded with "
+                f"{embedding_model} would be scored in another vector space. Use the same "
+                f"EMBEDDING_BACKEND / embedding model, or re-embed the whole index.")
+        with _confirmed_lock:
+            _confirmed_queries.add((index_name, embedding_model))
+
+
+def guard_embed_batch(
+    embed_batch: Callable[[List[str]], List[List[float]]],
+    index_name: str,
+    provider,
+) -> Callable[[List[str]], List[List[float]]]:
+    """
+    Check an indexing run against the index's embedding model.
+
+    The model name is checked now (before anything is written); the
+    returned embed_batch also checks (and on first use registers) the
+    dimension of the first batch it embeds, before its vectors are written.
+    """
+    model = embedding_model_of(provider)
+    check_embedding_index(index_name, model)
+    lock = threading.Lock()
+    checked = []
+
+    def guarded(texts: List[str]) -> List[List[float]]:
+        vectors = embed_batch(texts)
+        if vectors and not checked:
+            with lock:
+                if not checked:
+                    check_embedding_index(index_name, model, len(vectors[0]))
+                    checked.append(True)
+        return vectors
+
+    return guarded
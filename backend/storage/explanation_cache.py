@@ -0,0 +1,147 @@
+"""
+Persistent cache of per-section keyword explanations.
+
+Explaining a keyword over a selection of documents and sections runs the
+same HYDE expansions, keyword searches and one LLM call per section every
+time, although the output only changes when the keyword, the documents or
+the prompt changes. Each section's explanation is therefore stored in a
+local SQLite database keyed by:
+
+    (normalized keyword, normalized additional keywords, response language,
+     HYDE on/off, doc_id, section_heading, the document's index version,
+     section prompt version)
+
+so a selection is served from the entries of its sections: a repeated
+selection is a full hit, and an overlapping one reuses its cached sections
+and generates only the missing ones.
+
+The index version of a document is its 'keyword_doc:<doc_id>' data version,
+bumped by every keyword_chunks write of that document (see
+keyword_fts_index.mirror_chunk_upsert), so re-indexing a document makes
+its old entries unreachable; they expire after EXPLANATION_CACHE_TTL and
+are deleted by the periodic purge that put() runs (at most every
+PURGE_INTERVAL seconds per process), so the file does not grow without bound.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from backend.shared.config import EXPLANATION_CACHE_PATH, EXPLANATION_CACHE_TTL
+from backend.storage.term_cache import normalize_cache_term
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between two purges of expired entries from put()
+PURGE_INTERVAL = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sections (
+    key TEXT PRIMARY KEY,
+    doc_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_doc ON sections (doc_id);
+"""
+
+
+def section_cache_key(
+    keyword: str,
+    additional_keywords: Iterable[str],
+    language: str,
+    use_hyde: bool,
+    doc_id: str,
+    section_heading: Optional[str],
+    doc_version: int,
+    prompt_version: str,
+) -> str:
+    """Stable key of one section explanation (a sha256 over the normalized inputs)."""
+    parts = [
+        normalize_cache_term(keyword),
+        sorted({normalize_cache_term(kw) for kw in additional_keywords if kw and kw.strip()}
+               - {normalize_cache_term(keyword)}),
+        language,
+        bool(use_hyde),
+        doc_id,
+        section_heading,
+        doc_version,
+        prompt_version,
+    ]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class ExplanationCache:
+    """SQLite-backed section explanation cache; safe to share between threads."""
+
+    def __init__(self, db_path: str = EXPLANATION_CACHE_PATH, ttl: float = EXPLANATION_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        # First put() of the process purges what expired since the last run
+        self._purged_at = 0.0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values of the keys that have a live entry."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ', '.join('?' * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value, created_at FROM sections WHERE key IN ({placeholders})",
+                keys).fetchall()
+        now = time.time()
+        return {key: json.loads(value) for key, value, created_at in rows if now - created_at <= self.ttl}
+
+    def put(self, key: str, doc_id: str, value: Any) -> None:
+        """Store a value (JSON-serializable), replacing any previous entry."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sections (key, doc_id, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, doc_id, json.dumps(value, ensure_ascii=False), now))
+            purge = now - self._purged_at >= min(PURGE_INTERVAL, self.ttl)
+            if purge:
+                self._purged_at = now
+        if purge:
+            removed = self.purge_expired()
+            if removed:
+                logger.info(f"[Explanation Cache] Purged {removed} expired entries")
+
+    def delete_document(self, doc_id: str) -> int:
+        """Drop every entry of a document; returns how many were deleted."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM sections WHERE doc_id = ?", (doc_id,))
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; returns how many were deleted."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM sections WHERE created_at < ?", (time.time() - self.ttl,))
+        return cursor.rowcount
+
+
+_cache: Optional[ExplanationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Process-wide explanation cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExplanationCache()
+        return _cache
@@ -7,7 +7,8 @@ import os
 import sys
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Callable
+import itertools
 import json
 
 # Add project root to path for imports
@@ -21,10 +22,16 @@ from backend.storage.supabase_client import (
     insert_gdd_document,
     insert_gdd_chunks,
     get_gdd_documents,
+    get_gdd_chunk_ids,
+    delete_gdd_chunks,
     delete_gdd_document
 )
+from backend.storage.embedding_index import GDD_INDEX, guard_embed_batch
+from backend.storage.ingest_pipeline import run_ingest_pipeline
+from backend.storage.projections import KEYWORD_CHUNK_CONTENT, KEYWORD_CHUNK_SCORING
 # Import from local gdd_rag_backbone (now included in unified_rag_app)
 from gdd_rag_backbone.llm_providers import QwenProvider, make_embedding_func
+from gdd_rag_backbone.llm_providers.rate_limiter import BACKGROUND, is_rate_limit_error, llm_priority
 from gdd_rag_backbone.rag_backend.chunk_qa import (
     ChunkRecord,
     _embed_texts,
@@ -35,6 +42,7 @@ from gdd_rag_backbone.rag_backend.chunk_qa import (
     _extract_evidence_spans,
     _filter_chunks_by_evidence,
 )
+from gdd_rag_backbone.rag_backend.single_flight import get_single_flight, normalize_text_key, provider_key
 
 # Check if Supabase is configured
 USE_SUPABASE = bool(os.getenv('SUPABASE_URL') and os.getenv('SUPABASE_KEY'))
@@ -45,6 +53,9 @@ if USE_SUPABASE:
 else:
     print("[WARNING] Supabase not configured - SUPABASE_URL or SUPABASE_KEY missing")
 
+# chunk_id tag of every other version of a re-indexed document (see index_gdd_chunks_to_supabase)
+_ALT_CHUNK_ID_TAG = 'alt_'
+
 
 def _strip_section_number(section_name: str) -> str:
     """
@@ -99,7 +110,7 @@ def load_gdd_chunks_from_supabase(
         logger.info(f"[load_gdd_chunks_from_supabase] Querying doc_id: {doc_id}")
         
         # Build query with filters - using keyword_chunks table
-        query = client.table('keyword_chunks').select('chunk_id, doc_id, content, section_heading, chunk_index').eq('doc_id', doc_id)
+        query = KEYWORD_CHUNK_CONTENT.query(client).eq('doc_id', doc_id)
         
         # Apply section_heading filter (match by name only, ignore numbers)
         # NOTE: This is a soft filter - we load chunks and let vector search prioritize
@@ -210,7 +221,7 @@ def load_gdd_vectors_from_supabase(doc_ids: List[str], normalize: bool = True) -
     
     for doc_id in doc_ids:
         # Get all chunks with embeddings for this doc_id
-        result = client.table('keyword_chunks').select('chunk_id, doc_id, embedding').eq('doc_id', doc_id).execute()
+        result = KEYWORD_CHUNK_SCORING.query(client).eq('doc_id', doc_id).execute()
         
         for row in (result.data or []):
             chunk_id = row.get('chunk_id', '')  # Full format: {doc_id}_{chunk_id}
@@ -242,6 +253,42 @@ def get_gdd_top_chunks_supabase(
     section_path_filter: Optional[str] = None,
     content_type_filter: Optional[str] = None,
     numbered_header_filter: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Get top chunks from Supabase for a question (see _retrieve_gdd_top_chunks).
+    
+    Concurrent identical requests (same documents, question up to whitespace,
+    provider and options) share one retrieval run; the callers that waited
+    for it get a copy of its results with metrics["coalesced"] = True.
+    
+    Returns:
+        (results_list, metrics_dict)
+    """
+    key = (tuple(dict.fromkeys(doc_ids or [])), normalize_text_key(question), provider_key(provider),
+           top_k, per_doc_limit, use_rrf, filter_by_evidence, use_hyde,
+           section_path_filter, content_type_filter, numbered_header_filter)
+    (results, metrics), coalesced = get_single_flight('gdd_top_chunks').do(key, lambda: _retrieve_gdd_top_chunks(
+        doc_ids, question, provider, top_k=top_k, per_doc_limit=per_doc_limit, use_rrf=use_rrf,
+        filter_by_evidence=filter_by_evidence, use_hyde=use_hyde,
+        section_path_filter=section_path_filter, content_type_filter=content_type_filter,
+        numbered_header_filter=numbered_header_filter))
+    if coalesced:
+        metrics["coalesced"] = True
+    return results, metrics
+
+
+def _retrieve_gdd_top_chunks(
+    doc_ids: List[str],
+    question: str,
+    provider,
+    top_k: int = 8,
+    per_doc_limit: Optional[int] = None,
+    use_rrf: bool = True,
+    filter_by_evidence: bool = True,
+    use_hyde: bool = True,
+    section_path_filter: Optional[str] = None,
+    content_type_filter: Optional[str] = None,
+    numbered_header_filter: Optional[str] = None,
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Get top chunks from Supabase for a question with enhanced retrieval.
@@ -606,22 +653,41 @@ def list_gdd_documents_supabase() -> List[Dict[str, Any]]:
 
 def index_gdd_chunks_to_supabase(
     doc_id: str,
-    chunks: List[Dict],
+    chunks: Iterable[Any],
     provider,
     markdown_content: Optional[str] = None,
     pdf_storage_path: Optional[str] = None,
     images: Optional[List[Dict[str, Any]]] = None,
+    progress_cb: Optional[Callable[[str], None]] = None,
 ) -> bool:
     """
     Index GDD chunks to Supabase with embeddings.
+
+    Chunks are streamed through a bounded chunk -> embed -> upsert pipeline
+    (see backend.storage.ingest_pipeline), so a generator such as
+    MarkdownChunker.iter_chunks() is consumed while earlier chunks are being
+    embedded and written.
+
+    A new document's keyword_documents row is written before the first
+    chunk; if embedding or writing fails part-way, the document and the
+    chunks already written are deleted before the error is raised.
+
+    Re-indexing a doc_id that already has chunks keeps the previous version
+    intact until the new one is complete: the new chunks are written under
+    the chunk_id prefix the previous version does not use ("{doc_id}_..."
+    and "{doc_id}_alt_..." alternate), and the document row is only
+    overwritten once every chunk is written, after which the previous
+    version's chunks are deleted. A failed re-index deletes only the chunks
+    it wrote. While it runs, searches can see chunks of both versions.
     
     Args:
         doc_id: Document ID
-        chunks: List of chunk dictionaries from MarkdownChunker
+        chunks: Iterable of MarkdownChunk objects or chunk dictionaries
         provider: LLM provider for embeddings
         markdown_content: Optional full markdown content to store
         pdf_storage_path: Optional PDF filename in Supabase Storage (gdd_pdfs bucket)
         images: Optional list of image metadata dicts [{"filename", "url", "path"}] for keyword_documents.images
+        progress_cb: Optional callable(step_text) that receives per-stage throughput
     
     Returns:
         True if successful
@@ -632,114 +698,43 @@ def index_gdd_chunks_to_supabase(
     try:
         import logging
         import time
-        import threading
         
         logger = logging.getLogger(__name__)
         
         # Create embedding function
         embedding_func = make_embedding_func(provider)
         
-        def generate_embedding_with_timeout(content, timeout=30):
-            """Generate embedding with timeout protection (cross-platform)."""
-            result_container = [None]
-            exception_container = [None]
-            
-            def embed_worker():
-                try:
-                    result_container[0] = embedding_func([content])[0]
-                except Exception as e:
-                    exception_container[0] = e
-            
-            thread = threading.Thread(target=embed_worker)
-            thread.daemon = True
-            thread.start()
-            thread.join(timeout=timeout)
-            
-            if thread.is_alive():
-                # Thread is still running - timeout occurred
-                logger.error(f"Embedding generation exceeded {timeout}s timeout")
-                raise TimeoutError(f"Embedding generation exceeded {timeout}s timeout")
-            
-            if exception_container[0]:
-                raise exception_container[0]
-            
-            if result_container[0] is None:
-                raise Exception("Embedding generation returned None")
-            
-            return result_container[0]
-        
-        # Prepare chunks for Supabase
-        supabase_chunks = []
-        failed_chunks = []
-        
-        logger.info(f"Generating embeddings for {len(chunks)} chunks...")
-        
-        for i, chunk in enumerate(chunks):
-            # Handle both MarkdownChunk objects and dictionaries
-            if hasattr(chunk, 'chunk_id'):
-                # MarkdownChunk object
-                raw_chunk_id = chunk.chunk_id
-                content = chunk.content
-                chunk_metadata = chunk.metadata if hasattr(chunk, 'metadata') else {}
-                chunk_section = chunk_metadata.get('section_header', '') if isinstance(chunk_metadata, dict) else ''
-            else:
-                # Dictionary
-                raw_chunk_id = chunk.get("chunk_id") or f"chunk_{i:03d}"
-                content = chunk.get("content", "")
-                chunk_metadata = chunk.get("metadata", {})
-                chunk_section = chunk.get("section", "")
-            
-            # Make chunk_id globally unique by prepending doc_id: "{doc_id}_chunk_001"
-            chunk_id = f"{doc_id}_{raw_chunk_id}"
-            
-            # Skip empty content
-            if not content or not content.strip():
-                logger.warning(f"Skipping chunk {chunk_id} (index {i}): empty content")
-                failed_chunks.append((i, chunk_id, "empty content"))
-                continue
-            
-            # Generate embedding with retry and timeout
-            embedding = None
+        def embed_batch(texts):
+            """
+            Embed one batch at background priority, with retry, backoff and quota detection.
+
+            Request timeouts come from the shared API client; 429s are paced by
+            the process-wide rate limiter, so a retry waits for the model's budget.
+            """
             max_retries = 3
-            timeout_seconds = 30  # 30 second timeout per embedding
             
             for attempt in range(max_retries):
+                start_time = time.time()
                 try:
-                    if (i + 1) % 5 == 0:  # Log progress every 5 chunks
-                        logger.info(f"Processing chunk {i+1}/{len(chunks)} (attempt {attempt+1}/{max_retries})")
-                    
-                    start_time = time.time()
-                    
-                    # Generate embedding with timeout protection
-                    embedding = generate_embedding_with_timeout(content, timeout_seconds)
+                    with llm_priority(BACKGROUND):
+                        embeddings = embedding_func(texts)
+                    if embeddings is None:
+                        raise Exception("Embedding generation returned None")
                     
                     elapsed = time.time() - start_time
                     if elapsed > 5:  # Log slow embeddings
-                        logger.warning(f"Slow embedding generation: {elapsed:.2f}s for chunk {chunk_id}")
+                        logger.warning(f"Slow embedding generation: {elapsed:.2f}s for {len(texts)} chunks")
                     
-                    break  # Success, exit retry loop
+                    return embeddings
                     
-                except TimeoutError as e:
-                    elapsed = time.time() - start_time if 'start_time' in locals() else 0
-                    if attempt == max_retries - 1:
-                        logger.error(f"Timeout embedding chunk {chunk_id} (index {i}) after {max_retries} attempts")
-                        failed_chunks.append((i, chunk_id, f"timeout after {elapsed:.2f}s"))
-                        raise Exception(f"Failed to embed chunk {chunk_id} (index {i}): timeout after {elapsed:.2f}s")
-                    else:
-                        wait_time = (2 ** attempt) * 1.0
-                        logger.warning(f"Embedding timeout for chunk {chunk_id} (index {i}), retrying in {wait_time:.1f}s...")
-                        time.sleep(wait_time)
-                        
                 except Exception as e:
-                    elapsed = time.time() - start_time if 'start_time' in locals() else 0
+                    elapsed = time.time() - start_time
                     error_str = str(e)
                     
-                    # Check for quota/rate limit errors (429)
+                    # Exhausted quota (429 insufficient_quota) - won't resolve by retrying
                     is_quota_error = (
-                        "429" in error_str or 
-                        "quota" in error_str.lower() or 
                         "insufficient_quota" in error_str.lower() or
-                        "RateLimitError" in str(type(e).__name__)
+                        ("quota" in error_str.lower() and not is_rate_limit_error(e))
                     )
                     
                     if is_quota_error:
@@ -756,27 +751,47 @@ def index_gdd_chunks_to_supabase(
                             f"Please add credits to your OpenAI account and try again."
                         )
                         logger.error(error_msg)
-                        failed_chunks.append((i, chunk_id, "quota exceeded"))
                         raise Exception(error_msg)
                     
                     if attempt == max_retries - 1:
-                        # Last attempt failed
-                        logger.error(f"Failed to embed chunk {chunk_id} (index {i}) after {max_retries} attempts: {e}")
-                        failed_chunks.append((i, chunk_id, str(e)))
-                        # Don't skip - raise error to prevent silent data loss
-                        raise Exception(f"Failed to embed chunk {chunk_id} (index {i}): {e}. This indicates a critical indexing error.")
-                    else:
-                        # Retry with exponential backoff (but not for quota errors)
-                        wait_time = (2 ** attempt) * 1.0  # 1s, 2s, 4s
-                        logger.warning(f"Embedding attempt {attempt + 1} failed for chunk {chunk_id} (index {i}) after {elapsed:.2f}s, retrying in {wait_time:.1f}s... Error: {e}")
-                        time.sleep(wait_time)
-            
-            if embedding is None:
-                continue  # Should not reach here due to raise above, but safety check
+                        # Last attempt failed - raise to prevent silent data loss
+                        logger.error(f"Failed to embed {len(texts)} chunks after {max_retries} attempts: {e}")
+                        raise Exception(f"Failed to embed chunks for {doc_id}: {e}. This indicates a critical indexing error.")
+                    
+                    if is_rate_limit_error(e):
+                        # The rate limiter has paused the model; the next attempt waits for it
+                        logger.warning(f"Embedding rate limited for {len(texts)} chunks, retrying at the limiter's pace...")
+                        continue
+                    
+                    # Retry with exponential backoff (but not for quota errors)
+                    wait_time = (2 ** attempt) * 1.0  # 1s, 2s, 4s
+                    logger.warning(f"Embedding attempt {attempt + 1} failed for {len(texts)} chunks after {elapsed:.2f}s, retrying in {wait_time:.1f}s... Error: {e}")
+                    time.sleep(wait_time)
+        
+        def chunk_fields(i, chunk):
+            """Return (raw_chunk_id, content, metadata, section) for a chunk object or dict."""
+            if hasattr(chunk, 'chunk_id'):
+                # MarkdownChunk object
+                chunk_metadata = chunk.metadata if hasattr(chunk, 'metadata') else {}
+                chunk_section = chunk_metadata.get('section_header', '') if isinstance(chunk_metadata, dict) else ''
+                return chunk.chunk_id, chunk.content, chunk_metadata, chunk_section
+            # Dictionary
+            return (
+                chunk.get("chunk_id") or f"chunk_{i:03d}",
+                chunk.get("content", ""),
+                chunk.get("metadata", {}),
+                chunk.get("section", ""),
+            )
+        
+        def build_record(i, chunk, embedding):
+            """Build the keyword_chunks row for one embedded chunk."""
+            raw_chunk_id, content, chunk_metadata, chunk_section = chunk_fields(i, chunk)
             
+            # Make chunk_id globally unique by prepending doc_id: "{doc_id}_chunk_001"
+            # (or "{doc_id}_alt_chunk_001" when re-indexing over the plain prefix)
+            chunk_id = f"{chunk_id_prefix}{raw_chunk_id}"
             
             # ---- Extract section + metadata fields safely ----
-            # chunk_metadata is already set above (dict for both object/dict paths)
             meta = chunk_metadata if isinstance(chunk_metadata, dict) else {}
 
             section_header = meta.get("section_header") or chunk_section or ""
@@ -810,7 +825,7 @@ def index_gdd_chunks_to_supabase(
             })
 
             # ---- Supabase record with real columns populated ----
-            supabase_chunks.append({
+            return {
                 "chunk_id": chunk_id,
                 "doc_id": doc_id,
                 "content": content,
@@ -828,32 +843,103 @@ def index_gdd_chunks_to_supabase(
 
                 # Keep metadata flat and useful
                 "metadata": clean_metadata,
-            })
-
+            }
+        
+        # Peek at the first chunk for the document row; keep the first few
+        # chunks for metadata extraction without materializing the rest
+        chunk_iter = iter(chunks)
+        first_chunk = next(chunk_iter, None)
+        head_chunks: List[Any] = []
+        
+        def stream_chunks():
+            if first_chunk is None:
+                return
+            for chunk in itertools.chain([first_chunk], chunk_iter):
+                if len(head_chunks) < 5:
+                    head_chunks.append(chunk)
+                yield chunk
+        
+        # Refuse to mix embedding models in keyword_chunks (checked before any write)
+        embed_batch = guard_embed_batch(embed_batch, GDD_INDEX, provider)
+        
+        # A previous version stays searchable until this run has written all
+        # of its chunks: new chunk_ids must not overwrite the previous ones
+        previous_chunk_ids = set(get_gdd_chunk_ids(doc_id))
+        alt_prefix = f"{doc_id}_{_ALT_CHUNK_ID_TAG}"
+        if previous_chunk_ids and not any(c.startswith(alt_prefix) for c in previous_chunk_ids):
+            chunk_id_prefix = alt_prefix
+        else:
+            chunk_id_prefix = f"{doc_id}_"
+        written_chunk_ids: List[str] = []
+        
+        def write_batch(records):
+            # Recorded before the write, so a batch that fails part-way is cleaned up too
+            written_chunk_ids.extend(record['chunk_id'] for record in records)
+            return insert_gdd_chunks(records)
         
-        # Insert document metadata
         # Handle both MarkdownChunk objects and dictionaries
-        if chunks:
-            first_chunk = chunks[0]
-            if hasattr(first_chunk, 'metadata'):
-                # MarkdownChunk object - no file_path attribute
-                file_path = ""
-            else:
-                # Dictionary
-                file_path = first_chunk.get("file_path", "")
+        if first_chunk is not None and not hasattr(first_chunk, 'metadata'):
+            file_path = first_chunk.get("file_path", "")
         else:
+            # MarkdownChunk object - no file_path attribute
             file_path = ""
         doc_name = Path(file_path).name if file_path else doc_id
         
-        # Store markdown content, PDF path, and images in Supabase
-        insert_gdd_document(
-            doc_id=doc_id,
-            name=doc_name,
-            file_path=file_path,
-            markdown_content=markdown_content,  # Store markdown content in Supabase
-            pdf_storage_path=pdf_storage_path,  # Store PDF storage path
-            images=images,  # Store extracted image metadata (keyword_documents.images JSONB)
-        )
+        def write_document_row():
+            # Store markdown content, PDF path, and images in Supabase
+            insert_gdd_document(
+                doc_id=doc_id,
+                name=doc_name,
+                file_path=file_path,
+                markdown_content=markdown_content,  # Store markdown content in Supabase
+                pdf_storage_path=pdf_storage_path,  # Store PDF storage path
+                images=images,  # Store extracted image metadata (keyword_documents.images JSONB)
+            )
+        
+        # A new document's row goes first so chunk rows can reference it; an
+        # existing row is only overwritten once the new version is complete
+        if not previous_chunk_ids:
+            write_document_row()
+        
+        logger.info(f"Streaming chunks for {doc_id} through embed -> upsert pipeline...")
+        try:
+            stats = run_ingest_pipeline(
+                chunks=stream_chunks(),
+                text_of=lambda chunk: chunk_fields(0, chunk)[1],
+                embed_batch=embed_batch,
+                build_record=build_record,
+                write_batch=write_batch,
+                progress_cb=progress_cb,
+                progress_label="Indexing into Supabase",
+            )
+        except Exception:
+            # Don't leave a document with only part of its chunks behind
+            try:
+                if previous_chunk_ids:
+                    logger.error(f"Re-indexing failed part-way for {doc_id}, keeping the previous version "
+                                 f"and removing the chunks written by this run")
+                    delete_gdd_chunks(doc_id, [c for c in dict.fromkeys(written_chunk_ids)
+                                               if c not in previous_chunk_ids])
+                else:
+                    logger.error(f"Indexing failed part-way for {doc_id}, removing the document and its written chunks")
+                    delete_gdd_document(doc_id)
+            except Exception as cleanup_error:
+                logger.error(f"Could not remove partially indexed chunks of {doc_id}: {cleanup_error}")
+            raise
+        
+        if previous_chunk_ids:
+            # Swap: the new version is complete, so the row and the old chunks can go
+            write_document_row()
+            written = set(written_chunk_ids)
+            stale = sorted(c for c in previous_chunk_ids if c not in written)
+            delete_gdd_chunks(doc_id, stale)
+            logger.info(f"Replaced the previous version of {doc_id} ({len(stale)} old chunks removed)")
+        
+        if stats.skipped:
+            logger.warning(f"Skipped {stats.skipped} chunks with empty content for document {doc_id}")
+        
+        # The metadata fallback below only needs the first few chunks
+        chunks = head_chunks
         
         # Extract and store metadata - use full markdown content if available, otherwise use chunks
         try:
@@ -945,22 +1031,11 @@ def index_gdd_chunks_to_supabase(
             import traceback
             logger.debug(traceback.format_exc())
         
-        # Report any failed chunks before insertion
-        if failed_chunks:
-            logger.error(f"CRITICAL: {len(failed_chunks)} chunks failed embedding for document {doc_id}:")
-            for idx, chunk_id, error in failed_chunks[:10]:  # Show first 10
-                logger.error(f"  - Chunk {idx} ({chunk_id}): {error}")
-            if len(failed_chunks) > 10:
-                logger.error(f"  ... and {len(failed_chunks) - 10} more")
-            raise Exception(f"Failed to embed {len(failed_chunks)} out of {len(chunks)} chunks for document {doc_id}. Indexing aborted to prevent data loss.")
-        
-        # Insert chunks
-        logger.info(f"Inserting {len(supabase_chunks)} chunks to Supabase...")
-        inserted_count = insert_gdd_chunks(supabase_chunks)
+        inserted_count = stats.written_rows
         
         # Verify all chunks were inserted
-        if inserted_count != len(supabase_chunks):
-            logger.error(f"WARNING: Only {inserted_count} out of {len(supabase_chunks)} chunks were inserted for document {doc_id}")
+        if inserted_count != stats.write.items:
+            logger.error(f"WARNING: Only {inserted_count} out of {stats.write.items} chunks were inserted for document {doc_id}")
         
         # Use logger instead of print to handle Unicode characters properly
         try:
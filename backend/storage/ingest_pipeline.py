@@ -0,0 +1,249 @@
+"""
+Bounded producer/consumer pipeline for chunk -> embed -> write ingest.
+
+Chunks stream from the chunker into an embedding stage and then into batched
+writes. Stages run on their own threads and are connected by bounded queues,
+so a slow stage applies backpressure to the stages before it and only a few
+batches are ever held in memory. Used by both the GDD and code indexers.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.shared.config import (
+    INGEST_EMBED_BATCH_SIZE,
+    INGEST_WRITE_BATCH_SIZE,
+    INGEST_QUEUE_SIZE,
+    INGEST_EMBED_TOKEN_BUDGET,
+)
+from gdd_rag_backbone.markdown_chunking.tokenizer_utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Sentinel that marks the end of a stage's output
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Item count and busy time for one pipeline stage."""
+    name: str
+    items: int = 0
+    seconds: float = 0.0
+    calls: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of busy time."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'items': self.items,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 2),
+            'per_second': round(self.throughput, 1),
+        }
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage statistics for one pipeline run."""
+    chunk: StageStats = field(default_factory=lambda: StageStats('chunk'))
+    embed: StageStats = field(default_factory=lambda: StageStats('embed'))
+    write: StageStats = field(default_factory=lambda: StageStats('write'))
+    skipped: int = 0
+    written_rows: int = 0
+    elapsed: float = 0.0
+
+    def stages(self) -> List[StageStats]:
+        return [self.chunk, self.embed, self.write]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **{stage.name: stage.to_dict() for stage in self.stages()},
+            'skipped': self.skipped,
+            'written_rows': self.written_rows,
+            'elapsed': round(self.elapsed, 2),
+        }
+
+    def summary(self) -> str:
+        """One-line progress text, e.g. for job status."""
+        return (
+            f"chunked {self.chunk.items} ({self.chunk.throughput:.1f}/s) · "
+            f"embedded {self.embed.items} ({self.embed.throughput:.1f}/s) · "
+            f"written {self.write.items} ({self.write.throughput:.1f}/s)"
+        )
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+def run_ingest_pipeline(
+    chunks: Iterable[Any],
+    text_of: Callable[[Any], str],
+    embed_batch: Callable[[List[str]], List[List[float]]],
+    build_record: Callable[[int, Any, List[float]], Optional[Dict[str, Any]]],
+    write_batch: Callable[[List[Dict[str, Any]]], int],
+    embed_batch_size: int = INGEST_EMBED_BATCH_SIZE,
+    write_batch_size: int = INGEST_WRITE_BATCH_SIZE,
+    queue_size: int = INGEST_QUEUE_SIZE,
+    embed_token_budget: Optional[int] = INGEST_EMBED_TOKEN_BUDGET,
+    progress_cb: Optional[Callable[[str], None]] = None,
+    progress_label: str = "Indexing",
+) -> PipelineStats:
+    """
+    Stream chunks through embedding into batched writes.
+
+    Args:
+        chunks: Chunk iterable (a generator keeps chunking overlapped with I/O)
+        text_of: Returns the text to embed for a chunk; chunks with empty
+            text are skipped
+        embed_batch: Embeds a list of texts, returning one vector per text
+        build_record: Builds the row for (index, chunk, embedding); returning
+            None drops the chunk
+        write_batch: Writes (upserts) a list of rows, returning the row count
+        embed_batch_size: Texts per embedding call
+        embed_token_budget: Max estimated tokens per embedding call; a text
+            larger than the budget is sent on its own (None disables)
+        write_batch_size: Rows per write call
+        queue_size: Max batches buffered between stages (backpressure)
+        progress_cb: Optional callable(step_text) for job progress
+        progress_label: Prefix for progress text
+
+    Returns:
+        PipelineStats with per-stage counts and throughput
+
+    Raises:
+        Exception: The first error raised by any stage; the other stages are
+            stopped before it is re-raised
+    """
+    stats = PipelineStats()
+    stop = threading.Event()
+    errors: List[BaseException] = []
+    to_embed: queue.Queue = queue.Queue(maxsize=queue_size)
+    to_write: queue.Queue = queue.Queue(maxsize=queue_size)
+    started = time.perf_counter()
+
+    def put(q: queue.Queue, item: Any) -> None:
+        # Blocks while the next stage is behind; gives up if the run stopped
+        while True:
+            if stop.is_set():
+                raise _Stopped()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(q: queue.Queue) -> Any:
+        while True:
+            if stop.is_set():
+                raise _Stopped()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def fail(exc: BaseException) -> None:
+        if not isinstance(exc, _Stopped):
+            errors.append(exc)
+        stop.set()
+
+    def produce() -> None:
+        try:
+            batch = []
+            batch_tokens = 0
+            iterator = iter(chunks)
+            while True:
+                t0 = time.perf_counter()
+                chunk = next(iterator, _DONE)
+                stats.chunk.seconds += time.perf_counter() - t0
+                if chunk is _DONE:
+                    break
+                index = stats.chunk.items
+                stats.chunk.items += 1
+                text = text_of(chunk)
+                if not text or not text.strip():
+                    stats.skipped += 1
+                    continue
+                tokens = count_tokens(text)
+                if batch and embed_token_budget and batch_tokens + tokens > embed_token_budget:
+                    put(to_embed, batch)
+                    batch, batch_tokens = [], 0
+                batch.append((index, chunk, text))
+                batch_tokens += tokens
+                if len(batch) >= embed_batch_size:
+                    put(to_embed, batch)
+                    batch, batch_tokens = [], 0
+            if batch:
+                put(to_embed, batch)
+            put(to_embed, _DONE)
+        except BaseException as e:
+            fail(e)
+
+    def embed() -> None:
+        try:
+            pending: List[Dict[str, Any]] = []
+            while True:
+                batch = get(to_embed)
+                if batch is _DONE:
+                    break
+                t0 = time.perf_counter()
+                vectors = embed_batch([text for _, _, text in batch])
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Embedding returned {len(vectors)} vectors for {len(batch)} texts")
+                for (index, chunk, _), vector in zip(batch, vectors):
+                    record = build_record(index, chunk, vector)
+                    if record is None:
+                        stats.skipped += 1
+                    else:
+                        pending.append(record)
+                stats.embed.seconds += time.perf_counter() - t0
+                stats.embed.items += len(batch)
+                stats.embed.calls += 1
+                while len(pending) >= write_batch_size:
+                    put(to_write, pending[:write_batch_size])
+                    pending = pending[write_batch_size:]
+            if pending:
+                put(to_write, pending)
+            put(to_write, _DONE)
+        except BaseException as e:
+            fail(e)
+
+    producer = threading.Thread(target=produce, name="ingest-chunk", daemon=True)
+    embedder = threading.Thread(target=embed, name="ingest-embed", daemon=True)
+    producer.start()
+    embedder.start()
+
+    try:
+        while True:
+            batch = get(to_write)
+            if batch is _DONE:
+                break
+            t0 = time.perf_counter()
+            stats.written_rows += write_batch(batch)
+            stats.write.seconds += time.perf_counter() - t0
+            stats.write.items += len(batch)
+            stats.write.calls += 1
+            if callable(progress_cb):
+                progress_cb(f"{progress_label}: {stats.summary()}")
+    except BaseException as e:
+        fail(e)
+    finally:
+        producer.join()
+        embedder.join()
+
+    stats.elapsed = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+
+    logger.info("[Ingest] %s in %.2fs (%d skipped)",
+                stats.summary(), stats.elapsed, stats.skipped)
+    return stats
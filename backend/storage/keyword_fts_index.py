@@ -0,0 +1,441 @@
+"""
+Local SQLite FTS5 mirror of keyword_chunks for keyword search.
+
+The searchable columns of keyword_chunks (content, section_heading, doc_id)
+are mirrored into a local FTS5 table, so keyword_search is answered with a
+local BM25-ranked MATCH query (plus a highlighted snippet) instead of a
+keyword_search_documents RPC round trip per term. A keyword matches chunks
+containing it as a phrase (its tokens, consecutive and in order), so a
+multi-word term only exists where the whole term appears. Explainer section
+scoring asks for match_any instead: chunks containing any of the query's
+tokens (English stop words dropped), so long HYDE rewrites still find the
+relevant chunks and BM25 ranks those matching more tokens first.
+
+The mirror is rebuilt from Supabase at startup and kept in sync by the
+indexing write paths (keyword_storage.insert_chunks / delete_document and
+supabase_client.insert_gdd_chunks / delete_gdd_chunks / delete_gdd_document), which apply each
+write locally and bump the keyword_chunks data version (see migration
+006_data_versions.sql). A mirror whose synced version is behind the shared
+version (a write from another process) is stale: keyword_search falls back
+to the RPC and the mirror is rebuilt in the background. Without the
+data_versions table the mirror is trusted for KEYWORD_FTS_MAX_AGE seconds
+after a rebuild.
+
+The same write hooks bump the 'keyword_doc:<doc_id>' index version of each
+written document, which keys the explanation cache (explanation_cache.py).
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from backend.shared.config import (
+    KEYWORD_FTS_ENABLED,
+    KEYWORD_FTS_INDEX_PATH,
+    KEYWORD_FTS_MAX_AGE,
+    KEYWORD_FTS_VERSION_CHECK_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_VERSION_NAME = 'keyword_chunks'
+DOC_VERSION_PREFIX = 'keyword_doc:'
+
+# chunk_rows.id is the rowid of the chunk's chunks_fts row
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_rows (
+    id INTEGER PRIMARY KEY,
+    chunk_id TEXT NOT NULL UNIQUE,
+    doc_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunk_rows_doc ON chunk_rows (doc_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    section_heading,
+    content,
+    tokenize = 'unicode61 remove_diacritics 0'
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+"""
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Dropped from multi-token queries (unless nothing else is left), as the
+# english text search config drops them on the Postgres side
+_STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'in',
+    'into', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'their', 'this',
+    'to', 'was', 'what', 'when', 'which', 'with',
+))
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+_SNIPPET_TOKENS = 24
+
+
+def fts_query(keyword: str, match_any: bool = False) -> Optional[str]:
+    """
+    FTS5 query for a keyword: a phrase query, or with match_any its tokens
+    OR-ed together, each quoted.
+
+    Returns None when the keyword has no searchable token.
+    """
+    tokens = list(dict.fromkeys(_TOKEN_PATTERN.findall((keyword or '').lower())))
+    if not tokens:
+        return None
+    if not match_any:
+        return '"' + keyword.strip().replace('"', '""') + '"'
+    content_tokens = [token for token in tokens if token not in _STOP_WORDS]
+    return ' OR '.join(f'"{token}"' for token in (content_tokens or tokens))
+
+
+def doc_version_name(doc_id: str) -> str:
+    """Data version name of one document's chunks (its index version)."""
+    return f"{DOC_VERSION_PREFIX}{doc_id}"
+
+
+def _bump_chunk_version() -> Optional[int]:
+    try:
+        from backend.storage.supabase_client import bump_data_version
+        return bump_data_version(CHUNK_VERSION_NAME)
+    except Exception as e:
+        logger.warning(f"[Keyword FTS] Could not bump the keyword_chunks version: {e}")
+        return None
+
+
+class KeywordFtsIndex:
+    """SQLite FTS5 copy of keyword_chunks; safe to share between threads."""
+
+    def __init__(self, db_path: str = KEYWORD_FTS_INDEX_PATH,
+                 check_interval: float = KEYWORD_FTS_VERSION_CHECK_INTERVAL,
+                 max_age: float = KEYWORD_FTS_MAX_AGE):
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._rebuild_thread: Optional[threading.Thread] = None
+        # Set once the first rebuild of this process has finished (or failed)
+        self._first_rebuild_done = threading.Event()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+        # Nothing is trusted until the first rebuild of this process
+        self._ready = False
+        self._synced_version: Optional[int] = None
+        self._rebuilt_at = 0.0
+        self._checked_at = 0.0
+        self._fresh = False
+        self._invalid = False
+
+    # ---- writes -------------------------------------------------------
+
+    def _write_chunks(self, chunks: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for chunk in chunks:
+            self._delete_rows("SELECT id FROM chunk_rows WHERE chunk_id = ?", (chunk['chunk_id'],))
+            cursor = self._conn.execute(
+                "INSERT INTO chunk_rows (chunk_id, doc_id) VALUES (?, ?)",
+                (chunk['chunk_id'], chunk['doc_id']))
+            self._conn.execute(
+                "INSERT INTO chunks_fts (rowid, section_heading, content) VALUES (?, ?, ?)",
+                (cursor.lastrowid, chunk.get('section_heading') or '', chunk.get('content') or ''))
+            count += 1
+        return count
+
+    def _delete_rows(self, id_query: str, params: tuple) -> None:
+        ids = [(row[0],) for row in self._conn.execute(id_query, params)]
+        if ids:
+            self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", ids)
+            self._conn.executemany("DELETE FROM chunk_rows WHERE id = ?", ids)
+
+    def upsert_chunks(self, chunks: Iterable[Dict[str, Any]],
+                      replace_doc_id: Optional[str] = None) -> int:
+        """
+        Mirror upserted keyword_chunks rows.
+
+        Args:
+            chunks: Rows with chunk_id, doc_id, section_heading and content
+            replace_doc_id: Drop this document's chunks first (delete + insert writes)
+
+        Returns:
+            Number of chunks written
+        """
+        with self._lock, self._conn:
+            if replace_doc_id is not None:
+                self._delete_rows("SELECT id FROM chunk_rows WHERE doc_id = ?", (replace_doc_id,))
+            return self._write_chunks(chunks)
+
+    def delete_chunks(self, chunk_ids: Iterable[str]) -> None:
+        """Drop chunks from the mirror by chunk_id."""
+        with self._lock, self._conn:
+            for chunk_id in chunk_ids:
+                self._delete_rows("SELECT id FROM chunk_rows WHERE chunk_id = ?", (chunk_id,))
+
+    def delete_document(self, doc_id: str) -> None:
+        """Drop a document and its chunks from the mirror."""
+        with self._lock, self._conn:
+            self._delete_rows("SELECT id FROM chunk_rows WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+
+    def rebuild(self) -> int:
+        """
+        Reload the whole mirror from Supabase.
+
+        Returns:
+            Number of chunks mirrored
+        """
+        from backend.storage.supabase_client import (
+            get_data_version,
+            get_keyword_chunk_contents,
+            get_keyword_document_names,
+        )
+        started = time.perf_counter()
+        # Read the version first: writes made while loading bump it past
+        # this value, so the next freshness check triggers another rebuild
+        try:
+            version = get_data_version(CHUNK_VERSION_NAME)
+        except Exception as e:
+            logger.debug(f"[Keyword FTS] Data version unavailable, trusting the mirror for "
+                         f"{self.max_age:.0f}s: {e}")
+            version = None
+        rows = get_keyword_chunk_contents()
+        names = get_keyword_document_names()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunk_rows")
+            self._conn.execute("DELETE FROM chunks_fts")
+            self._conn.execute("DELETE FROM documents")
+            count = self._write_chunks(rows)
+            self._conn.executemany("INSERT INTO documents (doc_id, name) VALUES (?, ?)",
+                                   list(names.items()))
+        with self._state_lock:
+            self._synced_version = version
+            self._rebuilt_at = self._checked_at = time.monotonic()
+            self._ready = self._fresh = True
+            self._invalid = False
+        logger.info(f"[Keyword FTS] Rebuilt mirror with {count} chunks from {len(names)} documents "
+                    f"(version {version}) in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return count
+
+    def rebuild_async(self) -> None:
+        """Start a background rebuild unless one is already running."""
+        with self._state_lock:
+            if self._rebuild_thread is not None and self._rebuild_thread.is_alive():
+                return
+            self._rebuild_thread = threading.Thread(
+                target=self._rebuild_logged, name='keyword-fts-rebuild', daemon=True)
+            self._rebuild_thread.start()
+
+    def _rebuild_logged(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.warning(f"[Keyword FTS] Rebuild failed, keyword search stays on the RPC: {e}")
+        finally:
+            self._first_rebuild_done.set()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first background rebuild; returns whether the mirror is loaded."""
+        self._first_rebuild_done.wait(timeout)
+        return self._ready
+
+    # ---- freshness ----------------------------------------------------
+
+    def record_write(self, new_version: Optional[int]) -> None:
+        """
+        Account for a keyword_chunks write that was applied to this mirror.
+
+        The mirror stays fresh only if the bump moved the shared version
+        exactly one step past the synced one (no other writer in between).
+        """
+        with self._state_lock:
+            if new_version is None:
+                return
+            if self._synced_version is not None and new_version == self._synced_version + 1:
+                self._synced_version = new_version
+            else:
+                self._fresh = False
+                self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        """Stop serving the mirror until the next rebuild (a write could not be applied)."""
+        with self._state_lock:
+            self._invalid = True
+            self._fresh = False
+            self._checked_at = 0.0
+
+    def is_fresh(self) -> bool:
+        """Whether the mirror matches keyword_chunks (starts a rebuild when it does not)."""
+        if not self._ready:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._fresh
+        try:
+            from backend.storage.supabase_client import get_data_version
+            version = get_data_version(CHUNK_VERSION_NAME)
+        except Exception as e:
+            logger.debug(f"[Keyword FTS] Data version unavailable: {e}")
+            version = None
+        with self._state_lock:
+            if self._invalid:
+                fresh = False
+            elif version is None:
+                fresh = self._synced_version is None and now - self._rebuilt_at < self.max_age
+            else:
+                fresh = version == self._synced_version
+            self._fresh, self._checked_at = fresh, now
+        if not fresh:
+            logger.info(f"[Keyword FTS] Mirror is stale (synced {self._synced_version}, "
+                        f"current {version}); rebuilding in the background")
+            self.rebuild_async()
+        return fresh
+
+    # ---- search -------------------------------------------------------
+
+    def section_headings(self) -> List[str]:
+        """Distinct non-empty section headings of the mirrored chunks."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT section_heading FROM chunks_fts WHERE section_heading != '' "
+                "GROUP BY section_heading ORDER BY MIN(rowid)")]
+
+    def _doc_names(self, doc_ids: List[str]) -> Dict[str, str]:
+        with self._lock:
+            placeholders = ', '.join('?' * len(doc_ids))
+            names = {row['doc_id']: row['name'] for row in self._conn.execute(
+                f"SELECT doc_id, name FROM documents WHERE doc_id IN ({placeholders})", doc_ids)}
+        missing = [doc_id for doc_id in doc_ids if doc_id not in names]
+        if missing:
+            try:
+                from backend.storage.supabase_client import get_keyword_document_names
+                fetched = get_keyword_document_names(missing)
+                with self._lock, self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO documents (doc_id, name) VALUES (?, ?)",
+                        list(fetched.items()))
+                names.update(fetched)
+            except Exception as e:
+                logger.warning(f"[Keyword FTS] Could not fetch document names: {e}")
+        return names
+
+    def search(self, keyword: str, limit: int = 100, doc_id_filter: Optional[str] = None,
+               match_any: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        BM25-ranked search over the mirror for chunks containing the keyword
+        as a phrase, or with match_any any of its tokens.
+
+        Returns:
+            Rows shaped like keyword_search_documents results (chunk_id, doc_id,
+            doc_name, section_heading, content, relevance) plus a `snippet` with
+            the matches wrapped in SNIPPET_START/SNIPPET_END; relevance is the
+            negated bm25() score, so higher is better and every hit is > 0.
+            None when the keyword has no searchable token.
+        """
+        query = fts_query(keyword, match_any)
+        if query is None:
+            return None
+        sql = (
+            "SELECT r.chunk_id, r.doc_id, f.section_heading, f.content, "
+            "bm25(chunks_fts) AS score, "
+            f"snippet(chunks_fts, 1, ?, ?, '…', {_SNIPPET_TOKENS}) AS snippet "
+            "FROM chunks_fts f JOIN chunk_rows r ON r.id = f.rowid "
+            "WHERE chunks_fts MATCH ?"
+        )
+        params: List[Any] = [SNIPPET_START, SNIPPET_END, query]
+        if doc_id_filter:
+            sql += " AND r.doc_id = ?"
+            params.append(doc_id_filter)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        names = self._doc_names(list({row['doc_id'] for row in rows})) if rows else {}
+        return [{
+            'chunk_id': row['chunk_id'],
+            'doc_id': row['doc_id'],
+            'doc_name': names.get(row['doc_id'], row['doc_id']),
+            'section_heading': row['section_heading'] or None,
+            'content': row['content'],
+            'relevance': -row['score'],
+            'snippet': row['snippet'],
+        } for row in rows]
+
+
+_index: Optional[KeywordFtsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_fts_index() -> KeywordFtsIndex:
+    """Process-wide keyword FTS mirror (empty and stale until rebuilt)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KeywordFtsIndex()
+        return _index
+
+
+def _bump_doc_versions(doc_ids: Iterable[str]) -> None:
+    """Bump the index version of each written document (explanation cache keys)."""
+    from backend.storage.explanation_cache import get_explanation_cache
+    from backend.storage.supabase_client import bump_data_version
+    for doc_id in doc_ids:
+        try:
+            bump_data_version(doc_version_name(doc_id))
+        except Exception as e:
+            logger.warning(f"[Keyword FTS] Could not bump the index version of {doc_id}: {e}")
+        try:
+            get_explanation_cache().delete_document(doc_id)
+        except Exception as e:
+            logger.warning(f"[Keyword FTS] Could not drop cached explanations of {doc_id}: {e}")
+
+
+def _mirror_write(apply: Callable[[KeywordFtsIndex], Any], doc_ids: Iterable[str]) -> None:
+    applied = False
+    if KEYWORD_FTS_ENABLED:
+        try:
+            apply(get_keyword_fts_index())
+            applied = True
+        except Exception as e:
+            logger.warning(f"[Keyword FTS] Mirror update failed: {e}")
+    # Bump even when the mirror is disabled here, so other processes notice
+    new_version = _bump_chunk_version()
+    _bump_doc_versions(doc_ids)
+    if KEYWORD_FTS_ENABLED:
+        if applied:
+            get_keyword_fts_index().record_write(new_version)
+        else:
+            get_keyword_fts_index().invalidate()
+
+
+def mirror_chunk_upsert(chunks: Iterable[Dict[str, Any]],
+                        replace_doc_id: Optional[str] = None) -> None:
+    """Apply a keyword_chunks upsert to the mirror and bump the shared versions."""
+    chunks = list(chunks)
+    doc_ids = dict.fromkeys(chunk['doc_id'] for chunk in chunks)
+    if replace_doc_id is not None:
+        doc_ids[replace_doc_id] = None
+    _mirror_write(lambda index: index.upsert_chunks(chunks, replace_doc_id), doc_ids)
+
+
+def mirror_chunk_delete(doc_id: str, chunk_ids: Iterable[str]) -> None:
+    """Apply a delete of some of a document's chunks to the mirror and bump the shared versions."""
+    chunk_ids = list(chunk_ids)
+    _mirror_write(lambda index: index.delete_chunks(chunk_ids), [doc_id])
+
+
+def mirror_document_delete(doc_id: str) -> None:
+    """Apply a document delete to the mirror and bump the shared versions."""
+    _mirror_write(lambda index: index.delete_document(doc_id), [doc_id])
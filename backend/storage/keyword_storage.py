@@ -4,6 +4,7 @@ This routes keyword_extractor services to use unified_rag_app's Supabase connect
 """
 from typing import List, Dict, Optional, Any
 from backend.storage.supabase_client import get_supabase_client
+from backend.storage.keyword_fts_index import mirror_chunk_upsert, mirror_document_delete
 
 
 def list_keyword_documents() -> List[Dict[str, Any]]:
@@ -75,10 +76,14 @@ def insert_chunks(
     client.table('keyword_chunks').delete().eq('doc_id', doc_id).execute()
     
     # Insert new chunks
+    inserted = 0
     if chunks:
         result = client.table('keyword_chunks').insert(chunks).execute()
-        return len(result.data) if result.data else 0
-    return 0
+        inserted = len(result.data) if result.data else 0
+    
+    # Keep the local keyword search mirror in sync
+    mirror_chunk_upsert([{**chunk, 'doc_id': doc_id} for chunk in chunks], replace_doc_id=doc_id)
+    return inserted
 
 
 def delete_document(doc_id: str) -> bool:
@@ -95,6 +100,7 @@ def delete_document(doc_id: str) -> bool:
     client = get_supabase_client(use_service_key=True)
     
     result = client.table('keyword_documents').delete().eq('doc_id', doc_id).execute()
+    mirror_document_delete(doc_id)
     return len(result.data) > 0 if result.data else False
 
 
@@ -0,0 +1,13 @@
+-- Idempotent code chunk indexing.
+--
+-- Each code chunk is identified by (file_path, symbol_path, content_hash) so
+-- re-uploading a file upserts unchanged chunks in place instead of adding
+-- duplicates, and chunks whose symbol disappeared or changed can be deleted.
+-- Rows indexed before this migration keep NULL keys; they are treated as
+-- orphans and removed the next time their file is uploaded.
+
+alter table code_chunks add column if not exists symbol_path text;
+alter table code_chunks add column if not exists content_hash text;
+
+create unique index if not exists code_chunks_file_symbol_hash_key
+    on code_chunks (file_path, symbol_path, content_hash);
@@ -0,0 +1,6 @@
+-- Whole-file content hash for code files.
+--
+-- Recorded after a file's chunks are indexed; bulk codebase ingestion skips
+-- files whose hash is unchanged without parsing or querying their chunks.
+
+alter table code_files add column if not exists content_hash text;
@@ -0,0 +1,66 @@
+-- Unified multi-filter code vector search.
+--
+-- One round trip replaces a match_code_chunks call per file filter and per
+-- chunk type. file_path_filters match a stored path case-insensitively with
+-- either separator when the path equals the filter or either one is a suffix
+-- of the other at a path segment boundary. So "Tank.cs", "Scripts/Tank.cs"
+-- and a longer absolute path all find "Assets/Scripts/Tank.cs".
+--
+-- Returns hits grouped by chunk type, each group ranked by similarity and
+-- capped at match_count:
+--   {"method": [{...chunk columns..., "similarity": 0.83}, ...], "class": [...]}
+--
+-- Each chunk type is its own nearest-neighbour subquery (ORDER BY
+-- embedding <=> query_embedding LIMIT match_count, i.e. a UNION ALL over the
+-- types), so the vector index serves every group; match_threshold is applied
+-- to the limited rows. Without chunk_types, the types the code indexer writes
+-- are searched (method plus the C# type kinds).
+
+create or replace function match_code_chunks_multi(
+    query_embedding vector,
+    match_threshold float default 0.2,
+    match_count int default 20,
+    file_path_filters text[] default null,
+    chunk_types text[] default null
+)
+returns jsonb
+language sql stable
+as $$
+    with filters as (
+        select lower(replace(f, '\', '/')) as f
+        from unnest(coalesce(file_path_filters, '{}'::text[])) as f
+    ),
+    types as (
+        select distinct t as chunk_type
+        from unnest(coalesce(
+            chunk_types,
+            array['method', 'class', 'struct', 'interface', 'enum', 'record']
+        )) as t
+    ),
+    nearest as (
+        select n.*
+        from types
+        cross join lateral (
+            select c.*, 1 - (c.embedding <=> query_embedding) as similarity
+            from code_chunks c
+            where c.embedding is not null
+              and c.chunk_type = types.chunk_type
+              and (file_path_filters is null or exists (
+                    select 1 from filters
+                    where lower(replace(c.file_path, '\', '/')) = filters.f
+                       or right(lower(replace(c.file_path, '\', '/')), length(filters.f) + 1) = '/' || filters.f
+                       or right(filters.f, length(c.file_path) + 1) = '/' || lower(replace(c.file_path, '\', '/'))
+              ))
+            order by c.embedding <=> query_embedding
+            limit match_count
+        ) as n
+    )
+    select coalesce(jsonb_object_agg(grouped.chunk_type, grouped.hits), '{}'::jsonb)
+    from (
+        select n.chunk_type,
+               jsonb_agg(to_jsonb(n) - 'embedding' order by n.similarity desc) as hits
+        from nearest n
+        where n.similarity > match_threshold
+        group by n.chunk_type
+    ) as grouped;
+$$;
@@ -0,0 +1,14 @@
+-- Compact mirror of the local code symbol index (backend/storage/code_symbol_index.py).
+--
+-- One row per code file. symbols holds one array per symbol:
+--   [kind, name, parent, path, signature, start_byte, end_byte, start_line, end_line]
+
+create table if not exists code_symbols (
+    file_path text primary key,
+    file_name text not null,
+    content_hash text,
+    symbols jsonb not null default '[]'::jsonb,
+    updated_at timestamptz not null default now()
+);
+
+create index if not exists code_symbols_file_name on code_symbols (lower(file_name));
@@ -0,0 +1,35 @@
+-- Multi-term keyword search.
+--
+-- One round trip replaces a keyword_search_documents call per term (alias
+-- group searches, deep search word checks, per-keyword section scoring).
+-- Each term is searched with keyword_search_documents itself, so matching
+-- and relevance are exactly those of the single-term RPC; match_count and
+-- doc_id_filter apply per term as before. section_filter then keeps only
+-- hits in that section (NULL: no section filter).
+--
+-- Returns a jsonb array of the single-term result rows, each tagged with the
+-- term that produced it, in term order and then in each term's result order:
+--   [{...keyword_search_documents columns..., "matched_term": "tank"}, ...]
+
+create or replace function keyword_search_documents_multi(
+    search_terms text[],
+    match_count int default 100,
+    doc_id_filter text default null,
+    section_filter text default null
+)
+returns jsonb
+language sql stable
+as $$
+    select coalesce(
+        jsonb_agg(
+            (to_jsonb(r) - 'ordinality') || jsonb_build_object('matched_term', t.term)
+            order by t.term_order, r.ordinality
+        ),
+        '[]'::jsonb
+    )
+    from unnest(search_terms) with ordinality as t(term, term_order)
+    cross join lateral rows from (
+        keyword_search_documents(t.term, match_count, doc_id_filter)
+    ) with ordinality as r
+    where section_filter is null or r.section_heading = section_filter;
+$$;
@@ -0,0 +1,27 @@
+-- Version counters for data that processes cache in memory.
+--
+-- A process caching a table (e.g. the alias graph over keyword_aliases)
+-- reads the counter to decide whether its copy is stale; the endpoints
+-- that mutate the table bump it. Reading one row is much cheaper than
+-- reloading the table on every request or on a timer.
+
+create table if not exists data_versions (
+    name text primary key,
+    version bigint not null default 0,
+    updated_at timestamptz not null default now()
+);
+
+insert into data_versions (name) values ('keyword_aliases')
+on conflict (name) do nothing;
+
+-- Increment a counter (creating it on first use) and return the new version.
+create or replace function bump_data_version(version_name text)
+returns bigint
+language sql
+as $$
+    insert into data_versions as v (name, version)
+    values (version_name, 1)
+    on conflict (name) do update
+        set version = v.version + 1, updated_at = now()
+    returning version;
+$$;
@@ -0,0 +1,18 @@
+-- Embedding model of each vector index.
+--
+-- keyword_chunks.embedding and code_chunks.embedding only compare
+-- meaningfully when every row (and every query) was embedded by the same
+-- model. The first indexing run records its model and dimension here;
+-- later runs with another model are rejected (see
+-- backend/storage/embedding_index.py) instead of silently mixing vector
+-- spaces.
+--
+-- To switch models, re-embed the whole table after deleting its row:
+--   delete from embedding_indexes where index_name = 'keyword_chunks';
+
+create table if not exists embedding_indexes (
+    index_name text primary key,
+    embedding_model text not null,
+    embedding_dim integer not null,
+    created_at timestamptz not null default now()
+);
@@ -0,0 +1,29 @@
+-- Finish a code indexing run in one transaction.
+--
+-- After the changed chunks of a run have been upserted, two things remain:
+-- unchanged chunks that moved get their metadata (line numbers) refreshed,
+-- and chunks the files no longer produce are deleted. Doing both in one
+-- call replaces an UPDATE round trip per moved chunk plus separate DELETEs,
+-- and readers never see the refreshed metadata without the orphan delete.
+--
+-- metadata_updates: [{"id": ..., "metadata": {...}}, ...]
+-- orphan_ids:       [{"id": ...}, ...]
+-- Rows are read with jsonb_populate_recordset(null::code_chunks, ...), so
+-- ids keep the column's own type.
+
+create or replace function apply_code_chunk_changes(
+    metadata_updates jsonb default '[]'::jsonb,
+    orphan_ids jsonb default '[]'::jsonb
+)
+returns void
+language sql
+as $$
+    update code_chunks c
+    set metadata = u.metadata
+    from jsonb_populate_recordset(null::code_chunks, metadata_updates) as u
+    where c.id = u.id;
+
+    delete from code_chunks c
+    using jsonb_populate_recordset(null::code_chunks, orphan_ids) as d
+    where c.id = d.id;
+$$;
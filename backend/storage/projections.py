@@ -0,0 +1,58 @@
+"""
+Column sets for Supabase table reads.
+
+Each read declares what it is for instead of using select('*'):
+- listing: identifiers and positions, for section lists and lookups
+- content: listing columns plus the text needed to build context or rebuild documents
+- scoring: identifiers plus the embedding vector, for local similarity scoring
+
+Only scoring projections include `embedding` (vector(1536) on keyword_chunks),
+which as JSON is ~20 KB per row and dominates the payload of every other read.
+Use gdd_rag_backbone/scripts/measure_query_payloads.py to measure the payload
+of each projection against select('*').
+"""
+
+from dataclasses import dataclass
+from typing import Literal, Optional, Tuple
+
+ColumnUse = Literal['listing', 'content', 'scoring']
+
+
+@dataclass(frozen=True)
+class Projection:
+    """A named column set for one table."""
+    table: str
+    use: ColumnUse
+    columns: Tuple[str, ...]
+
+    @property
+    def select(self) -> str:
+        """Column list for PostgREST select()."""
+        return ', '.join(self.columns)
+
+    def query(self, client, count: Optional[str] = None):
+        """Start a select on the projection's table."""
+        if count:
+            return client.table(self.table).select(self.select, count=count)
+        return client.table(self.table).select(self.select)
+
+
+_KEYWORD_CHUNK_KEY = ('chunk_id', 'doc_id')
+
+KEYWORD_CHUNK_LISTING = Projection(
+    'keyword_chunks', 'listing', _KEYWORD_CHUNK_KEY + ('section_heading', 'chunk_index'))
+KEYWORD_CHUNK_CONTENT = Projection(
+    'keyword_chunks', 'content', KEYWORD_CHUNK_LISTING.columns + ('content',))
+KEYWORD_CHUNK_SCORING = Projection(
+    'keyword_chunks', 'scoring', _KEYWORD_CHUNK_KEY + ('embedding',))
+
+_CODE_CHUNK_KEY = ('id', 'file_path', 'chunk_type')
+
+CODE_CHUNK_LISTING = Projection(
+    'code_chunks', 'listing', _CODE_CHUNK_KEY + ('class_name', 'method_name', 'metadata'))
+CODE_CHUNK_CONTENT = Projection(
+    'code_chunks', 'content', CODE_CHUNK_LISTING.columns + (
+        'source_code', 'code', 'doc_comment', 'constructor_declaration',
+        'method_declarations', 'code_references'))
+CODE_CHUNK_SCORING = Projection(
+    'code_chunks', 'scoring', _CODE_CHUNK_KEY + ('embedding',))
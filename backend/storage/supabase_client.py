@@ -4,7 +4,7 @@ Supabase client for vector storage
 
 import os
 import sys
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 
 # Workaround: Mock storage3 if not available (we don't use it)
@@ -246,6 +246,44 @@ def vector_search_code_chunks(
         logger.error(f"[Supabase Code Search] Error: {e}")
         raise Exception(f"Error in Code vector search: {e}")
 
+def vector_search_code_chunks_multi(
+    query_embedding: List[float],
+    limit: int = 20,
+    threshold: float = 0.2,
+    file_paths: Optional[List[str]] = None,
+    chunk_types: Optional[List[str]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Vector search on code chunks for several files and chunk types in one RPC.
+    
+    Args:
+        query_embedding: Query vector embedding
+        limit: Maximum number of results per chunk type
+        threshold: Similarity threshold (0.0 to 1.0)
+        file_paths: Optional file paths or filenames to filter by (see
+            migrations/003_match_code_chunks_multi.sql for matching rules)
+        chunk_types: Optional chunk types to return (default: method and the C# type kinds)
+    
+    Returns:
+        Dict of chunk_type -> matching chunks ranked by similarity
+    """
+    try:
+        client = get_supabase_client()
+        result = client.rpc(
+            'match_code_chunks_multi',
+            {
+                'query_embedding': query_embedding,
+                'match_threshold': threshold,
+                'match_count': limit,
+                'file_path_filters': file_paths or None,
+                'chunk_types': chunk_types or None
+            }
+        ).execute()
+        grouped = result.data if isinstance(result.data, dict) else {}
+        return {chunk_type: hits or [] for chunk_type, hits in grouped.items()}
+    except Exception as e:
+        raise Exception(f"Error in Code multi vector search: {e}")
+
 def insert_gdd_document(
     doc_id: str,
     name: str,
@@ -407,10 +445,68 @@ def insert_gdd_chunks(chunks: List[Dict[str, Any]]) -> int:
             ).execute()
             total_inserted += len(result.data) if result.data else 0
         
+        # Keep the local keyword search mirror in sync
+        from backend.storage.keyword_fts_index import mirror_chunk_upsert
+        mirror_chunk_upsert(records)
+        
         return total_inserted
     except Exception as e:
         raise Exception(f"Error inserting GDD chunks: {e}")
 
+def get_gdd_chunk_ids(doc_id: str) -> List[str]:
+    """
+    Get the chunk_ids of a GDD document's stored chunks.
+    
+    Args:
+        doc_id: Document ID
+    
+    Returns:
+        List of chunk_ids (empty when the document is not indexed)
+    """
+    try:
+        client = get_supabase_client()
+        chunk_ids = []
+        page_size = 1000
+        offset = 0
+        while True:
+            result = client.table('keyword_chunks').select('chunk_id').eq(
+                'doc_id', doc_id
+            ).order('chunk_id').range(offset, offset + page_size - 1).execute()
+            page = result.data or []
+            chunk_ids.extend(row['chunk_id'] for row in page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return chunk_ids
+    except Exception as e:
+        raise Exception(f"Error fetching GDD chunk ids: {e}")
+
+def delete_gdd_chunks(doc_id: str, chunk_ids: List[str]) -> int:
+    """
+    Delete some of a GDD document's chunks by chunk_id (the document row stays).
+    
+    Args:
+        doc_id: Document ID the chunks belong to
+        chunk_ids: keyword_chunks chunk_ids
+    
+    Returns:
+        Number of ids deleted
+    """
+    if not chunk_ids:
+        return 0
+    try:
+        client = get_supabase_client(use_service_key=True)
+        batch_size = 100
+        for i in range(0, len(chunk_ids), batch_size):
+            client.table('keyword_chunks').delete().eq('doc_id', doc_id).in_(
+                'chunk_id', chunk_ids[i:i + batch_size]).execute()
+        # Keep the local keyword search mirror in sync
+        from backend.storage.keyword_fts_index import mirror_chunk_delete
+        mirror_chunk_delete(doc_id, chunk_ids)
+        return len(chunk_ids)
+    except Exception as e:
+        raise Exception(f"Error deleting GDD chunks: {e}")
+
 def insert_code_file(file_path: str, file_name: str, normalized_path: str) -> Dict[str, Any]:
     """
     Insert or update a code file.
@@ -436,6 +532,121 @@ def insert_code_file(file_path: str, file_name: str, normalized_path: str) -> Di
     except Exception as e:
         raise Exception(f"Error inserting code file: {e}")
 
+def upsert_code_files(files: List[Dict[str, Any]]) -> int:
+    """
+    Insert or update many code files in batches.
+    
+    Args:
+        files: Dicts with file_path, file_name, normalized_path and
+            optionally content_hash (omitted columns keep their stored value)
+    
+    Returns:
+        Number of files upserted
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        batch_size = 100
+        total = 0
+        for i in range(0, len(files), batch_size):
+            result = client.table('code_files').upsert(
+                files[i:i + batch_size], on_conflict='file_path').execute()
+            total += len(result.data) if result.data else 0
+        return total
+    except Exception as e:
+        raise Exception(f"Error upserting code files: {e}")
+
+def get_code_file_hashes() -> Dict[str, str]:
+    """
+    Get the recorded content hash of every indexed code file.
+    
+    Returns:
+        Dict of file_path -> content_hash (files without a hash are omitted)
+    """
+    try:
+        client = get_supabase_client()
+        hashes = {}
+        page_size = 1000
+        offset = 0
+        while True:
+            result = client.table('code_files').select(
+                'file_path, content_hash'
+            ).order('file_path').range(offset, offset + page_size - 1).execute()
+            page = result.data or []
+            for row in page:
+                if row.get('content_hash'):
+                    hashes[row['file_path']] = row['content_hash']
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return hashes
+    except Exception as e:
+        raise Exception(f"Error fetching code file hashes: {e}")
+
+def get_code_file_paths() -> List[str]:
+    """
+    Get the file_path of every indexed code file.
+    
+    Returns:
+        List of file paths, sorted
+    """
+    try:
+        client = get_supabase_client()
+        paths = []
+        page_size = 1000
+        offset = 0
+        while True:
+            result = client.table('code_files').select(
+                'file_path'
+            ).order('file_path').range(offset, offset + page_size - 1).execute()
+            page = result.data or []
+            paths.extend(row['file_path'] for row in page if row.get('file_path'))
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return paths
+    except Exception as e:
+        raise Exception(f"Error fetching code file paths: {e}")
+
+def get_code_file_hash(file_path: str) -> Optional[str]:
+    """
+    Get the recorded content hash of one code file.
+    
+    Args:
+        file_path: Exact file path as stored in code_files
+    
+    Returns:
+        The content hash, or None if the file is unknown or has no hash
+    """
+    try:
+        client = get_supabase_client()
+        result = client.table('code_files').select(
+            'content_hash'
+        ).eq('file_path', file_path).limit(1).execute()
+        return result.data[0].get('content_hash') if result.data else None
+    except Exception as e:
+        raise Exception(f"Error fetching code file hash: {e}")
+
+def _code_chunk_record(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a code chunk dict to the code_chunks row schema."""
+    record = {
+        'file_path': chunk['file_path'],
+        'chunk_type': chunk['chunk_type'],
+        'class_name': chunk.get('class_name'),
+        'method_name': chunk.get('method_name'),
+        'source_code': chunk['source_code'],
+        'code': chunk.get('code'),
+        'embedding': chunk.get('embedding'),
+        'doc_comment': chunk.get('doc_comment', ''),
+        'constructor_declaration': chunk.get('constructor_declaration', ''),
+        'method_declarations': chunk.get('method_declarations', ''),
+        'code_references': chunk.get('references', ''),  # Maps from 'references' key to 'code_references' column
+        'metadata': chunk.get('metadata', {})
+    }
+    if 'symbol_path' in chunk:
+        record['symbol_path'] = chunk['symbol_path']
+        record['content_hash'] = chunk['content_hash']
+    return record
+
 def insert_code_chunks(chunks: List[Dict[str, Any]]) -> int:
     """
     Insert code chunks (methods/classes) with embeddings into Supabase.
@@ -462,23 +673,7 @@ def insert_code_chunks(chunks: List[Dict[str, Any]]) -> int:
         client = get_supabase_client(use_service_key=True)
         
         # Prepare records for insertion
-        records = []
-        for chunk in chunks:
-            record = {
-                'file_path': chunk['file_path'],
-                'chunk_type': chunk['chunk_type'],
-                'class_name': chunk.get('class_name'),
-                'method_name': chunk.get('method_name'),
-                'source_code': chunk['source_code'],
-                'code': chunk.get('code'),
-                'embedding': chunk.get('embedding'),
-                'doc_comment': chunk.get('doc_comment', ''),
-                'constructor_declaration': chunk.get('constructor_declaration', ''),
-                'method_declarations': chunk.get('method_declarations', ''),
-                'code_references': chunk.get('references', ''),  # Maps from 'references' key to 'code_references' column
-                'metadata': chunk.get('metadata', {})
-            }
-            records.append(record)
+        records = [_code_chunk_record(chunk) for chunk in chunks]
         
         # Insert in batches
         batch_size = 100
@@ -493,6 +688,169 @@ def insert_code_chunks(chunks: List[Dict[str, Any]]) -> int:
     except Exception as e:
         raise Exception(f"Error inserting code chunks: {e}")
 
+def upsert_code_chunks(chunks: List[Dict[str, Any]]) -> int:
+    """
+    Upsert code chunks keyed on (file_path, symbol_path, content_hash).
+    Re-writing a chunk that is already stored updates it in place instead of
+    adding a duplicate row (requires migrations/001_code_chunk_keys.sql).
+    
+    Args:
+        chunks: Chunk dictionaries as for insert_code_chunks, plus
+            symbol_path and content_hash
+    
+    Returns:
+        Number of chunks upserted
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        
+        records = [_code_chunk_record(chunk) for chunk in chunks]
+        
+        batch_size = 100
+        total_upserted = 0
+        
+        for i in range(0, len(records), batch_size):
+            batch = records[i:i + batch_size]
+            result = client.table('code_chunks').upsert(
+                batch,
+                on_conflict='file_path,symbol_path,content_hash'
+            ).execute()
+            total_upserted += len(result.data) if result.data else 0
+        
+        return total_upserted
+    except Exception as e:
+        raise Exception(f"Error upserting code chunks: {e}")
+
+def get_code_chunk_keys(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get the identity of every stored chunk of some files (no source or embeddings).
+    
+    Args:
+        file_paths: File paths as stored in code_chunks
+    
+    Returns:
+        List of dicts with id, file_path, symbol_path, content_hash and metadata
+        (symbol_path/content_hash are None for chunks indexed before keys existed)
+    """
+    try:
+        client = get_supabase_client()
+        rows = []
+        page_size = 1000
+        for i in range(0, len(file_paths), 50):
+            paths = file_paths[i:i + 50]
+            offset = 0
+            while True:
+                result = client.table('code_chunks').select(
+                    'id, file_path, symbol_path, content_hash, metadata'
+                ).in_('file_path', paths).order('id').range(offset, offset + page_size - 1).execute()
+                page = result.data or []
+                rows.extend(page)
+                if len(page) < page_size:
+                    break
+                offset += page_size
+        return rows
+    except Exception as e:
+        raise Exception(f"Error fetching code chunk keys: {e}")
+
+def update_code_chunk_metadata(chunk_id: Any, metadata: Dict[str, Any]) -> None:
+    """
+    Update only the metadata of a stored code chunk (e.g. its line number).
+    
+    Args:
+        chunk_id: code_chunks row id
+        metadata: New metadata dict
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        client.table('code_chunks').update({'metadata': metadata}).eq('id', chunk_id).execute()
+    except Exception as e:
+        raise Exception(f"Error updating code chunk metadata: {e}")
+
+def delete_code_chunks(chunk_ids: List[Any]) -> int:
+    """
+    Delete code chunks by id.
+    
+    Args:
+        chunk_ids: code_chunks row ids
+    
+    Returns:
+        Number of ids deleted
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        batch_size = 100
+        for i in range(0, len(chunk_ids), batch_size):
+            client.table('code_chunks').delete().in_('id', chunk_ids[i:i + batch_size]).execute()
+        return len(chunk_ids)
+    except Exception as e:
+        raise Exception(f"Error deleting code chunks: {e}")
+
+def apply_code_chunk_changes(metadata_updates: List[Tuple[Any, Dict[str, Any]]],
+                             orphan_ids: List[Any]) -> None:
+    """
+    Refresh chunk metadata and delete orphaned chunks in one transaction
+    (requires migrations/008_apply_code_chunk_changes.sql).
+    
+    Args:
+        metadata_updates: (code_chunks row id, new metadata dict) pairs
+        orphan_ids: code_chunks row ids to delete
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        client.rpc('apply_code_chunk_changes', {
+            'metadata_updates': [{'id': chunk_id, 'metadata': metadata}
+                                 for chunk_id, metadata in metadata_updates],
+            'orphan_ids': [{'id': chunk_id} for chunk_id in orphan_ids],
+        }).execute()
+    except Exception as e:
+        raise Exception(f"Error applying code chunk changes: {e}")
+
+def upsert_code_symbols(rows: List[Dict[str, Any]]) -> int:
+    """
+    Upsert compact symbol-table rows (one per file) into code_symbols.
+    
+    Args:
+        rows: Dicts with file_path, file_name, content_hash and symbols
+    
+    Returns:
+        Number of rows upserted
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        batch_size = 100
+        total = 0
+        for i in range(0, len(rows), batch_size):
+            result = client.table('code_symbols').upsert(
+                rows[i:i + batch_size], on_conflict='file_path').execute()
+            total += len(result.data) if result.data else 0
+        return total
+    except Exception as e:
+        raise Exception(f"Error upserting code symbols: {e}")
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so `value` only matches itself (`_` is common in C# names)."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def get_code_symbols_by_name(file_name: str) -> List[Dict[str, Any]]:
+    """
+    Get the mirrored symbol-table rows of files with a given file name.
+    
+    Args:
+        file_name: File name (case-insensitive), e.g. "Tank.cs"
+    
+    Returns:
+        List of code_symbols rows
+    """
+    try:
+        client = get_supabase_client()
+        result = client.table('code_symbols').select(
+            'file_path, file_name, content_hash, symbols'
+        ).ilike('file_name', _escape_like(file_name)).execute()
+        return result.data if result.data else []
+    except Exception as e:
+        raise Exception(f"Error fetching code symbols: {e}")
+
 def get_gdd_documents() -> List[Dict[str, Any]]:
     """
     Get all GDD documents.
@@ -591,6 +949,55 @@ def upload_pdf_to_storage(pdf_path: Path, pdf_filename: str) -> bool:
         return False
 
 
+def _code_blob_storage_path(content_hash: str) -> str:
+    return f"{content_hash[:2]}/{content_hash}.z"
+
+
+def upload_code_blob(content_hash: str, blob: bytes) -> bool:
+    """
+    Upload a compressed code file blob to Supabase Storage (code blob bucket).
+    
+    Args:
+        content_hash: sha256 of the original file bytes
+        blob: Encoded blob (see backend.storage.code_blob_store)
+    
+    Returns:
+        True if successful
+    """
+    from backend.shared.config import CODE_BLOB_BUCKET
+    try:
+        client = get_supabase_client(use_service_key=True)
+        client.storage.from_(CODE_BLOB_BUCKET).upload(
+            path=_code_blob_storage_path(content_hash),
+            file=blob,
+            file_options={
+                "content-type": "application/octet-stream",
+                "cache-control": "31536000",
+                "upsert": "true",
+            },
+        )
+        return True
+    except Exception as e:
+        raise Exception(f"Error uploading code blob: {e}")
+
+
+def download_code_blob(content_hash: str) -> Optional[bytes]:
+    """
+    Download a compressed code file blob from Supabase Storage.
+    
+    Returns:
+        The encoded blob, or None if it is not in storage
+    """
+    from backend.shared.config import CODE_BLOB_BUCKET
+    client = get_supabase_client()
+    try:
+        return client.storage.from_(CODE_BLOB_BUCKET).download(_code_blob_storage_path(content_hash))
+    except Exception as e:
+        if 'not found' in str(e).lower() or '404' in str(e):
+            return None
+        raise Exception(f"Error downloading code blob: {e}")
+
+
 def upload_gdd_image_to_storage(doc_id: str, image_filename: str, image_bytes: bytes, content_type: str = "image/webp") -> Optional[str]:
     """
     Upload a single image to gdd_pdfs bucket under {doc_id}/images/{image_filename}.
@@ -766,6 +1173,8 @@ def delete_gdd_document(doc_id: str) -> bool:
         # Cascade delete will remove chunks automatically (from keyword_chunks table)
         # Uses keyword_documents table (shared with Keyword Finder feature)
         result = client.table('keyword_documents').delete().eq('doc_id', doc_id).execute()
+        from backend.storage.keyword_fts_index import mirror_document_delete
+        mirror_document_delete(doc_id)
         return True
     except Exception as e:
         raise Exception(f"Error deleting GDD document: {e}")
@@ -784,6 +1193,182 @@ def delete_code_file(file_path: str) -> bool:
         client = get_supabase_client(use_service_key=True)
         # Cascade delete will remove chunks automatically
         result = client.table('code_files').delete().eq('file_path', file_path).execute()
+        try:
+            client.table('code_symbols').delete().eq('file_path', file_path).execute()
+        except Exception as e:
+            import logging
+            logging.getLogger(__name__).warning(f"Could not delete code symbols for {file_path}: {e}")
         return True
     except Exception as e:
         raise Exception(f"Error deleting code file: {e}")
+
+def get_data_version(name: str) -> Optional[int]:
+    """
+    Get a data version counter (see migration 006_data_versions.sql).
+    
+    Args:
+        name: Counter name (e.g. 'keyword_aliases')
+    
+    Returns:
+        The current version (0 if the counter was never bumped)
+    """
+    try:
+        client = get_supabase_client()
+        result = client.table('data_versions').select('version').eq('name', name).limit(1).execute()
+        return int(result.data[0]['version']) if result.data else 0
+    except Exception as e:
+        raise Exception(f"Error fetching data version: {e}")
+
+def get_data_versions(names: List[str]) -> Dict[str, int]:
+    """
+    Get several data version counters in one query.
+    
+    Args:
+        names: Counter names
+    
+    Returns:
+        Dict of name -> version (0 for counters that were never bumped)
+    """
+    try:
+        if not names:
+            return {}
+        client = get_supabase_client()
+        result = client.table('data_versions').select('name, version').in_('name', list(names)).execute()
+        versions = {name: 0 for name in names}
+        versions.update({row['name']: int(row['version']) for row in (result.data or [])})
+        return versions
+    except Exception as e:
+        raise Exception(f"Error fetching data versions: {e}")
+
+def bump_data_version(name: str) -> int:
+    """
+    Increment a data version counter, so other processes reload their cached copy.
+    
+    Args:
+        name: Counter name (e.g. 'keyword_aliases')
+    
+    Returns:
+        The new version
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        result = client.rpc('bump_data_version', {'version_name': name}).execute()
+        return int(result.data)
+    except Exception as e:
+        raise Exception(f"Error bumping data version: {e}")
+
+def get_embedding_index(index_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the recorded embedding model of a vector index (see migration 007_embedding_indexes.sql).
+    
+    Args:
+        index_name: Table holding the vectors (e.g. 'keyword_chunks')
+    
+    Returns:
+        Dict with index_name, embedding_model and embedding_dim, or None if nothing is recorded
+    """
+    try:
+        client = get_supabase_client()
+        result = client.table('embedding_indexes').select(
+            'index_name, embedding_model, embedding_dim'
+        ).eq('index_name', index_name).limit(1).execute()
+        return result.data[0] if result.data else None
+    except Exception as e:
+        raise Exception(f"Error fetching embedding index: {e}")
+
+def register_embedding_index(index_name: str, embedding_model: str, embedding_dim: int) -> Dict[str, Any]:
+    """
+    Record the embedding model of a vector index unless one is already recorded.
+    
+    Args:
+        index_name: Table holding the vectors (e.g. 'keyword_chunks')
+        embedding_model: Model name
+        embedding_dim: Native vector dimension (before padding)
+    
+    Returns:
+        The recorded row (the existing one if the index was already registered)
+    """
+    try:
+        client = get_supabase_client(use_service_key=True)
+        client.table('embedding_indexes').upsert({
+            'index_name': index_name,
+            'embedding_model': embedding_model,
+            'embedding_dim': embedding_dim,
+        }, on_conflict='index_name', ignore_duplicates=True).execute()
+        return get_embedding_index(index_name)
+    except Exception as e:
+        raise Exception(f"Error registering embedding index: {e}")
+
+def get_keyword_section_headings() -> List[str]:
+    """
+    Get the distinct section headings of all keyword documents.
+    
+    Returns:
+        Headings in first-seen order
+    """
+    try:
+        client = get_supabase_client()
+        headings = {}
+        page_size = 1000
+        offset = 0
+        while True:
+            result = client.table('keyword_chunks').select(
+                'section_heading'
+            ).order('chunk_id').range(offset, offset + page_size - 1).execute()
+            page = result.data or []
+            for row in page:
+                if row.get('section_heading'):
+                    headings.setdefault(row['section_heading'], None)
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return list(headings)
+    except Exception as e:
+        raise Exception(f"Error fetching section headings: {e}")
+
+def get_keyword_chunk_contents() -> List[Dict[str, Any]]:
+    """
+    Get the searchable text of every keyword chunk (for the local FTS mirror).
+    
+    Returns:
+        List of dicts with chunk_id, doc_id, section_heading, chunk_index and content
+    """
+    try:
+        from backend.storage.projections import KEYWORD_CHUNK_CONTENT
+        client = get_supabase_client()
+        rows = []
+        page_size = 1000
+        offset = 0
+        while True:
+            result = KEYWORD_CHUNK_CONTENT.query(client).order('chunk_id').range(
+                offset, offset + page_size - 1).execute()
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return rows
+    except Exception as e:
+        raise Exception(f"Error fetching keyword chunk contents: {e}")
+
+def get_keyword_document_names(doc_ids: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Get keyword document names without their text columns.
+    
+    Args:
+        doc_ids: Documents to look up (None: all documents)
+    
+    Returns:
+        Dict of doc_id -> name
+    """
+    try:
+        client = get_supabase_client()
+        query = client.table('keyword_documents').select('doc_id, name')
+        if doc_ids is not None:
+            if not doc_ids:
+                return {}
+            query = query.in_('doc_id', list(doc_ids))
+        result = query.execute()
+        return {row['doc_id']: row.get('name') or row['doc_id'] for row in (result.data or [])}
+    except Exception as e:
+        raise Exception(f"Error fetching keyword document names: {e}")
@@ -0,0 +1,136 @@
+"""
+Persistent cache of per-term translation and synonym outputs.
+
+Google translations, WordNet synonyms and the deep-search LLM
+translation/synonym prompt depend only on the term, the language pair,
+the provider and the prompt, so their results are stored in a local SQLite
+database keyed by (term, source language, target language, provider,
+prompt version) and reused across requests and restarts until
+TERM_CACHE_TTL expires. Bump the prompt version of a caller when its
+prompt or output format changes, so stale entries are never read.
+
+The cache is prewarmed at startup with the alias table and the section
+headings of keyword documents (see
+translation_synonym_service.prewarm_term_cache), by one process only: the
+others share the same SQLite file.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Optional
+
+from backend.shared.config import TERM_CACHE_PATH, TERM_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT NOT NULL,
+    src TEXT NOT NULL,
+    tgt TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (term, src, tgt, provider, prompt_version)
+);
+"""
+
+
+def normalize_cache_term(term: str) -> str:
+    """NFC, lowercase and single spaces, so "Tank " and "tank" share an entry."""
+    return ' '.join(unicodedata.normalize('NFC', term or '').lower().split())
+
+
+class TermCache:
+    """SQLite-backed term cache; safe to share between threads."""
+
+    def __init__(self, db_path: str = TERM_CACHE_PATH, ttl: float = TERM_CACHE_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, term: str, src: str, tgt: str, provider: str, prompt_version: str) -> Optional[Any]:
+        """Cached value, or None when missing or older than the TTL."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM terms "
+                "WHERE term = ? AND src = ? AND tgt = ? AND provider = ? AND prompt_version = ?",
+                (normalize_cache_term(term), src or '', tgt or '', provider, prompt_version)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, term: str, src: str, tgt: str, provider: str, prompt_version: str, value: Any) -> None:
+        """Store a value (JSON-serializable), replacing any previous entry."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO terms (term, src, tgt, provider, prompt_version, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_cache_term(term), src or '', tgt or '', provider, prompt_version,
+                 json.dumps(value, ensure_ascii=False), time.time()))
+
+    def has(self, term: str, src: str, tgt: str, provider: str, prompt_version: str) -> bool:
+        return self.get(term, src, tgt, provider, prompt_version) is not None
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; returns how many were deleted."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM terms WHERE created_at < ?", (time.time() - self.ttl,))
+        return cursor.rowcount
+
+
+_prewarm_lock_file = None
+
+
+def acquire_prewarm_lock(db_path: str = TERM_CACHE_PATH) -> bool:
+    """
+    Claim the prewarm for this process (one per host, whatever the worker count).
+
+    The lock is an exclusive flock on a file next to the cache, held until the
+    process exits, so a worker that starts later does not prewarm again.
+    Platforms without fcntl have no cross-process lock and always get it.
+    """
+    global _prewarm_lock_file
+    if _prewarm_lock_file is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        return True
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lock_file = open(f"{db_path}.prewarm.lock", 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _prewarm_lock_file = lock_file
+    return True
+
+
+_cache: Optional[TermCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_term_cache() -> TermCache:
+    """Process-wide term cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TermCache()
+        return _cache
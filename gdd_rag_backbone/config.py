@@ -58,6 +58,45 @@ OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL", "https://api.opena
 DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o-mini")
 DEFAULT_EMBEDDING_MODEL = os.getenv("DEFAULT_EMBEDDING_MODEL", "text-embedding-3-small")
 
+# Shared HTTP connection pool of the OpenAI-compatible clients
+# (gdd_rag_backbone.llm_providers.client_registry); timeouts in seconds
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "64"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "32"))
+LLM_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "120"))
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT", "10"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+LLM_HTTP_MAX_RETRIES = int(os.getenv("LLM_HTTP_MAX_RETRIES", "2"))
+
+# Process-wide LLM/embedding rate limiter (gdd_rag_backbone.llm_providers.rate_limiter):
+# requests and tokens per minute for every model, per-model overrides as
+# "model=rpm:tpm,...", the share of each budget kept for interactive calls,
+# the longest wait (seconds) before a call is sent anyway, and the completion
+# size assumed when a request sets no max_tokens
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+LLM_RATE_LIMIT_RPM = float(os.getenv("LLM_RATE_LIMIT_RPM", "500"))
+LLM_RATE_LIMIT_TPM = float(os.getenv("LLM_RATE_LIMIT_TPM", "200000"))
+LLM_RATE_LIMITS = os.getenv("LLM_RATE_LIMITS", "text-embedding-3-small=3000:1000000")
+LLM_RATE_LIMIT_BACKGROUND_RESERVE = float(os.getenv("LLM_RATE_LIMIT_BACKGROUND_RESERVE", "0.2"))
+LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "120"))
+LLM_RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("LLM_RATE_LIMIT_COMPLETION_TOKENS", "512"))
+
+# Embedding micro-batcher (gdd_rag_backbone.rag_backend.embedding_batcher):
+# how long (milliseconds) a query embedding waits for others to share its
+# API request, and the most texts per batched request; 0 ms disables batching
+EMBED_BATCH_WINDOW_MS = float(os.getenv("EMBED_BATCH_WINDOW_MS", "5"))
+EMBED_BATCH_MAX_TEXTS = int(os.getenv("EMBED_BATCH_MAX_TEXTS", "64"))
+
+# Embedding backend: "remote" (the OpenAI-compatible / DashScope APIs) or
+# "local" (in-process CPU model, gdd_rag_backbone.llm_providers.local_embedding_provider).
+# The local model must be multilingual (Vietnamese documents); RUNTIME is
+# "torch" or "onnx", THREADS the CPU threads used for inference
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "remote").lower()
+LOCAL_EMBEDDING_MODEL = os.getenv(
+    "LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+LOCAL_EMBEDDING_RUNTIME = os.getenv("LOCAL_EMBEDDING_RUNTIME", "torch").lower()
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", str(min(4, os.cpu_count() or 1))))
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+
 # Ensure directories exist
 DEFAULT_WORKING_DIR.mkdir(parents=True, exist_ok=True)
 DEFAULT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -11,7 +11,18 @@ from gdd_rag_backbone.llm_providers.base import (
     make_embedding_func,
     make_llm_model_func,
 )
+from gdd_rag_backbone.llm_providers.client_registry import get_openai_client
+from gdd_rag_backbone.llm_providers.local_embedding_provider import (
+    LocalEmbeddingProvider,
+    get_local_embedding_provider,
+)
 from gdd_rag_backbone.llm_providers.qwen_provider import QwenProvider
+from gdd_rag_backbone.llm_providers.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    get_rate_limiter,
+    llm_priority,
+)
 
 __all__ = [
     "LlmProvider",
@@ -19,5 +30,12 @@ __all__ = [
     "make_llm_model_func",
     "make_embedding_func",
     "QwenProvider",
+    "LocalEmbeddingProvider",
+    "get_local_embedding_provider",
+    "get_openai_client",
+    "get_rate_limiter",
+    "llm_priority",
+    "INTERACTIVE",
+    "BACKGROUND",
 ]
 
@@ -0,0 +1,116 @@
+"""
+Process-wide registry of OpenAI-compatible API clients.
+
+Every LLM and embedding call (Q&A answers, HYDE, explanations, deep search,
+embeddings) gets its client from here instead of constructing one per
+request or per module. Clients are created once per (api_key, base_url) and
+all of them share one keep-alive HTTP connection pool, so hot paths reuse
+open TLS connections instead of paying a handshake per call.
+
+OpenAI clients and the underlying HTTP client are thread-safe, so the same
+instance is handed to every thread. Pool limits and timeouts come from the
+LLM_HTTP_* settings in gdd_rag_backbone.config.
+
+The HTTP client also runs every request through the process-wide rate
+limiter (see rate_limiter), so each call waits for its model's budget and
+429 responses slow down every caller of that model.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from gdd_rag_backbone.config import (
+    LLM_HTTP_CONNECT_TIMEOUT,
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_MAX_RETRIES,
+    LLM_HTTP_TIMEOUT,
+)
+from gdd_rag_backbone.llm_providers.rate_limiter import get_rate_limiter
+
+try:
+    import openai
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    openai = None
+    OpenAI = None
+    OPENAI_AVAILABLE = False
+
+_lock = threading.Lock()
+_http_client = None
+_clients: Dict[Tuple[Optional[str], Optional[str]], "OpenAI"] = {}
+
+
+def _timeout():
+    return openai.Timeout(LLM_HTTP_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT)
+
+
+def get_http_client():
+    """
+    The shared keep-alive connection pool (created on first use).
+
+    Built with openai.DefaultHttpxClient, i.e. on the HTTP library of the
+    installed openai release, with the client's default headers and redirects,
+    and the rate limiter's request/response hooks.
+    """
+    global _http_client
+    if not OPENAI_AVAILABLE:
+        raise ImportError("openai package is required. Install with: pip install openai")
+    with _lock:
+        if _http_client is None:
+            limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+                max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+            )
+            limiter = get_rate_limiter()
+            _http_client = openai.DefaultHttpxClient(
+                limits=limits,
+                timeout=_timeout(),
+                event_hooks={'request': [limiter.on_request], 'response': [limiter.on_response]},
+            )
+        return _http_client
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> "OpenAI":
+    """
+    Shared OpenAI-compatible client for an API key and endpoint.
+
+    Args:
+        api_key: API key (None: the openai package reads OPENAI_API_KEY)
+        base_url: Endpoint (None: the openai package default / OPENAI_BASE_URL)
+
+    Returns:
+        A thread-safe client backed by the shared connection pool
+
+    Raises:
+        ImportError: If the openai package is not installed
+    """
+    key = (api_key, base_url)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    http_client = get_http_client()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=http_client,
+                timeout=_timeout(),
+                max_retries=LLM_HTTP_MAX_RETRIES,
+            )
+            _clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close the shared pool (e.g. at shutdown); later calls open a new one."""
+    global _http_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
+        _clients.clear()
@@ -0,0 +1,119 @@
+"""
+In-process CPU embedding provider (sentence-transformers, PyTorch or ONNX Runtime).
+
+Embeds without any API call: no network latency per query, no rate limits
+during bulk indexing, and it works offline. The default model,
+paraphrase-multilingual-MiniLM-L12-v2 (384 dimensions), covers 50+
+languages including Vietnamese, so Vietnamese documents and English
+questions share one vector space.
+
+Selected with EMBEDDING_BACKEND=local; model, runtime ("torch" or "onnx"),
+thread count and batch size come from the LOCAL_EMBEDDING_* settings in
+gdd_rag_backbone.config. Requires `pip install sentence-transformers`
+(plus `optimum[onnxruntime]` for the ONNX runtime).
+
+Vectors are L2-normalized. The index records the model that embedded it
+(see backend.storage.embedding_index), so chunks embedded by this model and
+by a remote one are never mixed in one index.
+"""
+import threading
+from typing import List, Optional
+
+from gdd_rag_backbone.config import (
+    LOCAL_EMBEDDING_BATCH_SIZE,
+    LOCAL_EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_RUNTIME,
+    LOCAL_EMBEDDING_THREADS,
+)
+from gdd_rag_backbone.llm_providers.base import EmbeddingProvider
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """Embedding provider running a sentence-transformers model on the CPU."""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        runtime: Optional[str] = None,
+        num_threads: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Load the model (downloaded from the Hugging Face hub on first use).
+
+        Args:
+            model_name: sentence-transformers model name or local path (default: LOCAL_EMBEDDING_MODEL)
+            runtime: "torch" or "onnx" (default: LOCAL_EMBEDDING_RUNTIME)
+            num_threads: CPU threads for inference (default: LOCAL_EMBEDDING_THREADS)
+            batch_size: Texts per forward pass (default: LOCAL_EMBEDDING_BATCH_SIZE)
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers package is required for local embeddings. "
+                "Install with: pip install sentence-transformers")
+
+        self.embedding_model = model_name or LOCAL_EMBEDDING_MODEL
+        self.runtime = (runtime or LOCAL_EMBEDDING_RUNTIME).lower()
+        self.num_threads = max(1, num_threads or LOCAL_EMBEDDING_THREADS)
+        self.batch_size = max(1, batch_size or LOCAL_EMBEDDING_BATCH_SIZE)
+        # No endpoint; keeps provider identities (single-flight, batching) distinct
+        self.base_url = None
+
+        if self.runtime == "onnx":
+            import onnxruntime
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = self.num_threads
+            session_options.inter_op_num_threads = 1
+            self._model = SentenceTransformer(
+                self.embedding_model,
+                device="cpu",
+                backend="onnx",
+                model_kwargs={"provider": "CPUExecutionProvider", "session_options": session_options},
+            )
+        elif self.runtime == "torch":
+            import torch
+            torch.set_num_threads(self.num_threads)
+            self._model = SentenceTransformer(self.embedding_model, device="cpu")
+        else:
+            raise ValueError(f"Unknown LOCAL_EMBEDDING_RUNTIME {self.runtime!r} (use 'torch' or 'onnx')")
+
+        self.embedding_dim = self._model.get_sentence_embedding_dimension()
+        # One forward pass at a time: each already uses num_threads cores
+        self._lock = threading.Lock()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in batches of batch_size.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of L2-normalized embedding vectors
+        """
+        if not texts:
+            return []
+        with self._lock:
+            vectors = self._model.encode(
+                list(texts),
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        return vectors.tolist()
+
+
+_provider: Optional[LocalEmbeddingProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_local_embedding_provider() -> LocalEmbeddingProvider:
+    """Process-wide local embedding provider (the model is loaded once)."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            _provider = LocalEmbeddingProvider()
+        return _provider
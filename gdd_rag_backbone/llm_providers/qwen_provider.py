@@ -5,6 +5,12 @@ import os
 from typing import List, Optional, Dict, Any
 from gdd_rag_backbone.config import QWEN_API_KEY, QWEN_BASE_URL, DASHSCOPE_REGION, DEFAULT_LLM_MODEL, DEFAULT_EMBEDDING_MODEL
 from gdd_rag_backbone.llm_providers.base import LlmProvider, EmbeddingProvider
+from gdd_rag_backbone.llm_providers.client_registry import get_openai_client
+from gdd_rag_backbone.llm_providers.rate_limiter import (
+    estimate_request_tokens,
+    get_rate_limiter,
+    is_rate_limit_error,
+)
 
 
 class QwenProvider(LlmProvider, EmbeddingProvider):
@@ -126,13 +132,16 @@ class QwenProvider(LlmProvider, EmbeddingProvider):
                 
                 filtered_kwargs = {k: v for k, v in kwargs.items() if k in dashscope_valid_params}
                 
-                # Make API call using native DashScope
+                # Make API call using native DashScope (not behind the shared HTTP client)
+                limiter = get_rate_limiter()
+                limiter.acquire(self.llm_model, estimate_request_tokens({"messages": messages, **filtered_kwargs}))
                 response = Generation.call(
                     model=self.llm_model,
                     messages=messages,
                     result_format='message',
                     **filtered_kwargs
                 )
+                limiter.record_response(self.llm_model, response.status_code)
                 
                 if response.status_code == 200:
                     if hasattr(response, 'output') and hasattr(response.output, 'choices'):
@@ -145,11 +154,8 @@ class QwenProvider(LlmProvider, EmbeddingProvider):
                     error_msg = getattr(response, 'message', f'Status code: {response.status_code}')
                     raise RuntimeError(f"Qwen API error: {error_msg}")
             
-            # Use OpenAI-compatible API (preferred method)
-            client = OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url,
-            )
+            # Use OpenAI-compatible API (preferred method), via the shared client pool
+            client = get_openai_client(self.api_key, self.base_url)
             
             # Build messages list
             messages = []
@@ -210,11 +216,7 @@ class QwenProvider(LlmProvider, EmbeddingProvider):
         try:
             # Use OpenAI-compatible endpoint (works for text-embedding-v3 and v4)
             try:
-                from openai import OpenAI
-                client = OpenAI(
-                    api_key=self.api_key,
-                    base_url=self.base_url,
-                )
+                client = get_openai_client(self.api_key, self.base_url)
                 
                 # Batch process embeddings (OpenAI API can handle batch)
                 # Try batch first for efficiency
@@ -233,7 +235,10 @@ class QwenProvider(LlmProvider, EmbeddingProvider):
                     
                     response = client.embeddings.create(**create_kwargs)
                     return [item.embedding for item in response.data]
-                except Exception:
+                except Exception as e:
+                    # Rate limited: one request per text would only make it worse
+                    if is_rate_limit_error(e):
+                        raise
                     # If batch fails, try individual requests
                     embeddings_list = []
                     for text in texts:
@@ -303,11 +308,14 @@ class QwenProvider(LlmProvider, EmbeddingProvider):
             if self.region:
                 dashscope.region = self.region
             
-            # Make API call using TextEmbedding
+            # Make API call using TextEmbedding (not behind the shared HTTP client)
+            limiter = get_rate_limiter()
+            limiter.acquire(self.embedding_model, estimate_request_tokens({"input": texts}))
             response = embeddings.TextEmbedding.call(
                 model=self.embedding_model,
                 input=texts,
             )
+            limiter.record_response(self.embedding_model, response.status_code)
             
             # Check response status
             if response.status_code == 200:
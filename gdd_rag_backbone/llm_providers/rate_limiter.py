@@ -0,0 +1,356 @@
+"""
+Process-wide rate limiter for LLM and embedding API calls.
+
+Every model has two token buckets: one for requests and one for (estimated)
+tokens per minute. A call waits until both buckets can pay for it, so a bulk
+upload spreads its embedding batches over the budget instead of tripping
+429s for everyone.
+
+Calls have a priority class: interactive (the default: Q&A, HYDE,
+explanations) or background (indexing; set with llm_priority(BACKGROUND)).
+Background calls leave LLM_RATE_LIMIT_BACKGROUND_RESERVE of each bucket to
+interactive calls, and yield to any interactive call waiting for the same
+model.
+
+The rate adapts to the provider: a 429 halves the model's rate, drains its
+buckets and pauses it for the Retry-After delay; every successful response
+gives back a step of the rate until it is at its configured value again.
+
+Calls through the OpenAI-compatible clients of client_registry are limited
+automatically (the shared HTTP client calls on_request / on_response for
+every attempt, including the SDK's own retries). Other providers call
+acquire() and record_response() around their requests.
+
+Budgets come from gdd_rag_backbone.config: LLM_RATE_LIMIT_RPM /
+LLM_RATE_LIMIT_TPM for every model, overridden per model with
+LLM_RATE_LIMITS="model=rpm:tpm,other-model=rpm:tpm".
+"""
+import contextlib
+import contextvars
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from gdd_rag_backbone.config import (
+    LLM_RATE_LIMIT_BACKGROUND_RESERVE,
+    LLM_RATE_LIMIT_COMPLETION_TOKENS,
+    LLM_RATE_LIMIT_ENABLED,
+    LLM_RATE_LIMIT_MAX_WAIT,
+    LLM_RATE_LIMIT_RPM,
+    LLM_RATE_LIMIT_TPM,
+    LLM_RATE_LIMITS,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+_PRIORITY_NAMES = {INTERACTIVE: 'interactive', BACKGROUND: 'background'}
+
+# Conservative for Vietnamese, which needs more tokens per character than English
+_CHARS_PER_TOKEN = 3
+# Adaptive rate: x0.5 per 429, +0.05 per success, never below 5% of the budget
+_BACKOFF_FACTOR = 0.5
+_RECOVERY_STEP = 0.05
+_MIN_RATE_FACTOR = 0.05
+_DEFAULT_RETRY_AFTER = 1.0
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar('llm_priority', default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def llm_priority(priority: int) -> Iterator[None]:
+    """
+    Run the calls of this block (in this thread) with the given priority class.
+
+    Threads do not inherit it: set it inside worker functions.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    """Priority class of calls made here (see llm_priority)."""
+    return _priority.get()
+
+
+def parse_rate_limits(spec: str) -> Dict[str, tuple]:
+    """Parse "model=rpm:tpm,..." into {model: (rpm, tpm)}; malformed entries are skipped."""
+    limits = {}
+    for entry in (spec or '').split(','):
+        model, _, budget = entry.strip().partition('=')
+        rpm, _, tpm = budget.partition(':')
+        try:
+            limits[model.strip()] = (float(rpm), float(tpm))
+        except ValueError:
+            if entry.strip():
+                logger.warning(f"[Rate Limiter] Ignoring malformed LLM_RATE_LIMITS entry: {entry!r}")
+    return limits
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or '') // _CHARS_PER_TOKEN + 1
+
+
+def estimate_request_tokens(body: Dict[str, Any]) -> int:
+    """Estimated tokens of a chat completion (prompt + completion) or embedding request body."""
+    if 'messages' in body:
+        prompt = 0
+        for message in body.get('messages') or []:
+            content = message.get('content') if isinstance(message, dict) else None
+            if isinstance(content, list):
+                content = ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+            prompt += estimate_tokens(content if isinstance(content, str) else '')
+        completion = body.get('max_completion_tokens') or body.get('max_tokens') or LLM_RATE_LIMIT_COMPLETION_TOKENS
+        return prompt + int(completion)
+    inputs = body.get('input')
+    if isinstance(inputs, str):
+        return estimate_tokens(inputs)
+    if isinstance(inputs, list):
+        return sum(estimate_tokens(item) if isinstance(item, str) else len(item) for item in inputs)
+    return 1
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """Delay in seconds from retry-after-ms / Retry-After (seconds) headers, if present."""
+    try:
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000)
+        retry_after = headers.get('retry-after')
+        if retry_after is not None:
+            return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an API error is a 429 rate limit (not an exhausted quota, which does not recover)."""
+    text = str(error)
+    if 'insufficient_quota' in text:
+        return False
+    return (getattr(error, 'status_code', None) == 429
+            or type(error).__name__ == 'RateLimitError'
+            or '429' in text)
+
+
+class _Bucket:
+    __slots__ = ('capacity', 'rate', 'level', 'updated')
+
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = max(1.0, per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float, factor: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate * factor)
+        self.updated = now
+
+    def wait_time(self, cost: float, reserve: float, factor: float) -> float:
+        """Seconds until the bucket can pay cost and keep reserve (0 when it can now)."""
+        cost = min(cost, self.capacity - reserve)
+        missing = cost + reserve - self.level
+        return 0.0 if missing <= 0 else missing / (self.rate * factor)
+
+    def take(self, cost: float) -> None:
+        self.level -= min(cost, self.capacity)
+
+
+class _ModelLimiter:
+    """Request and token buckets of one model."""
+
+    def __init__(self, model: str, rpm: float, tpm: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.model = model
+        self.clock = clock
+        self.requests = _Bucket(rpm, clock())
+        self.tokens = _Bucket(tpm, clock())
+        self.factor = 1.0
+        self.paused_until = 0.0
+        self.cond = threading.Condition()
+        self.waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.calls = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.waited_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.rate_limited = 0
+        self.timeouts = 0
+
+    def acquire(self, tokens: int, priority: int, max_wait: float, reserve_fraction: float) -> float:
+        started = self.clock()
+        deadline = started + max_wait
+        with self.cond:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    now = self.clock()
+                    self.requests.refill(now, self.factor)
+                    self.tokens.refill(now, self.factor)
+                    if now < self.paused_until:
+                        delay = self.paused_until - now
+                    elif priority == BACKGROUND and self.waiting[INTERACTIVE]:
+                        # Yield to interactive callers; they notify when served
+                        delay = 1.0
+                    else:
+                        reserve = reserve_fraction if priority == BACKGROUND else 0.0
+                        delay = max(
+                            self.requests.wait_time(1, reserve * self.requests.capacity, self.factor),
+                            self.tokens.wait_time(tokens, reserve * self.tokens.capacity, self.factor),
+                        )
+                    if delay <= 0 or now >= deadline:
+                        if delay > 0:
+                            self.timeouts += 1
+                            logger.warning(f"[Rate Limiter] {self.model}: waited {max_wait:.0f}s, "
+                                           f"sending {_PRIORITY_NAMES[priority]} call over budget")
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        waited = now - started
+                        self.calls[priority] += 1
+                        self.waited_seconds[priority] += waited
+                        return waited
+                    self.cond.wait(min(delay, deadline - now))
+            finally:
+                self.waiting[priority] -= 1
+                self.cond.notify_all()
+
+    def rate_limited_by_provider(self, retry_after: Optional[float]) -> None:
+        with self.cond:
+            now = self.clock()
+            self.rate_limited += 1
+            self.factor = max(_MIN_RATE_FACTOR, self.factor * _BACKOFF_FACTOR)
+            self.paused_until = max(self.paused_until, now + (retry_after if retry_after is not None
+                                                              else _DEFAULT_RETRY_AFTER))
+            self.requests.refill(now, self.factor)
+            self.tokens.refill(now, self.factor)
+            self.requests.level = min(self.requests.level, 0.0)
+            self.tokens.level = min(self.tokens.level, 0.0)
+        logger.warning(f"[Rate Limiter] {self.model}: 429 from provider, rate now "
+                       f"{self.factor:.0%} of budget, paused {retry_after or _DEFAULT_RETRY_AFTER:.1f}s")
+
+    def succeeded(self) -> None:
+        if self.factor < 1.0:
+            with self.cond:
+                now = self.clock()
+                self.requests.refill(now, self.factor)
+                self.tokens.refill(now, self.factor)
+                self.factor = min(1.0, self.factor + _RECOVERY_STEP)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                'rpm': self.requests.capacity,
+                'tpm': self.tokens.capacity,
+                'rate_factor': round(self.factor, 3),
+                'rate_limited': self.rate_limited,
+                'over_budget': self.timeouts,
+                'waiting': {_PRIORITY_NAMES[p]: n for p, n in self.waiting.items()},
+                'calls': {_PRIORITY_NAMES[p]: n for p, n in self.calls.items()},
+                'waited_seconds': {_PRIORITY_NAMES[p]: round(s, 2) for p, s in self.waited_seconds.items()},
+            }
+
+
+class RateLimiter:
+    """Per-model request/token budgets with priorities; safe to share between threads."""
+
+    def __init__(
+        self,
+        default_rpm: float = LLM_RATE_LIMIT_RPM,
+        default_tpm: float = LLM_RATE_LIMIT_TPM,
+        limits: Optional[Dict[str, tuple]] = None,
+        max_wait: float = LLM_RATE_LIMIT_MAX_WAIT,
+        background_reserve: float = LLM_RATE_LIMIT_BACKGROUND_RESERVE,
+        enabled: bool = LLM_RATE_LIMIT_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.limits = parse_rate_limits(LLM_RATE_LIMITS) if limits is None else dict(limits)
+        self.max_wait = max_wait
+        self.background_reserve = min(max(background_reserve, 0.0), 0.9)
+        self.enabled = enabled
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._models: Dict[str, _ModelLimiter] = {}
+
+    def _model(self, model: str) -> _ModelLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            with self._lock:
+                limiter = self._models.get(model)
+                if limiter is None:
+                    rpm, tpm = self.limits.get(model, (self.default_rpm, self.default_tpm))
+                    limiter = self._models[model] = _ModelLimiter(model, rpm, tpm, self.clock)
+        return limiter
+
+    def acquire(self, model: str, tokens: int = 1, priority: Optional[int] = None) -> float:
+        """
+        Wait until the model's budgets allow one request of about `tokens` tokens.
+
+        Args:
+            model: Model name (budgets are per model)
+            tokens: Estimated prompt + completion tokens (see estimate_request_tokens)
+            priority: INTERACTIVE or BACKGROUND (default: the llm_priority() of the caller)
+
+        Returns:
+            Seconds waited
+        """
+        if not self.enabled:
+            return 0.0
+        if priority is None:
+            priority = _priority.get()
+        return self._model(model or 'unknown').acquire(
+            max(1, int(tokens)), priority, self.max_wait, self.background_reserve)
+
+    def record_response(self, model: str, status_code: int, retry_after: Optional[float] = None) -> None:
+        """Adapt the model's rate to a provider response (429 backs off, success recovers)."""
+        if not self.enabled:
+            return
+        limiter = self._model(model or 'unknown')
+        if status_code == 429:
+            limiter.rate_limited_by_provider(retry_after)
+        elif 200 <= status_code < 300:
+            limiter.succeeded()
+
+    # HTTP client event hooks (installed by client_registry.get_http_client)
+
+    def on_request(self, request) -> None:
+        if not self.enabled or request.method != 'POST':
+            return
+        try:
+            body = json.loads(request.content or b'{}')
+        except Exception:
+            # Not a JSON API call (e.g. a streamed file upload)
+            return
+        if not isinstance(body, dict) or not body.get('model'):
+            return
+        request.extensions['rate_limit_model'] = body['model']
+        self.acquire(body['model'], estimate_request_tokens(body))
+
+    def on_response(self, response) -> None:
+        model = response.request.extensions.get('rate_limit_model')
+        if model:
+            self.record_response(model, response.status_code, parse_retry_after(response.headers))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Budgets, adaptive rate, waits and 429 counts per model."""
+        with self._lock:
+            models = list(self._models.values())
+        return {limiter.model: limiter.stats() for limiter in models}
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide rate limiter."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
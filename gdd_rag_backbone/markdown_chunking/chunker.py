@@ -2,17 +2,24 @@
 Main chunking logic for markdown files.
 
 Implements document-based (structure-first) chunking with recursive fallback.
+Long sections are packed in a single pass over precomputed per-unit token counts.
 """
 
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 from gdd_rag_backbone.markdown_chunking.markdown_parser import MarkdownParser, MarkdownSection
 from gdd_rag_backbone.markdown_chunking.metadata_extractor import MetadataExtractor
 from gdd_rag_backbone.markdown_chunking.tokenizer_utils import count_tokens
 
+# Below this many sections, process start-up costs more than it saves
+PARALLEL_MIN_SECTIONS = 64
+
 
 @dataclass
 class MarkdownChunk:
@@ -33,7 +40,8 @@ class MarkdownChunker:
         self,
         chunk_size_tokens: int = 800,
         chunk_overlap_tokens: int = 80,
-        max_chunk_size: int = 1000
+        max_chunk_size: int = 1000,
+        max_workers: Optional[int] = None
     ):
         """
         Initialize chunker.
@@ -42,10 +50,13 @@ class MarkdownChunker:
             chunk_size_tokens: Target chunk size in tokens
             chunk_overlap_tokens: Overlap size in tokens (for recursive splits)
             max_chunk_size: Maximum chunk size before forcing recursive split
+            max_workers: Worker processes for chunking sections in parallel
+                (defaults to CPU count, capped at 4; 1 disables parallelism)
         """
         self.chunk_size_tokens = chunk_size_tokens
         self.chunk_overlap_tokens = chunk_overlap_tokens
         self.max_chunk_size = max_chunk_size
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
         self.parser = MarkdownParser()
         self.metadata_extractor = MetadataExtractor()
         self.chunk_counter = 0
@@ -67,29 +78,134 @@ class MarkdownChunker:
         Returns:
             List of MarkdownChunk objects
         """
+        return list(self.iter_chunks(markdown_content, doc_id, filename))
+
+    def iter_chunks(
+        self,
+        markdown_content: str,
+        doc_id: str,
+        filename: str = ""
+    ) -> Iterator[MarkdownChunk]:
+        """
+        Chunk a markdown document, yielding chunks as sections complete.
+
+        Top-level sections are chunked independently (in parallel for large
+        documents) and chunk IDs are assigned as chunks are yielded, in
+        document order, so the output does not depend on how the work was
+        scheduled. Lets indexing start before the whole document is chunked.
+
+        Args:
+            markdown_content: Full markdown content
+            doc_id: Document ID
+            filename: Original filename (for metadata)
+
+        Yields:
+            MarkdownChunk objects in document order
+        """
         self.chunk_counter = 0
-        chunks: List[MarkdownChunk] = []
 
-        # Extract document title
-        document_title = self.parser.extract_document_title(markdown_content)
+        # Parse markdown into sections (once; the title is the first header)
+        sections = self.parser.parse(markdown_content)
+        if sections and sections[0].header:
+            document_title = sections[0].header
+        else:
+            document_title = "Untitled Document"
+
         doc_metadata = self.metadata_extractor.extract_document_metadata(
             document_title, filename)
 
-        # Parse markdown into sections
-        sections = self.parser.parse(markdown_content)
+        if self.max_workers > 1 and len(sections) >= PARALLEL_MIN_SECTIONS:
+            batches = self._chunk_sections_parallel(
+                sections, doc_id, document_title, doc_metadata)
+        else:
+            batches = (
+                self._chunk_sections([section], doc_id, document_title, doc_metadata)
+                for section in sections
+            )
+
+        for batch in batches:
+            for chunk in batch:
+                self.chunk_counter += 1
+                chunk.chunk_id = f"chunk_{self.chunk_counter:03d}"
+                yield chunk
+
+    def _chunk_sections(
+        self,
+        sections: List[MarkdownSection],
+        doc_id: str,
+        document_title: str,
+        doc_metadata: Dict[str, str]
+    ) -> List[MarkdownChunk]:
+        """
+        Chunk a run of sections sequentially, preserving order.
 
-        # Process each section
+        Args:
+            sections: Sections to chunk
+            doc_id: Document ID
+            document_title: Document title
+            doc_metadata: Document-level metadata
+
+        Returns:
+            Chunks for all sections (without chunk IDs)
+        """
+        chunks: List[MarkdownChunk] = []
         for section in sections:
-            section_chunks = self._chunk_section(
+            chunks.extend(self._chunk_section(
                 section=section,
                 doc_id=doc_id,
                 document_title=document_title,
                 doc_metadata=doc_metadata
-            )
-            chunks.extend(section_chunks)
-
+            ))
         return chunks
 
+    def _chunk_sections_parallel(
+        self,
+        sections: List[MarkdownSection],
+        doc_id: str,
+        document_title: str,
+        doc_metadata: Dict[str, str]
+    ) -> Iterator[List[MarkdownChunk]]:
+        """
+        Chunk sections across worker processes.
+
+        Sections are handed out in contiguous batches (a few per worker) to
+        keep pickling overhead low; results are yielded in submission order.
+        If the pool fails, the remaining batches are chunked sequentially.
+
+        Args:
+            sections: Sections to chunk
+            doc_id: Document ID
+            document_title: Document title
+            doc_metadata: Document-level metadata
+
+        Yields:
+            Chunks for each batch of sections (without chunk IDs)
+        """
+        batch_count = self.max_workers * 4
+        batch_size = max(1, -(-len(sections) // batch_count))
+        batches = [sections[i:i + batch_size]
+                   for i in range(0, len(sections), batch_size)]
+        done = 0
+
+        try:
+            # Spawn rather than fork: chunking runs on server threads, and a
+            # forked child could inherit locks held by other threads
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [
+                    executor.submit(self._chunk_sections, batch, doc_id,
+                                    document_title, doc_metadata)
+                    for batch in batches
+                ]
+                for future in futures:
+                    chunks = future.result()
+                    done += 1
+                    yield chunks
+        except (OSError, RuntimeError):
+            for batch in batches[done:]:
+                yield self._chunk_sections(
+                    batch, doc_id, document_title, doc_metadata)
+
     def _chunk_section(
         self,
         section: MarkdownSection,
@@ -233,9 +349,10 @@ class MarkdownChunker:
         doc_metadata: Dict[str, str]
     ) -> List[MarkdownChunk]:
         """
-        Recursively chunk a long section.
+        Chunk a long section that has no usable sub-headers.
 
-        Splits in order: paragraphs -> list items -> sentences
+        Splits in order: paragraphs -> list items -> sentences, then packs
+        the units in a single pass (see _pack_units).
         Applies overlap only at sentence/paragraph level.
 
         Args:
@@ -247,179 +364,158 @@ class MarkdownChunker:
         Returns:
             List of chunks
         """
-        chunks: List[MarkdownChunk] = []
         content = section.content
-        parent_header = section.header
 
-        # Try splitting by paragraphs first
         paragraphs = self.parser.split_by_paragraphs(content)
-
         if len(paragraphs) > 1:
-            # Split by paragraphs with overlap
-            current_chunk_parts: List[str] = []
-            current_tokens = 0
-            part_num = 1
-
-            for i, para in enumerate(paragraphs):
-                para_tokens = count_tokens(para)
-
-                # If adding this paragraph would exceed limit
-                if current_tokens + para_tokens > self.chunk_size_tokens and current_chunk_parts:
-                    # Save current chunk
-                    chunk_content = '\n\n'.join(current_chunk_parts)
-                    if parent_header:
-                        chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
-
-                    chunks.append(self._create_chunk(
-                        content=chunk_content,
-                        doc_id=doc_id,
-                        section_header=parent_header,
-                        section_content=chunk_content,
-                        document_title=document_title,
-                        doc_metadata=doc_metadata,
-                        parent_header=parent_header,
-                        part_number=part_num
-                    ))
-
-                    # Start new chunk with overlap
-                    overlap_text = self._get_overlap_text(
-                        current_chunk_parts[-1] if current_chunk_parts else "")
-                    current_chunk_parts = [overlap_text,
-                                           para] if overlap_text else [para]
-                    current_tokens = count_tokens(
-                        '\n\n'.join(current_chunk_parts))
-                    part_num += 1
-                else:
-                    current_chunk_parts.append(para)
-                    current_tokens += para_tokens
-
-            # Save last chunk
-            if current_chunk_parts:
-                chunk_content = '\n\n'.join(current_chunk_parts)
-                if parent_header:
-                    chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
-
-                chunks.append(self._create_chunk(
-                    content=chunk_content,
-                    doc_id=doc_id,
-                    section_header=parent_header,
-                    section_content=chunk_content,
-                    document_title=document_title,
-                    doc_metadata=doc_metadata,
-                    parent_header=parent_header,
-                    part_number=part_num
-                ))
-
-            return chunks
+            return self._pack_units(
+                units=paragraphs,
+                separator='\n\n',
+                overlap="paragraph",
+                parent_header=section.header,
+                doc_id=doc_id,
+                document_title=document_title,
+                doc_metadata=doc_metadata
+            )
 
-        # If paragraphs didn't work, try list items
         list_items = self.parser.split_by_list_items(content)
-
         if len(list_items) > 1:
-            # Similar logic to paragraphs but for list items
-            current_chunk_parts: List[str] = []
-            current_tokens = 0
-            part_num = 1
-
-            for item in list_items:
-                item_tokens = count_tokens(item)
-
-                if current_tokens + item_tokens > self.chunk_size_tokens and current_chunk_parts:
-                    chunk_content = '\n'.join(current_chunk_parts)
-                    if parent_header:
-                        chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
-
-                    chunks.append(self._create_chunk(
-                        content=chunk_content,
-                        doc_id=doc_id,
-                        section_header=parent_header,
-                        section_content=chunk_content,
-                        document_title=document_title,
-                        doc_metadata=doc_metadata,
-                        parent_header=parent_header,
-                        part_number=part_num
-                    ))
-
-                    current_chunk_parts = [item]
-                    current_tokens = item_tokens
-                    part_num += 1
-                else:
-                    current_chunk_parts.append(item)
-                    current_tokens += item_tokens
+            return self._pack_units(
+                units=list_items,
+                separator='\n',
+                overlap=None,
+                parent_header=section.header,
+                doc_id=doc_id,
+                document_title=document_title,
+                doc_metadata=doc_metadata
+            )
 
-            if current_chunk_parts:
-                chunk_content = '\n'.join(current_chunk_parts)
-                if parent_header:
-                    chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
+        return self._pack_units(
+            units=self.parser.split_by_sentences(content),
+            separator=' ',
+            overlap="sentence",
+            parent_header=section.header,
+            doc_id=doc_id,
+            document_title=document_title,
+            doc_metadata=doc_metadata
+        )
 
-                chunks.append(self._create_chunk(
-                    content=chunk_content,
-                    doc_id=doc_id,
-                    section_header=parent_header,
-                    section_content=chunk_content,
-                    document_title=document_title,
-                    doc_metadata=doc_metadata,
-                    parent_header=parent_header,
-                    part_number=part_num
-                ))
+    def _pack_units(
+        self,
+        units: List[str],
+        separator: str,
+        overlap: Optional[str],
+        parent_header: str,
+        doc_id: str,
+        document_title: str,
+        doc_metadata: Dict[str, str]
+    ) -> List[MarkdownChunk]:
+        """
+        Pack units into chunks in a single pass.
 
-            return chunks
+        Token counts are computed once per unit and accumulated, so the
+        section is never re-joined and re-counted while packing. The current
+        chunk is a sliding window of (unit, tokens) pairs; when it is flushed,
+        its tail is carried over as overlap for the next chunk.
 
-        # Last resort: split by sentences
-        sentences = self.parser.split_by_sentences(content)
+        Args:
+            units: Paragraphs, list items or sentences, in document order
+            separator: String used to join units inside a chunk
+            overlap: "paragraph" (last sentences of the last unit),
+                "sentence" (last units) or None (no overlap)
+            parent_header: Header of the section being split
+            doc_id: Document ID
+            document_title: Document title
+            doc_metadata: Document metadata
 
-        current_chunk_parts: List[str] = []
-        current_tokens = 0
+        Returns:
+            List of chunks
+        """
+        chunks: List[MarkdownChunk] = []
+        window: List[Tuple[str, int]] = []
+        window_tokens = 0
         part_num = 1
 
-        for i, sentence in enumerate(sentences):
-            sentence_tokens = count_tokens(sentence)
-
-            if current_tokens + sentence_tokens > self.chunk_size_tokens and current_chunk_parts:
-                chunk_content = ' '.join(current_chunk_parts)
-                if parent_header:
-                    chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
+        for unit in units:
+            unit_tokens = count_tokens(unit)
 
-                chunks.append(self._create_chunk(
-                    content=chunk_content,
+            if window and window_tokens + unit_tokens > self.chunk_size_tokens:
+                chunks.append(self._create_part_chunk(
+                    parts=[text for text, _ in window],
+                    separator=separator,
+                    parent_header=parent_header,
+                    part_number=part_num,
                     doc_id=doc_id,
-                    section_header=parent_header,
-                    section_content=chunk_content,
                     document_title=document_title,
-                    doc_metadata=doc_metadata,
-                    parent_header=parent_header,
-                    part_number=part_num
+                    doc_metadata=doc_metadata
                 ))
-
-                # Start new chunk with overlap (last few sentences)
-                overlap_sentences = self._get_overlap_sentences(
-                    current_chunk_parts)
-                current_chunk_parts = overlap_sentences + [sentence]
-                current_tokens = count_tokens(' '.join(current_chunk_parts))
                 part_num += 1
-            else:
-                current_chunk_parts.append(sentence)
-                current_tokens += sentence_tokens
 
-        # Save last chunk
-        if current_chunk_parts:
-            chunk_content = ' '.join(current_chunk_parts)
-            if parent_header:
-                chunk_content = f"## {parent_header} (Part {part_num})\n\n{chunk_content}"
+                if overlap == "paragraph":
+                    overlap_text = self._get_overlap_text(window[-1][0])
+                    window = [(overlap_text, count_tokens(overlap_text))] if overlap_text else []
+                elif overlap == "sentence":
+                    window = self._get_overlap_window(window)
+                else:
+                    window = []
+                window_tokens = sum(tokens for _, tokens in window)
+
+            window.append((unit, unit_tokens))
+            window_tokens += unit_tokens
 
-            chunks.append(self._create_chunk(
-                content=chunk_content,
+        if window:
+            chunks.append(self._create_part_chunk(
+                parts=[text for text, _ in window],
+                separator=separator,
+                parent_header=parent_header,
+                part_number=part_num,
                 doc_id=doc_id,
-                section_header=parent_header,
-                section_content=chunk_content,
                 document_title=document_title,
-                doc_metadata=doc_metadata,
-                parent_header=parent_header,
-                part_number=part_num
+                doc_metadata=doc_metadata
             ))
 
         return chunks
 
+    def _create_part_chunk(
+        self,
+        parts: List[str],
+        separator: str,
+        parent_header: str,
+        part_number: int,
+        doc_id: str,
+        document_title: str,
+        doc_metadata: Dict[str, str]
+    ) -> MarkdownChunk:
+        """
+        Create one "(Part N)" chunk of a split section.
+
+        Args:
+            parts: Units making up the chunk
+            separator: String used to join the units
+            parent_header: Header of the section being split
+            part_number: 1-based part number
+            doc_id: Document ID
+            document_title: Document title
+            doc_metadata: Document metadata
+
+        Returns:
+            MarkdownChunk object
+        """
+        chunk_content = separator.join(parts)
+        if parent_header:
+            chunk_content = f"## {parent_header} (Part {part_number})\n\n{chunk_content}"
+
+        return self._create_chunk(
+            content=chunk_content,
+            doc_id=doc_id,
+            section_header=parent_header,
+            section_content=chunk_content,
+            document_title=document_title,
+            doc_metadata=doc_metadata,
+            parent_header=parent_header,
+            part_number=part_number
+        )
+
     def _get_overlap_text(self, text: str) -> str:
         """
         Get overlap text from end of previous chunk.
@@ -433,46 +529,32 @@ class MarkdownChunker:
         if not text:
             return ""
 
-        # Simple approach: take last N characters (approximate)
-        # More sophisticated: take last sentences until we reach overlap token count
         sentences = self.parser.split_by_sentences(text)
+        window = self._get_overlap_window(
+            [(sentence, count_tokens(sentence)) for sentence in sentences])
+        return ' '.join(sentence for sentence, _ in window)
 
-        overlap_sentences = []
-        overlap_tokens = 0
-
-        # Take sentences from end until we reach overlap size
-        for sentence in reversed(sentences):
-            sentence_tokens = count_tokens(sentence)
-            if overlap_tokens + sentence_tokens <= self.chunk_overlap_tokens:
-                overlap_sentences.insert(0, sentence)
-                overlap_tokens += sentence_tokens
-            else:
-                break
-
-        return ' '.join(overlap_sentences)
-
-    def _get_overlap_sentences(self, sentences: List[str]) -> List[str]:
+    def _get_overlap_window(self, window: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
         """
-        Get overlap sentences from end of previous chunk.
+        Get the trailing units of a window that fit in the overlap budget.
 
         Args:
-            sentences: List of sentences
+            window: (unit, tokens) pairs of the previous chunk
 
         Returns:
-            List of overlap sentences
+            Trailing (unit, tokens) pairs, in original order
         """
-        overlap_sentences = []
         overlap_tokens = 0
+        start = len(window)
 
-        for sentence in reversed(sentences):
-            sentence_tokens = count_tokens(sentence)
-            if overlap_tokens + sentence_tokens <= self.chunk_overlap_tokens:
-                overlap_sentences.insert(0, sentence)
-                overlap_tokens += sentence_tokens
-            else:
+        while start > 0:
+            tokens = window[start - 1][1]
+            if overlap_tokens + tokens > self.chunk_overlap_tokens:
                 break
+            overlap_tokens += tokens
+            start -= 1
 
-        return overlap_sentences
+        return window[start:]
 
     def _create_chunk(
         self,
@@ -488,6 +570,9 @@ class MarkdownChunker:
         """
         Create a MarkdownChunk object.
 
+        The chunk ID is left empty; chunk_document assigns IDs in document
+        order once all sections are chunked.
+
         Args:
             content: Chunk content
             doc_id: Document ID
@@ -501,9 +586,6 @@ class MarkdownChunker:
         Returns:
             MarkdownChunk object
         """
-        self.chunk_counter += 1
-        chunk_id = f"chunk_{self.chunk_counter:03d}"
-
         # Extract section metadata
         section_metadata = self.metadata_extractor.extract_section_metadata(
             section_header=section_header,
@@ -520,7 +602,7 @@ class MarkdownChunker:
         token_count = count_tokens(content)
 
         return MarkdownChunk(
-            chunk_id=chunk_id,
+            chunk_id="",
             doc_id=doc_id,
             content=content,
             metadata=metadata,
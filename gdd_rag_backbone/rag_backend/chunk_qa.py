@@ -25,6 +25,8 @@ except ImportError:
     CrossEncoder = None
 
 from gdd_rag_backbone.config import DEFAULT_WORKING_DIR
+from gdd_rag_backbone.rag_backend.embedding_batcher import get_embedding_batcher
+from gdd_rag_backbone.rag_backend.single_flight import coalesce, provider_key
 
 STATUS_PATH = DEFAULT_WORKING_DIR / "kv_store_doc_status.json"
 CHUNKS_PATH = DEFAULT_WORKING_DIR / "kv_store_text_chunks.json"
@@ -186,9 +188,18 @@ def _normalize_question(question: str) -> str:
     return ' '.join(question.lower().strip().split())
 
 
+def _embed_key(provider, texts: Sequence[str], use_cache: bool = True) -> tuple:
+    if use_cache and len(texts) == 1:
+        return provider_key(provider), True, _normalize_question(texts[0])
+    return provider_key(provider), use_cache, tuple(texts)
+
+
+@coalesce('embed_texts', _embed_key)
 def _embed_texts(provider, texts: Sequence[str], use_cache: bool = True) -> List[List[float]]:
     """
     Embed texts with optional caching for queries.
+    Concurrent calls with the same provider and texts share one embedding call,
+    and concurrent small calls are micro-batched into one API request.
     
     Args:
         provider: Embedding provider
@@ -208,7 +219,7 @@ def _embed_texts(provider, texts: Sequence[str], use_cache: bool = True) -> List
             return [embedding]
     
     # Generate embeddings
-    raw_embeddings = provider.embed(list(texts))
+    raw_embeddings = get_embedding_batcher().embed(provider, texts)
     floats: List[List[float]] = []
     for embedding in raw_embeddings:
         if embedding is None:
@@ -0,0 +1,152 @@
+"""
+Micro-batching of concurrent embedding requests.
+
+Under concurrent query traffic every question, HYDE expansion and code
+query embeds its own single string in its own API call. The batcher
+collects the texts that arrive for the same provider within a short window
+(EMBED_BATCH_WINDOW_MS, or until EMBED_BATCH_MAX_TEXTS texts) and sends
+them as one embedding request; each caller gets back the vectors of its own
+texts (or the request's exception).
+
+There is no background thread: the first caller of a window waits for it
+to close and makes the request for everyone. Batches are kept per provider
+and per rate-limit priority class, so an interactive query never rides in
+a background indexing request.
+
+The distribution of batch sizes (texts per API request) is returned by
+batcher_stats() and served by the /api/metrics endpoint.
+"""
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from gdd_rag_backbone.config import EMBED_BATCH_MAX_TEXTS, EMBED_BATCH_WINDOW_MS
+from gdd_rag_backbone.llm_providers.rate_limiter import current_priority
+from gdd_rag_backbone.rag_backend.single_flight import provider_key
+
+# Upper bounds of the batch size histogram buckets
+_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class _Batch:
+    __slots__ = ('texts', 'full', 'done', 'vectors', 'error')
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.vectors: Optional[List[List[float]]] = None
+        self.error: Optional[BaseException] = None
+
+
+class EmbeddingBatcher:
+    """Merges concurrent provider.embed() calls into batched requests; safe to share between threads."""
+
+    def __init__(self, window_ms: float = EMBED_BATCH_WINDOW_MS, max_texts: int = EMBED_BATCH_MAX_TEXTS):
+        self.window = max(0.0, window_ms) / 1000
+        self.max_texts = max(1, max_texts)
+        self._lock = threading.Lock()
+        self._open: Dict[Hashable, _Batch] = {}
+        self.calls = 0
+        self.batches = 0
+        self.texts = 0
+        self._sizes = [0] * (len(_SIZE_BUCKETS) + 1)
+
+    def _record(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.texts += size
+            for i, bound in enumerate(_SIZE_BUCKETS):
+                if size <= bound:
+                    self._sizes[i] += 1
+                    break
+            else:
+                self._sizes[-1] += 1
+
+    def _run(self, provider, texts: List[str]) -> List[List[float]]:
+        self._record(len(texts))
+        vectors = provider.embed(texts)
+        if vectors is None or len(vectors) != len(texts):
+            raise ValueError(f"Embedding provider returned {len(vectors or [])} vectors for {len(texts)} texts")
+        return vectors
+
+    def embed(self, provider, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed texts, sharing one API request with concurrent callers.
+
+        Args:
+            provider: Embedding provider (anything with embed(List[str]))
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        texts = list(texts)
+        with self._lock:
+            self.calls += 1
+        if not texts:
+            return []
+        if self.window <= 0 or len(texts) >= self.max_texts:
+            return self._run(provider, texts)
+
+        key = (provider_key(provider), current_priority())
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None or len(batch.texts) + len(texts) > self.max_texts
+            if leader:
+                batch = self._open[key] = _Batch()
+            start = len(batch.texts)
+            batch.texts.extend(texts)
+            if len(batch.texts) >= self.max_texts:
+                del self._open[key]
+                batch.full.set()
+
+        if not leader:
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            return batch.vectors[start:start + len(texts)]
+
+        batch.full.wait(self.window)
+        with self._lock:
+            if self._open.get(key) is batch:
+                del self._open[key]
+        try:
+            batch.vectors = self._run(provider, batch.texts)
+        except BaseException as e:
+            batch.error = e
+            raise
+        finally:
+            batch.done.set()
+        return batch.vectors[start:start + len(texts)]
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            sizes = {f"<={bound}": count for bound, count in zip(_SIZE_BUCKETS, self._sizes)}
+            sizes[f">{_SIZE_BUCKETS[-1]}"] = self._sizes[-1]
+            return {
+                'window_ms': self.window * 1000,
+                'max_texts': self.max_texts,
+                'calls': self.calls,
+                'requests': self.batches,
+                'texts': self.texts,
+                'mean_batch_size': round(self.texts / self.batches, 2) if self.batches else None,
+                'batch_sizes': sizes,
+            }
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Process-wide embedding batcher."""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = EmbeddingBatcher()
+        return _batcher
+
+
+def batcher_stats() -> Dict[str, object]:
+    """Calls, API requests and batch size distribution of the process-wide batcher."""
+    return get_embedding_batcher().stats()
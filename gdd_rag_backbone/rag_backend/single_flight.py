@@ -0,0 +1,143 @@
+"""
+Single-flight coalescing of identical in-flight calls.
+
+When several threads make the same expensive call at once (e.g. a team
+asking about a newly uploaded document together), only the first one runs
+it; the others wait for that run and receive a copy of its result (or its
+exception). Nothing is cached: once the call finishes, the next identical
+call runs again.
+
+Each hot path has a named group; per-group counters (runs, coalesced
+callers, calls in flight) are returned by single_flight_stats() and served
+by the /api/metrics endpoint.
+"""
+import copy
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        # Snapshot for followers; the leader's caller gets the original object
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key; safe to share between threads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.runs = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn, or wait for the in-flight run with the same key.
+
+        Returns:
+            (result, coalesced): coalesced is True when the result came from
+            another caller's run (it is then a deep copy, so callers can
+            mutate it freely)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                call.followers += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.runs += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                # No follower can join once the call is unregistered
+                del self._calls[key]
+                followers = call.followers
+            if followers and call.error is None:
+                try:
+                    # Followers copy this snapshot, never the object handed to
+                    # the leader's caller, who may mutate it as soon as we return
+                    call.result = copy.deepcopy(result)
+                except Exception as e:
+                    call.error = e
+            call.done.set()
+        return result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'runs': self.runs,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Process-wide group for one hot path (created on first use)."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Counters of every group, by name."""
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
+
+
+def coalesce(name: str, key: Callable[..., Hashable]):
+    """
+    Decorator: concurrent calls whose key(*args, **kwargs) is equal share one run.
+
+    Args:
+        name: Group name (shown in the metrics)
+        key: Builds the request identity from the call's arguments
+    """
+    group = get_single_flight(name)
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result, _ = group.do(key(*args, **kwargs), lambda: fn(*args, **kwargs))
+            return result
+        return wrapper
+    return decorator
+
+
+def normalize_text_key(text: str) -> str:
+    """Whitespace-collapsed text, so incidental spacing does not split a group."""
+    return ' '.join((text or '').split())
+
+
+def provider_key(provider) -> Tuple[str, Optional[str], Optional[str]]:
+    """Identity of an LLM/embedding provider: class, embedding model and endpoint."""
+    return (type(provider).__name__, getattr(provider, 'embedding_model', None),
+            getattr(provider, 'base_url', None))
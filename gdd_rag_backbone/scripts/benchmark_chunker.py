@@ -0,0 +1,148 @@
+"""
+Benchmark MarkdownChunker on a large markdown document.
+
+Generates a synthetic GDD-style document (numbered sections, long paragraphs,
+stat tables and bullet lists) of the requested page count, or reads an existing
+markdown file, then times chunk_document sequentially and in parallel.
+
+Usage (from project root with venv activated):
+    python -m gdd_rag_backbone.scripts.benchmark_chunker
+    python -m gdd_rag_backbone.scripts.benchmark_chunker --pages 500 --workers 4
+    python -m gdd_rag_backbone.scripts.benchmark_chunker --file path/to/doc.md
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from gdd_rag_backbone.markdown_chunking.chunker import MarkdownChunker  # noqa: E402
+
+# Roughly one printed page of GDD text
+CHARS_PER_PAGE = 3000
+
+_WORDS = (
+    "tank player damage armor skill cooldown reward battle pass season map "
+    "objective upgrade currency shop inventory mission level match rank "
+    "weapon shield boost speed health team spawn zone event quest"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(8, 20))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 8)))
+
+
+def _table(rng: random.Random, rows: int) -> str:
+    lines = ["| Name | HP | Speed | Damage |", "|---|---|---|---|"]
+    for i in range(rows):
+        lines.append(
+            f"| {rng.choice(_WORDS)}_{i} | {rng.randint(100, 999)} | "
+            f"{rng.randint(1, 20)} | {rng.randint(10, 300)} |")
+    return "\n".join(lines)
+
+
+def _bullets(rng: random.Random, items: int) -> str:
+    return "\n".join(f"- {_sentence(rng)}" for _ in range(items))
+
+
+def generate_markdown(pages: int, seed: int = 42) -> str:
+    """
+    Generate a synthetic GDD-style markdown document.
+
+    Args:
+        pages: Approximate number of pages
+        seed: Random seed (output is deterministic per seed)
+
+    Returns:
+        Markdown content
+    """
+    rng = random.Random(seed)
+    target_chars = pages * CHARS_PER_PAGE
+    parts = ["## Synthetic Game Design Document", _paragraph(rng)]
+    size = sum(len(p) for p in parts)
+    section = 1
+
+    while size < target_chars:
+        block = [f"## {section}. {rng.choice(_WORDS).title()} System"]
+        for sub in range(1, rng.randint(2, 5)):
+            block.append(f"### {section}.{sub} {rng.choice(_WORDS).title()} Rules")
+            kind = rng.random()
+            if kind < 0.2:
+                # One very long section with no sub-structure but paragraphs
+                block.append("\n\n".join(_paragraph(rng) for _ in range(rng.randint(10, 30))))
+            elif kind < 0.4:
+                block.append(_table(rng, rng.randint(40, 200)))
+            elif kind < 0.6:
+                block.append(_bullets(rng, rng.randint(30, 120)))
+            else:
+                block.append("\n\n".join(_paragraph(rng) for _ in range(rng.randint(1, 4))))
+        text = "\n\n".join(block)
+        parts.append(text)
+        size += len(text)
+        section += 1
+
+    return "\n\n".join(parts)
+
+
+def _run(chunker: MarkdownChunker, markdown_content: str, repeat: int) -> tuple:
+    best = None
+    chunks = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = chunker.chunk_document(markdown_content, doc_id="benchmark", filename="benchmark.md")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MarkdownChunker on a large markdown document.")
+    parser.add_argument("--file", type=Path, default=None, help="Markdown file to chunk (default: synthetic document)")
+    parser.add_argument("--pages", type=int, default=500, help="Pages of synthetic markdown to generate")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the parallel run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (best time is reported)")
+    args = parser.parse_args()
+
+    if args.file:
+        markdown_content = args.file.read_text(encoding="utf-8")
+        source = str(args.file)
+    else:
+        markdown_content = generate_markdown(args.pages)
+        source = f"synthetic, {args.pages} pages"
+
+    sections = MarkdownChunker().parser.parse(markdown_content)
+    print(f"Input: {source} — {len(markdown_content):,} chars, {len(sections):,} sections")
+
+    sequential_time, sequential_chunks = _run(
+        MarkdownChunker(max_workers=1), markdown_content, args.repeat)
+    parallel_chunker = MarkdownChunker(max_workers=args.workers)
+    parallel_time, parallel_chunks = _run(
+        parallel_chunker, markdown_content, args.repeat)
+
+    identical = [
+        (c.chunk_id, c.content, c.metadata) for c in sequential_chunks
+    ] == [
+        (c.chunk_id, c.content, c.metadata) for c in parallel_chunks
+    ]
+    mb = len(markdown_content) / 1_000_000
+
+    print(f"Chunks: {len(sequential_chunks):,} "
+          f"(avg {sum(c.token_count for c in sequential_chunks) / max(1, len(sequential_chunks)):.0f} tokens)")
+    print(f"Sequential:             {sequential_time:.3f}s ({mb / sequential_time:.2f} MB/s)")
+    print(f"Parallel ({parallel_chunker.max_workers} workers): {parallel_time:.3f}s ({mb / parallel_time:.2f} MB/s)")
+    print(f"Parallel output identical to sequential: {identical}")
+
+
+if __name__ == "__main__":
+    main()
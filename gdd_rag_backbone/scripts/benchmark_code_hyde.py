@@ -0,0 +1,88 @@
+"""
+Benchmark adaptive HYDE v2 in Code Q&A retrieval against an offline corpus.
+
+Runs generate_context_supabase for every corpus query with HYDE v2 "always"
+and "adaptive" (optionally at several skip thresholds), and reports the
+retrieval hit rate, mean latency and how often HYDE v2 was skipped or
+cancelled. A query is a hit when any of its expected strings (file names,
+class or method names) appears in the retrieved context.
+
+Corpus format (JSONL, one query per line):
+    {"query": "How does the tank fire?", "file_filters": ["Tank.cs"], "expected": ["Fire"]}
+
+Usage (from project root with venv activated):
+    python -m gdd_rag_backbone.scripts.benchmark_code_hyde --corpus code_queries.jsonl
+    python -m gdd_rag_backbone.scripts.benchmark_code_hyde --corpus code_queries.jsonl --thresholds 0.45 0.55 0.65
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import backend.code_service as code_service  # noqa: E402
+
+
+def load_corpus(path: Path) -> list:
+    cases = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            case = json.loads(line)
+            case.setdefault("file_filters", None)
+            case.setdefault("expected", [])
+            cases.append(case)
+    return cases
+
+
+def run_mode(cases: list, mode: str) -> dict:
+    hits = 0
+    elapsed = 0.0
+    decisions = {}
+    for case in cases:
+        start = time.perf_counter()
+        context, timing_info = code_service.generate_context_supabase(
+            case["query"], file_filters=case["file_filters"], hyde_mode=mode)
+        elapsed += time.perf_counter() - start
+        context_lower = context.lower()
+        if any(expected.lower() in context_lower for expected in case["expected"]):
+            hits += 1
+        decision = timing_info.get("hyde_v2_decision", {}).get("decision", "unknown")
+        decisions[decision] = decisions.get(decision, 0) + 1
+    return {
+        "hit_rate": hits / len(cases) if cases else 0.0,
+        "mean_latency": elapsed / len(cases) if cases else 0.0,
+        "decisions": decisions,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark adaptive HYDE v2 for Code Q&A retrieval.")
+    parser.add_argument("--corpus", type=Path, required=True, help="JSONL corpus of queries with expected strings")
+    parser.add_argument("--thresholds", type=float, nargs="*", default=None,
+                        help="Skip thresholds to sweep in adaptive mode (default: CODE_HYDE_SKIP_SCORE)")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    print(f"Corpus: {args.corpus} — {len(cases)} queries")
+
+    baseline = run_mode(cases, "always")
+    print(f"always:           hit rate {baseline['hit_rate']:.1%}, "
+          f"mean latency {baseline['mean_latency']:.2f}s")
+
+    for threshold in args.thresholds or [code_service.CODE_HYDE_SKIP_SCORE]:
+        code_service.CODE_HYDE_SKIP_SCORE = threshold
+        result = run_mode(cases, "adaptive")
+        print(f"adaptive @ {threshold:.2f}: hit rate {result['hit_rate']:.1%}, "
+              f"mean latency {result['mean_latency']:.2f}s "
+              f"({result['mean_latency'] - baseline['mean_latency']:+.2f}s), "
+              f"decisions {result['decisions']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Bulk-index a C# codebase (directory or zip archive) to Supabase for Code Q&A.
+
+Files are parsed in a process pool, files whose content hash matches
+code_files are skipped, and the chunks of all changed files go through one
+shared batched embedding/upsert pipeline. Prints files/sec and a per-file
+status summary.
+
+Usage (from project root with venv activated):
+    python -m gdd_rag_backbone.scripts.index_codebase --source path/to/UnityProject/Assets
+    python -m gdd_rag_backbone.scripts.index_codebase --source scripts.zip --prefix Assets/Scripts/
+    python -m gdd_rag_backbone.scripts.index_codebase --source Assets --workers 8 --force --json report.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add project root for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.code_ingest_service import ingest_codebase  # noqa: E402
+from backend.storage.code_supabase_storage import USE_SUPABASE  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-index a C# codebase to Supabase.")
+    parser.add_argument("--source", type=Path, required=True, help="Directory or .zip archive of the codebase")
+    parser.add_argument("--prefix", default="", help="Prefix prepended to relative paths (file_path in Supabase)")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: min(4, CPU count))")
+    parser.add_argument("--force", action="store_true", help="Re-index files whose content hash is unchanged")
+    parser.add_argument("--json", type=Path, default=None, help="Write the full report as JSON to this path")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary, not every file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+
+    if not USE_SUPABASE:
+        print("Supabase is not configured (SUPABASE_URL / SUPABASE_KEY)")
+        sys.exit(1)
+    if not args.source.exists():
+        print(f"Source not found: {args.source}")
+        sys.exit(1)
+
+    report = ingest_codebase(
+        args.source,
+        path_prefix=args.prefix,
+        max_workers=args.workers,
+        force=args.force,
+        progress_cb=lambda step: print(step, flush=True),
+    )
+
+    if not args.quiet:
+        for file_status in report.files:
+            detail = file_status.message if file_status.status == "error" else (
+                f"{file_status.chunks} chunks, {file_status.written} written, {file_status.removed} removed"
+                if file_status.status == "indexed" else "")
+            print(f"  [{file_status.status:>9}] {file_status.file_path}  {detail}".rstrip())
+
+    print(report.summary())
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        print(f"Report written to {args.json}")
+
+    if any(f.status == "error" for f in report.files):
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ from gdd_rag_backbone.markdown_chunking import MarkdownChunker
 from gdd_rag_backbone.scripts.marker_utils import run_marker, find_marker_output_dir
 from backend.services.document_service import generate_doc_id
 import argparse
+import itertools
 import logging
 import os
 import re
@@ -59,12 +60,25 @@ def _replace_markdown_image_refs(markdown: str, filename_to_url: Dict[str, str])
 
 
 def _get_embedding_provider():
-    """Resolve embedding provider: Ollama → OpenAI → Qwen (same logic as gdd_service)."""
+    """
+    Resolve embedding provider: local CPU model (EMBEDDING_BACKEND=local),
+    else Ollama → OpenAI → Qwen (same logic as gdd_service).
+    """
+    from gdd_rag_backbone.config import EMBEDDING_BACKEND
     from gdd_rag_backbone.llm_providers import QwenProvider
 
     provider = None
     provider_errors = []
 
+    # Local in-process model (no API calls); the index records the model,
+    # so it cannot be mixed with chunks embedded by a remote backend
+    if EMBEDDING_BACKEND == "local":
+        from gdd_rag_backbone.llm_providers import get_local_embedding_provider
+        provider = get_local_embedding_provider()
+        logger.info("Using local embeddings: %s (%d dims, %s, %d threads)",
+                    provider.embedding_model, provider.embedding_dim, provider.runtime, provider.num_threads)
+        return provider
+
     # Ollama
     openai_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
     if "localhost:11434" in openai_base_url or "127.0.0.1:11434" in openai_base_url:
@@ -121,7 +135,8 @@ def _get_embedding_provider():
         provider_errors.append(f"Qwen: {e}")
 
     raise RuntimeError(
-        "No embedding provider available. Configure OPENAI_BASE_URL + OPENAI_API_KEY (Ollama) or "
+        "No embedding provider available. Set EMBEDDING_BACKEND=local, or configure "
+        "OPENAI_BASE_URL + OPENAI_API_KEY (Ollama) or "
         "OPENAI_API_KEY (OpenAI) or DASHSCOPE_API_KEY (Qwen). Errors: " +
         "; ".join(provider_errors)
     )
@@ -271,31 +286,33 @@ def index_pdf_with_marker(
         except Exception as e:
             logger.warning("PDF upload to storage failed: %s", e)
 
-        # 6) Chunk markdown (same as current pipeline)
+        # 6) Embedding provider
+        bump("Preparing embedding provider")
+        provider = _get_embedding_provider()
+
+        # 7) Chunk markdown lazily (same chunker as before); chunks stream into
+        # the embed -> upsert pipeline as sections complete
         bump("Chunking Markdown")
         chunker = MarkdownChunker()
-        chunks = chunker.chunk_document(
+        chunks = chunker.iter_chunks(
             markdown_content=markdown_with_urls,
             doc_id=doc_id,
             filename=original_filename,
         )
-
-        if not chunks:
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
             return {"status": "error", "message": "Chunker produced no chunks"}
 
-        # 7) Embedding provider
-        bump("Generating embeddings")
-        provider = _get_embedding_provider()
-
-        # 8) Index to Supabase (markdown with URLs, pdf_storage_path, images JSONB)
+        # 8) Chunk -> embed -> index to Supabase (markdown with URLs, pdf_storage_path, images JSONB)
         bump("Indexing into Supabase")
         index_gdd_chunks_to_supabase(
             doc_id=doc_id,
-            chunks=chunks,
+            chunks=itertools.chain([first_chunk], chunks),
             provider=provider,
             markdown_content=markdown_with_urls,
             pdf_storage_path=pdf_filename,
             images=images_metadata if images_metadata else None,
+            progress_cb=bump,
         )
 
     bump("Completed")
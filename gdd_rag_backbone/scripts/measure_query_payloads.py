@@ -0,0 +1,89 @@
+"""
+Measure the Supabase payload of projected reads against select('*').
+
+For each hot read path (explainer section chunks, document reconstruction,
+section listing, direct code file lookup, local vector scoring) runs the same
+filtered query twice, once with select('*') and once with the path's column
+projection, and prints the JSON payload size of both and the reduction.
+
+Usage (from project root with venv activated):
+    python -m gdd_rag_backbone.scripts.measure_query_payloads
+    python -m gdd_rag_backbone.scripts.measure_query_payloads --doc-id my_gdd --file-path Assets/Scripts/Tank.cs
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.storage.projections import (  # noqa: E402
+    CODE_CHUNK_CONTENT,
+    KEYWORD_CHUNK_CONTENT,
+    KEYWORD_CHUNK_LISTING,
+    KEYWORD_CHUNK_SCORING,
+)
+from backend.storage.supabase_client import get_supabase_client  # noqa: E402
+
+
+def measure(query) -> tuple:
+    start = time.perf_counter()
+    rows = query.execute().data or []
+    elapsed = time.perf_counter() - start
+    return len(rows), len(json.dumps(rows, ensure_ascii=False).encode("utf-8")), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure payload reduction of projected Supabase reads.")
+    parser.add_argument("--doc-id", default=None, help="GDD doc_id to read (default: first keyword document)")
+    parser.add_argument("--file-path", default=None, help="Code file_path to read (default: first code file)")
+    args = parser.parse_args()
+
+    client = get_supabase_client()
+    doc_id = args.doc_id
+    if not doc_id:
+        docs = client.table("keyword_documents").select("doc_id").limit(1).execute().data
+        doc_id = docs[0]["doc_id"] if docs else None
+    file_path = args.file_path
+    if not file_path:
+        files = client.table("code_files").select("file_path").limit(1).execute().data
+        file_path = files[0]["file_path"] if files else None
+
+    cases = []
+    if doc_id:
+        sections = KEYWORD_CHUNK_LISTING.query(client).eq("doc_id", doc_id).limit(1).execute().data
+        section_heading = sections[0].get("section_heading") if sections else None
+        section_filter = (lambda q: q.eq("section_heading", section_heading)) if section_heading else (
+            lambda q: q.is_("section_heading", "null"))
+        cases += [
+            ("explainer section chunks", KEYWORD_CHUNK_CONTENT,
+             lambda q: section_filter(q.eq("doc_id", doc_id)).order("chunk_index")),
+            ("document reconstruction", KEYWORD_CHUNK_CONTENT,
+             lambda q: q.eq("doc_id", doc_id).order("chunk_index")),
+            ("section listing", KEYWORD_CHUNK_LISTING, lambda q: q.eq("doc_id", doc_id)),
+            ("vector scoring", KEYWORD_CHUNK_SCORING, lambda q: q.eq("doc_id", doc_id)),
+        ]
+    else:
+        print("No keyword documents found; skipping GDD read paths")
+    if file_path:
+        cases.append(("code file lookup", CODE_CHUNK_CONTENT, lambda q: q.eq("file_path", file_path)))
+    else:
+        print("No code files found; skipping code read paths")
+
+    print(f"doc_id={doc_id}  file_path={file_path}")
+    print(f"{'read path':<26} {'use':<8} {'rows':>5} {'select(*)':>12} {'projected':>12} {'reduction':>10}")
+    for name, projection, apply_filters in cases:
+        rows, full_bytes, full_time = measure(apply_filters(client.table(projection.table).select("*")))
+        _, projected_bytes, projected_time = measure(apply_filters(projection.query(client)))
+        reduction = 1 - projected_bytes / full_bytes if full_bytes else 0.0
+        print(f"{name:<26} {projection.use:<8} {rows:>5} {full_bytes:>11,}B {projected_bytes:>11,}B {reduction:>9.1%}"
+              f"   ({full_time * 1000:.0f}ms -> {projected_time * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Tests for the version-stamped in-memory alias graph."""
+
+import pytest
+
+from backend.storage import alias_graph, keyword_storage, supabase_client
+from backend.storage.alias_graph import AliasGraph
+
+ROWS = [
+    {'keyword': 'Tank', 'alias': 'Xe tăng', 'language': 'vi'},
+    {'keyword': 'Tank', 'alias': 'Armored vehicle', 'language': 'en'},
+    {'keyword': 'Map', 'alias': 'Bản đồ', 'language': 'vi'},
+]
+
+
+class _Backend:
+    """Stubbed data_versions row and keyword_aliases table."""
+
+    def __init__(self, monkeypatch, version=1):
+        self.version = version
+        self.rows = list(ROWS)
+        self.loads = 0
+        self.fail_loads = False
+        self.now = 1000.0
+        monkeypatch.setattr(alias_graph.time, 'monotonic', lambda: self.now)
+        monkeypatch.setattr(supabase_client, 'get_data_version', self.get_data_version)
+        monkeypatch.setattr(supabase_client, 'bump_data_version', self.bump_data_version)
+        monkeypatch.setattr(keyword_storage, 'list_all_aliases', self.list_all_aliases)
+
+    def get_data_version(self, name):
+        assert name == alias_graph.ALIAS_VERSION_NAME
+        if self.version is None:
+            raise RuntimeError('relation "data_versions" does not exist')
+        return self.version
+
+    def bump_data_version(self, name):
+        self.version += 1
+        return self.version
+
+    def list_all_aliases(self):
+        if self.fail_loads:
+            raise RuntimeError('connection reset')
+        self.loads += 1
+        return list(self.rows)
+
+
+def test_lookups_are_bidirectional(monkeypatch):
+    _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+
+    assert graph.get_aliases_for_keyword('tank') == ['Xe tăng', 'Armored vehicle']
+    assert graph.get_aliases_for_keyword('XE  TĂNG') == ['Tank']
+    assert [m['keyword'] for m in graph.find_keyword_by_alias('bản đồ')] == ['Map']
+    assert graph.is_keyword('Map') and not graph.is_keyword('Bản đồ')
+    assert graph.keywords() == ['Map', 'Tank']
+
+
+def test_reloads_only_when_the_version_changes(monkeypatch):
+    backend = _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+    graph.keywords()
+
+    backend.now += 10
+    assert graph.keywords() == ['Map', 'Tank']
+    assert backend.loads == 1
+
+    backend.rows.append({'keyword': 'Gold', 'alias': 'Vàng', 'language': 'vi'})
+    backend.version = 2
+    # Not checked again within the check interval
+    assert graph.keywords() == ['Map', 'Tank']
+    backend.now += 10
+    assert graph.keywords() == ['Gold', 'Map', 'Tank']
+    assert backend.loads == 2
+
+
+def test_falls_back_to_the_ttl_without_data_versions(monkeypatch):
+    backend = _Backend(monkeypatch, version=None)
+    graph = AliasGraph(check_interval=5, ttl=60)
+    graph.keywords()
+
+    backend.now += 30
+    graph.keywords()
+    assert backend.loads == 1
+    backend.now += 40
+    graph.keywords()
+    assert backend.loads == 2
+
+
+def test_keeps_the_loaded_graph_when_a_reload_fails(monkeypatch):
+    backend = _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+    graph.keywords()
+
+    backend.version, backend.fail_loads = 2, True
+    backend.now += 10
+    assert graph.keywords() == ['Map', 'Tank']
+
+    # Retried after the check interval
+    backend.fail_loads = False
+    backend.rows = ROWS[:1]
+    backend.now += 10
+    assert graph.keywords() == ['Tank']
+
+
+def test_first_load_failure_is_raised(monkeypatch):
+    backend = _Backend(monkeypatch)
+    backend.fail_loads = True
+
+    with pytest.raises(RuntimeError, match='connection reset'):
+        AliasGraph().keywords()
+
+
+def test_mark_changed_bumps_the_version_and_reloads(monkeypatch):
+    backend = _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+    graph.keywords()
+
+    backend.rows = ROWS[:1]
+    graph.mark_changed()
+
+    assert backend.version == 2
+    assert graph.keywords() == ['Tank']  # within the check interval
+    assert backend.loads == 2
+    # Another process's graph notices the bumped version
+    other = AliasGraph(check_interval=5, ttl=60)
+    assert other.keywords() == ['Tank']
+
+
+def test_keywords_in_text_match_whole_words_only(monkeypatch):
+    _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+
+    assert graph.keywords_in_text('xe tăng hạng nặng') == ['Tank']
+    assert graph.keywords_in_text('Nâng cấp XE  TĂNG và bản đồ') == ['Map', 'Tank']
+    # Tokens present but not as the whole phrase, or only inside a longer word
+    assert graph.keywords_in_text('tăng xe') == []
+    assert graph.keywords_in_text('tanks and maps') == []
+    assert graph.keywords_in_text('the tank') == ['Tank']
+    assert graph.keywords_in_text('') == []
+
+
+def test_deep_search_word_check_uses_whole_word_alias_matches(monkeypatch):
+    from backend.services import deep_search_service
+    _Backend(monkeypatch)
+    graph = AliasGraph(check_interval=5, ttl=60)
+    contents = ['Tank armor is upgraded with gold.']
+
+    def keyword_search_multi(terms, limit=100):
+        return {term: [{'content': c} for c in contents if term.lower() in c.lower()]
+                for term in terms}
+
+    monkeypatch.setattr(deep_search_service, 'get_alias_graph', lambda: graph)
+    monkeypatch.setattr(deep_search_service, 'keyword_search_multi', keyword_search_multi)
+
+    result = deep_search_service.check_words_against_aliases_and_database(
+        ['xe tăng hạng nặng', 'tanker truck'])
+
+    assert result == {'matched_keywords': ['Tank'],
+                      'matches_by_word': {'xe tăng hạng nặng': ['Tank']}}
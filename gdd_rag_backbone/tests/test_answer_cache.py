@@ -0,0 +1,123 @@
+"""Tests for the semantic GDD answer cache."""
+
+import pytest
+
+from backend import gdd_service
+from backend.services import llm_provider
+from backend.storage import answer_cache
+from backend.storage.answer_cache import AnswerCache
+
+KEY = AnswerCache.scope_key(['doc'], 'en', 'answer/v1', 'fake-embedding')
+OTHER_KEY = AnswerCache.scope_key(['other'], 'en', 'answer/v1', 'fake-embedding')
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(answer_cache.time, 'time', lambda: clock[0])
+    return clock
+
+
+def test_similar_question_hits_and_dissimilar_one_misses(now):
+    cache = AnswerCache(threshold=0.9, max_entries=10, ttl=60)
+    cache.put([1.0, 0.0], KEY, (1,), {'response': 'tank'})
+
+    value, similarity = cache.lookup([0.99, 0.1], KEY, (1,))
+    assert value == {'response': 'tank'} and similarity >= 0.9
+    assert cache.lookup([0.5, 0.5], KEY, (1,)) is None  # cosine ~0.71
+    assert cache.lookup([1.0, 0.0], OTHER_KEY, (1,)) is None  # other documents
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_scope_is_dropped_when_document_versions_change(now):
+    cache = AnswerCache(threshold=0.9, max_entries=10, ttl=60)
+    cache.put([1.0, 0.0], KEY, (1,), {'response': 'before re-index'})
+
+    assert cache.lookup([1.0, 0.0], KEY, (2,)) is None
+    assert cache.stats()['entries'] == 0
+    # Going back to the old versions does not resurrect the old answer
+    assert cache.lookup([1.0, 0.0], KEY, (1,)) is None
+
+
+def test_entries_expire_after_the_ttl(now):
+    cache = AnswerCache(threshold=0.9, max_entries=10, ttl=60)
+    cache.put([1.0, 0.0], KEY, (1,), {'response': 'old'})
+    now[0] += 30
+    cache.put([0.0, 1.0], KEY, (1,), {'response': 'new'})
+    now[0] += 45
+
+    assert cache.lookup([1.0, 0.0], KEY, (1,)) is None
+    assert cache.lookup([0.0, 1.0], KEY, (1,))[0] == {'response': 'new'}
+    assert cache.stats()['entries'] == 1
+
+
+def test_oldest_entry_is_evicted_across_scopes(now):
+    cache = AnswerCache(threshold=0.9, max_entries=2, ttl=3600)
+    cache.put([1.0, 0.0], KEY, (1,), {'response': 'first'})
+    now[0] += 1
+    cache.put([1.0, 0.0], OTHER_KEY, (1,), {'response': 'second'})
+    now[0] += 1
+    cache.put([0.0, 1.0], KEY, (1,), {'response': 'third'})
+
+    assert cache.lookup([1.0, 0.0], KEY, (1,)) is None
+    assert cache.lookup([1.0, 0.0], OTHER_KEY, (1,))[0] == {'response': 'second'}
+    assert cache.lookup([0.0, 1.0], KEY, (1,))[0] == {'response': 'third'}
+    assert cache.stats()['entries'] == 2 and cache.stats()['scopes'] == 2
+
+
+class _FakeProvider:
+    embedding_model = 'fake-embedding'
+
+    def __init__(self):
+        self.prompts = []
+
+    def llm(self, prompt):
+        self.prompts.append(prompt)
+        return f'answer {len(self.prompts)}'
+
+
+def _query_setup(monkeypatch, cache):
+    provider = _FakeProvider()
+    chunk = {'doc_id': 'doc', 'chunk_id': 'doc_chunk_001', 'content': 'Tanks have armor.',
+             'numbered_header': '1. Tanks', 'score': 0.9}
+    monkeypatch.setattr(gdd_service, 'SUPABASE_AVAILABLE', True)
+    monkeypatch.setattr(gdd_service, 'ANSWER_CACHE_ENABLED', True)
+    monkeypatch.setattr(gdd_service, 'list_documents_from_markdown',
+                        lambda: [{'doc_id': 'doc', 'name': 'Doc', 'chunks_count': 1}])
+    monkeypatch.setattr(llm_provider, 'get_llm_provider', lambda: provider)
+    monkeypatch.setattr(gdd_service, 'get_gdd_top_chunks_supabase',
+                        lambda **kwargs: ([dict(chunk)], {}), raising=False)
+    monkeypatch.setattr(gdd_service, '_embed_texts', lambda p, texts, use_cache=True: [[1.0, 0.0]],
+                        raising=False)
+    monkeypatch.setattr(gdd_service, '_answer_cache_scope',
+                        lambda doc_ids, language, query, p: (KEY, (1,)))
+    monkeypatch.setattr(answer_cache, 'get_answer_cache', lambda: cache)
+    return provider
+
+
+def test_query_is_answered_from_the_cache_the_second_time(monkeypatch, now):
+    cache = AnswerCache(threshold=0.9, max_entries=10, ttl=60)
+    provider = _query_setup(monkeypatch, cache)
+
+    first = gdd_service.query_gdd_documents('How do tanks work?', language='en')
+    second = gdd_service.query_gdd_documents('How do tanks work?', language='en')
+
+    assert first['status'] == 'success' and not first.get('cached')
+    assert second['cached'] and second['response'] == first['response']
+    assert len(provider.prompts) == 1
+
+
+def test_use_cache_false_neither_looks_up_nor_stores(monkeypatch, now):
+    class UntouchableCache:
+        def lookup(self, *args):
+            raise AssertionError('looked up')
+
+        def put(self, *args):
+            raise AssertionError('stored')
+
+    provider = _query_setup(monkeypatch, UntouchableCache())
+
+    result = gdd_service.query_gdd_documents('How do tanks work?', language='en', use_cache=False)
+
+    assert result['status'] == 'success' and not result.get('cached')
+    assert len(provider.prompts) == 1
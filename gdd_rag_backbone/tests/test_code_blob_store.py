@@ -0,0 +1,149 @@
+"""Tests for the compressed code blob store and the /api/code/file endpoint."""
+
+import random
+
+import pytest
+
+from backend.storage import code_blob_store
+from backend.storage.code_blob_store import CodeBlobStore, blob_hash
+
+# Incompressible, so the zlib stream spans several 64 KiB reads
+DATA = random.Random(0).randbytes(300_000)
+READ_SIZE = code_blob_store._READ_SIZE
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CodeBlobStore(str(tmp_path / 'blobs'), mirror=False)
+
+
+def test_put_is_idempotent_and_get_round_trips(store):
+    content_hash = store.put(DATA)
+
+    assert content_hash == blob_hash(DATA)
+    assert store.put(DATA) == content_hash
+    assert store.size(content_hash) == len(DATA)
+    assert store.get(content_hash) == DATA
+    assert store.get('0' * 64) is None and store.size('0' * 64) is None
+
+
+@pytest.mark.parametrize('start, end', [
+    (0, 1),
+    (READ_SIZE - 10, READ_SIZE + 10),       # across the first read boundary
+    (READ_SIZE, 2 * READ_SIZE),
+    (3 * READ_SIZE - 1, 3 * READ_SIZE + 1),
+    (123_456, None),                         # to the end of the file
+    (len(DATA) - 5, len(DATA) + 100),        # end past EOF is clamped
+])
+def test_read_range_matches_the_slice(store, start, end):
+    content_hash = store.put(DATA)
+
+    assert store.read_range(content_hash, start, end) == DATA[start:end]
+
+
+def test_empty_range_and_start_at_eof_read_nothing(store):
+    content_hash = store.put(DATA)
+
+    assert store.read_range(content_hash, 100, 100) == b''
+    assert store.read_range(content_hash, len(DATA), None) == b''
+    assert store.read_range(content_hash, len(DATA) + 10, None) == b''
+
+
+def test_empty_file(store):
+    content_hash = store.put(b'')
+
+    assert store.size(content_hash) == 0
+    assert store.get(content_hash) == b''
+
+
+# ---- /api/code/file ---------------------------------------------------
+
+@pytest.fixture(scope='module')
+def flask_app():
+    """app.py imported once, without its background startup work."""
+    import os
+    from backend.services import translation_synonym_service
+    from backend.shared import config
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('OPENAI_API_KEY', os.environ.get('OPENAI_API_KEY') or 'test-key')
+        mp.setattr(config, 'KEYWORD_FTS_ENABLED', False)
+        mp.setattr(translation_synonym_service, 'prewarm_term_cache', lambda: 0)
+        import app
+    return app.app
+
+
+class _PathIndex:
+    def __init__(self, paths):
+        self.paths = paths
+
+    def resolve(self, file_filter):
+        name = file_filter.lower()
+        return [p for p in self.paths if p.lower().endswith(name)]
+
+
+@pytest.fixture
+def client(flask_app, store, monkeypatch):
+    from backend.storage import code_path_index
+    content_hash = store.put(DATA)
+    monkeypatch.setattr(code_path_index, 'get_path_index',
+                        lambda: _PathIndex(['Assets/Tank.cs', 'A/Player.cs', 'B/Player.cs']))
+    monkeypatch.setattr(code_blob_store, 'get_blob_store', lambda: store)
+    monkeypatch.setattr(code_blob_store, 'code_file_hash',
+                        lambda path: content_hash if path == 'Assets/Tank.cs' else None)
+    return flask_app.test_client()
+
+
+def test_full_file_with_etag(client):
+    response = client.get('/api/code/file?file_path=Tank.cs')
+
+    assert response.status_code == 200
+    assert response.data == DATA
+    assert response.headers['ETag'] == f'"{blob_hash(DATA)}"'
+    assert response.headers['X-File-Path'] == 'Assets/Tank.cs'
+    assert response.headers['Accept-Ranges'] == 'bytes'
+
+
+def test_if_none_match_returns_304(client):
+    response = client.get('/api/code/file?file_path=Tank.cs',
+                          headers={'If-None-Match': f'"{blob_hash(DATA)}"'})
+
+    assert response.status_code == 304 and response.data == b''
+    stale = client.get('/api/code/file?file_path=Tank.cs', headers={'If-None-Match': '"other"'})
+    assert stale.status_code == 200
+
+
+def test_range_across_the_read_boundary(client):
+    start, end = READ_SIZE - 100, READ_SIZE + 100
+
+    response = client.get('/api/code/file?file_path=Tank.cs',
+                          headers={'Range': f'bytes={start}-{end - 1}'})
+
+    assert response.status_code == 206
+    assert response.data == DATA[start:end]
+    assert response.headers['Content-Range'] == f'bytes {start}-{end - 1}/{len(DATA)}'
+
+
+def test_suffix_range_returns_the_tail(client):
+    response = client.get('/api/code/file?file_path=Tank.cs', headers={'Range': 'bytes=-500'})
+
+    assert response.status_code == 206
+    assert response.data == DATA[-500:]
+    assert response.headers['Content-Range'] == f'bytes {len(DATA) - 500}-{len(DATA) - 1}/{len(DATA)}'
+
+
+def test_range_starting_at_eof_is_not_satisfiable(client):
+    response = client.get('/api/code/file?file_path=Tank.cs',
+                          headers={'Range': f'bytes={len(DATA)}-'})
+
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{len(DATA)}'
+
+
+def test_ambiguous_missing_and_unstored_files(client):
+    ambiguous = client.get('/api/code/file?file_path=Player.cs')
+    assert ambiguous.status_code == 409
+    assert ambiguous.get_json()['candidates'] == ['A/Player.cs', 'B/Player.cs']
+
+    assert client.get('/api/code/file?file_path=Missing.cs').status_code == 404
+    assert client.get('/api/code/file?file_path=A/Player.cs').status_code == 404
+    assert client.get('/api/code/file').status_code == 400
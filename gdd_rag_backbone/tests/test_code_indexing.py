@@ -0,0 +1,96 @@
+"""Tests for idempotent code chunk indexing (backend.storage.code_supabase_storage)."""
+
+from backend.storage import code_supabase_storage as storage
+
+
+class _FakeStore:
+    """In-memory code_chunks / code_files with the storage module's write calls."""
+
+    def __init__(self):
+        self.rows = {}
+        self.files = {}
+        self.apply_calls = []
+        self._next_id = 1
+
+    def upsert_chunks(self, records):
+        for record in records:
+            self.rows[self._next_id] = dict(record, id=self._next_id)
+            self._next_id += 1
+        return len(records)
+
+    def chunk_keys(self, file_paths):
+        return [row for row in self.rows.values() if row['file_path'] in file_paths]
+
+    def upsert_files(self, files):
+        for row in files:
+            self.files.setdefault(row['file_path'], {}).update(row)
+        return len(files)
+
+    def apply_changes(self, metadata_updates, orphan_ids):
+        self.apply_calls.append((list(metadata_updates), list(orphan_ids)))
+        for chunk_id, metadata in metadata_updates:
+            self.rows[chunk_id]['metadata'] = metadata
+        for chunk_id in orphan_ids:
+            del self.rows[chunk_id]
+
+
+class _PathIndex:
+    def add_paths(self, paths):
+        list(paths)
+
+
+def _install(monkeypatch, store, embed):
+    monkeypatch.setattr(storage, 'USE_SUPABASE', True)
+    monkeypatch.setattr(storage, 'upsert_code_chunks', store.upsert_chunks)
+    monkeypatch.setattr(storage, 'get_code_chunk_keys', store.chunk_keys)
+    monkeypatch.setattr(storage, 'upsert_code_files', store.upsert_files)
+    monkeypatch.setattr(storage, 'apply_code_chunk_changes', store.apply_changes)
+    monkeypatch.setattr(storage, 'get_path_index', lambda: _PathIndex())
+    monkeypatch.setattr(storage, 'guard_embed_batch', lambda embed_batch, index, provider: embed_batch)
+    monkeypatch.setattr(storage, 'make_embedding_func', lambda provider: embed)
+
+
+def _method(name, line, body='{}'):
+    return {'chunk_type': 'method', 'name': name, 'class_name': 'Tank',
+            'code': f"void {name}() {body}", 'metadata': {'line': line, 'path': f"Tank.{name}"}}
+
+
+def test_moved_chunks_and_orphans_are_applied_in_one_call(monkeypatch):
+    store = _FakeStore()
+    _install(monkeypatch, store, lambda texts: [[0.1, 0.2] for _ in texts])
+    storage.index_code_files_to_supabase(
+        [('A/Tank.cs', 'Tank.cs', [_method('Fire', 3), _method('Move', 8)], 'h1')], provider=None)
+
+    # One line inserted at the top, Move removed
+    results, _ = storage.index_code_files_to_supabase(
+        [('A/Tank.cs', 'Tank.cs', [_method('Fire', 4)], 'h2')], provider=None)
+
+    assert len(store.apply_calls) == 1
+    metadata_updates, orphan_ids = store.apply_calls[-1]
+    assert len(metadata_updates) == 1 and len(orphan_ids) == 1
+    assert results['A/Tank.cs'].unchanged == 1 and results['A/Tank.cs'].removed == 1
+    assert [row['metadata']['original_metadata']['line'] for row in store.rows.values()] == [4]
+
+
+def test_embedding_failure_only_fails_the_files_in_the_batch(monkeypatch):
+    store = _FakeStore()
+
+    def embed(texts):
+        if any('Broken' in text for text in texts):
+            raise RuntimeError('embedding API error')
+        return [[0.1, 0.2] for _ in texts]
+
+    _install(monkeypatch, store, embed)
+    files = [
+        ('A/Good.cs', 'Good.cs', [_method('Fire', 1)], 'good'),
+        ('A/Bad.cs', 'Bad.cs', [_method('Broken', 1)], 'bad'),
+    ]
+
+    results, _ = storage.index_code_files_to_supabase(files, provider=None)
+
+    assert results['A/Good.cs'].error is None and results['A/Good.cs'].written == 1
+    assert 'embedding API error' in results['A/Bad.cs'].error
+    # The failed file's hash is not recorded, so the next run retries it
+    assert store.files['A/Good.cs'].get('content_hash') == 'good'
+    assert store.files['A/Bad.cs'].get('content_hash') is None
+    assert [row['file_path'] for row in store.rows.values()] == ['A/Good.cs']
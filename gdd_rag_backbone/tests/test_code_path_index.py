@@ -0,0 +1,127 @@
+"""Tests for resolving user file filters to indexed code file paths."""
+
+import threading
+import time
+
+from backend.storage import code_path_index, supabase_client
+from backend.storage.code_path_index import CodePathIndex, normalize_file_filter
+
+PATHS = [
+    'Assets/Scripts/Tank.cs',
+    'Assets/Scripts/TankController.cs',
+    'Assets/Scripts/UI/Player.cs',
+    'Assets/Editor/Player.cs',
+]
+
+
+def _index(paths=PATHS, ttl=300):
+    index = CodePathIndex(ttl=ttl)
+    index.load(paths)
+    return index
+
+
+def test_normalize_file_filter():
+    assert normalize_file_filter('.\\Assets//Scripts\\Tank.CS') == 'assets/scripts/tank.cs'
+    assert normalize_file_filter('/') == ''
+
+
+def test_resolution_tiers(monkeypatch):
+    index = _index()
+    monkeypatch.setattr(index, '_ensure_fresh', lambda force=False: None)
+
+    # Exact path (case and separators normalized)
+    assert index.resolve('assets\\scripts\\tank.cs') == ['Assets/Scripts/Tank.cs']
+    # Path suffix, which covers the basename; it may match several files
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/Tank.cs']
+    assert index.resolve('Player.cs') == ['Assets/Editor/Player.cs', 'Assets/Scripts/UI/Player.cs']
+    assert index.resolve('ui/player.cs') == ['Assets/Scripts/UI/Player.cs']
+    # Filename without extension
+    assert index.resolve('TankController') == ['Assets/Scripts/TankController.cs']
+    # Filename substring, only when no earlier tier matched
+    assert index.resolve('controller') == ['Assets/Scripts/TankController.cs']
+    assert index.resolve('Missing.cs') == []
+    assert index.resolve_many(['Tank', '']) == {'Tank': ['Assets/Scripts/Tank.cs']}
+
+
+def test_remove_path_and_add_paths(monkeypatch):
+    index = _index()
+    monkeypatch.setattr(index, '_ensure_fresh', lambda force=False: None)
+
+    index.remove_path('Assets/Editor/Player.cs')
+    assert index.resolve('Player.cs') == ['Assets/Scripts/UI/Player.cs']
+
+    index.remove_path('Assets/Scripts/Tank.cs')
+    # Only the substring tier still matches
+    assert index.resolve('Tank') == ['Assets/Scripts/TankController.cs']
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/TankController.cs']
+    assert index.resolve('Assets/Scripts/Tank.cs') == ['Assets/Scripts/TankController.cs']
+    assert len(index) == 2
+
+    index.add_paths(['Assets/Scripts/Tank.cs', 'Assets/Scripts/Tank.cs'])
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/Tank.cs']
+    assert len(index) == 3
+
+
+class _Clock:
+    def __init__(self, monkeypatch):
+        self.now = 1000.0
+        monkeypatch.setattr(code_path_index.time, 'monotonic', lambda: self.now)
+
+
+def test_reloads_after_the_ttl_and_on_misses_at_most_every_interval(monkeypatch):
+    clock = _Clock(monkeypatch)
+    stored = list(PATHS)
+    loads = []
+    monkeypatch.setattr(supabase_client, 'get_code_file_paths',
+                        lambda: loads.append(clock.now) or list(stored))
+    index = CodePathIndex(ttl=300)
+
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/Tank.cs']
+    stored.append('Assets/Scripts/Map.cs')
+    clock.now += 10
+    # A miss shortly after a load does not reload
+    assert index.resolve('Map.cs') == []
+    clock.now += 30
+    assert index.resolve('Map.cs') == ['Assets/Scripts/Map.cs']
+    clock.now += 301
+    index.resolve('Tank.cs')
+    assert loads == [1000.0, 1040.0, 1341.0]
+
+
+def test_failed_reload_keeps_the_index_and_backs_off(monkeypatch):
+    clock = _Clock(monkeypatch)
+    calls = []
+
+    def unreachable():
+        calls.append(clock.now)
+        raise ConnectionError('down')
+
+    index = _index(ttl=300)
+    monkeypatch.setattr(supabase_client, 'get_code_file_paths', unreachable)
+    clock.now += 301
+
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/Tank.cs']
+    assert index.resolve('Tank.cs') == ['Assets/Scripts/Tank.cs']
+    assert len(calls) == 1
+
+
+def test_concurrent_lookups_after_the_ttl_share_one_reload(monkeypatch):
+    loads = []
+
+    def slow_paths():
+        loads.append(1)
+        time.sleep(0.05)
+        return list(PATHS)
+
+    monkeypatch.setattr(supabase_client, 'get_code_file_paths', slow_paths)
+    index = CodePathIndex(ttl=300)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(index.resolve('Tank.cs')))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert results == [['Assets/Scripts/Tank.cs']] * 8
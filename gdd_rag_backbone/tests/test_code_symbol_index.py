@@ -0,0 +1,133 @@
+"""Tests for the local code symbol index and its restore from the Supabase mirror."""
+
+import sqlite3
+
+from backend.services import code_ingest_service
+from backend.storage import code_symbol_index, supabase_client
+from backend.storage.code_symbol_index import CodeSymbolIndex
+
+
+def _symbol(kind, name, line, parent=None):
+    return {'kind': kind, 'name': name, 'parent': parent,
+            'path': f'{parent}.{name}' if parent else name, 'signature': f'{kind} {name}',
+            'start_byte': line * 10, 'end_byte': line * 10 + 9,
+            'start_line': line, 'end_line': line, 'doc_comment': ''}
+
+
+def _entry(file_path, content_hash='h1', symbols=None):
+    return {'file_path': file_path, 'file_name': file_path.split('/')[-1],
+            'content_hash': content_hash,
+            'symbols': symbols if symbols is not None else [
+                _symbol('class', 'Tank', 1),
+                _symbol('field', 'armor', 3, 'Tank'),
+                _symbol('method', 'Fire', 5, 'Tank'),
+            ]}
+
+
+def _index(tmp_path):
+    return CodeSymbolIndex(str(tmp_path / 'symbols.sqlite'))
+
+
+def test_record_and_get_symbols(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.record_files([_entry('Assets/Tank.cs')], mirror=False) == 1
+
+    assert [s['name'] for s in index.get_symbols('Assets/Tank.cs')] == ['Tank', 'armor', 'Fire']
+    assert [s['name'] for s in index.get_symbols('Assets/Tank.cs', kinds=['method'])] == ['Fire']
+    assert index.get_content_hash('Assets/Tank.cs') == 'h1'
+
+    # Recording a file again replaces its symbols
+    index.record_files([_entry('Assets/Tank.cs', 'h2', [_symbol('class', 'Tank', 1)])], mirror=False)
+    assert [s['name'] for s in index.get_symbols('Assets/Tank.cs')] == ['Tank']
+    assert index.get_content_hash('Assets/Tank.cs') == 'h2'
+
+
+def test_resolve_by_path_unique_name_or_unique_suffix(tmp_path):
+    index = _index(tmp_path)
+    index.record_files([_entry('Assets/Tank.cs'), _entry('Game/A/Player.cs'),
+                        _entry('Game/B/Player.cs')], mirror=False)
+
+    assert index.resolve('Assets/Tank.cs') == 'Assets/Tank.cs'
+    assert index.resolve('tank.CS') == 'Assets/Tank.cs'
+    assert index.resolve('Player.cs') is None  # ambiguous
+    assert index.resolve('b\\player.cs') == 'Game/B/Player.cs'
+    assert index.resolve('Root/Game/A/Player.cs') == 'Game/A/Player.cs'
+    assert index.resolve('Missing.cs') is None
+    assert index.resolve('') is None
+
+
+def test_delete_file_drops_its_symbols(tmp_path):
+    index = _index(tmp_path)
+    index.record_files([_entry('Assets/Tank.cs')], mirror=False)
+
+    index.delete_file('Assets/Tank.cs')
+
+    assert index.resolve('Tank.cs') is None
+    assert index.get_symbols('Assets/Tank.cs') == []
+    assert index.get_content_hash('Assets/Tank.cs') is None
+
+
+def test_mirror_restore_does_not_treat_underscores_as_wildcards(tmp_path, monkeypatch):
+    index = _index(tmp_path)
+    mirror_rows = [
+        {'file_path': 'A/My_Type.cs', 'file_name': 'My_Type.cs', 'content_hash': 'h1',
+         'symbols': [['class', 'My_Type', None, 'My_Type', 'class My_Type', 0, 9, 1, 1]]},
+        {'file_path': 'B/MyXType.cs', 'file_name': 'MyXType.cs', 'content_hash': 'h2',
+         'symbols': [['class', 'MyXType', None, 'MyXType', 'class MyXType', 0, 9, 1, 1]]},
+    ]
+
+    class Query:
+        """code_symbols filtered with Postgres ILIKE semantics (SQLite LIKE with '\\' escape)."""
+
+        def select(self, columns):
+            return self
+
+        def ilike(self, column, pattern):
+            conn = sqlite3.connect(':memory:')
+            self.rows = [row for row in mirror_rows if conn.execute(
+                "SELECT ? LIKE ? ESCAPE '\\'", (row[column], pattern)).fetchone()[0]]
+            return self
+
+        def execute(self):
+            return type('R', (), {'data': self.rows})()
+
+    client = type('C', (), {'table': lambda self, name: Query()})()
+    monkeypatch.setattr(supabase_client, 'get_supabase_client', lambda *a, **k: client)
+
+    # The restore path of code_service._indexed_file_path
+    assert index.load_mirror_rows(supabase_client.get_code_symbols_by_name('My_Type.cs')) == 1
+    assert index.resolve('My_Type.cs') == 'A/My_Type.cs'
+    assert [s['name'] for s in index.get_symbols('A/My_Type.cs')] == ['My_Type']
+    assert index.resolve('MyXType.cs') is None
+
+
+def test_bulk_ingest_records_symbols_only_for_indexed_files(tmp_path, monkeypatch):
+    index = _index(tmp_path)
+    source = tmp_path / 'src'
+    source.mkdir()
+    (source / 'Good.cs').write_text('class Good { void A() {} }')
+    (source / 'Bad.cs').write_text('class Bad { void B() {} }')
+
+    def index_files(files, provider, **kwargs):
+        from backend.storage.code_supabase_storage import CodeFileIndexResult
+        results = {}
+        for file_path, file_name, chunks, content_hash in files:
+            result = CodeFileIndexResult(file_path, file_name, content_hash)
+            if file_name == 'Bad.cs':
+                result.error = 'embedding failed'
+            results[file_path] = result
+        return results, type('S', (), {'to_dict': lambda self: {}})()
+
+    monkeypatch.setattr(code_ingest_service, 'get_symbol_index', lambda: index)
+    monkeypatch.setattr(code_ingest_service, 'get_blob_store',
+                        lambda: type('B', (), {'put': lambda self, data, content_hash: None})())
+    monkeypatch.setattr('backend.storage.code_supabase_storage.index_code_files_to_supabase', index_files)
+    monkeypatch.setattr(supabase_client, 'get_code_file_hashes', lambda: {})
+    monkeypatch.setattr(code_symbol_index.CodeSymbolIndex, '_mirror', lambda self, entries: None)
+
+    report = code_ingest_service.ingest_codebase(str(source), provider=object(), max_workers=1)
+
+    assert {f.file_path: f.status for f in report.files} == {'Bad.cs': 'error', 'Good.cs': 'indexed'}
+    assert index.resolve('Good.cs') == 'Good.cs'
+    assert index.resolve('Bad.cs') is None
@@ -0,0 +1,97 @@
+"""Tests for the C# symbol extractor (tree-sitter and regex fallback)."""
+
+import pytest
+
+from backend import csharp_symbols
+from backend.csharp_symbols import extract_csharp_symbols
+
+NESTED = """namespace Game
+{
+    public class Tank
+    {
+        private int armor = 10;
+        public string Name { get; set; }
+
+        public Tank(int armor)
+        {
+            this.armor = armor;
+        }
+
+        public void Fire()
+        {
+            int shots = 1;
+        }
+
+        public class Inner { void Go() {} }
+    }
+}
+"""
+
+GENERIC = """public class Pool<T> where T : class
+{
+    private List<T> items;
+
+    public T Take<TKey>(Dictionary<TKey, T> lookup) where TKey : notnull
+    {
+        return default;
+    }
+}
+"""
+
+NON_ASCII = """public class Xe
+{
+    // Xe tăng hạng nặng
+    public void Bắn() { }
+    public int Giáp => 5;
+}
+"""
+
+BACKENDS = [
+    pytest.param(True, id='tree-sitter', marks=pytest.mark.skipif(
+        not csharp_symbols.TREE_SITTER_AVAILABLE, reason='tree-sitter is not installed')),
+    pytest.param(False, id='fallback'),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def extract(request, monkeypatch):
+    monkeypatch.setattr(csharp_symbols, 'TREE_SITTER_AVAILABLE', request.param)
+    return extract_csharp_symbols
+
+
+def _by_path(symbols):
+    return {symbol.path: symbol for symbol in symbols}
+
+
+def test_nested_types_and_members(extract):
+    symbols = _by_path(extract(NESTED))
+
+    assert symbols['Tank'].kind == 'class'
+    assert symbols['Tank.armor'].kind == 'field'
+    assert symbols['Tank.Name'].kind == 'property'
+    assert symbols['Tank.Tank'].kind == 'constructor'
+    assert symbols['Tank.Fire'].start_line == 13
+    assert symbols['Tank.Inner'].parent == 'Tank'
+    # Member declared on the same line as its nested type
+    assert symbols['Tank.Inner.Go'].kind == 'method'
+    assert symbols['Tank.Inner.Go'].parent == 'Inner'
+    # Locals inside method bodies are not members
+    assert 'Tank.Fire.shots' not in symbols and 'Tank.shots' not in symbols
+
+
+def test_generic_types_and_methods(extract):
+    symbols = _by_path(extract(GENERIC))
+
+    assert symbols['Pool'].kind == 'class'
+    assert symbols['Pool.items'].kind == 'field'
+    assert symbols['Pool.Take'].kind == 'method'
+    assert symbols['Pool.Take'].text.rstrip().endswith('}')
+
+
+def test_non_ascii_byte_offsets(extract):
+    source = NON_ASCII.encode('utf-8')
+    symbols = extract(NON_ASCII)
+
+    assert {symbol.path for symbol in symbols} >= {'Xe', 'Xe.Bắn', 'Xe.Giáp'}
+    for symbol in symbols:
+        assert source[symbol.start_byte:symbol.end_byte].decode('utf-8') == symbol.text
@@ -0,0 +1,117 @@
+"""Tests for micro-batching of concurrent embedding requests."""
+
+import threading
+import time
+
+import pytest
+
+from gdd_rag_backbone.rag_backend.embedding_batcher import EmbeddingBatcher
+
+
+class FakeProvider:
+    """Embeds each text as [len(text)] and records every request."""
+
+    embedding_model = 'fake'
+    base_url = None
+
+    def __init__(self, error=None):
+        self.requests = []
+        self.error = error
+
+    def embed(self, texts):
+        self.requests.append(list(texts))
+        if self.error is not None:
+            raise self.error
+        return [[float(len(text))] for text in texts]
+
+
+def _in_thread(fn, *args):
+    out = []
+
+    def run():
+        try:
+            out.append(fn(*args))
+        except Exception as e:
+            out.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, out
+
+
+def _wait_for_open_batch(batcher):
+    while not batcher._open:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_request_and_get_their_own_vectors():
+    # The batch closes when it is full, long before the window ends
+    batcher = EmbeddingBatcher(window_ms=10_000, max_texts=5)
+    provider = FakeProvider()
+
+    leader, leader_out = _in_thread(batcher.embed, provider, ['a', 'bb'])
+    _wait_for_open_batch(batcher)
+    follower = batcher.embed(provider, ['ccc', 'dddd', 'eeeee'])
+    leader.join()
+
+    assert provider.requests == [['a', 'bb', 'ccc', 'dddd', 'eeeee']]
+    assert leader_out == [[[1.0], [2.0]]]
+    assert follower == [[3.0], [4.0], [5.0]]
+    stats = batcher.stats()
+    assert stats['calls'] == 2 and stats['requests'] == 1 and stats['mean_batch_size'] == 5
+
+
+def test_a_caller_that_would_overflow_the_batch_starts_a_new_one():
+    batcher = EmbeddingBatcher(window_ms=50, max_texts=5)
+    provider = FakeProvider()
+
+    first, first_out = _in_thread(batcher.embed, provider, ['a', 'b', 'c'])
+    _wait_for_open_batch(batcher)
+    second = batcher.embed(provider, ['dd', 'ee', 'ff'])
+    first.join()
+
+    assert sorted(provider.requests) == [['a', 'b', 'c'], ['dd', 'ee', 'ff']]
+    assert first_out == [[[1.0]] * 3]
+    assert second == [[2.0]] * 3
+
+
+def test_requests_of_max_texts_or_more_are_sent_directly():
+    batcher = EmbeddingBatcher(window_ms=10_000, max_texts=2)
+    provider = FakeProvider()
+
+    assert batcher.embed(provider, ['a', 'bb', 'ccc']) == [[1.0], [2.0], [3.0]]
+    assert batcher.embed(provider, []) == []
+    assert provider.requests == [['a', 'bb', 'ccc']]
+
+
+def test_a_zero_window_disables_batching():
+    batcher = EmbeddingBatcher(window_ms=0, max_texts=8)
+    provider = FakeProvider()
+
+    batcher.embed(provider, ['a'])
+    batcher.embed(provider, ['b'])
+
+    assert provider.requests == [['a'], ['b']]
+
+
+def test_a_failed_request_raises_in_every_caller():
+    batcher = EmbeddingBatcher(window_ms=10_000, max_texts=2)
+    provider = FakeProvider(error=RuntimeError('embedding API error'))
+
+    leader, leader_out = _in_thread(batcher.embed, provider, ['a'])
+    _wait_for_open_batch(batcher)
+    with pytest.raises(RuntimeError, match='embedding API error'):
+        batcher.embed(provider, ['b'])
+    leader.join()
+
+    assert len(provider.requests) == 1
+    assert isinstance(leader_out[0], RuntimeError)
+
+
+def test_a_short_vector_list_is_an_error():
+    batcher = EmbeddingBatcher(window_ms=0, max_texts=8)
+    provider = FakeProvider()
+    provider.embed = lambda texts: [[1.0]]
+
+    with pytest.raises(ValueError, match='1 vectors for 2 texts'):
+        batcher.embed(provider, ['a', 'b'])
@@ -0,0 +1,34 @@
+"""Tests for the persistent section explanation cache."""
+
+from backend.storage import explanation_cache
+from backend.storage.explanation_cache import ExplanationCache
+
+
+def test_put_purges_expired_entries(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(explanation_cache.time, 'time', lambda: now[0])
+    cache = ExplanationCache(str(tmp_path / 'explanations.sqlite'), ttl=60)
+
+    cache.put('old', 'doc', {'text': 'old'})
+    now[0] += 120
+    cache.put('new', 'doc', {'text': 'new'})
+
+    rows = cache._conn.execute("SELECT key FROM sections").fetchall()
+    assert [key for key, in rows] == ['new']
+    assert cache.get_many(['old', 'new']) == {'new': {'text': 'new'}}
+
+
+def test_purge_runs_at_most_once_per_interval(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(explanation_cache.time, 'time', lambda: now[0])
+    monkeypatch.setattr(explanation_cache, 'PURGE_INTERVAL', 300.0)
+    cache = ExplanationCache(str(tmp_path / 'explanations.sqlite'), ttl=3600)
+    purges = []
+    original = cache.purge_expired
+    monkeypatch.setattr(cache, 'purge_expired', lambda: purges.append(now[0]) or original())
+
+    for _ in range(12):
+        cache.put('key', 'doc', 1)
+        now[0] += 30
+
+    assert purges == [1000.0, 1300.0]
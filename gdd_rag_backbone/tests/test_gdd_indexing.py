@@ -0,0 +1,113 @@
+"""Tests for GDD re-indexing (backend.storage.gdd_supabase_storage)."""
+
+import time
+
+import pytest
+
+from backend.shared.config import INGEST_EMBED_BATCH_SIZE, INGEST_WRITE_BATCH_SIZE
+from backend.storage import gdd_supabase_storage as storage
+
+
+class _FakeStore:
+    """In-memory keyword_documents / keyword_chunks with the storage module's write calls."""
+
+    def __init__(self, doc_id, chunk_ids=(), name='old.pdf'):
+        self.documents = {doc_id: name} if chunk_ids else {}
+        self.chunks = {chunk_id: doc_id for chunk_id in chunk_ids}
+
+    def install(self, monkeypatch):
+        monkeypatch.setattr(storage, 'USE_SUPABASE', True)
+        monkeypatch.setattr(storage, 'guard_embed_batch', lambda embed_batch, index, provider: embed_batch)
+        monkeypatch.setattr(storage, 'get_gdd_chunk_ids',
+                            lambda doc_id: [c for c, d in self.chunks.items() if d == doc_id])
+        monkeypatch.setattr(storage, 'insert_gdd_document', self.insert_document)
+        monkeypatch.setattr(storage, 'insert_gdd_chunks', self.insert_chunks)
+        monkeypatch.setattr(storage, 'delete_gdd_chunks', self.delete_chunks)
+        monkeypatch.setattr(storage, 'delete_gdd_document', self.delete_document)
+
+    def insert_document(self, doc_id, name, **kwargs):
+        self.documents[doc_id] = name
+
+    def insert_chunks(self, records):
+        assert all(record['doc_id'] in self.documents for record in records)
+        for record in records:
+            self.chunks[record['chunk_id']] = record['doc_id']
+        return len(records)
+
+    def delete_chunks(self, doc_id, chunk_ids):
+        for chunk_id in chunk_ids:
+            self.chunks.pop(chunk_id, None)
+        return len(chunk_ids)
+
+    def delete_document(self, doc_id):
+        self.documents.pop(doc_id, None)
+        self.chunks = {c: d for c, d in self.chunks.items() if d != doc_id}
+
+
+def _chunks(count):
+    return [{'chunk_id': f'chunk_{i:03d}', 'content': f'text {i}', 'file_path': 'new.pdf'}
+            for i in range(count)]
+
+
+def _embedding_func(fail_on_call=None, wait_for=None):
+    calls = []
+
+    def embed(texts):
+        calls.append(len(texts))
+        if len(calls) == fail_on_call:
+            # Fail only once an earlier batch has reached the database
+            deadline = time.monotonic() + 5
+            while wait_for is not None and not wait_for() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            raise RuntimeError('insufficient_quota')
+        return [[0.1] * 4 for _ in texts]
+    return lambda provider: embed
+
+
+OLD_IDS = [f'doc_chunk_{i:03d}' for i in range(40)]
+
+
+def test_failed_reindex_keeps_the_previous_version(monkeypatch):
+    store = _FakeStore('doc', OLD_IDS)
+    store.install(monkeypatch)
+    written = []
+    insert_chunks = store.insert_chunks
+    monkeypatch.setattr(storage, 'insert_gdd_chunks',
+                        lambda records: written.extend(records) or insert_chunks(records))
+    # A later embedding batch fails after the first write batch has been written
+    batches_per_write = -(-INGEST_WRITE_BATCH_SIZE // INGEST_EMBED_BATCH_SIZE)
+    monkeypatch.setattr(storage, 'make_embedding_func',
+                        _embedding_func(fail_on_call=batches_per_write + 2, wait_for=lambda: written))
+
+    with pytest.raises(Exception, match='insufficient_quota'):
+        storage.index_gdd_chunks_to_supabase('doc', _chunks(400), provider=None)
+
+    assert written
+    assert sorted(store.chunks) == OLD_IDS
+    assert store.documents == {'doc': 'old.pdf'}
+
+
+def test_successful_reindex_replaces_the_previous_version(monkeypatch):
+    store = _FakeStore('doc', OLD_IDS)
+    store.install(monkeypatch)
+    monkeypatch.setattr(storage, 'make_embedding_func', _embedding_func())
+
+    assert storage.index_gdd_chunks_to_supabase('doc', _chunks(3), provider=None)
+
+    assert sorted(store.chunks) == ['doc_alt_chunk_000', 'doc_alt_chunk_001', 'doc_alt_chunk_002']
+    assert store.documents == {'doc': 'new.pdf'}
+
+    # The next re-index goes back to the plain prefix
+    assert storage.index_gdd_chunks_to_supabase('doc', _chunks(2), provider=None)
+    assert sorted(store.chunks) == ['doc_chunk_000', 'doc_chunk_001']
+
+
+def test_failed_first_index_leaves_no_document(monkeypatch):
+    store = _FakeStore('doc')
+    store.install(monkeypatch)
+    monkeypatch.setattr(storage, 'make_embedding_func', _embedding_func(fail_on_call=2))
+
+    with pytest.raises(Exception, match='insufficient_quota'):
+        storage.index_gdd_chunks_to_supabase('doc', _chunks(60), provider=None)
+
+    assert store.documents == {} and store.chunks == {}
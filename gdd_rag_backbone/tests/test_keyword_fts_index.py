@@ -0,0 +1,78 @@
+"""Tests for the local FTS5 mirror of keyword_chunks."""
+
+from backend.services import search_service
+from backend.storage import keyword_fts_index, supabase_client
+from backend.storage.keyword_fts_index import KeywordFtsIndex, fts_query
+
+CHUNKS = [
+    {'chunk_id': 'doc_tank_1', 'doc_id': 'doc', 'section_heading': '1. Tanks',
+     'content': 'Each tank upgrade raises armor by ten percent.'},
+    {'chunk_id': 'doc_tank_2', 'doc_id': 'doc', 'section_heading': '1. Tanks',
+     'content': 'Upgrade costs are paid in gold.'},
+    {'chunk_id': 'doc_map_1', 'doc_id': 'doc', 'section_heading': '2. Maps',
+     'content': 'Maps rotate every match.'},
+    {'chunk_id': 'doc_vi_1', 'doc_id': 'doc', 'section_heading': '3. Xe',
+     'content': 'Xe tăng hạng nặng có giáp dày.'},
+    {'chunk_id': 'doc_vi_2', 'doc_id': 'doc', 'section_heading': '3. Xe',
+     'content': 'Xe chạy nhanh; tăng tốc khi lên hạng.'},
+]
+
+
+def _fresh_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(supabase_client, 'get_data_version', lambda name: 1)
+    monkeypatch.setattr(supabase_client, 'get_keyword_chunk_contents', lambda: CHUNKS)
+    monkeypatch.setattr(supabase_client, 'get_keyword_document_names',
+                        lambda doc_ids=None: {'doc': 'Doc'})
+    index = KeywordFtsIndex(str(tmp_path / 'fts.sqlite'), check_interval=60)
+    index.rebuild()
+    return index
+
+
+def _ids(hits):
+    return {hit['chunk_id'] for hit in hits}
+
+
+def test_fts_query_is_a_phrase_unless_match_any():
+    assert fts_query('tank') == '"tank"'
+    assert fts_query(' tank "upgrade" ') == '"tank ""upgrade"""'
+    assert fts_query('The tank, of armor', match_any=True) == '"tank" OR "armor"'
+    assert fts_query('the of', match_any=True) == '"the" OR "of"'
+    assert fts_query(' -- ') is None
+
+
+def test_multi_word_keyword_matches_only_the_whole_phrase(tmp_path, monkeypatch):
+    index = _fresh_index(tmp_path, monkeypatch)
+
+    assert _ids(index.search('tank upgrade')) == {'doc_tank_1'}
+    assert _ids(index.search('Tank  Upgrade!')) == {'doc_tank_1'}
+    # Every token exists somewhere, but not together and in order
+    assert index.search('upgrade tank') == []
+    assert index.search('tank gold') == []
+    assert _ids(index.search('xe tăng hạng nặng')) == {'doc_vi_1'}
+    assert index.search('xe tăng hạng') != [] and index.search('xe hạng nặng') == []
+
+
+def test_match_any_ranks_partial_token_overlap(tmp_path, monkeypatch):
+    index = _fresh_index(tmp_path, monkeypatch)
+
+    hits = index.search('tank upgrade mechanics armor improvements', match_any=True)
+
+    assert [hit['chunk_id'] for hit in hits][0] == 'doc_tank_1'
+    assert _ids(hits) == {'doc_tank_1', 'doc_tank_2'}
+
+
+def test_keyword_search_multi_only_matches_any_token_when_asked(tmp_path, monkeypatch):
+    index = _fresh_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(search_service, 'KEYWORD_FTS_ENABLED', True)
+    monkeypatch.setattr(keyword_fts_index, 'get_keyword_fts_index', lambda: index)
+    query = 'tank upgrade mechanics'
+
+    assert search_service.keyword_search_multi([query]) == {query: []}
+    scored = search_service.keyword_search_multi([query], section_filter='1. Tanks', match_any=True)
+    assert _ids(scored[query]) == {'doc_tank_1', 'doc_tank_2'}
+
+
+def test_section_headings_are_read_from_the_mirror(tmp_path, monkeypatch):
+    index = _fresh_index(tmp_path, monkeypatch)
+
+    assert index.section_headings() == ['1. Tanks', '2. Maps', '3. Xe']
@@ -0,0 +1,43 @@
+"""Smoke tests for the markdown chunker."""
+
+from gdd_rag_backbone.markdown_chunking import chunker as chunker_module
+from gdd_rag_backbone.markdown_chunking.chunker import MarkdownChunker
+
+
+def _long_section(sentences: int) -> str:
+    return " ".join(f"Tank number {i} has armor and speed stats." for i in range(sentences))
+
+
+def test_chunk_ids_follow_document_order():
+    markdown = "## Title\n\nIntro.\n\n## 1. Tanks\n\nTank text.\n\n## 2. Maps\n\nMap text."
+    chunks = MarkdownChunker(max_workers=1).chunk_document(markdown, doc_id="doc")
+
+    assert [c.chunk_id for c in chunks] == ["chunk_001", "chunk_002", "chunk_003"]
+    assert chunks[1].content.startswith("## 1. Tanks")
+    assert chunks[1].metadata["document_title"] == "Title"
+
+
+def test_long_section_is_split_into_overlapping_parts():
+    markdown = f"## Tanks\n\n{_long_section(400)}"
+    chunker = MarkdownChunker(chunk_size_tokens=200, chunk_overlap_tokens=20, max_workers=1)
+    chunks = chunker.chunk_document(markdown, doc_id="doc")
+
+    assert len(chunks) > 1
+    assert [c.part_number for c in chunks] == list(range(1, len(chunks) + 1))
+    assert all(c.parent_header == "Tanks" for c in chunks)
+    # Each part starts with sentences carried over from the previous part
+    for previous, current in zip(chunks, chunks[1:]):
+        first_sentence = current.content.split("\n\n", 1)[1].split(". ")[0] + "."
+        assert first_sentence in previous.content
+
+
+def test_parallel_output_matches_sequential(monkeypatch):
+    monkeypatch.setattr(chunker_module, "PARALLEL_MIN_SECTIONS", 2)
+    markdown = "\n\n".join(
+        f"## {i}. Section\n\n{_long_section(80)}" for i in range(1, 9))
+
+    sequential = MarkdownChunker(chunk_size_tokens=200, max_workers=1).chunk_document(markdown, doc_id="doc")
+    parallel = MarkdownChunker(chunk_size_tokens=200, max_workers=2).chunk_document(markdown, doc_id="doc")
+
+    assert [(c.chunk_id, c.content, c.metadata) for c in parallel] == \
+        [(c.chunk_id, c.content, c.metadata) for c in sequential]
@@ -0,0 +1,140 @@
+"""Tests for the process-wide LLM rate limiter, on a fake clock."""
+
+import pytest
+
+from gdd_rag_backbone.llm_providers.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimiter,
+    _Bucket,
+    parse_rate_limits,
+)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a limiter waits on it."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.waits = []
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        self.now += timeout
+        return False
+
+
+def _limiter(rpm=60, tpm=60000, max_wait=600, background_reserve=0.0):
+    clock = FakeClock()
+    limiter = RateLimiter(default_rpm=rpm, default_tpm=tpm, limits={}, max_wait=max_wait,
+                          background_reserve=background_reserve, enabled=True, clock=clock)
+    # Waiting advances the fake clock instead of blocking
+    limiter._model('m').cond.wait = clock.wait
+    return limiter, clock
+
+
+def test_bucket_refill_and_wait_math():
+    bucket = _Bucket(60, now=0.0)  # 1 per second
+    bucket.take(60)
+
+    assert bucket.wait_time(1, reserve=0, factor=1.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, reserve=0, factor=0.5) == pytest.approx(2.0)
+    assert bucket.wait_time(1, reserve=10, factor=1.0) == pytest.approx(11.0)
+    bucket.refill(now=0.5, factor=1.0)
+    assert bucket.level == pytest.approx(0.5)
+    bucket.refill(now=1000.0, factor=1.0)
+    assert bucket.level == 60  # capped at capacity
+    # A cost above capacity is paid with a full bucket instead of never
+    assert bucket.wait_time(500, reserve=0, factor=1.0) == 0.0
+
+
+def test_calls_within_budget_do_not_wait_and_the_next_one_does():
+    limiter, clock = _limiter(rpm=60)
+
+    assert all(limiter.acquire('m') == 0.0 for _ in range(60))
+    assert limiter.acquire('m') == pytest.approx(1.0)
+    assert clock.now == pytest.approx(101.0)
+
+
+def test_token_budget_limits_large_requests():
+    limiter, _ = _limiter(rpm=1000, tpm=600)  # 10 tokens per second
+
+    assert limiter.acquire('m', tokens=600) == 0.0
+    assert limiter.acquire('m', tokens=100) == pytest.approx(10.0)
+
+
+def test_background_calls_leave_the_reserve_to_interactive_calls():
+    limiter, _ = _limiter(rpm=10, background_reserve=0.5)
+
+    waits = [limiter.acquire('m', priority=BACKGROUND) for _ in range(6)]
+    assert waits[:5] == [0.0] * 5
+    assert waits[5] > 0
+    # The reserve is still there for interactive callers
+    limiter, _ = _limiter(rpm=10, background_reserve=0.5)
+    for _ in range(5):
+        limiter.acquire('m', priority=BACKGROUND)
+    assert [limiter.acquire('m', priority=INTERACTIVE) for _ in range(5)] == [0.0] * 5
+
+
+def test_background_calls_yield_to_waiting_interactive_callers():
+    limiter, clock = _limiter(rpm=60)
+    model = limiter._model('m')
+    model.waiting[INTERACTIVE] = 1
+
+    def interactive_served(timeout=None):
+        model.waiting[INTERACTIVE] = 0
+        return clock.wait(timeout)
+
+    model.cond.wait = interactive_served
+
+    assert limiter.acquire('m', priority=BACKGROUND) == pytest.approx(1.0)
+    assert clock.waits == [1.0]
+
+
+def test_429_halves_the_rate_and_pauses_for_retry_after():
+    limiter, clock = _limiter(rpm=60)
+    limiter.acquire('m')
+
+    limiter.record_response('m', 429, retry_after=2.0)
+
+    stats = limiter.stats()['m']
+    assert stats['rate_factor'] == 0.5 and stats['rate_limited'] == 1
+    # Paused for 2s with drained buckets refilling at half rate: 1 request after 2s
+    assert limiter.acquire('m') == pytest.approx(2.0)
+    assert limiter.acquire('m') == pytest.approx(2.0)
+
+
+def test_successes_recover_the_rate_step_by_step():
+    limiter, _ = _limiter(rpm=60)
+    limiter.record_response('m', 429, retry_after=0)
+    limiter.record_response('m', 429, retry_after=0)
+    assert limiter.stats()['m']['rate_factor'] == 0.25
+
+    for _ in range(5):
+        limiter.record_response('m', 200)
+    assert limiter.stats()['m']['rate_factor'] == pytest.approx(0.5)
+    for _ in range(20):
+        limiter.record_response('m', 200)
+    assert limiter.stats()['m']['rate_factor'] == 1.0
+
+
+def test_calls_go_over_budget_after_max_wait():
+    limiter, _ = _limiter(rpm=1, max_wait=5)
+
+    limiter.acquire('m')
+    assert limiter.acquire('m') == pytest.approx(5.0)
+    assert limiter.stats()['m']['over_budget'] == 1
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter(default_rpm=1, default_tpm=1, limits={}, enabled=False)
+
+    assert [limiter.acquire('m') for _ in range(3)] == [0.0] * 3
+    assert limiter.stats() == {}
+
+
+def test_parse_rate_limits_skips_malformed_entries():
+    assert parse_rate_limits("a=10:1000, b=bad, c=5:50") == {'a': (10.0, 1000.0), 'c': (5.0, 50.0)}
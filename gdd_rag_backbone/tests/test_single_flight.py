@@ -0,0 +1,128 @@
+"""Tests for single-flight coalescing of identical in-flight calls."""
+
+import threading
+import time
+
+import pytest
+
+from gdd_rag_backbone.rag_backend.single_flight import SingleFlight
+
+
+def _run_followers(group, key, count, started):
+    """Start `count` followers once the leader is running; returns (threads, outcomes)."""
+    outcomes = []
+
+    def follower():
+        try:
+            outcomes.append(group.do(key, lambda: pytest.fail('follower must not run')))
+        except Exception as e:
+            outcomes.append(e)
+
+    started.wait()
+    threads = [threading.Thread(target=follower) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def _wait_for_followers(group, count):
+    while group.stats()['coalesced'] < count:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_run():
+    group = SingleFlight('test')
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def leader_fn():
+        runs.append(1)
+        started.set()
+        release.wait()
+        return {'chunks': [1, 2]}
+
+    leader_out = []
+    leader = threading.Thread(target=lambda: leader_out.append(group.do('k', leader_fn)))
+    leader.start()
+    threads, outcomes = _run_followers(group, 'k', 3, started)
+    _wait_for_followers(group, 3)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join()
+
+    assert len(runs) == 1
+    assert leader_out == [({'chunks': [1, 2]}, False)]
+    assert outcomes == [({'chunks': [1, 2]}, True)] * 3
+    # Every follower has its own copy
+    assert len({id(result) for result, _ in outcomes}) == 3
+    assert group.stats() == {'runs': 1, 'coalesced': 3, 'in_flight': 0}
+
+
+def test_followers_do_not_see_the_leaders_mutations():
+    group = SingleFlight('test')
+    started, release = threading.Event(), threading.Event()
+    mutated = threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait()
+        return {'chunks': list(range(100)), 'metrics': {}}
+
+    def leader_caller():
+        result, _ = group.do('k', leader_fn)
+        # The leader's caller mutates its result as soon as it has it
+        result['chunks'].clear()
+        result['metrics']['added'] = True
+        mutated.set()
+
+    leader = threading.Thread(target=leader_caller)
+    leader.start()
+    threads, outcomes = _run_followers(group, 'k', 2, started)
+    _wait_for_followers(group, 2)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join()
+
+    assert mutated.is_set()
+    for result, coalesced in outcomes:
+        assert coalesced
+        assert result == {'chunks': list(range(100)), 'metrics': {}}
+
+
+def test_followers_receive_the_leaders_exception():
+    group = SingleFlight('test')
+    started, release = threading.Event(), threading.Event()
+
+    def leader_fn():
+        started.set()
+        release.wait()
+        raise ValueError('boom')
+
+    leader_out = []
+
+    def leader_caller():
+        try:
+            group.do('k', leader_fn)
+        except ValueError as e:
+            leader_out.append(e)
+
+    leader = threading.Thread(target=leader_caller)
+    leader.start()
+    threads, outcomes = _run_followers(group, 'k', 2, started)
+    _wait_for_followers(group, 2)
+    release.set()
+    for thread in [leader] + threads:
+        thread.join()
+
+    assert [str(e) for e in leader_out] == ['boom']
+    assert [str(e) for e in outcomes] == ['boom', 'boom']
+    assert group.stats()['in_flight'] == 0
+
+
+def test_nothing_is_cached_after_the_call_finishes():
+    group = SingleFlight('test')
+    calls = []
+
+    assert group.do('k', lambda: calls.append(1) or len(calls)) == (1, False)
+    assert group.do('k', lambda: calls.append(1) or len(calls)) == (2, False)
+    assert group.stats() == {'runs': 2, 'coalesced': 0, 'in_flight': 0}
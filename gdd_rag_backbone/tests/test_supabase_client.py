@@ -0,0 +1,40 @@
+"""Tests for query building in backend.storage.supabase_client."""
+
+import sqlite3
+
+from backend.storage import supabase_client
+
+
+class _FakeQuery:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def select(self, columns):
+        return self
+
+    def ilike(self, column, pattern):
+        self.calls.append((column, pattern))
+        return self
+
+    def execute(self):
+        return type('R', (), {'data': []})()
+
+
+def _ilike(value, pattern):
+    # Postgres ILIKE with its default backslash escape, via SQLite
+    return sqlite3.connect(':memory:').execute(
+        "SELECT ? LIKE ? ESCAPE '\\'", (value, pattern)).fetchone()[0] == 1
+
+
+def test_code_symbol_lookup_escapes_like_wildcards(monkeypatch):
+    calls = []
+    client = type('C', (), {'table': lambda self, name: _FakeQuery(calls)})()
+    monkeypatch.setattr(supabase_client, 'get_supabase_client', lambda *a, **k: client)
+
+    supabase_client.get_code_symbols_by_name('My_Type%.cs')
+
+    (column, pattern), = calls
+    assert column == 'file_name'
+    assert _ilike('my_type%.cs', pattern)
+    assert not _ilike('MyXTypeAB.cs', pattern)
+    assert _ilike('a\\b.cs', supabase_client._escape_like('a\\b.cs'))
@@ -0,0 +1,43 @@
+"""Tests for the term cache prewarm."""
+
+from backend.services import translation_synonym_service
+from backend.storage import keyword_fts_index, supabase_client, term_cache
+
+
+def test_only_one_process_holds_the_prewarm_lock(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'terms.sqlite')
+    monkeypatch.setattr(term_cache, '_prewarm_lock_file', None)
+
+    assert term_cache.acquire_prewarm_lock(db_path)
+    held = term_cache._prewarm_lock_file
+    assert term_cache.acquire_prewarm_lock(db_path)  # already ours
+    # Another process opens its own file description: flock refuses it
+    monkeypatch.setattr(term_cache, '_prewarm_lock_file', None)
+    try:
+        assert not term_cache.acquire_prewarm_lock(db_path)
+    finally:
+        held.close()
+
+
+def test_prewarm_skips_without_the_lock(monkeypatch):
+    monkeypatch.setattr(term_cache, 'acquire_prewarm_lock', lambda: False)
+    monkeypatch.setattr(term_cache, 'get_term_cache',
+                        lambda: (_ for _ in ()).throw(AssertionError('cache touched')))
+
+    assert translation_synonym_service.prewarm_term_cache(limit=10) == 0
+
+
+def test_prewarm_headings_come_from_the_loaded_mirror(monkeypatch):
+    class Mirror:
+        def wait_until_ready(self, timeout=None):
+            return True
+
+        def section_headings(self):
+            return ['1. Tanks']
+
+    monkeypatch.setattr('backend.shared.config.KEYWORD_FTS_ENABLED', True)
+    monkeypatch.setattr(keyword_fts_index, 'get_keyword_fts_index', lambda: Mirror())
+    monkeypatch.setattr(supabase_client, 'get_keyword_section_headings',
+                        lambda: (_ for _ in ()).throw(AssertionError('second full scan')))
+
+    assert translation_synonym_service._prewarm_section_headings() == ['1. Tanks']
@@ -2228,22 +2228,58 @@ document.addEventListener('DOMContentLoaded', function () {
 
             // Note: Don't use keepalive for large payloads (>64KB limit)
             // The body size can exceed 64KB with many results
-            const response = await fetch('/api/gdd/explainer/explain', {
+            const response = await fetch('/api/gdd/explainer/explain/stream', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: requestBody
             });
 
-            const result = await response.json();
-            genStatus.textContent = result.success ? "✓ Completed" : "✕ Generation Failed";
-            genStatus.style.color = result.success ? "var(--status-success)" : "var(--status-error)";
-
             function setExplanationDisplay() {
                 explanationOutput.style.display = 'block';
                 explanationOutput.style.alignItems = 'stretch';
                 explanationOutput.style.justifyContent = 'flex-start';
             }
 
+            // Sections arrive as soon as each one is explained; show them in
+            // document order until the summary event replaces them
+            const streamedSections = [];
+            function renderStreamedSections(total) {
+                const done = streamedSections.filter(Boolean);
+                genStatus.innerHTML = `<div style="display:flex;align-items:center;gap:8px;color:var(--status-info)"><div class="spinner" style="width:12px;height:12px;"></div> Explained ${done.length}/${total} sections...</div>`;
+                const text = done.map(section => section.explanation).filter(Boolean).join('\n\n');
+                if (!text) return;
+                setExplanationDisplay();
+                explanationOutput.innerHTML = `<div class="generated-explanation" style="color: var(--foreground)">${renderMarkdown(text, 'Explanation', keyword)}</div>`;
+            }
+
+            let result = null;
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (!result) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const rawEvent of events) {
+                    if (!rawEvent.startsWith('data: ')) continue;
+                    const event = JSON.parse(rawEvent.slice(6));
+                    if (event.type === 'section') {
+                        streamedSections[event.position] = event;
+                        renderStreamedSections(event.total);
+                    } else if (event.type === 'summary') {
+                        result = event;
+                    }
+                }
+            }
+            if (!result) {
+                throw new Error('Explanation stream ended unexpectedly');
+            }
+
+            genStatus.textContent = result.success ? "✓ Completed" : "✕ Generation Failed";
+            genStatus.style.color = result.success ? "var(--status-success)" : "var(--status-error)";
+
             if (!result.success) {
                 setExplanationDisplay();
                 explanationOutput.innerHTML = `<div class="placeholder-text"><p style="color:var(--status-error)">${result.explanation || 'Generation failed'}</p></div>`;